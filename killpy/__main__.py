@@ -1,37 +1,123 @@
-"""killpy CLI entry point: the ``cli`` click group and its subcommands."""
+"""killpy CLI entry point: the ``cli`` click group and its subcommands.
+
+Start-up time matters for the non-interactive commands, which run from
+pre-commit hooks and shell prompts.  Subcommand modules are therefore only
+imported when that subcommand is invoked (see :class:`_LazyGroup`; ``--help``
+lists them from the help sentences kept in ``_SUBCOMMANDS``), and the
+Textual TUI and the ``--delete-all`` progress display are imported inside the
+code paths that use them.
+"""
 
 from __future__ import annotations
 
 import logging
 import sys
+from importlib import import_module
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Confirm
 
 from killpy.cleaner import Cleaner, CleanerError
-from killpy.cli import TableApp
-from killpy.commands._utils import partition_in_use
-from killpy.commands.clean import clean_cmd
-from killpy.commands.delete import delete_cmd
-from killpy.commands.doctor import doctor_cmd
-from killpy.commands.find import find_cmd
-from killpy.commands.list import list_cmd
-from killpy.commands.stats import stats_cmd
-from killpy.files import format_size
+from killpy.files import SIZE_MODES, SizeMode, format_size
 from killpy.intelligence.tracker import UsageTracker
 from killpy.scanner import Scanner
 
+# Subcommand name -> "module:attribute" of its click command, and the first
+# sentence of its help.  ``killpy --help`` lists the subcommands from these
+# strings, without importing a single subcommand module.
+_SUBCOMMANDS: dict[str, tuple[str, str]] = {
+    "clean": (
+        "killpy.commands.clean:clean_cmd",
+        "Remove all ``__pycache__`` directories under PATH and report freed space.",
+    ),
+    "list": (
+        "killpy.commands.list:list_cmd",
+        "List all detected Python environments under PATH.",
+    ),
+    "delete": (
+        "killpy.commands.delete:delete_cmd",
+        "Delete detected Python environments under PATH.",
+    ),
+    "stats": (
+        "killpy.commands.stats:stats_cmd",
+        "Show disk-usage statistics grouped by environment type.",
+    ),
+    "doctor": (
+        "killpy.commands.doctor:doctor_cmd",
+        "Analyse environments and show actionable deletion recommendations.",
+    ),
+    "find": (
+        "killpy.commands.find:find_cmd",
+        "Find environments that have PACKAGE installed.",
+    ),
+    "serve": (
+        "killpy.commands.serve:serve_cmd",
+        "Index PATH once, keep the index current, and serve it over a socket.",
+    ),
+}
+
+
+class _LazyGroup(click.Group):
+    """Click group that imports a subcommand's module only when it is used."""
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *_SUBCOMMANDS})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name not in self.commands and cmd_name in _SUBCOMMANDS:
+            module, attribute = _SUBCOMMANDS[cmd_name][0].split(":")
+            self.add_command(getattr(import_module(module), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        # As click.Group does, but commands not imported yet are described by
+        # a stand-in carrying their help from _SUBCOMMANDS.
+        commands = [
+            (
+                name,
+                self.commands.get(name)
+                or click.Command(name, help=_SUBCOMMANDS[name][1]),
+            )
+            for name in self.list_commands(ctx)
+        ]
+        commands = [(name, cmd) for name, cmd in commands if not cmd.hidden]
+        if not commands:
+            return
+        limit = formatter.width - 6 - max(len(name) for name, _cmd in commands)
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [(name, cmd.get_short_help_str(limit)) for name, cmd in commands]
+            )
+
 
 def _run_delete_all(
     path: Path, excluded: set[str], yes: bool, force: bool = False
 ) -> None:
-    """Scan and delete all discovered environments without launching the TUI."""
+    """Scan and delete all discovered environments without launching the TUI.
+
+    The run is journaled like ``killpy delete``, so ``killpy delete --resume``
+    finishes it if it is interrupted.
+    """
+    from rich.console import Console  # noqa: PLC0415
+    from rich.progress import (  # noqa: PLC0415
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+    )
+    from rich.prompt import Confirm  # noqa: PLC0415
+
+    from killpy.commands._utils import (  # noqa: PLC0415
+        partition_in_use,
+        refuse_if_interrupted,
+    )
+    from killpy.journal import DeletionJournal  # noqa: PLC0415
+
+    journal = DeletionJournal()
+    refuse_if_interrupted(journal)
     console = Console()
     scanner = Scanner(excluded=excluded)
-    cleaner = Cleaner(force=force)
 
     with Progress(
         SpinnerColumn(),
@@ -70,6 +156,8 @@ def _run_delete_all(
     except Exception:  # noqa: BLE001
         pass
 
+    journal.begin(envs, path, "apparent")
+    cleaner = Cleaner(force=force, journal=journal)
     deleted = 0
     freed = 0
     errors = 0
@@ -92,12 +180,23 @@ def _run_delete_all(
         tracker.record_deletion(freed)
     except Exception:  # noqa: BLE001
         pass
+    journal.finish()
 
     if errors:
         sys.exit(1)
 
 
-@click.group(invoke_without_command=True)
+def _cached_max_age(max_age: str) -> float:
+    """Parse the root ``--max-age``, which is only converted for the TUI."""
+    from killpy.commands._utils import parse_duration  # noqa: PLC0415
+
+    try:
+        return parse_duration(max_age)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="'--max-age'") from exc
+
+
+@click.group(cls=_LazyGroup, invoke_without_command=True)
 @click.option(
     "--path",
     default=Path.cwd,
@@ -134,9 +233,71 @@ def _run_delete_all(
         "(flagged system-critical)."
     ),
 )
+@click.option(
+    "--size-mode",
+    type=click.Choice(SIZE_MODES),
+    default="apparent",
+    show_default=True,
+    help="Show apparent file sizes in the TUI, or the blocks allocated on disk.",
+)
+@click.option(
+    "--gentle",
+    is_flag=True,
+    default=False,
+    help=(
+        "Low-impact mode for busy hosts, for the TUI and every subcommand: "
+        "idle I/O priority and rate-limited filesystem calls."
+    ),
+)
+@click.option(
+    "--one-file-system",
+    is_flag=True,
+    default=False,
+    help=(
+        "For the TUI and every subcommand: do not descend into directories "
+        "on other filesystems than the scan root's."
+    ),
+)
+@click.option(
+    "--cached",
+    is_flag=True,
+    default=False,
+    help=(
+        "TUI: show the last scan of PATH at once when it is younger than "
+        "--max-age, and reconcile it with a fresh scan as that runs."
+    ),
+)
+@click.option(
+    "--max-age",
+    default="1h",
+    show_default=True,
+    metavar="DURATION",
+    help="With --cached: the oldest snapshot to show, e.g. 30m or 1h30m.",
+)
 @click.pass_context
-def cli(ctx, path: Path, exclude: str, delete_all: bool, yes: bool, force: bool):
+def cli(  # noqa: PLR0913 - one parameter per click option
+    ctx,
+    *,
+    path: Path,
+    exclude: str,
+    delete_all: bool,
+    yes: bool,
+    force: bool,
+    size_mode: SizeMode,
+    gentle: bool,
+    one_file_system: bool,
+    cached: bool,
+    max_age: str,
+):
     logging.basicConfig(level=logging.WARNING)
+    if gentle:
+        from killpy.throttle import enable_gentle  # noqa: PLC0415
+
+        enable_gentle()
+    if one_file_system:
+        from killpy.mounts import configure  # noqa: PLC0415
+
+        configure(one_file_system=True)
     excluded = (
         {p.strip() for p in exclude.split(",") if p.strip()} if exclude else set()
     )
@@ -144,16 +305,15 @@ def cli(ctx, path: Path, exclude: str, delete_all: bool, yes: bool, force: bool)
         if delete_all:
             _run_delete_all(path, excluded, yes, force)
         else:
-            app = TableApp(root_dir=path, excluded=excluded)
-            app.run()
-
+            from killpy.cli import TableApp  # noqa: PLC0415 - Textual is heavy
 
-cli.add_command(clean_cmd, name="clean")
-cli.add_command(list_cmd, name="list")
-cli.add_command(delete_cmd, name="delete")
-cli.add_command(stats_cmd, name="stats")
-cli.add_command(doctor_cmd, name="doctor")
-cli.add_command(find_cmd, name="find")
+            app = TableApp(
+                root_dir=path,
+                excluded=excluded,
+                size_mode=size_mode,
+                cached_max_age=_cached_max_age(max_age) if cached else None,
+            )
+            app.run()
 
 
 if __name__ == "__main__":
@@ -13,6 +13,11 @@ The :class:`Cleaner` dispatches to the correct removal strategy based on
 ``managed_by="conda"`` are removed via ``conda env remove``;
 ``managed_by="pipx"`` via ``pipx uninstall``; ``managed_by="uv"`` via
 ``uv tool uninstall``; all others via :func:`shutil.rmtree`.
+
+:meth:`Cleaner.delete_within` runs deletions against a time budget: it deletes
+the environments that free the most bytes per estimated second first, learns
+the actual throughput as it goes (:class:`DeletionRate`), never starts a
+deletion it does not expect to finish, and reports what is left.
 """
 
 from __future__ import annotations
@@ -20,9 +25,14 @@ from __future__ import annotations
 import logging
 import shutil
 import subprocess
+import time
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from killpy import throttle
+from killpy.files import SizeMode
+from killpy.journal import DeletionJournal
 from killpy.models import Environment
 
 logger = logging.getLogger(__name__)
@@ -31,11 +41,83 @@ logger = logging.getLogger(__name__)
 # deletion target: refuses e.g. /usr or /home, which are never environments.
 _MIN_DEPTH_BELOW_ROOT = 2
 
+# Deletion-time model used by :class:`DeletionRate` until real deletions have
+# been observed.  Removing a tree costs one unlink/rmdir per inode; for
+# environments whose inodes were not counted, the count is guessed from the
+# size.  Tool-managed environments pay for starting the tool's subprocess.
+_DEFAULT_INODES_PER_SECOND = 20_000.0
+_BYTES_PER_INODE_GUESS = 16 << 10
+_MANAGED_OVERHEAD_SECONDS = 2.0
+
 
 class CleanerError(Exception):
     """Raised when a deletion operation fails."""
 
 
+class DeletionRate:
+    """Estimates how long deleting an environment takes, from observed throughput.
+
+    Estimates start from a conservative default rate and switch to the
+    inodes-per-second actually achieved once :meth:`observe` has seen a
+    filesystem deletion.
+    """
+
+    def __init__(self) -> None:
+        self._inodes = 0
+        self._seconds = 0.0
+
+    @property
+    def inodes_per_second(self) -> float:
+        """Observed deletion throughput, or the default before any observation."""
+        if self._inodes and self._seconds > 0:
+            return self._inodes / self._seconds
+        return _DEFAULT_INODES_PER_SECOND
+
+    def estimate(self, env: Environment) -> float:
+        """Return the estimated seconds needed to delete *env*."""
+        overhead = _MANAGED_OVERHEAD_SECONDS if env.managed_by else 0.0
+        return overhead + _inode_estimate(env) / self.inodes_per_second
+
+    def observe(self, env: Environment, seconds: float) -> None:
+        """Record that deleting *env* took *seconds*."""
+        # Tool-managed removals are dominated by the subprocess, not the tree.
+        if env.managed_by is None:
+            self._inodes += _inode_estimate(env)
+            self._seconds += seconds
+
+    def order(self, envs: list[Environment], size_mode: SizeMode) -> list[Environment]:
+        """Sort *envs* by bytes freed per estimated second, best first."""
+        return sorted(
+            envs,
+            key=lambda env: env.reclaimable_for(size_mode) / self.estimate(env),
+            reverse=True,
+        )
+
+
+def _average_file_size(env: Environment) -> int:
+    if env.usage is None or not env.usage.file_count:
+        return 0
+    return env.usage.disk_bytes // env.usage.file_count
+
+
+def _inode_estimate(env: Environment) -> int:
+    return env.inode_count or max(1, env.size_bytes // _BYTES_PER_INODE_GUESS)
+
+
+@dataclass
+class BudgetedRun:
+    """Outcome of :meth:`Cleaner.delete_within`."""
+
+    freed_bytes: int = 0
+    deleted: list[Environment] = field(default_factory=list)
+    failed: list[Environment] = field(default_factory=list)
+    #: Environments not attempted because the budget ran out, in the order
+    #: the next run should take them.
+    remaining: list[Environment] = field(default_factory=list)
+    elapsed: float = 0.0
+    inodes_per_second: float = _DEFAULT_INODES_PER_SECOND
+
+
 class Cleaner:
     """Deletes :class:`~killpy.models.Environment` instances.
 
@@ -48,11 +130,27 @@ class Cleaner:
         When ``True``, allow deleting environments flagged
         :attr:`~killpy.models.Environment.is_system_critical` (currently in
         use).  By default those are refused with a :class:`CleanerError`.
+    size_mode:
+        How freed space is measured: ``"apparent"`` (``st_size``) or
+        ``"disk"`` (allocated blocks, as ``du`` reports).
+    journal:
+        Optional :class:`~killpy.journal.DeletionJournal` of the current
+        run.  Each deletion is recorded there as started before anything is
+        removed, and as done or failed afterwards.  Dry runs are not
+        journaled.
     """
 
-    def __init__(self, dry_run: bool = False, force: bool = False) -> None:
+    def __init__(
+        self,
+        dry_run: bool = False,
+        force: bool = False,
+        size_mode: SizeMode = "apparent",
+        journal: DeletionJournal | None = None,
+    ) -> None:
         self.dry_run = dry_run
         self.force = force
+        self.size_mode = size_mode
+        self.journal = journal
 
     # ------------------------------------------------------------------ #
     #  Public API                                                          #
@@ -70,9 +168,11 @@ class Cleaner:
         -------
         int
             Number of bytes freed (or that *would have been* freed in dry-run
-            mode).  ``0`` when the path was already gone — e.g. it was
-            removed together with a previously deleted parent environment —
-            so callers don't over-report freed space.
+            mode): the environment's reclaimable bytes in :attr:`size_mode`
+            (see :meth:`~killpy.models.Environment.reclaimable_for`).  ``0`` when
+            the path was already gone — e.g. it was removed together with a
+            previously deleted parent environment — so callers don't
+            over-report freed space.
 
         Raises
         ------
@@ -80,6 +180,18 @@ class Cleaner:
             If the underlying removal command fails, or when *env* is
             system-critical and :attr:`force` is ``False``.
         """
+        if self.journal is None or self.dry_run:
+            return self._delete(env)
+        self.journal.started(env)
+        try:
+            freed = self._delete(env)
+        except CleanerError as exc:
+            self.journal.failed(env, str(exc))
+            raise
+        self.journal.done(env, freed)
+        return freed
+
+    def _delete(self, env: Environment) -> int:
         if env.is_system_critical and not self.force:
             raise CleanerError(
                 f"Refusing to delete {env.path}: environment is currently in "
@@ -88,7 +200,7 @@ class Cleaner:
 
         if self.dry_run:
             logger.info("[dry-run] Would delete %s (%s)", env.path, env.size_human)
-            return env.size_bytes
+            return env.reclaimable_for(self.size_mode)
 
         try:
             if env.managed_by == "conda":
@@ -97,7 +209,7 @@ class Cleaner:
                 self._remove_pipx(env.name)
             elif env.managed_by == "uv":
                 self._remove_uv_tool(env.name)
-            elif not self._remove_filesystem(env.path):
+            elif not self._remove_filesystem(env.path, _average_file_size(env)):
                 return 0
         except CleanerError:
             raise
@@ -105,7 +217,7 @@ class Cleaner:
             raise CleanerError(f"Failed to delete {env.path}: {exc}") from exc
 
         logger.info("Deleted %s (%s)", env.path, env.size_human)
-        return env.size_bytes
+        return env.reclaimable_for(self.size_mode)
 
     def delete_many(
         self,
@@ -141,6 +253,79 @@ class Cleaner:
 
         return total
 
+    def delete_within(
+        self,
+        envs: list[Environment],
+        budget: float,
+        on_progress: Callable[[Environment, int, CleanerError | None], None]
+        | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> BudgetedRun:
+        """Delete as much of *envs* as fits in *budget* seconds.
+
+        Environments are taken in order of bytes freed per estimated second
+        (see :class:`DeletionRate`), re-estimated after every deletion from
+        the throughput observed so far.  A deletion is only started when its
+        estimate fits in the time left; one that does not is passed over for
+        a quicker one, and the run stops once nothing fits or the deadline
+        has passed.  A deletion in progress is never interrupted.
+
+        Parameters
+        ----------
+        envs:
+            Environments to delete.
+        budget:
+            Seconds available for the whole run.
+        on_progress:
+            Optional callback invoked after each attempted deletion.  Receives
+            *(env, freed_bytes, error)*; *error* is the :class:`CleanerError`
+            when the deletion failed, else ``None``.
+        clock:
+            Monotonic clock, in seconds.
+
+        Returns
+        -------
+        BudgetedRun
+            What was deleted, what failed and what is left for a later run.
+        """
+        rate = DeletionRate()
+        run = BudgetedRun()
+        start = clock()
+        deadline = start + budget
+        pending = list(envs)
+
+        while pending:
+            time_left = deadline - clock()
+            pending = rate.order(pending, self.size_mode)
+            env = next((e for e in pending if rate.estimate(e) <= time_left), None)
+            if env is None:
+                break
+            pending.remove(env)
+
+            began = clock()
+            error: CleanerError | None = None
+            try:
+                freed = self.delete(env)
+            except CleanerError as exc:
+                logger.error("%s", exc)
+                error, freed = exc, 0
+                run.failed.append(env)
+            else:
+                # Paths already gone and dry runs say nothing about throughput.
+                if freed and not self.dry_run:
+                    rate.observe(env, clock() - began)
+                run.deleted.append(env)
+                run.freed_bytes += freed
+
+            if on_progress is not None:
+                on_progress(env, freed, error)
+
+        run.remaining = pending
+        run.elapsed = clock() - start
+        run.inodes_per_second = rate.inodes_per_second
+        return run
+
     # ------------------------------------------------------------------ #
     #  Removal strategies                                                  #
     # ------------------------------------------------------------------ #
@@ -173,13 +358,18 @@ class Cleaner:
             raise CleanerError(f"Refusing to delete top-level directory: {resolved}")
 
     @staticmethod
-    def _remove_filesystem(path: Path) -> bool:
-        """Remove *path* recursively; return False when it no longer exists."""
+    def _remove_filesystem(path: Path, bytes_per_file: int = 0) -> bool:
+        """Remove *path* recursively; return False when it no longer exists.
+
+        Goes through :func:`killpy.throttle.rmtree`, so gentle mode
+        rate-limits the unlinks; *bytes_per_file* is what each one is
+        charged against the bytes-per-second limit.
+        """
         if not path.exists():
             logger.warning("Path no longer exists: %s", path)
             return False
         Cleaner._ensure_sane_deletion_target(path)
-        shutil.rmtree(path)
+        throttle.rmtree(path, bytes_per_file=bytes_per_file)
         return True
 
     @staticmethod
@@ -1,34 +1,78 @@
-"""Stateless ``__pycache__`` removal helper used by ``killpy clean``."""
+"""Stateless ``__pycache__`` removal helpers used by ``killpy clean`` and the TUI.
+
+``__pycache__`` directories are found with the shared walk's prune policy
+(:mod:`killpy.detectors._shared_walk`): environments (conda environments and
+pyenv versions included), ``site-packages``, VCS and ``node_modules`` trees
+are never entered, so caches that belong to an environment are left for the
+interpreter that owns them.  Build artifacts are entered: the caches under
+``build/lib`` are the project's own.  Each directory is then sized and
+deleted in a single pass, several at a time, with every filesystem call
+going through the gentle-mode throttle (:mod:`killpy.throttle`).
+"""
 
 from __future__ import annotations
 
-import os
-import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from killpy.files import get_total_size
+from killpy import throttle
+from killpy.detectors._shared_walk import walk_environments, walk_git_candidates
+
+# Directories deleted concurrently; removal is dominated by filesystem
+# metadata calls, which release the GIL.
+_REMOVE_WORKERS = 8
+
+
+def find_pycache(path: Path, *, git_aware: bool = False) -> list[Path]:
+    """Return every ``__pycache__`` directory under *path* that cleaning removes.
+
+    With ``git_aware=True`` inside a git work tree, only the directories git
+    reports as untracked or ignored are visited (see
+    :func:`~killpy.detectors._shared_walk.walk_git_candidates`).  Symlinks are
+    never followed or reported.
+    """
+    envs = None
+    if git_aware:
+        envs = walk_git_candidates(path, {"cache"}, sized=False, enter_artifacts=True)
+    if envs is None:
+        envs = walk_environments(path, {"cache"}, sized=False, enter_artifacts=True)
+    return [env.path for env in envs if env.type == "__pycache__"]
+
+
+def remove_pycache(path: Path, *, git_aware: bool = False) -> int:
+    """Remove every ``__pycache__`` directory under *path*; return the bytes freed.
+
+    The directories are those of :func:`find_pycache`.  Only files actually
+    unlinked count as freed space, so a failed removal frees nothing.
+    """
+    pycache_dirs = find_pycache(path, git_aware=git_aware)
+    if not pycache_dirs:
+        return 0
+    with ThreadPoolExecutor(max_workers=_REMOVE_WORKERS) as pool:
+        return sum(pool.map(_remove_tree, pycache_dirs))
 
 
-def remove_pycache(path: Path) -> int:
-    """Remove every ``__pycache__`` directory under *path*.
+def _remove_tree(directory: Path) -> int:
+    """Delete *directory*, sizing each file just before it is unlinked.
 
-    The walk never follows symlinks, so a link placed inside the tree
-    cannot steer the deletion outside the scanned root.  Failed removals
-    are skipped and not counted as freed space.
+    The listing, every ``lstat``, ``unlink`` and ``rmdir`` is a throttled op.
     """
-    total_freed_space = 0
-    for current_root, directories, _files in os.walk(path, topdown=True):
-        if "__pycache__" not in directories:
-            continue
-        # Prune it from the walk: it is deleted below, not descended into.
-        directories.remove("__pycache__")
-        pycache_dir = Path(current_root) / "__pycache__"
-        if pycache_dir.is_symlink():
-            continue
-        try:
-            size = get_total_size(pycache_dir)
-            shutil.rmtree(pycache_dir)
-        except OSError:
-            continue
-        total_freed_space += size
-    return total_freed_space
+    freed = 0
+    try:
+        if stat.S_ISLNK(throttle.lstat(directory).st_mode):
+            return 0
+        for entry in throttle.scandir(directory):
+            if entry.is_dir(follow_symlinks=False):
+                freed += _remove_tree(Path(entry.path))
+                continue
+            try:
+                size = throttle.lstat(entry.path).st_size
+                throttle.unlink(entry.path, size)
+            except OSError:
+                continue
+            freed += size
+        throttle.rmdir(directory)
+    except OSError:
+        pass
+    return freed
@@ -5,16 +5,23 @@ from __future__ import annotations
 import asyncio
 import subprocess
 import sys
-from datetime import datetime
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from enum import Enum
 from importlib.metadata import PackageNotFoundError, version
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, TypedDict, cast
 
 from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.coordinate import Coordinate
+from textual.timer import Timer
 from textual.widgets import (
     DataTable,
     Footer,
@@ -28,10 +35,28 @@ from textual.widgets import (
 
 from killpy.cleaner import Cleaner, CleanerError
 from killpy.cleaners import remove_pycache
-from killpy.files import format_size
-from killpy.intelligence import SuggestionEngine, UsageTracker, score_all
-from killpy.models import Environment
+from killpy.commands._utils import filter_envs, format_duration
+from killpy.daemon import query_daemon
+from killpy.files import DiskUsage, SizeMode, format_size, get_disk_usage, parse_size
+from killpy.intelligence import (
+    SuggestionEngine,
+    UsageTracker,
+    plan_to_free,
+    score_all,
+)
+from killpy.models import Environment, ScoredEnvironment
+from killpy.mounts import MountLimiter
 from killpy.scanner import Scanner
+from killpy.snapshots import ScanLock, Snapshot, SnapshotStore
+from killpy.virtual_table import CellType, VirtualTable
+
+# Quiet period after the last keystroke in the filter box before re-filtering.
+_SEARCH_DEBOUNCE_SECONDS = 0.15
+
+# Threads summing environment sizes in the background after a deferred scan.
+_SIZING_WORKERS = 4
+
+_SIZING_PLACEHOLDER = "sizing…"
 
 _HEALTH_STYLES: dict[str, tuple[str, str]] = {
     "HIGH": ("HIGH", "bold red"),
@@ -40,6 +65,11 @@ _HEALTH_STYLES: dict[str, tuple[str, str]] = {
 }
 
 
+# Sort rank of each health category: most deletable first.
+_HEALTH_RANK = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+_NO_HEALTH_RANK = len(_HEALTH_RANK)
+
+
 def _health_text(category: str) -> Text | str:
     if category in _HEALTH_STYLES:
         label, style = _HEALTH_STYLES[category]
@@ -63,6 +93,15 @@ def _is_pipx_tab(func):
     return wrapper
 
 
+def _size_then_delete(cleaner: Cleaner, environment: Environment) -> int:
+    """Delete *environment*, sizing it first if the scan deferred that."""
+    if environment.size_pending:
+        environment.usage = get_disk_usage(environment.path)
+        environment.size_bytes = environment.usage.apparent_bytes
+        environment.size_pending = False
+    return cleaner.delete(environment)
+
+
 def _shorten_path_for_table(path_value, max_parts: int = 2) -> str:
     path_text = str(path_value)
     if "/" not in path_text and "\\" not in path_text:
@@ -79,15 +118,27 @@ def _shorten_path_for_table(path_value, max_parts: int = 2) -> str:
 class EnvStatus(Enum):
     DELETED = "DELETED"
     MARKED_TO_DELETE = "MARKED TO DELETE"
+    QUEUED = "QUEUED"
+    DELETING = "DELETING"
+
+
+# Rows in these states cannot be marked, selected or queued again.
+_LOCKED_STATUSES = frozenset(
+    {EnvStatus.DELETED.value, EnvStatus.QUEUED.value, EnvStatus.DELETING.value}
+)
 
 
 class VenvRow(TypedDict):
     path: str
+    path_key: str
     type: str
     last_modified: str
+    mtime: float
     size: int
     size_human: str
+    inodes: int
     health: str
+    health_rank: int
     status: str
     environment: Environment
 
@@ -107,6 +158,7 @@ class TableApp(App):
         "Last Modified",
         "Size",
         "Size (Human Readable)",
+        "Inodes",
         "Health",
         "Status",
     ]
@@ -116,14 +168,32 @@ class TableApp(App):
     VENV_COL_LAST_MODIFIED = 2
     VENV_COL_SIZE = 3
     VENV_COL_SIZE_HUMAN = 4
-    VENV_COL_HEALTH = 5
-    VENV_COL_STATUS = 6
+    VENV_COL_INODES = 5
+    VENV_COL_HEALTH = 6
+    VENV_COL_STATUS = 7
 
     PIPX_COL_PACKAGE = 0
     PIPX_COL_SIZE = 1
     PIPX_COL_SIZE_HUMAN = 2
     PIPX_COL_STATUS = 3
 
+    # Typed, precomputed sort key of each venv column.  Both size columns
+    # sort by bytes: "9.00 MB" must not sort above "10.00 GB".  Status has no
+    # stored key: it sorts by the text shown (see _venv_sort_key).
+    _VENV_SORT_KEYS = {
+        VENV_COL_PATH: "path_key",
+        VENV_COL_TYPE: "type",
+        VENV_COL_LAST_MODIFIED: "mtime",
+        VENV_COL_SIZE: "size",
+        VENV_COL_SIZE_HUMAN: "size",
+        VENV_COL_INODES: "inodes",
+        VENV_COL_HEALTH: "health_rank",
+    }
+    # Columns whose order changes as deferred sizes arrive.
+    _VENV_SIZE_COLUMNS = frozenset(
+        {VENV_COL_SIZE, VENV_COL_SIZE_HUMAN, VENV_COL_INODES}
+    )
+
     SPINNER_FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
 
     def __init__(
@@ -131,11 +201,15 @@ class TableApp(App):
         root_dir: Path | None = None,
         excluded: set[str] | None = None,
         *args: Any,
+        size_mode: SizeMode = "apparent",
+        cached_max_age: float | None = None,
         **kwargs: Any,
     ):
         super().__init__(*args, **kwargs)
         self.app_version = self.get_app_version()
         self.root_dir = root_dir or Path.cwd()
+        # Which size the Size columns show: apparent or allocated on disk.
+        self.size_mode: SizeMode = size_mode
         self.venv_rows: list[VenvRow] = []
         self.pipx_rows: list[PipxRow] = []
         self.sort_state: dict[str, tuple[int, bool]] = {}
@@ -144,12 +218,33 @@ class TableApp(App):
         self._spinner_timer = None
         self._scan_counts: tuple[int, int, int, int] = (0, 0, 0, 0)
         self._filter_query: str = ""
+        # Lower-cased query that ``_venv_display_indices`` currently reflects.
+        self._applied_query: str = ""
+        self._search_timer: Timer | None = None
         self._venv_display_indices: list[int] = []
         self._multi_select_mode: bool = False
         self._selected_venv_paths: set[str] = set()
         self._health_by_path: dict[str, str] = {}
-        self.cleaner = Cleaner()
+        # Scores from the health pass, reused by the free-space planner.
+        self._scored_by_path: dict[str, ScoredEnvironment] = {}
+        # Why the free-space planner marked each row, keyed by path.
+        self._plan_reasons: dict[str, str] = {}
+        self._delete_queue: deque[VenvRow | PipxRow] = deque()
+        self._draining: bool = False
+        # Rows still waiting for their size, keyed by path, oldest first.
+        self._unsized: dict[str, VenvRow] = {}
+        self._sizing: bool = False
+        self._scan_complete: bool = False
+        # With --cached: the oldest snapshot shown while the rescan runs.
+        self._cached_max_age = cached_max_age
+        # Rows shown from the snapshot that the rescan has not found yet.
+        self._snapshot_rows: dict[str, VenvRow | PipxRow] = {}
+        # Held from the start of the scan until its snapshot is saved, so other
+        # killpy processes wait for this scan instead of repeating it.
+        self._scan_lock: ScanLock | None = None
+        self.cleaner = Cleaner(size_mode=size_mode)
         self.tracker = UsageTracker()
+        self.snapshots = SnapshotStore()
         self.scanner = Scanner(
             types={
                 "venv",
@@ -192,6 +287,12 @@ class TableApp(App):
             description="Delete immediately",
             show=True,
         ),
+        Binding(
+            key="c",
+            action="cancel_deletions",
+            description="Cancel queued",
+            show=True,
+        ),
         Binding(
             key="p",
             action="clean_pycache",
@@ -210,6 +311,7 @@ class TableApp(App):
         Binding(key="k", action="cursor_up_active", description="Move up", show=False),
         Binding(key="o", action="open_folder", description="Open folder", show=True),
         Binding(key="slash", action="start_search", description="Filter /", show=True),
+        Binding(key="f", action="start_free", description="Free space…", show=True),
         Binding(
             key="t",
             action="toggle_multi_select",
@@ -259,6 +361,15 @@ class TableApp(App):
         display: block;
     }
 
+    #free-input {
+        display: none;
+        height: 1;
+    }
+
+    #free-input.visible {
+        display: block;
+    }
+
     #multi-select-label {
         display: none;
         height: 1;
@@ -269,6 +380,14 @@ class TableApp(App):
         display: block;
     }
 
+    TabbedContent, ContentSwitcher, TabPane {
+        height: 1fr;
+    }
+
+    #venv-table {
+        height: 1fr;
+    }
+
     TabbedContent #--content-tab-venv-tab {
         color: green;
     }
@@ -299,11 +418,15 @@ class TableApp(App):
             placeholder="Filter by path… Esc to clear",
             id="search-input",
         )
+        yield Input(
+            placeholder="Free how much? e.g. 20GB — Enter marks a plan, Esc cancels",
+            id="free-input",
+        )
         yield Label("", id="multi-select-label")
 
         with TabbedContent():
             with TabPane("Environments", id="venv-tab"):
-                yield DataTable(id="venv-table")
+                yield VirtualTable(self._venv_cells, id="venv-table")
             with TabPane("Pipx", id="pipx-tab"):
                 yield DataTable(id="pipx-table")
 
@@ -316,10 +439,9 @@ class TableApp(App):
         self.run_worker(self.load_initial_data(), exclusive=True)
 
     def setup_tables(self) -> None:
-        venv_table = self.query_one("#venv-table", DataTable)
+        venv_table = self.query_one("#venv-table", VirtualTable)
         if not venv_table.columns:
-            venv_table.add_columns(*self.get_headers_for_table("venv-table"))
-        venv_table.cursor_type = "row"
+            venv_table.set_columns(*self.get_headers_for_table("venv-table"))
         venv_table.zebra_stripes = True
 
         pipx_table = self.query_one("#pipx-table", DataTable)
@@ -330,43 +452,65 @@ class TableApp(App):
 
         venv_table.focus()
 
-    def add_venv_environment(self, environment: Environment) -> None:
-        data_index = len(self.venv_rows)
-        self.venv_rows.append(
-            {
-                "path": str(environment.path),
-                "type": environment.type,
-                "last_modified": environment.last_modified_str,
-                "size": environment.size_bytes,
-                "size_human": environment.size_human,
-                "health": self._health_by_path.get(str(environment.path), ""),
-                "status": "",
-                "environment": environment,
-            }
-        )
-        self._venv_display_indices.append(data_index)
-
-        table = self.query_one("#venv-table", DataTable)
-        row = self.venv_rows[-1]
-        type_label = ("\u26a0\ufe0f " if environment.is_system_critical else "") + row[
-            "type"
-        ]
-        table.add_row(
-            _shorten_path_for_table(row["path"]),
-            type_label,
-            row["last_modified"],
-            row["size"],
-            row["size_human"],
-            _health_text(row["health"]),
-            row["status"],
-        )
+    def add_venv_environment(self, environment: Environment) -> VenvRow:
+        """Show *environment* in the venv table and return its row."""
+        health = self._health_by_path.get(str(environment.path), "")
+        row: VenvRow = {
+            "path": str(environment.path),
+            "path_key": str(environment.path).lower(),
+            "type": environment.type,
+            "last_modified": environment.last_modified_str,
+            "mtime": environment.last_modified.timestamp(),
+            "size": environment.size_for(self.size_mode),
+            "size_human": (
+                _SIZING_PLACEHOLDER
+                if environment.size_pending
+                else format_size(environment.size_for(self.size_mode))
+            ),
+            "inodes": environment.inode_count,
+            "health": health,
+            "health_rank": _HEALTH_RANK.get(health, _NO_HEALTH_RANK),
+            "status": "",
+            "environment": environment,
+        }
+        self._insert_venv_row(row)
+        if environment.size_pending:
+            self._unsized[str(environment.path)] = row
+            self._start_sizing()
+        return row
+
+    def _insert_venv_row(self, row: VenvRow) -> None:
+        """Add *row* in sorted place under a size sort, else at the end.
+
+        Display indices after it shift by one; only the on-screen rows at or
+        below it are repainted.
+        """
+        order = self._size_order()
+        at = len(self.venv_rows)
+        if order is not None:
+            at = bisect_right(self.venv_rows, order(row), key=order)
+        self.venv_rows.insert(at, row)
+        indices = self._venv_display_indices
+        if not self._applied_query:
+            # Unfiltered, display row i is venv_rows[i]: the view just grows.
+            indices.append(len(indices))
+            first = at
+        else:
+            first = bisect_left(indices, at)
+            indices[first:] = [i + 1 for i in indices[first:]]
+            if not self._matches_filter(row):
+                return
+            indices.insert(first, at)
+        table = self.query_one("#venv-table", VirtualTable)
+        table.append_rows()
+        self._repaint_venv_rows(first, len(indices) - 1)
 
     def add_pipx_environment(self, environment: Environment) -> None:
         self.pipx_rows.append(
             {
                 "package": environment.name,
-                "size": environment.size_bytes,
-                "size_human": environment.size_human,
+                "size": environment.size_for(self.size_mode),
+                "size_human": format_size(environment.size_for(self.size_mode)),
                 "status": "",
                 "environment": environment,
             }
@@ -377,28 +521,64 @@ class TableApp(App):
         table.add_row(row["package"], row["size"], row["size_human"], row["status"])
 
     def render_venv_table(self) -> None:
-        table = self.query_one("#venv-table", DataTable)
-        table.clear(columns=True)
-        table.add_columns(*self.get_headers_for_table("venv-table"))
-        self._venv_display_indices = []
+        """Recompute the filtered display index and repaint the visible rows.
+
+        The table is virtual: it pulls cells through :meth:`_venv_cells` for
+        on-screen rows only, so this costs one pass over ``venv_rows`` and no
+        widget rebuild.
+        """
+        table = self.query_one("#venv-table", VirtualTable)
+        table.set_columns(*self.get_headers_for_table("venv-table"))
+        # Rows may have been dropped: filter from scratch.
+        self._applied_query = ""
+        self._apply_filter()
+
+    def _apply_filter(self) -> None:
+        """Filter ``venv_rows`` by the current query and update the table.
+
+        When the query extends the one already applied, only the rows that
+        matched before can still match, so the previous result is narrowed
+        instead of rescanning every row.
+        """
+        if self._search_timer is not None:
+            self._search_timer.stop()
+            self._search_timer = None
         query = self._filter_query.lower()
-        for i, row in enumerate(self.venv_rows):
-            if query and query not in row["path"].lower():
-                continue
-            self._venv_display_indices.append(i)
-            env = row["environment"]
-            type_label = ("\u26a0\ufe0f " if env.is_system_critical else "") + row[
-                "type"
+        if not query:
+            self._venv_display_indices = list(range(len(self.venv_rows)))
+        else:
+            candidates: Iterable[int] = range(len(self.venv_rows))
+            if self._applied_query and query.startswith(self._applied_query):
+                candidates = self._venv_display_indices
+            self._venv_display_indices = [
+                i for i in candidates if query in self.venv_rows[i]["path_key"]
             ]
-            table.add_row(
-                _shorten_path_for_table(row["path"]),
-                type_label,
-                row["last_modified"],
-                row["size"],
-                row["size_human"],
-                _health_text(row["health"]),
-                self._compute_row_status(row),
-            )
+        self._applied_query = query
+        self.query_one("#venv-table", VirtualTable).row_count = len(
+            self._venv_display_indices
+        )
+
+    def _matches_filter(self, row: VenvRow) -> bool:
+        return self._applied_query in row["path_key"]
+
+    def _venv_cells(self, display_row: int) -> list[CellType]:
+        """Return the cells of *display_row* for the virtual venv table."""
+        resolved = self._resolve_venv_row(display_row)
+        if resolved is None:
+            return []
+        _, row = resolved
+        env = row["environment"]
+        type_label = ("\u26a0\ufe0f " if env.is_system_critical else "") + row["type"]
+        return [
+            _shorten_path_for_table(row["path"]),
+            type_label,
+            row["last_modified"],
+            "…" if env.size_pending else row["size"],
+            row["size_human"],
+            "…" if env.size_pending else row["inodes"],
+            _health_text(row["health"]),
+            self._compute_row_status(row),
+        ]
 
     def render_pipx_table(self) -> None:
         table = self.query_one("#pipx-table", DataTable)
@@ -420,8 +600,8 @@ class TableApp(App):
 
     def _compute_row_status(self, row: VenvRow) -> str:
         """Return the status string to display, taking multi-select into account."""
-        if row["status"] == EnvStatus.DELETED.value:
-            return EnvStatus.DELETED.value
+        if row["status"] in _LOCKED_STATUSES:
+            return row["status"]
         if self._multi_select_mode and row["path"] in self._selected_venv_paths:
             return "\u25cf SELECTED"
         return row["status"]
@@ -459,42 +639,40 @@ class TableApp(App):
         return headers
 
     def sort_venv_rows(self, column_index: int, reverse: bool) -> None:
-        def date_key(value: str):
-            try:
-                return datetime.strptime(value, "%d/%m/%Y")
-            except ValueError:
-                return datetime.min
+        """Sort ``venv_rows`` in place by *column_index*, ties broken by path.
+
+        The stable second pass keeps equal rows in path order whatever the
+        direction.  The filtered view is re-ordered rather than filtered
+        again, so a query being typed keeps narrowing incrementally.
+        """
+        shown = None
+        if self._applied_query:
+            shown = {id(self.venv_rows[i]) for i in self._venv_display_indices}
+        if column_index != self.VENV_COL_PATH:
+            self.venv_rows.sort(key=itemgetter("path_key"))
+        self.venv_rows.sort(key=self._venv_sort_key(column_index), reverse=reverse)
+        if shown is not None:
+            self._venv_display_indices = [
+                i for i, row in enumerate(self.venv_rows) if id(row) in shown
+            ]
+        table = self.query_one("#venv-table", VirtualTable)
+        table.set_columns(*self.get_headers_for_table("venv-table"))
+        table.reload()
 
-        if column_index == self.VENV_COL_TYPE:
-            self.venv_rows.sort(key=lambda row: row["type"].lower(), reverse=reverse)
-        elif column_index == self.VENV_COL_LAST_MODIFIED:
-            self.venv_rows.sort(
-                key=lambda row: date_key(row["last_modified"]), reverse=reverse
-            )
-        elif column_index == self.VENV_COL_SIZE:
-            self.venv_rows.sort(key=lambda row: row["size"], reverse=reverse)
-        elif column_index == self.VENV_COL_SIZE_HUMAN:
-            self.venv_rows.sort(
-                key=lambda row: row["size_human"].lower(), reverse=reverse
-            )
-        elif column_index == self.VENV_COL_HEALTH:
-            _order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "": 3}
-            self.venv_rows.sort(
-                key=lambda row: _order.get(row["health"], 3), reverse=reverse
-            )
-        elif column_index == self.VENV_COL_STATUS:
-            self.venv_rows.sort(key=lambda row: row["status"].lower(), reverse=reverse)
-        else:
-            self.venv_rows.sort(key=lambda row: row["path"].lower(), reverse=reverse)
-        self.render_venv_table()
+    def _venv_sort_key(self, column_index: int) -> Callable[[VenvRow], Any]:
+        """Return the sort key of venv column *column_index*.
+
+        Keys are stored on the rows when they are added, so no per-row
+        parsing happens while sorting; the status column sorts by the text
+        it shows, a multi-select mark included.
+        """
+        if column_index == self.VENV_COL_STATUS:
+            return self._compute_row_status
+        return itemgetter(self._VENV_SORT_KEYS.get(column_index, "path_key"))
 
     def sort_pipx_rows(self, column_index: int, reverse: bool) -> None:
-        if column_index == self.PIPX_COL_SIZE:
+        if column_index in {self.PIPX_COL_SIZE, self.PIPX_COL_SIZE_HUMAN}:
             self.pipx_rows.sort(key=lambda row: row["size"], reverse=reverse)
-        elif column_index == self.PIPX_COL_SIZE_HUMAN:
-            self.pipx_rows.sort(
-                key=lambda row: row["size_human"].lower(), reverse=reverse
-            )
         elif column_index == self.PIPX_COL_STATUS:
             self.pipx_rows.sort(key=lambda row: row["status"].lower(), reverse=reverse)
         else:
@@ -502,15 +680,16 @@ class TableApp(App):
         self.render_pipx_table()
 
     def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
-        table_id = event.data_table.id
-        if table_id not in {"venv-table", "pipx-table"}:
-            return
+        if event.data_table.id == "pipx-table":
+            self._sort_by_header("pipx-table", event.column_index)
 
-        column_index = getattr(event, "column_index", None)
-        if column_index is None and hasattr(event, "column"):
-            column_index = getattr(event.column, "index", None)
-        if column_index is None:
-            column_index = 0
+    def on_virtual_table_header_selected(
+        self, event: VirtualTable.HeaderSelected
+    ) -> None:
+        if event.virtual_table.id == "venv-table":
+            self._sort_by_header("venv-table", event.column_index)
+
+    def _sort_by_header(self, table_id: str, column_index: int) -> None:
         previous_sort = self.sort_state.get(table_id)
         reverse = False
         if previous_sort and previous_sort[0] == column_index:
@@ -537,6 +716,12 @@ class TableApp(App):
         loading_display = self.query_one("#loading-display", Static)
         status_label = self.query_one("#status-label", Label)
         self.setup_tables()
+        if await self._load_from_daemon() or await self._await_concurrent_scan():
+            return
+
+        snapshot = self._load_snapshot()
+        if snapshot is not None:
+            self._show_snapshot(snapshot)
 
         self._scan_counts = (0, 0, 0, 0)
         loading_display.display = True
@@ -550,11 +735,13 @@ class TableApp(App):
         venv_count = 0
         pipx_count = 0
         seen_venv_paths: set[Path] = set()
+        refreshed = 0
 
-        async for _detector, environments in self.scanner.scan_async(self.root_dir):
+        async for _detector, environments in self.scanner.scan_async(
+            self.root_dir, defer_sizing=True
+        ):
             for environment in environments:
                 if environment.type == "pipx":
-                    self.add_pipx_environment(environment)
                     pipx_count += 1
                 else:
                     try:
@@ -564,19 +751,360 @@ class TableApp(App):
                     if resolved_path in seen_venv_paths:
                         continue
                     seen_venv_paths.add(resolved_path)
-                    self.add_venv_environment(environment)
                     venv_count += 1
+                refreshed += self._place_scanned(environment)
             completed_tasks += 1
             self._scan_counts = (completed_tasks, total_tasks, venv_count, pipx_count)
 
         self._spinner_timer.stop()  # type: ignore[attr-defined]
         loading_display.display = False
-        status_label.update(
+        message = (
             f"Found {venv_count} virtual environments and {pipx_count} pipx packages"
         )
+        if snapshot is not None:
+            gone = self._drop_vanished_rows()
+            new = venv_count + pipx_count - refreshed
+            message += f" ({new} new, {gone} gone since the snapshot)"
+        status_label.update(message)
+        self._scan_complete = True
+        if self._sizing:
+            # Sizing can take far longer than the walk: do not keep another
+            # process waiting for a snapshot that is only saved afterwards.
+            self._release_scan_lock()
+        else:
+            await self._finish_scan()
+
+    async def _finish_scan(self) -> None:
+        """Record the scan and score it once every row has its size."""
         self._record_scan()
+        self._save_snapshot()
         await self._compute_health_scores()
 
+    async def _load_from_daemon(self) -> bool:
+        """Fill the tables from a running ``killpy serve``, instead of scanning."""
+        if self.scanner.options:
+            return False  # the daemon's index follows its own options
+        envs = await asyncio.to_thread(query_daemon, self.root_dir)
+        if envs is None:
+            return False
+        envs = filter_envs(envs, tuple(self.scanner.types), None)
+        excluded = self.scanner.excluded
+        envs = [e for e in envs if not any(p in str(e.path) for p in excluded)]
+        await self._show_result(envs, "answered by the killpy daemon")
+        return True
+
+    async def _await_concurrent_scan(self) -> bool:
+        """Take this scan's lock; if another process holds it, reuse its result.
+
+        Returns ``True`` when the tables were filled from the other scan.
+        """
+        lock = self.snapshots.lock(
+            self.root_dir,
+            self.scanner.types,
+            self.scanner.excluded,
+            options=self.scanner.options,
+        )
+        if lock.acquire(blocking=False):
+            self._scan_lock = lock
+            return False
+        requested_at = datetime.now(tz=timezone.utc)
+        self.query_one("#status-label", Label).update(
+            "Another killpy process is scanning this path; waiting for its result…"
+        )
+        # Polled rather than blocking in a thread, so quitting is not held up.
+        while not lock.acquire(blocking=False):
+            await asyncio.sleep(0.2)
+        snapshot = self.snapshots.load(
+            self.root_dir,
+            self.scanner.types,
+            self.scanner.excluded,
+            options=self.scanner.options,
+        )
+        if snapshot is None or snapshot.taken_at < requested_at:
+            self._scan_lock = lock  # it saved nothing: scan after all
+            return False
+        lock.release()
+        await self._show_result(snapshot.envs, "from a concurrent scan")
+        return True
+
+    async def _show_result(self, envs: list[Environment], source: str) -> None:
+        """Fill the tables with a finished result obtained without scanning."""
+        for environment in envs:
+            if environment.type == "pipx":
+                self.add_pipx_environment(environment)
+            else:
+                self.add_venv_environment(environment)
+        self.query_one("#status-label", Label).update(
+            f"Found {len(self.venv_rows)} virtual environments and "
+            f"{len(self.pipx_rows)} pipx packages ({source})"
+        )
+        self._scan_complete = True
+        await self._finish_scan()
+
+    # ------------------------------------------------------------------ #
+    #  Snapshots (--cached)                                                #
+    # ------------------------------------------------------------------ #
+
+    def _load_snapshot(self) -> Snapshot | None:
+        """Return the snapshot to show while scanning, if --cached found one."""
+        if self._cached_max_age is None:
+            return None
+        snapshot = self.snapshots.load(
+            self.root_dir,
+            self.scanner.types,
+            self.scanner.excluded,
+            options=self.scanner.options,
+        )
+        if snapshot is None or not snapshot.is_fresh(self._cached_max_age):
+            return None
+        return snapshot
+
+    def _show_snapshot(self, snapshot: Snapshot) -> None:
+        """Fill the tables from *snapshot*; the rescan then reconciles them."""
+        for environment in snapshot.envs:
+            if environment.type == "pipx":
+                self.add_pipx_environment(environment)
+                self._snapshot_rows[str(environment.path)] = self.pipx_rows[-1]
+            else:
+                row = self.add_venv_environment(environment)
+                self._snapshot_rows[str(environment.path)] = row
+        age = format_duration(snapshot.age.total_seconds())
+        self.query_one("#status-label", Label).update(
+            f"Showing the scan from {age} ago; rescanning…"
+        )
+
+    def _place_scanned(self, environment: Environment) -> bool:
+        """Show a scanned environment; return ``True`` if it was in the snapshot."""
+        if self._refresh_snapshot_row(environment):
+            return True
+        if environment.type == "pipx":
+            self.add_pipx_environment(environment)
+        else:
+            self.add_venv_environment(environment)
+        return False
+
+    def _refresh_snapshot_row(self, environment: Environment) -> bool:
+        """Update the snapshot row for *environment*, if there is one.
+
+        The row keeps its place, status and selection; a deferred size keeps
+        showing the snapshot's figure until the new one is measured.
+        """
+        row = self._snapshot_rows.pop(str(environment.path), None)
+        if row is None:
+            return False
+        if row["status"] in _LOCKED_STATUSES:
+            return True  # being deleted: leave it alone
+        row["environment"] = environment
+        if environment.type == "pipx":
+            row["size"] = environment.size_for(self.size_mode)
+            row["size_human"] = format_size(row["size"])
+            return True
+        venv_row = cast(VenvRow, row)
+        venv_row["last_modified"] = environment.last_modified_str
+        venv_row["mtime"] = environment.last_modified.timestamp()
+        if environment.size_pending:
+            self._unsized[venv_row["path"]] = venv_row
+            self._start_sizing()
+        else:
+            venv_row["size"] = environment.size_for(self.size_mode)
+            venv_row["size_human"] = format_size(venv_row["size"])
+            venv_row["inodes"] = environment.inode_count
+        return True
+
+    def _drop_vanished_rows(self) -> int:
+        """Remove the snapshot rows the rescan did not find; return how many."""
+        gone = {
+            path
+            for path, row in self._snapshot_rows.items()
+            if row["status"] not in _LOCKED_STATUSES
+        }
+        self._snapshot_rows = {}
+        self.venv_rows = [row for row in self.venv_rows if row["path"] not in gone]
+        self.pipx_rows = [
+            row for row in self.pipx_rows if str(row["environment"].path) not in gone
+        ]
+        self._selected_venv_paths -= gone
+        for path in gone:
+            self._unsized.pop(path, None)
+        self.render_venv_table()
+        self.render_pipx_table()
+        return len(gone)
+
+    def _save_snapshot(self) -> None:
+        """Store this scan for the next ``--cached`` start, minus deleted rows."""
+        rows: list[VenvRow | PipxRow] = [*self.venv_rows, *self.pipx_rows]
+        envs = [
+            row["environment"]
+            for row in rows
+            if row["status"] != EnvStatus.DELETED.value
+        ]
+        self.snapshots.save(
+            self.root_dir,
+            envs,
+            self.scanner.types,
+            self.scanner.excluded,
+            options=self.scanner.options,
+        )
+        self._release_scan_lock()
+
+    def _release_scan_lock(self) -> None:
+        if self._scan_lock is not None:
+            self._scan_lock.release()
+            self._scan_lock = None
+
+    # ------------------------------------------------------------------ #
+    #  Background sizing                                                   #
+    # ------------------------------------------------------------------ #
+
+    def _start_sizing(self) -> None:
+        if self._unsized and not self._sizing:
+            self._sizing = True
+            self.run_worker(self._size_pending_rows(), group="sizing")
+
+    async def _size_pending_rows(self) -> None:
+        """Fill in deferred sizes on a small thread pool, visible rows first.
+
+        Rows on a network or FUSE mount already being sized by its share of
+        the workers wait, so a slow server does not hold up the local rows.
+        """
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(
+            max_workers=_SIZING_WORKERS, thread_name_prefix="killpy-size"
+        )
+        limiter = MountLimiter()
+        running: dict[asyncio.Future[DiskUsage], VenvRow] = {}
+        try:
+            while self._unsized or running:
+                while self._unsized and len(running) < _SIZING_WORKERS:
+                    row = self._next_row_to_size(limiter)
+                    if row is None:
+                        break  # every remaining row is on a busy mount
+                    path = row["environment"].path
+                    limiter.acquire(path)
+                    running[loop.run_in_executor(pool, get_disk_usage, path)] = row
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    row = running.pop(future)
+                    limiter.release(row["environment"].path)
+                    self._apply_size(row, future.result())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._sizing = False
+        self._resort_by_size()
+        if self._scan_complete:
+            await self._finish_scan()
+
+    def _next_row_to_size(self, limiter: MountLimiter) -> VenvRow | None:
+        """Pop the next unsized row: an on-screen one if any, else the oldest.
+
+        Rows *limiter* has no room for are passed over; ``None`` when that
+        is all of them.
+        """
+        table = self.query_one("#venv-table", VirtualTable)
+        top = round(table.scroll_y)
+        bottom = min(top + table.size.height, len(self._venv_display_indices))
+        for display_row in range(top, bottom):
+            path = self.venv_rows[self._venv_display_indices[display_row]]["path"]
+            if path in self._unsized and limiter.has_room(path):
+                return self._unsized.pop(path)
+        for path in self._unsized:
+            if limiter.has_room(path):
+                return self._unsized.pop(path)
+        return None
+
+    def _apply_size(self, row: VenvRow, usage: DiskUsage) -> None:
+        """Show a measured size: move *row* into place under a size sort."""
+        environment = row["environment"]
+        if not environment.size_pending:
+            return  # sized for a deletion in the meantime
+        order = self._size_order()
+        was = order(row) if order is not None else None
+        environment.usage = usage
+        environment.size_bytes = usage.apparent_bytes
+        environment.size_pending = False
+        row["size"] = usage.size(self.size_mode)
+        row["size_human"] = format_size(row["size"])
+        row["inodes"] = usage.inode_count
+        if order is None or was is None or not self._move_venv_row(row, was, order):
+            self._refresh_venv_row(row)
+
+    def _size_order(self) -> Callable[[VenvRow], tuple[int, str]] | None:
+        """The key ``venv_rows`` is in ascending order of under a size sort.
+
+        It is what :meth:`sort_venv_rows` produces: the size (negated when
+        descending), then the path.  ``None`` when no size column is sorted.
+        """
+        sort_info = self.sort_state.get("venv-table")
+        if not sort_info or sort_info[0] not in self._VENV_SIZE_COLUMNS:
+            return None
+        size = itemgetter(self._VENV_SORT_KEYS[sort_info[0]])
+        sign = -1 if sort_info[1] else 1
+        return lambda row: (sign * size(row), row["path_key"])
+
+    def _move_venv_row(
+        self,
+        row: VenvRow,
+        was: tuple[int, str],
+        order: Callable[[VenvRow], tuple[int, str]],
+    ) -> bool:
+        """Move *row*, which sorted as *was*, to its place by *order*.
+
+        Two bisections and a list move, instead of a full sort; the view
+        keeps its filter and only on-screen rows between the two places are
+        repainted.  Returns ``False`` if the row stayed put.
+        """
+        rows = self.venv_rows
+        old = bisect_left(rows, was, key=order)
+        if old >= len(rows) or rows[old] is not row:
+            # Out of order after all (equal path keys): find it the slow way.
+            old = next(i for i, other in enumerate(rows) if other is row)
+        del rows[old]
+        new = bisect_right(rows, order(row), key=order)
+        rows.insert(new, row)
+        if new == old:
+            return False
+        if not self._applied_query:
+            self._repaint_venv_rows(min(old, new), max(old, new))
+            return True
+        indices = self._venv_display_indices
+        shown = self._matches_filter(row)
+        old_display = bisect_left(indices, old)
+        if shown:
+            del indices[old_display]
+        if old < new:  # the rows in between move up a place
+            lo, hi, step = old + 1, new, -1
+        else:  # ...or down one
+            lo, hi, step = new, old - 1, 1
+        start, stop = bisect_left(indices, lo), bisect_right(indices, hi)
+        indices[start:stop] = [i + step for i in indices[start:stop]]
+        if not shown:
+            return True  # the rows shown kept their order
+        new_display = bisect_left(indices, new)
+        indices.insert(new_display, new)
+        self._repaint_venv_rows(
+            min(old_display, new_display), max(old_display, new_display)
+        )
+        return True
+
+    def _repaint_venv_rows(self, first: int, last: int) -> None:
+        """Repaint the on-screen display rows *first* to *last*, inclusive."""
+        table = self.query_one("#venv-table", VirtualTable)
+        for display_row in table.cached_rows:
+            if first <= display_row <= last:
+                table.refresh_row(display_row)
+
+    def _resort_by_size(self) -> None:
+        """Settle a size sort once sizing is done.
+
+        Rows are moved into place as their sizes arrive; this pass also
+        catches sizes changed by other means, such as a snapshot refresh.
+        """
+        sort_info = self.sort_state.get("venv-table")
+        if sort_info and sort_info[0] in self._VENV_SIZE_COLUMNS:
+            self.sort_venv_rows(*sort_info)
+
     def _record_scan(self) -> None:
         """Persist this scan session so ``killpy stats --history`` reflects it."""
         try:
@@ -601,13 +1129,15 @@ class TableApp(App):
             return
         envs = [row["environment"] for row in self.venv_rows]
         scored = await asyncio.to_thread(lambda: score_all(envs, run_git=False))
+        self._scored_by_path = {str(se.env.path): se for se in scored}
         engine = SuggestionEngine()
         suggestions = engine.classify_all(scored)
         for suggestion in suggestions:
             self._health_by_path[str(suggestion.env_path)] = suggestion.category
         for row in self.venv_rows:
             row["health"] = self._health_by_path.get(row["path"], "")
-        self.render_venv_table()
+            row["health_rank"] = _HEALTH_RANK.get(row["health"], _NO_HEALTH_RANK)
+        self.query_one("#venv-table", VirtualTable).reload()
 
     def _show_bytes_released(self) -> None:
         """Update the status label with the running total of freed space."""
@@ -622,24 +1152,24 @@ class TableApp(App):
         self.bell()
 
     def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
-        selected_path_label = self.query_one("#selected-path-label", Label)
-        if event.data_table.id != "venv-table":
-            selected_path_label.update("")
-            return
-
-        row_index = event.cursor_row
-        if row_index is None:
-            selected_path_label.update("")
-            return
+        self.query_one("#selected-path-label", Label).update("")
 
-        resolved = self._resolve_venv_row(row_index)
+    def on_virtual_table_row_highlighted(
+        self, event: VirtualTable.RowHighlighted
+    ) -> None:
+        selected_path_label = self.query_one("#selected-path-label", Label)
+        resolved = self._resolve_venv_row(event.cursor_row)
         if resolved:
             _, row = resolved
-            selected_path_label.update(f"Selected: {row['path']}")
+            reason = self._plan_reasons.get(row["path"])
+            selected_path_label.update(
+                f"Selected: {row['path']}" + (f" — why: {reason}" if reason else "")
+            )
+        else:
+            selected_path_label.update("")
 
     @_is_venv_tab
     def action_confirm_delete(self):
-        freed_now = 0
         if self._multi_select_mode and self._selected_venv_paths:
             # Multi-select mode: delete all selected rows.  Selection is
             # tracked by path (not by list position) so it stays valid even
@@ -647,137 +1177,209 @@ class TableApp(App):
             for row in self.venv_rows:
                 if row["path"] not in self._selected_venv_paths:
                     continue
-                if row["status"] == EnvStatus.DELETED.value:
+                if row["status"] in _LOCKED_STATUSES:
                     continue
-                if self.delete_environment(row["environment"]):
-                    freed_now += int(row["size"])
-                    self.bytes_release += int(row["size"])
-                    row["status"] = EnvStatus.DELETED.value
+                self._enqueue_deletion(row)
             self._selected_venv_paths.clear()
+            self._update_multi_select_label()
         else:
             # Normal mode: delete all rows marked for deletion
             for row in self.venv_rows:
-                if row["status"] != EnvStatus.MARKED_TO_DELETE.value:
-                    continue
-                if self.delete_environment(row["environment"]):
-                    freed_now += int(row["size"])
-                    self.bytes_release += int(row["size"])
-                    row["status"] = EnvStatus.DELETED.value
-
-        self._record_deletion(freed_now)
-        self.render_venv_table()
-        self._show_bytes_released()
-        self.bell()
+                if row["status"] == EnvStatus.MARKED_TO_DELETE.value:
+                    self._enqueue_deletion(row)
+        self._start_deletions()
 
     @_is_venv_tab
     def action_mark_for_delete(self):
-        table = self.query_one("#venv-table", DataTable)
-
-        cursor_cell = table.cursor_coordinate
-        if cursor_cell:
-            resolved = self._resolve_venv_row(cursor_cell.row)
-            if not resolved:
-                return
-            data_index, row = resolved
-            current_status = row["status"]
-            if current_status == EnvStatus.DELETED.value:
-                return
-            elif current_status == EnvStatus.MARKED_TO_DELETE.value:
-                row["status"] = ""
-                table.update_cell_at((cursor_cell.row, self.VENV_COL_STATUS), "")
-            else:
-                row["status"] = EnvStatus.MARKED_TO_DELETE.value
-                table.update_cell_at(
-                    (cursor_cell.row, self.VENV_COL_STATUS),
-                    EnvStatus.MARKED_TO_DELETE.value,
-                )
+        table = self.query_one("#venv-table", VirtualTable)
+        resolved = self._resolve_venv_row(table.cursor_row)
+        if not resolved:
+            return
+        _, row = resolved
+        current_status = row["status"]
+        if current_status == EnvStatus.QUEUED.value:
+            # Not started yet: take it back out of the queue.
+            self._unqueue_deletion(row)
+            row["status"] = ""
+        elif current_status in _LOCKED_STATUSES:
+            return
+        elif current_status == EnvStatus.MARKED_TO_DELETE.value:
+            row["status"] = ""
+        else:
+            row["status"] = EnvStatus.MARKED_TO_DELETE.value
+        table.refresh_row(table.cursor_row)
 
     @_is_venv_tab
     def action_delete_now(self):
-        table = self.query_one("#venv-table", DataTable)
-        cursor_cell = table.cursor_coordinate
-        if cursor_cell:
-            resolved = self._resolve_venv_row(cursor_cell.row)
-            if not resolved:
-                return
-            data_index, row = resolved
-            if row["status"] == EnvStatus.DELETED.value:
-                return
-            if self.delete_environment(row["environment"]):
-                self.bytes_release += int(row["size"])
-                self._record_deletion(int(row["size"]))
-                row["status"] = EnvStatus.DELETED.value
-                table.update_cell_at(
-                    (cursor_cell.row, self.VENV_COL_STATUS),
-                    EnvStatus.DELETED.value,
-                )
-                self._show_bytes_released()
-        self.bell()
+        table = self.query_one("#venv-table", VirtualTable)
+        resolved = self._resolve_venv_row(table.cursor_row)
+        if not resolved:
+            return
+        _, row = resolved
+        if row["status"] in _LOCKED_STATUSES:
+            return
+        if self._enqueue_deletion(row):
+            self._start_deletions()
 
-    def delete_environment(self, environment: Environment) -> bool:
-        # Shared helper — no tab gating here: it is called from both the
-        # venv tab (delete actions) and the pipx tab (uninstall action).
+    @_is_pipx_tab
+    def action_uninstall_pipx(self):
+        table = self.query_one("#pipx-table", DataTable)
+        if not 0 <= table.cursor_row < len(self.pipx_rows):
+            return
+        row = self.pipx_rows[table.cursor_row]
+        if row["status"] in _LOCKED_STATUSES:
+            return
+        if self._enqueue_deletion(row):
+            self._start_deletions()
+
+    def action_cancel_deletions(self) -> None:
+        """Drop every queued deletion that has not started yet (C key)."""
+        cancelled = list(self._delete_queue)
+        self._delete_queue.clear()
+        for row in cancelled:
+            row["status"] = ""
+            self._refresh_status(row)
+        if cancelled:
+            self.query_one("#status-label", Label).update(
+                f"Cancelled {len(cancelled)} queued deletion(s)"
+            )
+
+    # ------------------------------------------------------------------ #
+    #  Deletion queue                                                      #
+    # ------------------------------------------------------------------ #
+
+    def _can_delete(self, environment: Environment) -> bool:
+        # Shared check — no tab gating here: it is used from both the venv
+        # tab (delete actions) and the pipx tab (uninstall action).
         if environment.is_system_critical:
             self.query_one("#status-label", Label).update(
                 f"⚠️ Not deleted — currently in use: {environment.path}"
             )
             return False
-        try:
-            self.cleaner.delete(environment)
-            return True
-        except CleanerError as error:
-            self.query_one("#status-label", Label).update(str(error))
-            return False
+        return True
 
-    @_is_pipx_tab
-    def action_uninstall_pipx(self):
-        table = self.query_one("#pipx-table", DataTable)
-        cursor_cell = table.cursor_coordinate
-        if cursor_cell:
-            row = self.pipx_rows[cursor_cell.row]
-            if row["status"] == EnvStatus.DELETED.value:
+    def _enqueue_deletion(self, row: VenvRow | PipxRow) -> bool:
+        """Queue *row* for the background deletion worker."""
+        if not self._can_delete(row["environment"]):
+            return False
+        # An unsized row is sized by the deletion itself.
+        self._unsized.pop(str(row["environment"].path), None)
+        row["status"] = EnvStatus.QUEUED.value
+        self._delete_queue.append(row)
+        self._refresh_status(row)
+        return True
+
+    def _unqueue_deletion(self, row: VenvRow | PipxRow) -> None:
+        """Take *row* itself out of the queue.
+
+        By identity: ``deque.remove`` compares rows as dicts, and two rows
+        for equal environments would be mistaken for one another.
+        """
+        for index, queued in enumerate(self._delete_queue):
+            if queued is row:
+                del self._delete_queue[index]
                 return
-            if self.delete_environment(row["environment"]):
-                row["status"] = EnvStatus.DELETED.value
-                table.update_cell_at((cursor_cell.row, 3), EnvStatus.DELETED.value)
-                self.bytes_release += int(row["size"])
-                self._record_deletion(int(row["size"]))
-                self._show_bytes_released()
 
+    def _start_deletions(self) -> None:
+        if self._delete_queue and not self._draining:
+            self._draining = True
+            self.run_worker(self._drain_delete_queue(), group="delete")
+
+    async def _drain_delete_queue(self) -> None:
+        """Delete queued rows one at a time off the event loop.
+
+        The UI stays interactive meanwhile: rows can still be navigated,
+        filtered, queued or cancelled.  Freed space is recorded in the
+        history once, when the queue is empty.
+        """
+        started = time.monotonic()
+        freed_total = 0
+        deleted = 0
+        try:
+            while self._delete_queue:
+                row = self._delete_queue.popleft()
+                row["status"] = EnvStatus.DELETING.value
+                self._refresh_status(row)
+                try:
+                    freed = await asyncio.to_thread(
+                        _size_then_delete, self.cleaner, row["environment"]
+                    )
+                except CleanerError as error:
+                    row["status"] = ""
+                    self.query_one("#status-label", Label).update(str(error))
+                else:
+                    row["status"] = EnvStatus.DELETED.value
+                    row["size"] = row["environment"].size_for(self.size_mode)
+                    row["size_human"] = format_size(row["size"])
+                    if "inodes" in row:  # venv rows only
+                        cast(VenvRow, row)["inodes"] = row["environment"].inode_count
+                    deleted += 1
+                    freed_total += freed
+                    self.bytes_release += freed
+                    self._show_deletion_progress(deleted, freed_total, started)
+                self._refresh_status(row)
+        finally:
+            self._draining = False
+        self._record_deletion(freed_total)
+        if deleted:
+            self._show_bytes_released()
         self.bell()
 
+    def _show_deletion_progress(self, deleted: int, freed: int, started: float) -> None:
+        elapsed = max(time.monotonic() - started, 1e-3)
+        self.query_one("#status-label", Label).update(
+            f"Deleting… {deleted} done, {len(self._delete_queue)} queued — "
+            f"{format_size(freed)} freed ({format_size(int(freed / elapsed))}/s)"
+        )
+
+    def _refresh_status(self, row: VenvRow | PipxRow) -> None:
+        """Repaint the status cell of *row* in whichever table shows it.
+
+        In the virtual venv table only a cached line can show *row*; that
+        line alone is re-fetched and repainted.
+        """
+        for index, pipx_row in enumerate(self.pipx_rows):
+            if pipx_row is row:
+                self.query_one("#pipx-table", DataTable).update_cell_at(
+                    Coordinate(index, self.PIPX_COL_STATUS), row["status"]
+                )
+                return
+        self._refresh_venv_row(cast(VenvRow, row))
+
+    def _refresh_venv_row(self, row: VenvRow) -> None:
+        """Repaint *row* if it is on screen in the venv table."""
+        table = self.query_one("#venv-table", VirtualTable)
+        for display_row in table.cached_rows:
+            resolved = self._resolve_venv_row(display_row)
+            if resolved is not None and resolved[1] is row:
+                table.refresh_row(display_row)
+                return
+
     # ------------------------------------------------------------------ #
     #  New actions: navigation, search, open folder, multi-select         #
     # ------------------------------------------------------------------ #
 
-    def action_cursor_down_active(self) -> None:
-        """Move cursor down in the currently focused DataTable (j key)."""
+    def _active_table(self) -> DataTable | VirtualTable:
         focused = self.focused
-        if isinstance(focused, DataTable):
-            focused.action_cursor_down()
-        else:
-            active = self.query_one(TabbedContent).active
-            tid = "#venv-table" if active == "venv-tab" else "#pipx-table"
-            self.query_one(tid, DataTable).action_cursor_down()
+        if isinstance(focused, (DataTable, VirtualTable)):
+            return focused
+        if self.query_one(TabbedContent).active == "venv-tab":
+            return self.query_one("#venv-table", VirtualTable)
+        return self.query_one("#pipx-table", DataTable)
+
+    def action_cursor_down_active(self) -> None:
+        """Move cursor down in the focused or active table (j key)."""
+        self._active_table().action_cursor_down()
 
     def action_cursor_up_active(self) -> None:
-        """Move cursor up in the currently focused DataTable (k key)."""
-        focused = self.focused
-        if isinstance(focused, DataTable):
-            focused.action_cursor_up()
-        else:
-            active = self.query_one(TabbedContent).active
-            tid = "#venv-table" if active == "venv-tab" else "#pipx-table"
-            self.query_one(tid, DataTable).action_cursor_up()
+        """Move cursor up in the focused or active table (k key)."""
+        self._active_table().action_cursor_up()
 
     @_is_venv_tab
     def action_open_folder(self) -> None:
         """Open the parent directory of the selected environment in the OS file manager."""  # noqa: E501
-        table = self.query_one("#venv-table", DataTable)
-        cursor_cell = table.cursor_coordinate
-        if not cursor_cell:
-            return
-        resolved = self._resolve_venv_row(cursor_cell.row)
+        table = self.query_one("#venv-table", VirtualTable)
+        resolved = self._resolve_venv_row(table.cursor_row)
         if not resolved:
             return
         _, row = resolved
@@ -801,61 +1403,124 @@ class TableApp(App):
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id == "search-input":
             self._filter_query = event.value
-            self.render_venv_table()
+            if self._search_timer is not None:
+                self._search_timer.stop()
+            self._search_timer = self.set_timer(
+                _SEARCH_DEBOUNCE_SECONDS, self._apply_filter
+            )
+
+    @_is_venv_tab
+    def action_start_free(self) -> None:
+        """Show the free-space target input and focus it (F key)."""
+        free_input = self.query_one("#free-input", Input)
+        free_input.add_class("visible")
+        free_input.focus()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
-        if event.input.id == "search-input":
+        if event.input.id == "free-input":
+            event.input.remove_class("visible")
+            self.query_one("#venv-table", VirtualTable).focus()
+            try:
+                target = parse_size(event.value)
+            except ValueError:
+                self.query_one("#status-label", Label).update(
+                    f"{event.value!r} is not a size such as 20GB or 500M"
+                )
+                return
+            event.input.value = ""
+            self.run_worker(self._mark_plan(target), group="plan")
+        elif event.input.id == "search-input":
             if not event.value:
                 self._filter_query = ""
                 event.input.remove_class("visible")
-            self.query_one("#venv-table", DataTable).focus()
+            self._apply_filter()
+            self.query_one("#venv-table", VirtualTable).focus()
 
     def on_key(self, event) -> None:  # type: ignore[override]
         """Handle Escape to clear and close the search bar."""
         if event.key == "escape":
+            free_input = self.query_one("#free-input", Input)
+            if "visible" in free_input.classes:
+                free_input.value = ""
+                free_input.remove_class("visible")
+                self.query_one("#venv-table", VirtualTable).focus()
+                event.stop()
+                return
             search_input = self.query_one("#search-input", Input)
             if "visible" in search_input.classes:
                 self._filter_query = ""
                 search_input.value = ""
                 search_input.remove_class("visible")
-                self.render_venv_table()
+                self._apply_filter()
                 active = self.query_one(TabbedContent).active
                 tid = "#venv-table" if active == "venv-tab" else "#pipx-table"
-                self.query_one(tid, DataTable).focus()
+                self.query_one(tid).focus()
                 event.stop()
 
+    async def _mark_plan(self, target: int) -> None:
+        """Mark the rows :func:`~killpy.intelligence.plan_to_free` picks for *target*.
+
+        Only sized rows that are not already marked, queued or deleted are
+        candidates.  Rows without a health score yet are scored first.
+        """
+        rows = {
+            row["path"]: row
+            for row in self.venv_rows
+            if not row["status"] and not row["environment"].size_pending
+        }
+        unscored = [
+            row["environment"]
+            for path, row in rows.items()
+            if path not in self._scored_by_path
+        ]
+        if unscored:
+            scored = await asyncio.to_thread(lambda: score_all(unscored, run_git=False))
+            self._scored_by_path.update({str(se.env.path): se for se in scored})
+        plan = plan_to_free(
+            [self._scored_by_path[path] for path in rows],
+            target,
+            size_mode=self.size_mode,
+        )
+        for item in plan.items:
+            path = str(item.env.path)
+            rows[path]["status"] = EnvStatus.MARKED_TO_DELETE.value
+            self._plan_reasons[path] = item.reason
+        self.query_one("#venv-table", VirtualTable).reload()
+        freed, wanted = format_size(plan.freed_bytes), format_size(target)
+        self.query_one("#status-label", Label).update(
+            f"Marked {len(plan.items)} environment(s) freeing {freed} "
+            f"(target {wanted}) — Ctrl+D deletes them"
+            if plan.reached
+            else f"Only {freed} can be freed (target {wanted}); "
+            f"marked {len(plan.items)} environment(s)"
+        )
+
     def action_toggle_multi_select(self) -> None:
         """Toggle multi-select mode on/off (T key)."""
         self._multi_select_mode = not self._multi_select_mode
         if not self._multi_select_mode:
             self._selected_venv_paths.clear()
         self._update_multi_select_label()
-        self.render_venv_table()
+        self.query_one("#venv-table", VirtualTable).reload()
 
     @_is_venv_tab
     def action_multi_select_toggle_row(self) -> None:
         """Toggle current row selection in multi-select mode (Space key)."""
         if not self._multi_select_mode:
             return
-        table = self.query_one("#venv-table", DataTable)
-        cursor_cell = table.cursor_coordinate
-        if not cursor_cell:
-            return
-        resolved = self._resolve_venv_row(cursor_cell.row)
+        table = self.query_one("#venv-table", VirtualTable)
+        resolved = self._resolve_venv_row(table.cursor_row)
         if not resolved:
             return
         _, row = resolved
-        if row["status"] == EnvStatus.DELETED.value:
+        if row["status"] in _LOCKED_STATUSES:
             return
         if row["path"] in self._selected_venv_paths:
             self._selected_venv_paths.discard(row["path"])
         else:
             self._selected_venv_paths.add(row["path"])
         self._update_multi_select_label()
-        table.update_cell_at(
-            Coordinate(cursor_cell.row, self.VENV_COL_STATUS),
-            self._compute_row_status(row),
-        )
+        table.refresh_row(table.cursor_row)
 
     @_is_venv_tab
     def action_multi_select_all(self) -> None:
@@ -865,11 +1530,11 @@ class TableApp(App):
         non_deleted = {
             self.venv_rows[i]["path"]
             for i in self._venv_display_indices
-            if self.venv_rows[i]["status"] != EnvStatus.DELETED.value
+            if self.venv_rows[i]["status"] not in _LOCKED_STATUSES
         }
         if non_deleted == self._selected_venv_paths:
             self._selected_venv_paths.clear()
         else:
             self._selected_venv_paths = non_deleted
         self._update_multi_select_label()
-        self.render_venv_table()
+        self.query_one("#venv-table", VirtualTable).reload()
@@ -2,11 +2,34 @@
 
 from __future__ import annotations
 
+import re
+import subprocess
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from rich.console import Console
+import click
 
+from killpy.daemon import query_daemon
+from killpy.detectors.base import AbstractDetector
+from killpy.files import SIZE_MODES, SizeMode, get_reclaimable_size, parse_size
+from killpy.journal import DeletionJournal
 from killpy.models import Environment
+from killpy.mounts import DEFAULT_SKIPPED_FSTYPES
+from killpy.mounts import configure as configure_mounts
+from killpy.mounts import get_policy as get_mount_policy
+from killpy.scanner import Scanner
+from killpy.snapshots import SnapshotStore
+from killpy.throttle import enable_gentle, get_throttle
+from killpy.users import LocalUser, local_users
+
+if TYPE_CHECKING:
+    # Imported where output is printed: rich costs start-up time that
+    # ``list --json`` and ``--help`` have no use for.
+    from rich.console import Console
 
 # Maps user-facing type names (detector names) to the concrete ``Environment.type``
 # values those detectors produce.  Two detectors use sub-type tags instead of
@@ -29,6 +52,408 @@ _TYPE_ALIASES: dict[str, frozenset[str]] = {
 }
 
 
+class ByteSize(click.ParamType):
+    """Click parameter type for sizes such as ``20GB`` or ``500M`` (in bytes)."""
+
+    name = "size"
+
+    def convert(self, value, param, ctx) -> int:
+        if isinstance(value, int):
+            return value
+        try:
+            return parse_size(value)
+        except ValueError:
+            self.fail(f"{value!r} is not a size such as 20GB or 500M", param, ctx)
+
+
+_DURATION_RE = re.compile(r"\s*(?:(\d+(?:\.\d*)?)\s*([hms]?)\s*)", re.IGNORECASE)
+_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1, "": 1}
+
+
+def parse_duration(text: str) -> float:
+    """Parse a duration such as ``"10m"``, ``"1h30m"``, ``"90s"`` or ``"45"``.
+
+    Returns seconds; a bare number is in seconds.
+
+    Raises
+    ------
+    ValueError
+        If *text* is not a duration.
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("Empty duration")
+    seconds = 0.0
+    pos = 0
+    while pos < len(text):
+        match = _DURATION_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ValueError(f"Not a duration: {text!r}")
+        number, unit = match.groups()
+        seconds += float(number) * _DURATION_UNITS[unit.lower()]
+        pos = match.end()
+    return seconds
+
+
+def format_duration(seconds: float) -> str:
+    """Format *seconds* compactly, e.g. ``"45s"``, ``"9m50s"`` or ``"1h30m"``."""
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    parts = [f"{n}{unit}" for n, unit in ((hours, "h"), (minutes, "m")) if n]
+    if secs or not parts:
+        parts.append(f"{secs}s")
+    return "".join(parts)
+
+
+class Duration(click.ParamType):
+    """Click parameter type for durations such as ``10m`` or ``1h30m`` (seconds)."""
+
+    name = "duration"
+
+    def convert(self, value, param, ctx) -> float:
+        if isinstance(value, (int, float)):
+            return float(value)
+        try:
+            return parse_duration(value)
+        except ValueError:
+            self.fail(f"{value!r} is not a duration such as 10m or 1h30m", param, ctx)
+
+
+def _enable_gentle(_ctx: click.Context, _param: click.Parameter, value: bool) -> None:
+    if value:
+        enable_gentle()
+
+
+#: ``--gentle`` option shared by the commands that scan or delete.  It takes
+#: effect while the command line is parsed, before any filesystem work.
+gentle_option = click.option(
+    "--gentle",
+    is_flag=True,
+    default=False,
+    expose_value=False,
+    callback=_enable_gentle,
+    help=(
+        "Low-impact mode for busy hosts: idle I/O priority, and rate-limited "
+        "directory reads, stats and unlinks that back off as the disk slows."
+    ),
+)
+
+
+def _stay_on_one_file_system(
+    _ctx: click.Context, _param: click.Parameter, value: bool
+) -> None:
+    if value:
+        configure_mounts(one_file_system=True)
+
+
+def _skip_fs_types(
+    _ctx: click.Context, _param: click.Parameter, value: tuple[str, ...]
+) -> None:
+    if value:
+        configure_mounts(skip_types=value)
+
+
+#: ``--one-file-system`` option shared by the commands that walk trees.
+one_file_system_option = click.option(
+    "--one-file-system",
+    is_flag=True,
+    default=False,
+    expose_value=False,
+    callback=_stay_on_one_file_system,
+    help="Do not descend into directories on other filesystems than the root's.",
+)
+
+#: Repeatable ``--skip-fs-type`` option, added to the built-in skip list.
+skip_fs_type_option = click.option(
+    "--skip-fs-type",
+    multiple=True,
+    metavar="TYPE",
+    expose_value=False,
+    callback=_skip_fs_types,
+    help=(
+        "Never descend into mounts of this filesystem type (e.g. nfs4, or "
+        "fuse for every FUSE type), in addition to proc, sysfs, autofs and "
+        "the other virtual filesystems. Repeatable."
+    ),
+)
+
+
+def mount_options(func: Callable) -> Callable:
+    """Apply ``--one-file-system`` and ``--skip-fs-type`` to a command."""
+    return one_file_system_option(skip_fs_type_option(func))
+
+
+#: Repeatable ``--path`` option shared by the commands that scan.
+paths_option = click.option(
+    "--path",
+    "paths",
+    multiple=True,
+    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
+    help="Root directory to scan (repeatable; default: the current directory).",
+)
+
+#: ``--system`` option shared by the commands that scan.
+system_option = click.option(
+    "--system",
+    is_flag=True,
+    default=False,
+    help=(
+        "Also scan the home directory of every local user, with that user's "
+        "own tool directories (pip cache, Poetry, pyenv…)."
+    ),
+)
+
+#: ``--size-mode`` option shared by the commands that report sizes.
+size_mode_option = click.option(
+    "--size-mode",
+    type=click.Choice(SIZE_MODES),
+    default="apparent",
+    show_default=True,
+    help=("Report apparent file sizes, or the blocks allocated on disk (matches du)."),
+)
+
+#: ``--sort`` option shared by the commands that list environments.
+sort_option = click.option(
+    "--sort",
+    "sort_by",
+    type=click.Choice(["size", "inodes"]),
+    default=None,
+    help="Order environments largest first, by size or by inode (file) count.",
+)
+
+
+#: ``--cached`` option shared by the commands that scan.
+cached_option = click.option(
+    "--cached",
+    is_flag=True,
+    default=False,
+    help=(
+        "Show the last scan of PATH at once when it is younger than --max-age, "
+        "and refresh it in the background."
+    ),
+)
+
+#: ``--max-age`` option that goes with ``--cached``.
+max_age_option = click.option(
+    "--max-age",
+    type=Duration(),
+    default="1h",
+    show_default=True,
+    metavar="DURATION",
+    help="With --cached: the oldest snapshot to show; older ones mean a new scan.",
+)
+
+#: ``--processes`` option shared by the commands that scan.
+processes_option = click.option(
+    "--processes",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    metavar="N",
+    help=(
+        "Walk the tree in N worker processes, split by top-level directory "
+        "(0: one per CPU).  Useful for wide roots such as /home."
+    ),
+)
+
+# A snapshot younger than this is not refreshed again, so running a --cached
+# command in a loop does not start one background scan per call.
+_MIN_REFRESH_AGE = 60.0
+
+
+@dataclass(frozen=True)
+class ScanTargets:
+    """What a command scans: its ``--path`` roots and, with ``--system``, users."""
+
+    roots: list[Path]
+    users: list[LocalUser] = field(default_factory=list)
+
+    @classmethod
+    def from_options(cls, paths: tuple[Path, ...], system: bool) -> ScanTargets:
+        """Build the targets of ``--path`` and ``--system``.
+
+        Without either, the current directory is scanned.
+        """
+        roots = list(paths) or ([] if system else [Path.cwd()])
+        return cls(roots, local_users() if system else [])
+
+    @property
+    def label(self) -> str:
+        """What the scan covered, for the history and the deletion journal."""
+        parts = [str(root) for root in self.roots]
+        if self.users:
+            parts.append("all user homes")
+        return ", ".join(parts)
+
+    def scan(
+        self,
+        scanner: Scanner,
+        on_progress: Callable[[AbstractDetector, list[Environment]], None]
+        | None = None,
+    ) -> list[Environment]:
+        """Scan every target with *scanner* (see :meth:`Scanner.scan_many`)."""
+        if len(self.roots) == 1 and not self.users:
+            return scanner.scan(self.roots[0], on_progress)
+        return scanner.scan_many(self.roots, users=self.users, on_progress=on_progress)
+
+
+def print_note(text: str) -> None:
+    """Print a dimmed progress note on stderr, without loading rich."""
+    click.secho(text, err=True, dim=True)
+
+
+def scan_or_snapshot(
+    scanner: Scanner,
+    targets: ScanTargets,
+    scan: Callable[[], list[Environment]],
+    *,
+    cached: bool,
+    max_age: float,
+    quiet: bool = False,
+) -> list[Environment]:
+    """Return the environments in *targets*: from the daemon, a snapshot, or *scan*.
+
+    A running ``killpy serve`` that indexes the root answers first; its
+    answer covers every type, so callers filter it as they would a scan.
+    With *cached*, a snapshot of the root (for *scanner*'s types) no older
+    than *max_age* seconds is returned at once, its age noted on stderr,
+    and a background ``killpy list`` refreshes it.  Otherwise *scan* runs
+    and its result becomes the new snapshot; while another process is
+    running the same scan, its result is awaited and reused instead.
+
+    All of that is per root: with several roots, or users to scan, *scan*
+    simply runs.
+    """
+    if len(targets.roots) != 1 or targets.users:
+        if cached:
+            raise click.UsageError("--cached needs a single --path and no --system.")
+        return scan()
+    path = targets.roots[0]
+    # The daemon's index follows its own options; only a default scan can use it.
+    envs = None if scanner.options else query_daemon(path)
+    if envs is not None:
+        if not quiet:
+            print_note("Answered by the killpy daemon.")
+        return envs
+    store = SnapshotStore()
+    if cached:
+        envs = _fresh_snapshot(store, scanner, path, max_age, quiet)
+        if envs is not None:
+            return envs
+
+    def _note_wait() -> None:
+        if not quiet:
+            print_note(
+                "Another killpy process is scanning this path; waiting for its result."
+            )
+
+    return store.scan_once(
+        path,
+        scan,
+        scanner.types,
+        scanner.excluded,
+        options=scanner.options,
+        on_wait=_note_wait,
+    )
+
+
+def _fresh_snapshot(
+    store: SnapshotStore,
+    scanner: Scanner,
+    path: Path,
+    max_age: float,
+    quiet: bool,
+) -> list[Environment] | None:
+    """Return the snapshot of *path* if it is fresh, and start refreshing it."""
+    snapshot = store.load(
+        path, scanner.types, scanner.excluded, options=scanner.options
+    )
+    if snapshot is None or not snapshot.is_fresh(max_age):
+        return None
+    age = snapshot.age.total_seconds()
+    if not quiet:
+        print_note(
+            f"Showing the scan from {format_duration(age)} ago; "
+            "refreshing it in the background."
+        )
+    if age >= _MIN_REFRESH_AGE:
+        refresh_snapshot(path, scanner.types)
+    return snapshot.envs
+
+
+def refresh_snapshot(path: Path, types: frozenset[str]) -> None:
+    """Rescan *path* in a detached ``killpy list`` that rewrites its snapshot.
+
+    The child outlives this process and inherits gentle mode and the mount
+    policy.  Failing to
+    start it only leaves the snapshot as it is.
+    """
+    command = [sys.executable, "-m", "killpy"]
+    if get_throttle() is not None:
+        command.append("--gentle")
+    command += ["list", "--path", str(path), "--json", "--quiet"]
+    policy = get_mount_policy()
+    if policy.one_file_system:
+        command.append("--one-file-system")
+    for fstype in sorted(policy.skip_types - DEFAULT_SKIPPED_FSTYPES):
+        command += ["--skip-fs-type", fstype]
+    for name in sorted(types):
+        command += ["--type", name]
+    try:
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as exc:
+        click.echo(f"Cannot refresh the snapshot: {exc}", err=True)
+
+
+def sort_envs(
+    envs: list[Environment], sort_by: str | None, size_mode: SizeMode = "apparent"
+) -> list[Environment]:
+    """Return *envs* largest first by *sort_by*, or unchanged when it is ``None``.
+
+    ``"size"`` sorts by the size of *size_mode*; ``"inodes"`` by
+    :attr:`~killpy.models.Environment.inode_count`.
+    """
+    if sort_by == "inodes":
+        return sorted(envs, key=lambda e: e.inode_count, reverse=True)
+    if sort_by == "size":
+        return sorted(envs, key=lambda e: e.size_for(size_mode), reverse=True)
+    return envs
+
+
+def select_to_free_inodes(envs: list[Environment], target: int) -> list[Environment]:
+    """Pick environments, most reclaimable inodes first, until *target* are freed.
+
+    Returns every candidate when together they cannot reach *target*.
+    Environments that would free no inode (unmeasured ones included) are
+    never picked.
+    """
+    chosen: list[Environment] = []
+    freed = 0
+    for env in sorted(envs, key=lambda e: e.reclaimable_inode_count, reverse=True):
+        if freed >= target or not env.reclaimable_inode_count:
+            break
+        chosen.append(env)
+        freed += env.reclaimable_inode_count
+    return chosen
+
+
+def refuse_if_interrupted(journal: DeletionJournal) -> None:
+    """Stop a new run from overwriting the journal of an unfinished one."""
+    run = journal.load()
+    if run is not None:
+        raise click.ClickException(
+            f"A deletion run started {run.started_at:%Y-%m-%d %H:%M} UTC was "
+            f"interrupted with {len(run.unfinished)} environment(s) left. "
+            "Finish it with 'killpy delete --resume' first."
+        )
+
+
 def partition_in_use(
     envs: list[Environment], force: bool, console: Console
 ) -> list[Environment]:
@@ -87,3 +512,30 @@ def filter_envs(
         result = [e for e in result if e.last_modified < cutoff]
 
     return result
+
+
+def reclaimable_total(
+    envs: list[Environment], mode: SizeMode = "apparent", *, rewalk: bool = True
+) -> int:
+    """Return the bytes deleting all of *envs* together would free.
+
+    Environments without hardlinked files contribute their measured
+    reclaimable size directly.  The rest are re-walked together with
+    :func:`~killpy.files.get_reclaimable_size`, so a file hardlinked between
+    two selected environments counts as freed.  Sizes are measured per *mode*.
+
+    Without *rewalk* (a ``--from`` plan, which must not walk again), the
+    recorded reclaimable sizes are summed; links shared between selected
+    environments are then not counted as freed.
+    """
+    if not rewalk:
+        return sum(env.reclaimable_for(mode) for env in envs)
+    total = 0
+    linked: list[Path] = []
+    for env in envs:
+        size = env.size_for(mode)
+        if env.reclaimable_for(mode) == size:
+            total += size
+        else:
+            linked.append(env.path)
+    return total + (get_reclaimable_size(linked, mode) if linked else 0)
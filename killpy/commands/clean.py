@@ -6,8 +6,8 @@ from pathlib import Path
 
 import click
 
-from killpy.cleaners import remove_pycache
-from killpy.files import format_size
+from killpy.cleaners import find_pycache, remove_pycache
+from killpy.files import format_size, get_total_size
 
 
 @click.command("clean")
@@ -17,8 +17,36 @@ from killpy.files import format_size
     type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
     help="Path to the directory to clean",
 )
-def clean_cmd(path: Path) -> None:
-    """Remove all ``__pycache__`` directories under PATH and report freed space."""
+@click.option(
+    "--git",
+    "git_aware",
+    is_flag=True,
+    default=False,
+    help=(
+        "Only look in directories git reports as untracked or ignored. "
+        "Falls back to a full walk outside git."
+    ),
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Count the __pycache__ directories and their size without deleting.",
+)
+def clean_cmd(path: Path, git_aware: bool, dry_run: bool) -> None:
+    """Remove all ``__pycache__`` directories under PATH and report freed space.
+
+    Caches inside environments (``.venv``, ``site-packages``) and VCS trees
+    are left alone; those under build artifacts (``build/lib``) are removed.
+    """
+    if dry_run:
+        pycache_dirs = find_pycache(path, git_aware=git_aware)
+        size = sum(get_total_size(d) for d in pycache_dirs)
+        click.echo(
+            f"{len(pycache_dirs)} __pycache__ directories, "
+            f"{format_size(size)} would be freed"
+        )
+        return
     click.echo(f"Cleaning {path}…")
-    total_freed_space = remove_pycache(path)
+    total_freed_space = remove_pycache(path, git_aware=git_aware)
     click.echo(f"{format_size(total_freed_space)} freed")
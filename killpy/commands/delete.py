@@ -2,26 +2,46 @@
 
 from __future__ import annotations
 
+import json
 import sys
 from pathlib import Path
+from typing import TextIO
 
 import click
 from rich.console import Console
 
-from killpy.cleaner import Cleaner, CleanerError
-from killpy.commands._utils import filter_envs, partition_in_use
-from killpy.files import format_size
+from killpy.cleaner import Cleaner, CleanerError, DeletionRate
+from killpy.commands._utils import (
+    ByteSize,
+    Duration,
+    ScanTargets,
+    filter_envs,
+    format_duration,
+    gentle_option,
+    mount_options,
+    partition_in_use,
+    paths_option,
+    processes_option,
+    reclaimable_total,
+    refuse_if_interrupted,
+    select_to_free_inodes,
+    size_mode_option,
+    sort_envs,
+    sort_option,
+    system_option,
+)
+from killpy.files import SizeMode, format_size
+from killpy.intelligence.planner import plan_to_free
+from killpy.intelligence.scoring import score_all
 from killpy.intelligence.tracker import UsageTracker
-from killpy.scanner import Scanner
+from killpy.journal import DeletionJournal, JournaledRun
+from killpy.models import Environment
+from killpy.scanner import Scanner, revalidate
 
 
 @click.command("delete")
-@click.option(
-    "--path",
-    default=Path.cwd,
-    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
-    help="Root directory to scan.",
-)
+@paths_option
+@system_option
 @click.option(
     "--type",
     "types",
@@ -58,43 +78,151 @@ from killpy.scanner import Scanner
     default=False,
     help="Also delete environments currently in use (flagged system-critical).",
 )
-def delete_cmd(
-    path: Path,
+@click.option(
+    "--git",
+    "git_aware",
+    is_flag=True,
+    default=False,
+    help=(
+        "Only look in directories git reports as untracked or ignored; tracked "
+        "source trees are never walked. Falls back to a full scan outside git."
+    ),
+)
+@click.option(
+    "--free",
+    "free_bytes",
+    type=ByteSize(),
+    default=None,
+    metavar="SIZE",
+    help=(
+        "Only delete enough environments to free SIZE (e.g. 20GB), choosing "
+        "the least valuable ones by score and size."
+    ),
+)
+@click.option(
+    "--free-inodes",
+    type=click.IntRange(min=1),
+    default=None,
+    metavar="N",
+    help=(
+        "Only delete enough environments, those with the most files first, "
+        "to free at least N inodes."
+    ),
+)
+@click.option(
+    "--from",
+    "plan_file",
+    type=click.File("r"),
+    default=None,
+    metavar="PLAN",
+    help=(
+        "Delete the environments in PLAN, the output of 'killpy list --json' "
+        "or '--json-stream' ('-' reads stdin), instead of scanning. Entries "
+        "changed since that scan are skipped."
+    ),
+)
+@click.option(
+    "--time-budget",
+    type=Duration(),
+    default=None,
+    metavar="DURATION",
+    help=(
+        "Stop after DURATION (e.g. 10m, 1h30m), deleting whatever frees the "
+        "most space per second first; what is left is listed for the next run."
+    ),
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help=(
+        "Finish a deletion run that was interrupted (killed, disconnected): "
+        "complete partly deleted environments, delete the ones not reached "
+        "yet and record the freed space in the history."
+    ),
+)
+@processes_option
+@size_mode_option
+@gentle_option
+@mount_options
+@sort_option
+def delete_cmd(  # noqa: PLR0913 - one parameter per click option
+    *,
+    paths: tuple[Path, ...],
+    system: bool,
     types: tuple[str, ...],
     older_than: int | None,
     dry_run: bool,
     yes: bool,
     force: bool,
+    git_aware: bool,
+    free_bytes: int | None,
+    free_inodes: int | None,
+    plan_file: TextIO | None,
+    time_budget: float | None,
+    resume: bool,
+    processes: int,
+    size_mode: SizeMode,
+    sort_by: str | None,
 ) -> None:
     """Delete detected Python environments under PATH.
 
     By default, shows a confirmation prompt before deleting.
     Use --dry-run to preview which environments would be removed.
     Environments currently in use (system-critical) are skipped
-    unless --force is given.
+    unless --force is given.  --git keeps the scan to untracked and
+    ignored directories, which is what the pre-commit hooks use.
+    --free plans the deletions that reach a space target with the least
+    collateral, and explains each choice.  --free-inodes picks the fewest
+    environments that give back N inodes, for filesystems that run out of
+    inodes before bytes.  --time-budget fits the run into a maintenance
+    window: the biggest, quickest deletions go first and the command stops
+    before the deadline, listing what it left for next time.  --from
+    deletes a reviewed 'killpy list --json' result without rescanning:
+    each entry is only checked to be the same, unchanged directory.
+    Every run is journaled to ~/.killpy/deletions.ndjson until it
+    completes; --resume finishes one that was interrupted.  --path can be
+    given several times; --system adds the home directory of every local
+    user.
     """
     console = Console()
+    if resume:
+        _resume(DeletionJournal(), force=force, yes=yes, console=console)
+        return
+    if not dry_run:
+        refuse_if_interrupted(DeletionJournal())
 
-    scanner = Scanner(types=set(types) if types else None)
-    envs = scanner.scan(path)
+    targets = ScanTargets.from_options(paths, system)
+    if plan_file is None:
+        scanner = Scanner(
+            types=set(types) if types else None,
+            git_aware=git_aware,
+            processes=processes,
+        )
+        envs = targets.scan(scanner)
+    else:
+        envs = _load_plan(plan_file, console)
     envs = filter_envs(envs, types or None, older_than)
     envs = partition_in_use(envs, force, console)
+    envs, reasons = _select_for_target(envs, free_bytes, free_inodes, size_mode)
+    envs = sort_envs(envs, sort_by, size_mode)
+    if time_budget is not None:
+        envs = DeletionRate().order(envs, size_mode)
 
     if not envs:
         console.print("[yellow]No environments found matching the criteria.[/yellow]")
         return
 
-    total_bytes = sum(e.size_bytes for e in envs)
-
-    console.print(
-        f"\nFound [bold]{len(envs)}[/bold] environment(s) — "
-        f"[bold]{format_size(total_bytes)}[/bold] total\n"
+    _print_selection(
+        envs,
+        size_mode,
+        dry_run,
+        console,
+        note=_target_note(envs, free_bytes, free_inodes, size_mode)
+        or _budget_note(envs, time_budget),
+        reasons=reasons,
+        from_plan=plan_file is not None,
     )
-    for env in envs:
-        flag = "[dim][dry-run][/dim] " if dry_run else ""
-        console.print(
-            f"  {flag}[red]{env.type}[/red]  {env.name}  {env.size_human}  {env.path}"
-        )
 
     if dry_run:
         console.print("\n[bold yellow]Dry run — nothing deleted.[/bold yellow]")
@@ -106,25 +234,43 @@ def delete_cmd(
             abort=True,
         )
 
+    errors = _delete_selected(
+        envs,
+        targets.label,
+        force=force,
+        size_mode=size_mode,
+        time_budget=time_budget,
+        console=console,
+    )
+    if errors:
+        sys.exit(1)
+
+
+def _delete_selected(
+    envs: list[Environment],
+    scan_path: str,
+    *,
+    force: bool,
+    size_mode: SizeMode,
+    time_budget: float | None,
+    console: Console,
+) -> int:
+    """Delete the confirmed selection, journaled and recorded; return the errors."""
     # Record this cleanup session up-front so `killpy stats --history` reflects
     # it; record_deletion() below updates the same record with the freed bytes.
     tracker = UsageTracker()
     try:
-        tracker.record_scan_result(envs, path)
+        tracker.record_scan_result(envs, scan_path)
     except Exception:  # noqa: BLE001
         pass
 
-    cleaner = Cleaner(dry_run=False, force=force)
-    freed = 0
-    errors = 0
-
-    for env in envs:
-        try:
-            freed += cleaner.delete(env)
-            console.print(f"  [green]✓[/green] Deleted {env.name} ({env.size_human})")
-        except CleanerError as exc:
-            console.print(f"  [red]✗[/red] {env.name}: {exc}")
-            errors += 1
+    journal = DeletionJournal()
+    journal.begin(envs, scan_path, size_mode)
+    cleaner = Cleaner(dry_run=False, force=force, size_mode=size_mode, journal=journal)
+    if time_budget is None:
+        freed, errors = _delete_all(cleaner, envs, console)
+    else:
+        freed, errors = _delete_within(cleaner, envs, time_budget, console)
 
     console.print(
         f"\n[bold green]Done.[/bold green] "
@@ -137,6 +283,235 @@ def delete_cmd(
         tracker.record_deletion(freed)
     except Exception:  # noqa: BLE001
         pass
+    journal.finish()
+    return errors
+
+
+def _resume(
+    journal: DeletionJournal, *, force: bool, yes: bool, console: Console
+) -> None:
+    """Finish the interrupted run in *journal* and reconcile the freed bytes."""
+    run = journal.load()
+    if run is None:
+        console.print("Nothing to resume: no interrupted deletion run.")
+        return
+
+    partial = [item.env for item in run.unfinished if item.state == "deleting"]
+    pending = [item.env for item in run.unfinished if item.state == "pending"]
+    # Removal got this far before the interruption, and nothing is left of
+    # the finished ones.
+    finished: list[Environment] = []
+    remaining: list[Environment] = []
+    for env in partial:
+        gone = env.managed_by is None and not env.path.exists()
+        (finished if gone else remaining).append(env)
+    # A partly deleted tree has a new mtime, but must still be the same tree:
+    # one recreated at its path since the interruption is not touched.
+    partial, stale = revalidate(remaining, check_mtime=False)
+    pending, stale_pending = revalidate(pending)
+    stale.update(stale_pending)
+    for env in _stale_envs(run, stale):
+        journal.failed(env, f"skipped on resume: {stale[env.path]}")
+        console.print(f"  [dim]Skipping {env.name}: {stale[env.path]}[/dim]")
+    envs = partition_in_use(partial + pending, force, console)
+
+    console.print(
+        f"\nResuming the deletion run started {run.started_at:%Y-%m-%d %H:%M} UTC "
+        f"under {run.scan_path}: [bold]{len(envs) + len(finished)}[/bold] "
+        f"environment(s) left, {len(finished) + len(partial)} partly deleted; "
+        f"{format_size(run.freed_bytes)} freed before the interruption."
+    )
+    if envs and not yes:
+        click.confirm(f"\nDelete {len(envs)} environment(s)?", abort=True)
+
+    cleaner = Cleaner(force=force, size_mode=run.size_mode, journal=journal)
+    freed = 0
+    for env in finished:
+        # The recorded size is what the interrupted run freed.
+        freed += env.reclaimable_for(run.size_mode)
+        journal.done(env, env.reclaimable_for(run.size_mode))
+        _print_deleted(env, run.size_mode, console)
+    resumed, errors = _delete_all(cleaner, envs, console)
+    total = run.freed_bytes + freed + resumed
 
+    console.print(
+        f"\n[bold green]Done.[/bold green] Freed [bold]{format_size(total)}[/bold] "
+        "over the whole run" + (f" — [red]{errors} error(s)[/red]" if errors else "")
+    )
+    try:
+        UsageTracker().record_deletion(total)
+    except Exception:  # noqa: BLE001
+        pass
+    journal.finish()
     if errors:
         sys.exit(1)
+
+
+def _stale_envs(run: JournaledRun, stale: dict[Path, str]) -> list[Environment]:
+    return [item.env for item in run.items if item.env.path in stale]
+
+
+def _load_plan(plan_file: TextIO, console: Console) -> list[Environment]:
+    """Read a --from plan and keep the entries that still match the disk."""
+    text = plan_file.read()
+    try:
+        if text.lstrip().startswith("["):
+            records = json.loads(text)
+        else:
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+        envs = [Environment.from_dict(record) for record in records]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise click.BadParameter(
+            f"not the output of 'killpy list --json' or '--json-stream' ({exc})",
+            param_hint="--from",
+        ) from exc
+
+    envs, stale = revalidate(envs)
+    if stale:
+        console.print(
+            f"[yellow]Skipping {len(stale)} plan entr"
+            f"{'y' if len(stale) == 1 else 'ies'} changed since the scan:[/yellow]"
+        )
+        for env_path, reason in stale.items():
+            console.print(f"  [dim]{reason}: {env_path}[/dim]")
+    return envs
+
+
+def _delete_all(
+    cleaner: Cleaner, envs: list[Environment], console: Console
+) -> tuple[int, int]:
+    """Delete every environment in *envs*; return the bytes freed and errors."""
+    freed = 0
+    errors = 0
+    for env in envs:
+        try:
+            freed += cleaner.delete(env)
+            _print_deleted(env, cleaner.size_mode, console)
+        except CleanerError as exc:
+            console.print(f"  [red]✗[/red] {env.name}: {exc}")
+            errors += 1
+    return freed, errors
+
+
+def _delete_within(
+    cleaner: Cleaner, envs: list[Environment], budget: float, console: Console
+) -> tuple[int, int]:
+    """Delete what fits in *budget* seconds; list the rest for the next run."""
+
+    def report(env: Environment, _freed: int, error: CleanerError | None) -> None:
+        if error is None:
+            _print_deleted(env, cleaner.size_mode, console)
+        else:
+            console.print(f"  [red]✗[/red] {env.name}: {error}")
+
+    run = cleaner.delete_within(envs, budget, report)
+    if run.remaining:
+        left = reclaimable_total(run.remaining, cleaner.size_mode)
+        console.print(
+            f"\n[yellow]Time budget of {format_duration(budget)} used up after "
+            f"{format_duration(run.elapsed)} "
+            f"({run.inodes_per_second:,.0f} inodes/s): "
+            f"{len(run.remaining)} environment(s), {format_size(left)}, "
+            "left for the next run:[/yellow]"
+        )
+        for env in run.remaining:
+            size = format_size(env.size_for(cleaner.size_mode))
+            console.print(f"  [dim]{env.type}  {env.name}  {size}  {env.path}[/dim]")
+    return run.freed_bytes, len(run.failed)
+
+
+def _print_deleted(env: Environment, size_mode: SizeMode, console: Console) -> None:
+    size = format_size(env.size_for(size_mode))
+    console.print(f"  [green]✓[/green] Deleted {env.name} ({size})")
+
+
+def _budget_note(envs: list[Environment], budget: float | None) -> str | None:
+    """Describe how the selection compares with the --time-budget window."""
+    if budget is None:
+        return None
+    rate = DeletionRate()
+    estimate = sum(rate.estimate(env) for env in envs)
+    return (
+        f"Time budget [bold]{format_duration(budget)}[/bold]: most space per "
+        f"second first (about {format_duration(estimate)} for everything)"
+    )
+
+
+def _select_for_target(
+    envs: list[Environment],
+    free_bytes: int | None,
+    free_inodes: int | None,
+    size_mode: SizeMode,
+) -> tuple[list[Environment], dict[Path, str]]:
+    """Narrow *envs* to what --free / --free-inodes need; return why each was kept.
+
+    Without a target every environment stays and no reasons are given.
+    """
+    if free_bytes is not None and free_inodes is not None:
+        raise click.UsageError("--free and --free-inodes cannot be combined.")
+    if free_inodes is not None:
+        return select_to_free_inodes(envs, free_inodes), {}
+    if free_bytes is None:
+        return envs, {}
+    plan = plan_to_free(score_all(envs), free_bytes, size_mode=size_mode)
+    return plan.envs, {item.env.path: item.reason for item in plan.items}
+
+
+def _target_note(
+    envs: list[Environment],
+    free_bytes: int | None,
+    free_inodes: int | None,
+    size_mode: SizeMode,
+) -> str | None:
+    """Describe how the selection measures up to the --free / --free-inodes goal."""
+    if free_inodes is not None:
+        inodes = sum(e.reclaimable_inode_count for e in envs)
+        if inodes >= free_inodes:
+            return f"Frees [bold]{inodes:,}[/bold] inodes (target {free_inodes:,})"
+        return (
+            f"[yellow]Only {inodes:,} inodes can be freed "
+            f"(target {free_inodes:,})[/yellow]"
+        )
+    if free_bytes is not None:
+        freed = sum(e.reclaimable_for(size_mode) for e in envs)
+        target = format_size(free_bytes)
+        if freed >= free_bytes:
+            return f"Frees [bold]{format_size(freed)}[/bold] (target {target})"
+        return (
+            f"[yellow]Only {format_size(freed)} can be freed (target {target})[/yellow]"
+        )
+    return None
+
+
+def _print_selection(  # noqa: PLR0913 - display settings of one selection
+    envs: list[Environment],
+    size_mode: SizeMode,
+    dry_run: bool,
+    console: Console,
+    *,
+    note: str | None = None,
+    reasons: dict[Path, str] | None = None,
+    from_plan: bool = False,
+) -> None:
+    total_bytes = sum(e.size_for(size_mode) for e in envs)
+    reclaimable = reclaimable_total(envs, size_mode, rewalk=not from_plan)
+
+    console.print(
+        f"\nFound [bold]{len(envs)}[/bold] environment(s) — "
+        f"[bold]{format_size(total_bytes)}[/bold] total"
+        + (" on disk" if size_mode == "disk" else "")
+        + (
+            f", [bold]{format_size(reclaimable)}[/bold] reclaimable"
+            if reclaimable != total_bytes
+            else ""
+        )
+        + "\n"
+    )
+    if note is not None:
+        console.print(note + "\n")
+    for env in envs:
+        flag = "[dim][dry-run][/dim] " if dry_run else ""
+        size = format_size(env.size_for(size_mode))
+        console.print(f"  {flag}[red]{env.type}[/red]  {env.name}  {size}  {env.path}")
+        if reasons and env.path in reasons:
+            console.print(f"      [dim]why: {reasons[env.path]}[/dim]")
@@ -10,7 +10,7 @@ import click
 from rich.console import Console
 from rich.table import Table
 
-from killpy.detectors import ALL_DETECTORS
+from killpy.detectors import DETECTOR_NAMES
 from killpy.files import format_size
 from killpy.intelligence import SuggestionEngine, UsageTracker, score_all
 from killpy.models import ScoredEnvironment, Suggestion
@@ -33,7 +33,7 @@ _TOP_N = 5
 # are intentionally excluded from doctor – use `killpy clean` for those.
 _CACHE_ARTIFACT_TYPES: frozenset[str] = frozenset({"cache", "artifacts"})
 _ENV_TYPES: set[str] = {
-    cls.name for cls in ALL_DETECTORS if cls.name not in _CACHE_ARTIFACT_TYPES
+    name for name in DETECTOR_NAMES if name not in _CACHE_ARTIFACT_TYPES
 }
 
 
@@ -96,14 +96,15 @@ def _summarise(
 ) -> tuple[int, int, dict[str, int]]:
     """Return ``(total_size_bytes, wasted_bytes, category_counts)``.
 
-    *wasted* sums the sizes of HIGH-category environments at or above
-    :data:`_IMPACTFUL_SIZE_BYTES`; *category_counts* maps each category to the
+    *wasted* sums the reclaimable bytes (hard links accounted for) of
+    HIGH-category environments at or above :data:`_IMPACTFUL_SIZE_BYTES`;
+    *category_counts* maps each category to the
     number of suggestions in it.  Computed once and shared by both output paths.
     """
     total_size = sum(se.env.size_bytes for se in scored_envs)
     high_paths = {s.env_path for s in suggestions if s.category == "HIGH"}
     wasted = sum(
-        se.env.size_bytes
+        se.env.reclaimable_bytes
         for se in scored_envs
         if se.env.path in high_paths and se.env.size_bytes >= _IMPACTFUL_SIZE_BYTES
     )
@@ -12,6 +12,7 @@ from rich.console import Console
 from rich.table import Table
 
 from killpy.commands._utils import filter_envs
+from killpy.daemon import query_daemon
 from killpy.scanner import Scanner
 
 # ---------------------------------------------------------------------------
@@ -153,7 +154,10 @@ def find_cmd(
         raise click.BadParameter(str(exc), param_hint="PACKAGE") from exc
 
     scanner = Scanner(types=set(types) if types else None)
-    envs = scanner.scan(path)
+    # A running ``killpy serve`` answers without a scan.
+    envs = query_daemon(path)
+    if envs is None:
+        envs = scanner.scan(path)
     envs = filter_envs(envs, types or None, None)
 
     matches: list[tuple] = []  # (Environment, version_string)
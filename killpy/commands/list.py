@@ -3,63 +3,92 @@
 from __future__ import annotations
 
 import json
+import sys
 from pathlib import Path
 
 import click
-from rich.console import Console
-from rich.table import Table
 
-from killpy.commands._utils import filter_envs
-from killpy.files import format_size
+from killpy.commands._utils import (
+    ScanTargets,
+    cached_option,
+    filter_envs,
+    gentle_option,
+    max_age_option,
+    mount_options,
+    paths_option,
+    print_note,
+    processes_option,
+    scan_or_snapshot,
+    size_mode_option,
+    sort_envs,
+    sort_option,
+    system_option,
+)
+from killpy.files import SizeMode, format_size
 from killpy.models import Environment
 from killpy.scanner import Scanner
 
 
 def _run_json_stream(
     scanner: Scanner,
-    path: Path,
+    targets: ScanTargets,
     types: tuple[str, ...],
     older_than: int | None,
     quiet: bool,
-    stderr_console: Console,
 ) -> None:
     if not quiet:
-        stderr_console.print("[dim]Scanning…[/dim]")
+        print_note("Scanning…")
 
     def _progress(detector, envs):
         if not quiet:
-            stderr_console.print(
-                f"[dim]  {detector.name}[/dim] — [dim]{len(envs)} found[/dim]",
-            )
+            print_note(f"  {detector.name} — {len(envs)} found")
         for env in filter_envs(envs, types or None, older_than):
             click.echo(json.dumps(env.to_dict()))
 
-    scanner.scan(path, on_progress=_progress)
+    targets.scan(scanner, on_progress=_progress)
 
 
 def _scan_with_progress(
-    scanner: Scanner, path: Path, quiet: bool, stderr_console: Console
+    scanner: Scanner, targets: ScanTargets, quiet: bool, as_json: bool
 ) -> list[Environment]:
     if quiet:
-        return scanner.scan(path)
+        return targets.scan(scanner)
+    if as_json:
+        # A plain note in place of the spinner: JSON output should not cost
+        # rich's import.  Like the spinner, it is shown on terminals only.
+        if sys.stderr.isatty():
+            print_note("Scanning…")
+        return targets.scan(scanner)
+
+    from rich.console import Console  # noqa: PLC0415 - only the table needs rich
 
-    status = stderr_console.status("Scanning…", spinner="dots")
+    status = Console(stderr=True).status("Scanning…", spinner="dots")
     status.start()
 
     def _progress(detector, _envs):
         status.update(f"Scanning… [dim]{detector.name}[/dim]")
 
-    envs = scanner.scan(path, on_progress=_progress)
+    envs = targets.scan(scanner, on_progress=_progress)
     status.stop()
     return envs
 
 
-def _print_table(envs: list, console: Console) -> None:
+def _print_table(envs: list[Environment], size_mode: SizeMode = "apparent") -> None:
+    from rich.console import Console  # noqa: PLC0415 - only the table needs rich
+    from rich.table import Table  # noqa: PLC0415
+
+    console = Console()
     table = Table(show_header=True, header_style="bold cyan")
     table.add_column("Type", style="dim", min_width=10)
     table.add_column("Name", min_width=20)
     table.add_column("Last modified", min_width=12)
-    table.add_column("Size", justify="right", min_width=9)
+    table.add_column(
+        "Size" if size_mode == "apparent" else "Disk usage",
+        justify="right",
+        min_width=9,
+    )
+    table.add_column("Reclaimable", justify="right", min_width=11)
+    table.add_column("Inodes", justify="right", min_width=7)
     table.add_column("Path")
 
     for env in envs:
@@ -67,25 +96,24 @@ def _print_table(envs: list, console: Console) -> None:
             env.type,
             env.name,
             env.last_modified_str,
-            env.size_human,
+            format_size(env.size_for(size_mode)),
+            format_size(env.reclaimable_for(size_mode)),
+            f"{env.inode_count:,}",
             str(env.path),
         )
 
     console.print(table)
-    total = sum(e.size_bytes for e in envs)
+    total = sum(e.size_for(size_mode) for e in envs)
     console.print(
         f"\n[bold]{len(envs)}[/bold] environment(s) — "
         f"[bold]{format_size(total)}[/bold] total"
+        + (" on disk" if size_mode == "disk" else "")
     )
 
 
 @click.command("list")
-@click.option(
-    "--path",
-    default=Path.cwd,
-    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
-    help="Root directory to scan.",
-)
+@paths_option
+@system_option
 @click.option(
     "--type",
     "types",
@@ -124,24 +152,53 @@ def _print_table(envs: list, console: Console) -> None:
     default=False,
     help="Suppress progress messages (useful in scripts/pipelines).",
 )
-def list_cmd(
-    path: Path,
+@cached_option
+@max_age_option
+@processes_option
+@size_mode_option
+@gentle_option
+@mount_options
+@sort_option
+def list_cmd(  # noqa: PLR0913 - one parameter per click option
+    *,
+    paths: tuple[Path, ...],
+    system: bool,
     types: tuple[str, ...],
     older_than: int | None,
     as_json: bool,
     as_json_stream: bool,
     quiet: bool,
+    cached: bool,
+    max_age: float,
+    processes: int,
+    size_mode: SizeMode,
+    sort_by: str | None,
 ) -> None:
-    """List all detected Python environments under PATH."""
-    scanner = Scanner(types=set(types) if types else None)
-    stderr_console = Console(stderr=True)
+    """List all detected Python environments under PATH.
+
+    JSON output always carries both the apparent and the on-disk sizes;
+    --size-mode picks the one the table shows.  --sort orders the
+    output largest first (it does not apply to --json-stream, and neither
+    does --cached).  --path can be given several times; --system adds the
+    home directory of every local user.
+    """
+    scanner = Scanner(types=set(types) if types else None, processes=processes)
+    targets = ScanTargets.from_options(paths, system)
 
     if as_json_stream:
-        _run_json_stream(scanner, path, types, older_than, quiet, stderr_console)
+        _run_json_stream(scanner, targets, types, older_than, quiet)
         return
 
-    envs = _scan_with_progress(scanner, path, quiet, stderr_console)
+    envs = scan_or_snapshot(
+        scanner,
+        targets,
+        lambda: _scan_with_progress(scanner, targets, quiet, as_json),
+        cached=cached,
+        max_age=max_age,
+        quiet=quiet,
+    )
     envs = filter_envs(envs, types or None, older_than)
+    envs = sort_envs(envs, sort_by, size_mode)
 
     if as_json:
         click.echo(json.dumps([e.to_dict() for e in envs], indent=2))
@@ -151,4 +208,4 @@ def list_cmd(
         click.echo("No environments found.")
         return
 
-    _print_table(envs, Console())
+    _print_table(envs, size_mode)
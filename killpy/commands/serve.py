@@ -0,0 +1,111 @@
+"""``killpy serve`` – keep a live environment index and answer queries from it."""
+
+from __future__ import annotations
+
+import signal
+import threading
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from killpy.commands._utils import Duration, gentle_option, mount_options
+from killpy.daemon import (
+    DaemonError,
+    EnvironmentIndex,
+    daemon_status,
+    make_watcher,
+    serve,
+    socket_path,
+)
+
+
+@click.command("serve")
+@click.option(
+    "--path",
+    default=Path.cwd,
+    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
+    help="Root directory to index.",
+)
+@click.option(
+    "--socket",
+    "sock",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Unix socket to listen on (default: $KILLPY_SOCKET or ~/.killpy/daemon.sock).",
+)
+@click.option(
+    "--interval",
+    type=Duration(),
+    default="2s",
+    show_default=True,
+    metavar="DURATION",
+    help="How often to check for changes when polling.",
+)
+@click.option(
+    "--polling",
+    is_flag=True,
+    default=False,
+    help="Poll directory mtimes instead of using inotify.",
+)
+@click.option(
+    "--status",
+    "show_status",
+    is_flag=True,
+    default=False,
+    help="Report on the running daemon instead of starting one.",
+)
+@gentle_option
+@mount_options
+def serve_cmd(  # noqa: PLR0913 - one parameter per click option
+    *,
+    path: Path,
+    sock: Path | None,
+    interval: float,
+    polling: bool,
+    show_status: bool,
+) -> None:
+    """Index PATH once, keep the index current, and serve it over a socket.
+
+    While it runs, list, stats, find and the TUI answer from its index for
+    PATH and everything below it, without scanning.  Stop it with Ctrl-C.
+    """
+    console = Console(stderr=True)
+    sock = sock or socket_path()
+    if show_status:
+        _print_status(sock)
+        return
+
+    index = EnvironmentIndex(path, watcher=make_watcher(polling=polling))
+    with console.status(f"Indexing {index.root}…", spinner="dots"):
+        index.build()
+    status = index.status()
+    console.print(
+        f"Indexed [bold]{status['environments']}[/bold] environment(s) under "
+        f"{index.root}; watching {status['watched_directories']:,} directories "
+        f"({status['watcher']}). Listening on {sock}."
+    )
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        serve(index, sock, interval=interval, stop=stop)
+    except DaemonError as exc:
+        raise click.ClickException(str(exc)) from exc
+    except KeyboardInterrupt:
+        pass
+
+
+def _print_status(sock: Path) -> None:
+    status = daemon_status(sock)
+    if status is None:
+        raise click.ClickException(f"No killpy daemon is listening on {sock}.")
+    console = Console()
+    console.print(f"Root:         {status['root']}")
+    console.print(f"Environments: {status['environments']}")
+    console.print(
+        f"Watching:     {status['watched_directories']:,} directories "
+        f"({status['watcher']})"
+    )
+    console.print(f"Updated:      {status['updated_at']}")
+    console.print(f"PID:          {status['pid']}")
@@ -1,27 +1,46 @@
-"""``killpy stats`` – aggregate disk usage grouped by environment type."""
+"""``killpy stats`` – aggregate disk usage grouped by environment type (or owner)."""
 
 from __future__ import annotations
 
 import json
 from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import TypeVar
 
 import click
 from rich.console import Console
 from rich.table import Table
 
-from killpy.files import format_size
+from killpy.commands._utils import (
+    ScanTargets,
+    cached_option,
+    gentle_option,
+    max_age_option,
+    mount_options,
+    paths_option,
+    processes_option,
+    scan_or_snapshot,
+    size_mode_option,
+    system_option,
+)
+from killpy.files import SizeMode, format_size
 from killpy.intelligence.tracker import UsageTracker
+from killpy.models import Environment
 from killpy.scanner import Scanner
+from killpy.throttle import lstat
+from killpy.users import owner_name
+
+_Key = TypeVar("_Key")
+
+# Owner reported for an environment that vanished before it could be stat'ed.
+_UNKNOWN_OWNER = -1
 
 
 @click.command("stats")
-@click.option(
-    "--path",
-    default=Path.cwd,
-    type=click.Path(path_type=Path, exists=True, file_okay=False, dir_okay=True),
-    help="Root directory to scan.",
-)
+@paths_option
+@system_option
 @click.option(
     "--json",
     "as_json",
@@ -35,22 +54,85 @@ from killpy.scanner import Scanner
     default=False,
     help="Show cumulative scan history from ~/.killpy/history.json.",
 )
-def stats_cmd(path: Path, as_json: bool, history: bool) -> None:
-    """Show disk-usage statistics grouped by environment type."""
+@click.option(
+    "--since",
+    type=click.IntRange(min=0),
+    default=None,
+    metavar="DAYS",
+    help="With --history: only count scans from the last N days.",
+)
+@click.option(
+    "--by-type",
+    "show_trends",
+    is_flag=True,
+    default=False,
+    help=(
+        "With --history: monthly size per environment type with growth rates "
+        "(needs the SQLite history store, see KILLPY_HISTORY_DB)."
+    ),
+)
+@click.option(
+    "--by-owner",
+    is_flag=True,
+    default=False,
+    help="Also total the environments per owning user (implied by --system).",
+)
+@cached_option
+@max_age_option
+@processes_option
+@size_mode_option
+@gentle_option
+@mount_options
+def stats_cmd(  # noqa: PLR0913 - one parameter per click option
+    *,
+    paths: tuple[Path, ...],
+    system: bool,
+    as_json: bool,
+    history: bool,
+    since: int | None,
+    show_trends: bool,
+    by_owner: bool,
+    cached: bool,
+    max_age: float,
+    processes: int,
+    size_mode: SizeMode,
+) -> None:
+    """Show disk-usage statistics grouped by environment type.
+
+    JSON output always carries both the apparent and the on-disk sizes;
+    --size-mode picks the one the table shows.  --path can be given several
+    times; --system adds the home directory of every local user and a
+    report per owner, for finding the biggest consumers on a shared machine.
+    """
     if history:
-        _show_history(as_json)
+        window = (
+            datetime.now(tz=timezone.utc) - timedelta(days=since)
+            if since is not None
+            else None
+        )
+        if show_trends:
+            _show_type_trends(as_json, window)
+        else:
+            _show_history(as_json, window)
         return
 
-    scanner = Scanner()
-    envs = scanner.scan(path)
+    scanner = Scanner(processes=processes)
+    targets = ScanTargets.from_options(paths, system)
+    envs = scan_or_snapshot(
+        scanner,
+        targets,
+        lambda: targets.scan(scanner),
+        cached=cached,
+        max_age=max_age,
+    )
 
-    # Aggregate by type
-    by_type: dict[str, dict] = defaultdict(lambda: {"count": 0, "size_bytes": 0})
-    for env in envs:
-        by_type[env.type]["count"] += 1
-        by_type[env.type]["size_bytes"] += env.size_bytes
+    by_type = _aggregate(envs, lambda env: env.type)
+    by_uid = _aggregate(envs, _owner_uid) if by_owner or system else None
 
     total_bytes = sum(e.size_bytes for e in envs)
+    total_reclaimable = sum(e.reclaimable_bytes for e in envs)
+    total_disk = sum(e.disk_bytes for e in envs)
+    total_inodes = sum(e.inode_count for e in envs)
     total_count = len(envs)
 
     if as_json:
@@ -58,15 +140,18 @@ def stats_cmd(path: Path, as_json: bool, history: bool) -> None:
             "total_count": total_count,
             "total_size_bytes": total_bytes,
             "total_size_human": format_size(total_bytes),
-            "by_type": {
-                t: {
-                    "count": data["count"],
-                    "size_bytes": data["size_bytes"],
-                    "size_human": format_size(data["size_bytes"]),
-                }
-                for t, data in sorted(by_type.items())
-            },
+            "total_reclaimable_bytes": total_reclaimable,
+            "total_reclaimable_human": format_size(total_reclaimable),
+            "total_disk_bytes": total_disk,
+            "total_disk_human": format_size(total_disk),
+            "total_inode_count": total_inodes,
+            "by_type": {t: _json_group(data) for t, data in sorted(by_type.items())},
         }
+        if by_uid is not None:
+            output["by_owner"] = {
+                _owner_label(uid): {"uid": uid, **_json_group(data)}
+                for uid, data in sorted(by_uid.items())
+            }
         click.echo(json.dumps(output, indent=2))
         return
 
@@ -74,33 +159,134 @@ def stats_cmd(path: Path, as_json: bool, history: bool) -> None:
         click.echo("No environments found.")
         return
 
+    # The table reports the sizes of one --size-mode; JSON above carries both.
+    if size_mode == "disk":
+        size_key, reclaimable_key = "disk_bytes", "reclaimable_disk_bytes"
+    else:
+        size_key, reclaimable_key = "size_bytes", "reclaimable_bytes"
+    shown_total = sum(data[size_key] for data in by_type.values())
+    shown_reclaimable = sum(data[reclaimable_key] for data in by_type.values())
+
     console = Console()
     table = Table(show_header=True, header_style="bold cyan", title="Environment stats")
     table.add_column("Type", style="dim", min_width=14)
     table.add_column("Count", justify="right", min_width=7)
-    table.add_column("Total size", justify="right", min_width=12)
+    table.add_column(
+        "Total size" if size_mode == "apparent" else "Disk usage",
+        justify="right",
+        min_width=12,
+    )
     table.add_column("Avg size", justify="right", min_width=10)
+    table.add_column("Reclaimable", justify="right", min_width=12)
+    table.add_column("Inodes", justify="right", min_width=8)
 
-    for env_type, data in sorted(by_type.items(), key=lambda x: -x[1]["size_bytes"]):
-        avg = data["size_bytes"] // data["count"] if data["count"] else 0
+    for env_type, data in sorted(by_type.items(), key=lambda x: -x[1][size_key]):
+        avg = data[size_key] // data["count"] if data["count"] else 0
         table.add_row(
             env_type,
             str(data["count"]),
-            format_size(data["size_bytes"]),
+            format_size(data[size_key]),
             format_size(avg),
+            format_size(data[reclaimable_key]),
+            f"{data['inode_count']:,}",
         )
 
     console.print(table)
     console.print(
         f"\nTotal: [bold]{total_count}[/bold] environment(s) — "
-        f"[bold]{format_size(total_bytes)}[/bold]"
+        f"[bold]{format_size(shown_total)}[/bold] "
+        f"([bold]{format_size(shown_reclaimable)}[/bold] reclaimable), "
+        f"[bold]{total_inodes:,}[/bold] inodes"
     )
+    if by_uid is not None:
+        _print_owners(by_uid, size_mode, console)
+
+
+def _aggregate(
+    envs: list[Environment], key: Callable[[Environment], _Key]
+) -> dict[_Key, dict]:
+    """Total the sizes and counts of *envs* per value of *key*."""
+    groups: dict[_Key, dict] = defaultdict(
+        lambda: {
+            "count": 0,
+            "size_bytes": 0,
+            "reclaimable_bytes": 0,
+            "disk_bytes": 0,
+            "reclaimable_disk_bytes": 0,
+            "inode_count": 0,
+        }
+    )
+    for env in envs:
+        data = groups[key(env)]
+        data["count"] += 1
+        data["size_bytes"] += env.size_bytes
+        data["reclaimable_bytes"] += env.reclaimable_bytes
+        data["disk_bytes"] += env.disk_bytes
+        data["reclaimable_disk_bytes"] += env.reclaimable_for("disk")
+        data["inode_count"] += env.inode_count
+    return groups
+
+
+def _owner_uid(env: Environment) -> int:
+    try:
+        return lstat(env.path).st_uid
+    except OSError:
+        return _UNKNOWN_OWNER
+
 
+def _owner_label(uid: int) -> str:
+    return "unknown" if uid == _UNKNOWN_OWNER else owner_name(uid)
 
-def _show_history(as_json: bool) -> None:
-    """Print cumulative scan history."""
+
+def _json_group(data: dict) -> dict:
+    return {
+        "count": data["count"],
+        "size_bytes": data["size_bytes"],
+        "size_human": format_size(data["size_bytes"]),
+        "reclaimable_bytes": data["reclaimable_bytes"],
+        "reclaimable_human": format_size(data["reclaimable_bytes"]),
+        "disk_bytes": data["disk_bytes"],
+        "disk_human": format_size(data["disk_bytes"]),
+        "inode_count": data["inode_count"],
+    }
+
+
+def _print_owners(
+    by_uid: dict[int, dict], size_mode: SizeMode, console: Console
+) -> None:
+    """Print the per-owner totals, biggest consumer first."""
+    if size_mode == "disk":
+        size_key, reclaimable_key = "disk_bytes", "reclaimable_disk_bytes"
+    else:
+        size_key, reclaimable_key = "size_bytes", "reclaimable_bytes"
+    table = Table(show_header=True, header_style="bold cyan", title="By owner")
+    table.add_column("Owner", min_width=12)
+    table.add_column("UID", justify="right", style="dim", min_width=6)
+    table.add_column("Count", justify="right", min_width=7)
+    table.add_column(
+        "Total size" if size_mode == "apparent" else "Disk usage",
+        justify="right",
+        min_width=12,
+    )
+    table.add_column("Reclaimable", justify="right", min_width=12)
+    table.add_column("Inodes", justify="right", min_width=8)
+    for uid, data in sorted(by_uid.items(), key=lambda x: -x[1][size_key]):
+        table.add_row(
+            _owner_label(uid),
+            "—" if uid == _UNKNOWN_OWNER else str(uid),
+            str(data["count"]),
+            format_size(data[size_key]),
+            format_size(data[reclaimable_key]),
+            f"{data['inode_count']:,}",
+        )
+    console.print()
+    console.print(table)
+
+
+def _show_history(as_json: bool, since: datetime | None = None) -> None:
+    """Print cumulative scan history, optionally limited to scans after *since*."""
     tracker = UsageTracker()
-    summary = tracker.get_summary()
+    summary = tracker.get_summary(since)
 
     if as_json:
         click.echo(json.dumps(summary, indent=2))
@@ -115,9 +301,56 @@ def _show_history(as_json: bool) -> None:
     deleted_str = format_size(summary["total_space_deleted"])
     console.print()
     console.rule("[bold cyan]Scan History Summary[/bold cyan]")
+    if since is not None:
+        console.print(f"\n  Since:             {since.date().isoformat()}")
     console.print(
         f"\n  Total scans:       [bold]{summary['total_scans']}[/bold]\n"
         f"  Space found:       [bold]{found_str}[/bold]\n"
         f"  Space deleted:     [bold red]{deleted_str}[/bold red]\n"
         f"  Last scan:         {summary['last_scan_time']}\n"
     )
+
+
+def _show_type_trends(as_json: bool, since: datetime | None = None) -> None:
+    """Print monthly per-type totals and growth from the SQLite history store."""
+    tracker = UsageTracker()
+    trends = tracker.get_type_trends(since)
+    if trends is None:
+        raise click.UsageError(
+            "--by-type needs the SQLite history store: set KILLPY_HISTORY_DB "
+            "to a database path and let a few scans populate it."
+        )
+
+    if as_json:
+        click.echo(json.dumps(trends, indent=2))
+        return
+
+    if not trends:
+        Console().print("[yellow]No scan history found.[/yellow]")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan", title="Growth by type")
+    table.add_column("Type", style="dim", min_width=14)
+    table.add_column("Month", min_width=7)
+    table.add_column("Count", justify="right", min_width=7)
+    table.add_column("Total size", justify="right", min_width=12)
+    table.add_column("Change", justify="right", min_width=12)
+    table.add_column("Growth", justify="right", min_width=8)
+
+    for row in trends:
+        growth = row["growth_bytes"]
+        if growth is None:
+            change = "—"
+        else:
+            change = ("+" if growth >= 0 else "-") + format_size(abs(growth))
+        rate = row["growth_rate"]
+        table.add_row(
+            row["type"],
+            row["period"],
+            str(row["count"]),
+            format_size(row["size_bytes"]),
+            change,
+            f"{rate:+.1%}" if rate is not None else "—",
+        )
+
+    Console().print(table)
@@ -0,0 +1,590 @@
+"""``killpy serve``: a daemon that keeps the environment index of a tree live.
+
+The daemon scans its root once, then keeps the result current instead of
+rescanning:
+
+* Every directory of the tree that is not itself an environment, and every
+  environment root, is watched: with inotify on Linux, or by comparing
+  ``mtime`` values every few seconds elsewhere (and when inotify runs out of
+  watches).  A directory that changed is listed again.  New subdirectories
+  are walked, vanished ones dropped with everything below them, and a
+  directory that just gained a ``pyvenv.cfg`` becomes an environment.
+* An environment whose root changed is sized again.  Changes deeper inside
+  an environment (a ``pip install`` into ``site-packages``) do not touch its
+  root, so a few environments are also re-sized every cycle, least recently
+  sized first.
+* Global tool directories (pyenv, conda, pipx, pip and uv caches…) are
+  rescanned every few minutes.
+
+``list``, ``stats``, ``find`` and the TUI ask the daemon through a Unix
+socket (``~/.killpy/daemon.sock``, or ``$KILLPY_SOCKET``) before scanning,
+and use its answer when it indexes the requested path.  The protocol is one
+JSON request line and one JSON reply line per connection.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import errno
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Protocol
+
+from killpy import throttle
+from killpy.detectors._shared_walk import NEVER_WALKED, classify
+from killpy.files import get_disk_usage
+from killpy.models import Environment, RootIdentity
+from killpy.mounts import MountGuard
+from killpy.scanner import Scanner, mark_system_critical
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_SOCKET = Path.home() / ".killpy" / "daemon.sock"
+_SOCKET_ENV = "KILLPY_SOCKET"
+
+# Clients give up quickly on a daemon that does not accept the connection,
+# and fall back to scanning; a reply may take longer for a large tree.
+_CONNECT_TIMEOUT_SECONDS = 0.5
+_REPLY_TIMEOUT_SECONDS = 30.0
+
+# After the first change, wait this long for the rest of a burst (a pip
+# install, a rm -rf) before updating the index.
+_SETTLE_SECONDS = 0.2
+
+_GLOBALS_INTERVAL_SECONDS = 300.0
+_RESIZE_PER_CYCLE = 8
+
+# inotify(7) event masks.
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ONLYDIR = 0x01000000
+_IN_DONT_FOLLOW = 0x02000000
+_WATCH_MASK = (
+    _IN_CREATE
+    | _IN_DELETE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+    | _IN_DONT_FOLLOW
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class DaemonError(Exception):
+    """Raised when the daemon cannot start."""
+
+
+def socket_path() -> Path:
+    """Return the daemon socket: ``$KILLPY_SOCKET`` or ``~/.killpy/daemon.sock``."""
+    override = os.environ.get(_SOCKET_ENV)
+    return Path(override) if override else _DEFAULT_SOCKET
+
+
+# --------------------------------------------------------------------------- #
+#  Watchers                                                                    #
+# --------------------------------------------------------------------------- #
+
+
+class Watcher(Protocol):
+    """Reports which watched directories changed."""
+
+    name: str
+
+    def add(self, path: str) -> None: ...
+
+    def discard(self, path: str) -> None: ...
+
+    def changes(self, timeout: float) -> set[str]: ...
+
+    def close(self) -> None: ...
+
+
+class PollingWatcher:
+    """Watches directories by comparing their ``mtime`` every *timeout* seconds."""
+
+    name = "polling"
+
+    def __init__(self) -> None:
+        self._mtimes: dict[str, int | None] = {}
+
+    def add(self, path: str) -> None:
+        self._mtimes[path] = _mtime(path)
+
+    def discard(self, path: str) -> None:
+        self._mtimes.pop(path, None)
+
+    def changes(self, timeout: float) -> set[str]:
+        """Sleep *timeout* seconds, then return the directories that changed."""
+        time.sleep(timeout)
+        changed = set()
+        for path, before in list(self._mtimes.items()):
+            now = _mtime(path)
+            if now != before:
+                self._mtimes[path] = now
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        self._mtimes.clear()
+
+
+class InotifyWatcher:
+    """Watches directories with inotify(7); Linux only.
+
+    Raises
+    ------
+    OSError
+        From the constructor when inotify is unavailable, and from
+        :meth:`add` when the per-user watch limit is reached.
+    """
+
+    name = "inotify"
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths: dict[int, str] = {}
+        self._watches: dict[str, int] = {}
+
+    def add(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err in (errno.ENOENT, errno.ENOTDIR):
+                return  # gone already; its parent reports that
+            raise OSError(err, os.strerror(err), path)
+        self._paths[wd] = path
+        self._watches[path] = wd
+
+    def discard(self, path: str) -> None:
+        wd = self._watches.pop(path, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def changes(self, timeout: float) -> set[str]:
+        """Wait up to *timeout* seconds for events; return the directories they hit."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        time.sleep(_SETTLE_SECONDS)
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            changed |= self._parse(data)
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+    def _parse(self, data: bytes) -> set[str]:
+        changed: set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size + length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost: every directory may have changed.
+                changed.update(self._watches)
+                continue
+            path = self._paths.get(wd)
+            if path is None:
+                continue
+            changed.add(path)
+            if mask & _IN_IGNORED:
+                self._paths.pop(wd, None)
+                self._watches.pop(path, None)
+        return changed
+
+
+def make_watcher(*, polling: bool = False) -> Watcher:
+    """Return an :class:`InotifyWatcher`, or a :class:`PollingWatcher` fallback."""
+    if not polling:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as exc:
+            logger.info("inotify unavailable (%s); polling instead", exc)
+    return PollingWatcher()
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return throttle.lstat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# --------------------------------------------------------------------------- #
+#  Index                                                                       #
+# --------------------------------------------------------------------------- #
+
+
+class EnvironmentIndex:
+    """The environments under *root*, kept current by a :class:`Watcher`.
+
+    Parameters
+    ----------
+    root:
+        Tree to index.
+    scanner:
+        Scanner used for the initial walk and to index new directories;
+        every detector by default.
+    watcher:
+        Source of change notifications; see :func:`make_watcher`.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        scanner: Scanner | None = None,
+        watcher: Watcher | None = None,
+    ) -> None:
+        self.root = root.resolve()
+        self.scanner = scanner or Scanner()
+        self.watcher: Watcher = watcher or make_watcher()
+        self.updated_at = datetime.now(tz=timezone.utc)
+        self._lock = threading.Lock()
+        # Directories walked that are not environments, and tree environments
+        # by path: both are watched.  _children maps each directory to the
+        # indexed paths right below it, so a change costs the size of that
+        # directory, not of the whole index.
+        self._dirs: set[str] = set()
+        self._tree: dict[str, Environment] = {}
+        self._children: dict[str, set[str]] = {}
+        self._globals: list[Environment] = []
+        self._globals_at = 0.0
+        # Tree environments, least recently sized first (a dict, used as an
+        # ordered set: moving a path to the end is O(1)).
+        self._resize_queue: dict[str, None] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Queries                                                             #
+    # ------------------------------------------------------------------ #
+
+    def query(self, path: Path) -> list[Environment] | None:
+        """Return what ``Scanner.scan(path)`` would, or ``None`` outside the root.
+
+        That is the tree environments at or below *path* plus the global
+        ones, largest first.
+        """
+        target = str(path)
+        if not _is_within(target, str(self.root)):
+            return None
+        with self._lock:
+            envs = [env for key, env in self._tree.items() if _is_within(key, target)]
+            envs += self._globals
+        envs.sort(key=lambda e: e.size_bytes, reverse=True)
+        return envs
+
+    def status(self) -> dict:
+        """Summary of the index for ``killpy serve --status``."""
+        with self._lock:
+            return {
+                "root": str(self.root),
+                "environments": len(self._tree) + len(self._globals),
+                "watched_directories": len(self._dirs) + len(self._tree),
+                "watcher": self.watcher.name,
+                "updated_at": self.updated_at.isoformat(),
+                "pid": os.getpid(),
+            }
+
+    # ------------------------------------------------------------------ #
+    #  Updates                                                             #
+    # ------------------------------------------------------------------ #
+
+    def build(self) -> None:
+        """Scan the whole tree and start watching it."""
+        visited: list[str] = []
+        envs = self.scanner.scan_tree(self.root, visited=visited)
+        self._add(visited, envs)
+        self._refresh_globals()
+
+    def refresh(self, timeout: float) -> None:
+        """Wait up to *timeout* seconds for changes, and apply them."""
+        changed = self.watcher.changes(timeout)
+        # Parents first, so a removed tree is forgotten in one go.
+        for path in sorted(changed):
+            if path in self._tree:
+                self._update_env(path)
+            elif path in self._dirs:
+                self._update_dir(path)
+        self._resize_some()
+        if time.monotonic() - self._globals_at >= _GLOBALS_INTERVAL_SECONDS:
+            self._refresh_globals()
+        if changed:
+            self.updated_at = datetime.now(tz=timezone.utc)
+
+    def _update_dir(self, path: str) -> None:
+        """List a changed directory again and index what appeared or vanished."""
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            self._forget(path)
+            return
+        files = [e.name for e in entries if not e.is_dir(follow_symlinks=False)]
+        if classify(os.path.basename(path), files) is not None:
+            # It just became an environment (a pyvenv.cfg was written).
+            self._forget(path)
+            self._index(path)
+            return
+        names = [
+            e.name
+            for e in entries
+            if e.is_dir(follow_symlinks=False) and e.name not in NEVER_WALKED
+        ]
+        present = {
+            os.path.join(path, name)
+            for name in MountGuard(self.root).filter(path, names)
+        }
+        with self._lock:
+            known = set(self._children.get(path, ()))
+        for child in known - present:
+            self._forget(child)
+        for child in present - known:
+            self._index(child)
+
+    def _update_env(self, path: str) -> None:
+        if not os.path.lexists(path):
+            self._forget(path)
+            return
+        self._resize(path)
+
+    def _resize_some(self) -> None:
+        for path in list(islice(self._resize_queue, _RESIZE_PER_CYCLE)):
+            if path in self._tree:
+                self._resize(path)  # moves it to the back of the queue
+            else:
+                del self._resize_queue[path]
+
+    def _resize(self, path: str) -> None:
+        env = self._tree[path]
+        usage = get_disk_usage(env.path)
+        identity: RootIdentity | None
+        try:
+            identity = RootIdentity.of(env.path)
+        except OSError:
+            identity = env.identity
+        with self._lock:
+            env.usage = usage
+            env.size_bytes = usage.apparent_bytes
+            env.identity = identity
+            if identity is not None:
+                env.last_modified = datetime.fromtimestamp(
+                    identity.mtime_ns / 1e9, tz=timezone.utc
+                )
+        self._resize_queue.pop(path, None)
+        self._resize_queue[path] = None
+
+    def _index(self, top: str) -> None:
+        visited: list[str] = []
+        envs = self.scanner.scan_tree(Path(top), visited=visited)
+        self._add(visited, envs)
+
+    def _add(self, dirs: list[str], envs: Iterable[Environment]) -> None:
+        added = [(str(env.path), env) for env in envs]
+        with self._lock:
+            self._dirs.update(dirs)
+            self._tree.update(added)
+            for path in (*dirs, *(path for path, _env in added)):
+                self._children.setdefault(os.path.dirname(path), set()).add(path)
+        for path in dirs:
+            self._watch(path)
+        for path, _env in added:
+            self._watch(path)
+            self._resize_queue.pop(path, None)
+            self._resize_queue[path] = None
+
+    def _forget(self, top: str) -> None:
+        """Drop *top* and everything indexed below it."""
+        forgotten: list[str] = []
+        with self._lock:
+            pending = [top]
+            while pending:
+                path = pending.pop()
+                if path in self._dirs or path in self._tree:
+                    forgotten.append(path)
+                    self._dirs.discard(path)
+                    self._tree.pop(path, None)
+                pending.extend(self._children.pop(path, ()))
+            self._children.get(os.path.dirname(top), set()).discard(top)
+        for path in forgotten:
+            self._resize_queue.pop(path, None)
+            self.watcher.discard(path)
+
+    def _watch(self, path: str) -> None:
+        try:
+            self.watcher.add(path)
+        except OSError as exc:
+            # Out of inotify watches: poll everything from now on.
+            logger.warning("Cannot watch %s (%s); falling back to polling", path, exc)
+            self.watcher.close()
+            self.watcher = PollingWatcher()
+            for watched in (*self._dirs, *self._tree):
+                self.watcher.add(watched)
+
+    def _refresh_globals(self) -> None:
+        found = self.scanner.scan_globals(self.root)
+        tree = {env.path.resolve() for env in self._tree.values()}
+        with self._lock:
+            self._globals = [env for env in found if env.path.resolve() not in tree]
+        self._globals_at = time.monotonic()
+
+
+def _is_within(path: str, top: str) -> bool:
+    return path == top or path.startswith(top.rstrip(os.sep) + os.sep)
+
+
+# --------------------------------------------------------------------------- #
+#  Server                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    index: EnvironmentIndex
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            reply = self._answer(request)
+        except (ValueError, KeyError, TypeError) as exc:
+            reply = {"ok": False, "error": f"bad request: {exc}"}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    def _answer(self, request: dict) -> dict:
+        index = self.server.index
+        op = request["op"]
+        if op == "status":
+            return {"ok": True, **index.status()}
+        if op == "envs":
+            envs = index.query(Path(request["path"]))
+            if envs is None:
+                return {"ok": False, "error": f"not indexing {request['path']}"}
+            return {
+                "ok": True,
+                "updated_at": index.updated_at.isoformat(),
+                "envs": [env.to_dict() for env in envs],
+            }
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+
+def serve(
+    index: EnvironmentIndex,
+    path: Path | None = None,
+    *,
+    interval: float = 2.0,
+    stop: threading.Event | None = None,
+) -> None:
+    """Answer queries about *index* on the socket at *path* until *stop* is set.
+
+    The calling thread keeps the index current, checking for changes every
+    *interval* seconds (inotify reports them sooner).
+
+    Raises
+    ------
+    DaemonError
+        If another daemon already answers on *path*.
+    """
+    path = path or socket_path()
+    stop = stop or threading.Event()
+    if path.exists():
+        if daemon_status(path) is not None:
+            raise DaemonError(f"A killpy daemon is already listening on {path}")
+        path.unlink()  # left behind by a daemon that died
+    path.parent.mkdir(parents=True, exist_ok=True)
+    server = _Server(str(path), _Handler)
+    server.index = index
+    os.chmod(path, 0o600)
+    thread = threading.Thread(target=server.serve_forever, name="killpy-serve")
+    thread.daemon = True
+    thread.start()
+    try:
+        while not stop.is_set():
+            index.refresh(interval)
+    finally:
+        server.shutdown()
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+# --------------------------------------------------------------------------- #
+#  Client                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+def query_daemon(path: Path, sock: Path | None = None) -> list[Environment] | None:
+    """Ask a running daemon for the environments under *path*.
+
+    Returns ``None`` when no daemon is running, or it does not index *path*;
+    the caller then scans as usual.  The system-critical flags are those of
+    this process, not the daemon's.
+    """
+    reply = _request({"op": "envs", "path": str(path.resolve())}, sock)
+    if reply is None or not reply.get("ok"):
+        return None
+    try:
+        envs = [Environment.from_dict(env) for env in reply["envs"]]
+    except (KeyError, TypeError, ValueError) as exc:
+        logger.debug("Unusable daemon reply: %s", exc)
+        return None
+    # The daemon flagged what *it* runs from; what matters is this process.
+    mark_system_critical(envs)
+    return envs
+
+
+def daemon_status(sock: Path | None = None) -> dict | None:
+    """Return the running daemon's :meth:`EnvironmentIndex.status`, or ``None``."""
+    reply = _request({"op": "status"}, sock)
+    if reply is None or not reply.get("ok"):
+        return None
+    return reply
+
+
+def _request(request: dict, sock: Path | None) -> dict | None:
+    path = sock or socket_path()
+    if not path.exists():
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(_CONNECT_TIMEOUT_SECONDS)
+            conn.connect(str(path))
+            conn.settimeout(_REPLY_TIMEOUT_SECONDS)
+            conn.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reply:
+                return json.loads(reply.readline())
+    except (OSError, ValueError) as exc:
+        logger.debug("No answer from the daemon on %s: %s", path, exc)
+        return None
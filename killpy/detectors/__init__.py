@@ -3,22 +3,36 @@
 All concrete detectors are exported here.  :data:`ALL_DETECTORS` provides
 the canonical ordered list used by :class:`~killpy.scanner.Scanner` when no
 explicit detector selection is given.
+
+Detector modules are imported lazily: :data:`DETECTOR_REGISTRY` maps each
+detector name to the module and class that implement it, and
+:func:`load_detectors` imports only the ones a scan asks for.  The class
+names and :data:`ALL_DETECTORS` remain importable from this package as
+before; accessing them triggers the import.
 """
 
 from __future__ import annotations
 
-from killpy.detectors.artifacts import ArtifactsDetector
+from collections.abc import Iterable
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from killpy.detectors.base import AbstractDetector
-from killpy.detectors.cache import CacheDetector
-from killpy.detectors.conda import CondaDetector
-from killpy.detectors.hatch import HatchDetector
-from killpy.detectors.pipenv import PipenvDetector
-from killpy.detectors.pipx import PipxDetector
-from killpy.detectors.poetry import PoetryDetector
-from killpy.detectors.pyenv import PyenvDetector
-from killpy.detectors.tox import ToxDetector
-from killpy.detectors.uv import UvDetector
-from killpy.detectors.venv import VenvDetector
+
+if TYPE_CHECKING:
+    from killpy.detectors.artifacts import ArtifactsDetector
+    from killpy.detectors.cache import CacheDetector
+    from killpy.detectors.conda import CondaDetector
+    from killpy.detectors.hatch import HatchDetector
+    from killpy.detectors.pipenv import PipenvDetector
+    from killpy.detectors.pipx import PipxDetector
+    from killpy.detectors.poetry import PoetryDetector
+    from killpy.detectors.pyenv import PyenvDetector
+    from killpy.detectors.tox import ToxDetector
+    from killpy.detectors.uv import UvDetector
+    from killpy.detectors.venv import VenvDetector
+
+    ALL_DETECTORS: list[type[AbstractDetector]]
 
 __all__ = [
     "AbstractDetector",
@@ -34,20 +48,55 @@ __all__ = [
     "UvDetector",
     "VenvDetector",
     "ALL_DETECTORS",
+    "DETECTOR_NAMES",
+    "DETECTOR_REGISTRY",
+    "load_detectors",
 ]
 
-# Ordered list of all detector classes.  The Scanner instantiates these in
-# this order; it respects ``can_handle()`` before calling ``detect()``.
-ALL_DETECTORS: list[type[AbstractDetector]] = [
-    VenvDetector,
-    PoetryDetector,
-    CondaDetector,
-    PipxDetector,
-    PyenvDetector,
-    PipenvDetector,
-    HatchDetector,
-    UvDetector,
-    ToxDetector,
-    CacheDetector,
-    ArtifactsDetector,
-]
+# Detector name -> (module, class), in canonical order.  The Scanner
+# instantiates detectors in this order; it respects ``can_handle()`` before
+# calling ``detect()``.
+DETECTOR_REGISTRY: dict[str, tuple[str, str]] = {
+    "venv": ("killpy.detectors.venv", "VenvDetector"),
+    "poetry": ("killpy.detectors.poetry", "PoetryDetector"),
+    "conda": ("killpy.detectors.conda", "CondaDetector"),
+    "pipx": ("killpy.detectors.pipx", "PipxDetector"),
+    "pyenv": ("killpy.detectors.pyenv", "PyenvDetector"),
+    "pipenv": ("killpy.detectors.pipenv", "PipenvDetector"),
+    "hatch": ("killpy.detectors.hatch", "HatchDetector"),
+    "uv": ("killpy.detectors.uv", "UvDetector"),
+    "tox": ("killpy.detectors.tox", "ToxDetector"),
+    "cache": ("killpy.detectors.cache", "CacheDetector"),
+    "artifacts": ("killpy.detectors.artifacts", "ArtifactsDetector"),
+}
+
+#: Every detector name, in canonical order, without importing any detector.
+DETECTOR_NAMES: tuple[str, ...] = tuple(DETECTOR_REGISTRY)
+
+_CLASS_MODULES: dict[str, str] = {
+    class_name: module for module, class_name in DETECTOR_REGISTRY.values()
+}
+
+
+def load_detectors(
+    names: Iterable[str] | None = None,
+) -> list[type[AbstractDetector]]:
+    """Import and return the detector classes for *names*, in canonical order.
+
+    ``None`` loads every detector.  Unknown names are ignored, matching the
+    Scanner's ``types`` filter.
+    """
+    wanted = DETECTOR_NAMES if names is None else set(names)
+    return [
+        getattr(import_module(module), class_name)
+        for name, (module, class_name) in DETECTOR_REGISTRY.items()
+        if name in wanted
+    ]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ALL_DETECTORS":
+        return load_detectors()
+    if name in _CLASS_MODULES:
+        return getattr(import_module(_CLASS_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,23 +9,49 @@ environment *container* (a venv, a cache dir, a build artifact, or ``.tox``);
 a match is recorded, its size is summed once, and its subtree is pruned.
 Environment pruning is always applied — once a venv is found, nothing inside it
 is scanned again — which also collapses the cache/artifact double-counting that
-used to happen inside environments.
+used to happen inside environments.  Conda environments and pyenv versions,
+which these detectors do not report, are pruned the same way.
 
 Callers pass the set of detector names whose results they want (``active``).
 Pruning happens on every container regardless of ``active``, so asking for a
 subset yields exactly what running those detectors alone would.
+
+Inside a git work tree, :func:`walk_git_candidates` goes further and asks git
+for the untracked and ignored directories (:func:`git_candidate_dirs`), then
+walks only those.  Tracked source trees are never visited, which is what keeps
+the pre-commit hooks cheap on large repositories.
+
+:func:`walk_sharded` spreads the walk of a wide root (``/home`` with
+thousands of users, say) over worker processes: the root's top-level
+directories are balanced into shards, each shard is walked and sized in a
+worker, and the environments come back as plain tuples as each shard
+finishes.
+
+Every walk consults a :class:`~killpy.mounts.MountGuard` before descending,
+so mount points the installed :class:`~killpy.mounts.MountPolicy` rules out
+(virtual filesystems, other devices under ``--one-file-system``, bind mounts
+of trees already walked) are pruned like containers.
 """
 
 from __future__ import annotations
 
+import heapq
 import logging
+import multiprocessing
 import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import astuple
 from datetime import datetime, timezone
 from pathlib import Path
 
-from killpy.detectors.base import VCS_PRUNE_DIRS
-from killpy.files import get_total_size
+from killpy import throttle
+from killpy.detectors.base import VCS_PRUNE_DIRS, is_environment_tree
+from killpy.detectors.pyenv import _pyenv_versions_root
+from killpy.files import DiskUsage, get_disk_usage
 from killpy.models import Environment
+from killpy.mounts import MountGuard, MountPolicy, get_policy, set_policy
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +59,22 @@ _CACHE_DIRS = frozenset({"__pycache__", ".mypy_cache", ".pytest_cache", ".ruff_c
 _ARTIFACT_EXACT = frozenset({"dist", "build"})
 _ARTIFACT_SUFFIXES = (".egg-info", ".dist-info")
 
+#: Directories the walk never descends into, whatever git says about them.
+NEVER_WALKED = VCS_PRUNE_DIRS | {"site-packages"}
+
+# ``git ls-files --others`` lists untracked files that are not ignored; adding
+# ``--ignored`` lists the ignored ones instead.  ``--directory`` collapses a
+# wholly untracked/ignored directory into a single ``dir/`` entry.
+_GIT_LS_OTHERS = ("ls-files", "--others", "--exclude-standard", "--directory", "-z")
+
+# Shards per worker process: enough that one slow shard does not leave the
+# other workers idle at the end, few enough to keep per-task overhead low.
+_SHARDS_PER_PROCESS = 4
+
+# An environment as sent back by a worker: path, type, mtime (epoch seconds),
+# size in bytes, whether the size is pending, and the DiskUsage fields.
+_EnvRow = tuple[str, str, float, int, bool, "tuple[int, ...] | None"]
+
 #: Map every ``Environment.type`` the shared walk (and the cache global scan)
 #: can produce back to the detector that owns it — used to group results per
 #: detector for progress callbacks.
@@ -50,7 +92,7 @@ TYPE_TO_DETECTOR: dict[str, str] = {
 }
 
 
-def _classify(basename: str, filenames: list[str]) -> tuple[str, str] | None:
+def classify(basename: str, filenames: list[str]) -> tuple[str, str] | None:
     """Return ``(detector_name, env_type)`` if the dir is a container, else ``None``."""
     if basename == ".venv" or "pyvenv.cfg" in filenames:
         return ("venv", ".venv" if basename == ".venv" else "pyvenv.cfg")
@@ -65,46 +107,281 @@ def _classify(basename: str, filenames: list[str]) -> tuple[str, str] | None:
     return None
 
 
-def _make_env(path: Path, env_type: str) -> Environment | None:
-    """Build an :class:`Environment` for *path*, summing its size once."""
+def _make_env(path: Path, env_type: str, sized: bool = True) -> Environment | None:
+    """Build an :class:`Environment` for *path*, summing its size once.
+
+    With ``sized=False`` the size is left for the caller to fill in and the
+    environment is flagged :attr:`~killpy.models.Environment.size_pending`.
+    """
     try:
         stat = path.stat()
+        usage = get_disk_usage(path) if sized else None
         return Environment(
             path=path,
             name=str(path),
             type=env_type,
             last_modified=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-            size_bytes=get_total_size(path),
+            size_bytes=usage.apparent_bytes if usage else 0,
+            size_pending=not sized,
+            usage=usage,
         )
     except (FileNotFoundError, OSError) as exc:
         logger.debug("Skipping %s: %s", path, exc)
         return None
 
 
-def walk_environments(root: Path, active: set[str]) -> list[Environment]:
+def walk_environments(
+    root: Path, active: set[str], *, sized: bool = True, enter_artifacts: bool = False
+) -> list[Environment]:
     """Walk *root* once and return environments for the ``active`` detector set.
 
     Each directory that matches a container type is reported (when its detector
     is in *active*) and its subtree pruned; VCS and ``site-packages`` trees are
-    never descended into.
+    never descended into.  With ``sized=False`` no container is descended into
+    at all, which makes the walk cheap; see :func:`_make_env`.  With
+    ``enter_artifacts=True`` build artifacts are walked like any directory
+    and never reported: the ``__pycache__`` cleaner wants the caches under
+    ``build/lib``.
+    """
+    return _walk(
+        root, active, sized, classify_top=False, enter_artifacts=enter_artifacts
+    )
+
+
+def walk_subtree(
+    top: Path, active: set[str], *, visited: list[str] | None = None
+) -> list[Environment]:
+    """Like :func:`walk_environments`, but *top* itself may be a container.
+
+    Used to index a directory that appeared inside an already indexed tree.
+    When *visited* is given, every directory walked that is not a container
+    is appended to it: those are the directories whose changes can add or
+    remove environments.
+    """
+    return _walk(top, active, True, classify_top=True, visited=visited)
+
+
+def walk_sharded(
+    root: Path,
+    active: set[str],
+    *,
+    processes: int,
+    sized: bool = True,
+    weights: dict[str, int] | None = None,
+) -> list[Environment]:
+    """Like :func:`walk_environments`, but walked by up to *processes* workers.
+
+    The top-level directories of *root* are split into balanced shards
+    (see :func:`balance_shards`), weighted by *weights* (top-level name to
+    relative cost, typically the directory counts of a previous scan; one
+    each by default).  Each shard is walked and sized in a separate process.
+    Falls back to a walk in this process when *root* has fewer than two
+    top-level directories or the worker pool cannot be started.
+    """
+    tops = _top_level_dirs(root)
+    if processes <= 1 or len(tops) <= 1:
+        return walk_environments(root, active, sized=sized)
+    weights = weights or {}
+    shards = balance_shards(
+        {top: weights.get(top, 1) for top in tops},
+        processes * _SHARDS_PER_PROCESS,
+    )
+    envs: list[Environment] = []
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(processes, len(shards)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _walk_shard,
+                    [str(root / top) for top in shard],
+                    active,
+                    sized,
+                    get_policy(),
+                )
+                for shard in shards
+            ]
+            for future in as_completed(futures):
+                envs.extend(_thaw(row) for row in future.result())
+    except (OSError, BrokenProcessPool) as exc:
+        logger.warning("Sharded walk failed (%s); walking in one process", exc)
+        return walk_environments(root, active, sized=sized)
+    return envs
+
+
+def balance_shards(weights: dict[str, int], count: int) -> list[list[str]]:
+    """Split the keys of *weights* into at most *count* shards of similar weight.
+
+    Greedy longest-processing-time: the heaviest remaining entry always goes
+    to the lightest shard.  Empty shards are dropped.
     """
+    count = max(1, min(count, len(weights)))
+    loads = [(0, i) for i in range(count)]
+    shards: list[list[str]] = [[] for _ in range(count)]
+    for name in sorted(weights, key=lambda n: (-weights[n], n)):
+        load, i = heapq.heappop(loads)
+        shards[i].append(name)
+        heapq.heappush(loads, (load + max(weights[name], 1), i))
+    return [shard for shard in shards if shard]
+
+
+def walk_git_candidates(
+    root: Path, active: set[str], *, sized: bool = True, enter_artifacts: bool = False
+) -> list[Environment] | None:
+    """Like :func:`walk_environments`, but only below git's untracked/ignored dirs.
+
+    Returns ``None`` when git cannot narrow the walk (see
+    :func:`git_candidate_dirs`); callers then fall back to
+    :func:`walk_environments`.  Containers that git tracks (a committed
+    ``build/`` package, say) are never reported.  *enter_artifacts* is as for
+    :func:`walk_environments`.
+    """
+    candidates = git_candidate_dirs(root)
+    if candidates is None:
+        return None
+    envs: list[Environment] = []
+    for top in candidates:
+        envs.extend(
+            _walk(
+                top, active, sized, classify_top=True, enter_artifacts=enter_artifacts
+            )
+        )
+    return envs
+
+
+def git_candidate_dirs(root: Path) -> list[Path] | None:
+    """Return the untracked and ignored directories under *root*, according to git.
+
+    Nested entries are collapsed into their outermost directory, and anything
+    inside a VCS, ``node_modules`` or ``site-packages`` tree is dropped, as the
+    full walk would never enter it.  Returns ``None`` when *root* is not inside
+    a git work tree, git is not installed, or *root* itself is untracked (git
+    has nothing to narrow down).
+    """
+    entries: set[str] = set()
+    for extra in ((), ("--ignored",)):
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(root), *_GIT_LS_OTHERS, *extra],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except FileNotFoundError:
+            return None
+        except subprocess.CalledProcessError as exc:
+            logger.debug("git ls-files failed in %s: %s", root, exc)
+            return None
+        except OSError as exc:
+            logger.debug("OS error running git in %s: %s", root, exc)
+            return None
+        entries.update(e for e in result.stdout.split("\0") if e.endswith("/"))
+    if "./" in entries:
+        return None
+    candidates: list[Path] = []
+    outer = ""
+    # Sorted, every ``dir/...`` entry directly follows ``dir/``.
+    for entry in sorted(entries):
+        if outer and entry.startswith(outer):
+            continue
+        if NEVER_WALKED.intersection(entry.split("/")):
+            continue
+        outer = entry
+        candidates.append(root / entry)
+    return candidates
+
+
+def _top_level_dirs(root: Path) -> list[str]:
+    """Names of the directories the walk of *root* would descend into."""
+    try:
+        with os.scandir(root) as entries:
+            names = [
+                entry.name
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and entry.name not in NEVER_WALKED
+            ]
+        # Each shard walks its tops unguarded at the top level: filter here.
+        return MountGuard(root).filter(str(root), names)
+    except OSError as exc:
+        logger.debug("Cannot list %s: %s", root, exc)
+        return []
+
+
+def _walk_shard(
+    tops: list[str], active: set[str], sized: bool, policy: MountPolicy
+) -> list[_EnvRow]:
+    """Worker-process entry point: walk each of *tops* as part of a wider root."""
+    set_policy(policy)  # spawned workers start with the default policy
+    rows: list[_EnvRow] = []
+    for top in tops:
+        for env in _walk(Path(top), active, sized, classify_top=True):
+            rows.append(
+                (
+                    str(env.path),
+                    env.type,
+                    env.last_modified.timestamp(),
+                    env.size_bytes,
+                    env.size_pending,
+                    astuple(env.usage) if env.usage else None,
+                )
+            )
+    return rows
+
+
+def _thaw(row: _EnvRow) -> Environment:
+    path, env_type, mtime, size_bytes, size_pending, usage = row
+    return Environment(
+        path=Path(path),
+        name=path,
+        type=env_type,
+        last_modified=datetime.fromtimestamp(mtime, tz=timezone.utc),
+        size_bytes=size_bytes,
+        size_pending=size_pending,
+        usage=DiskUsage(*usage) if usage else None,
+    )
+
+
+def _walk(
+    top: Path,
+    active: set[str],
+    sized: bool,
+    *,
+    classify_top: bool,
+    visited: list[str] | None = None,
+    enter_artifacts: bool = False,
+) -> list[Environment]:
     envs: list[Environment] = []
-    for current, dirnames, filenames in os.walk(root, topdown=True):
-        dirnames[:] = [d for d in dirnames if d not in VCS_PRUNE_DIRS]
+    guard = MountGuard(top)
+    pyenv_versions = str(_pyenv_versions_root())
+    for current, dirnames, filenames in throttle.walk(top):
+        dirnames[:] = guard.filter(
+            current, [d for d in dirnames if d not in VCS_PRUNE_DIRS]
+        )
         current_path = Path(current)
-        if current_path != root:
-            match = _classify(current_path.name, filenames)
+        if classify_top or current_path != top:
+            match = classify(current_path.name, filenames)
+            if enter_artifacts and match is not None and match[0] == "artifacts":
+                match = None
             if match is not None:
                 detector_name, env_type = match
                 if detector_name in active:
-                    env = _make_env(current_path, env_type)
+                    env = _make_env(current_path, env_type, sized)
                     if env is not None:
                         envs.append(env)
                 dirnames[:] = []  # env-pruning: never descend into a container
                 continue
-        # A bare ``site-packages`` (e.g. a conda env, which has no pyvenv.cfg) is
-        # not a container but must not be scanned for caches/artifacts. ``.venv``
-        # IS a container — detected on entry — so it is deliberately not pruned
-        # here (that would stop us from ever reporting it).
+            # Conda environments and pyenv versions are no container of the
+            # walk's detectors, but their caches are theirs all the same.
+            if is_environment_tree(current, dirnames, filenames, pyenv_versions):
+                dirnames[:] = []
+                continue
+        if visited is not None:
+            visited.append(current)
+        # A bare ``site-packages`` (e.g. a system Python's) is not a container
+        # but must not be scanned for caches/artifacts. ``.venv`` IS a
+        # container — detected on entry — so it is deliberately not pruned here
+        # (that would stop us from ever reporting it).
         dirnames[:] = [d for d in dirnames if d != "site-packages"]
     return envs
@@ -11,8 +11,10 @@ from killpy.detectors.base import (
     ENV_INTERNAL_DIRS,
     VCS_PRUNE_DIRS,
     AbstractDetector,
+    is_environment_tree,
 )
-from killpy.files import get_total_size
+from killpy.detectors.pyenv import _pyenv_versions_root
+from killpy.files import get_disk_usage
 from killpy.models import Environment
 
 logger = logging.getLogger(__name__)
@@ -34,10 +36,10 @@ class ArtifactsDetector(AbstractDetector):
     """Detects Python build artifact directories.
 
     Finds ``dist/``, ``build/``, ``*.egg-info/``, and ``*.dist-info/``
-    directories under the scan root.  Virtual environments (``.venv``,
-    any directory containing ``pyvenv.cfg``) and ``site-packages`` trees
-    are skipped: their ``*.dist-info`` entries are package metadata, not
-    build output.
+    directories under the scan root.  Environments (``.venv``, any
+    directory containing ``pyvenv.cfg``, conda environments, pyenv versions)
+    and ``site-packages`` trees are skipped: their ``*.dist-info`` entries
+    are package metadata, not build output.
     """
 
     name = "artifacts"
@@ -46,9 +48,10 @@ class ArtifactsDetector(AbstractDetector):
 
     def detect(self, path: Path) -> list[Environment]:
         envs: list[Environment] = []
+        pyenv_versions = str(_pyenv_versions_root())
         for current_root, directories, files in os.walk(path, topdown=True):
-            if "pyvenv.cfg" in files:
-                # Inside a virtual environment (whatever its name) — skip it.
+            if is_environment_tree(current_root, directories, files, pyenv_versions):
+                # Inside an environment (whatever its name or kind) — skip it.
                 directories[:] = []
                 continue
             pruned = set()
@@ -60,7 +63,7 @@ class ArtifactsDetector(AbstractDetector):
                     artifact_path = Path(current_root) / d
                     try:
                         stat = artifact_path.stat()
-                        size = get_total_size(artifact_path)
+                        usage = get_disk_usage(artifact_path)
                         mtime = datetime.fromtimestamp(
                             stat.st_mtime,
                             tz=timezone.utc,
@@ -71,7 +74,8 @@ class ArtifactsDetector(AbstractDetector):
                                 name=str(artifact_path),
                                 type="artifacts",
                                 last_modified=mtime,
-                                size_bytes=size,
+                                size_bytes=usage.apparent_bytes,
+                                usage=usage,
                             )
                         )
                     except (FileNotFoundError, OSError) as exc:
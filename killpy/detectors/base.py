@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import os
 import shutil
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from pathlib import Path
 from typing import ClassVar
 
 from killpy.models import Environment
+from killpy.users import other_user
 
 # Directory names shared by the filesystem-walking detectors.  Defined once
 # here so the prune policy has a single source of truth (see
@@ -22,6 +25,27 @@ VCS_PRUNE_DIRS: frozenset[str] = frozenset({".git", ".hg", ".svn", "node_modules
 # into it and double-count (or wrongly offer to delete) its contents.
 ENV_INTERNAL_DIRS: frozenset[str] = frozenset({".venv", "site-packages"})
 
+# A conda environment has no ``pyvenv.cfg``; its package metadata directory
+# marks its root instead.
+CONDA_META_DIR = "conda-meta"
+
+
+def is_environment_tree(
+    path: str, dirnames: Iterable[str], filenames: Iterable[str], pyenv_versions: str
+) -> bool:
+    """Return whether the directory *path* is the root of an environment tree.
+
+    That is a virtual environment (it holds a ``pyvenv.cfg``), a conda
+    environment (it holds ``conda-meta``) or a pyenv-installed Python (it sits
+    directly in *pyenv_versions*, pyenv's versions directory).  Whatever such a
+    tree holds, its caches included, belongs to the interpreter that owns it.
+    """
+    return (
+        "pyvenv.cfg" in filenames
+        or CONDA_META_DIR in dirnames
+        or os.path.dirname(path) == pyenv_versions
+    )
+
 
 class AbstractDetector(ABC):
     """Common interface every detector must implement.
@@ -107,9 +131,17 @@ class AbstractDetector(ABC):
         Computed from the declared contract (see the class docstring); a
         pre-flight gate that never raises and does no I/O beyond ``which()`` /
         ``exists()``.  Do not override — declare the contract instead.
+
+        When resolving another user's directories (see
+        :func:`killpy.users.as_user`) a tool on ``PATH`` does not count: it
+        would report the invoking user's environments.
         """
         if self.always_available:
             return True
-        if self.required_tool is not None and shutil.which(self.required_tool):
+        if (
+            self.required_tool is not None
+            and not other_user()
+            and shutil.which(self.required_tool)
+        ):
             return True
         return any(d.exists() for d in self._candidate_dirs())
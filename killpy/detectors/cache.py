@@ -21,9 +21,12 @@ from killpy.detectors.base import (
     ENV_INTERNAL_DIRS,
     VCS_PRUNE_DIRS,
     AbstractDetector,
+    is_environment_tree,
 )
-from killpy.files import get_total_size
+from killpy.detectors.pyenv import _pyenv_versions_root
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
@@ -42,28 +45,28 @@ _LOCAL_CACHE_DIRS: tuple[str, ...] = (
 
 def _pip_cache_dir() -> Path:
     """Return pip's cache directory, honouring env vars and the platform."""
-    override = os.environ.get("PIP_CACHE_DIR")
+    override = user_env("PIP_CACHE_DIR")
     if override:
         return Path(override).expanduser()
     system = platform.system()
     if system == "Windows":  # pragma: no cover
-        return Path.home() / "AppData" / "Local" / "pip" / "cache"  # pragma: no cover
+        return user_home() / "AppData" / "Local" / "pip" / "cache"  # pragma: no cover
     if system == "Darwin":
-        return Path.home() / "Library" / "Caches" / "pip"
-    xdg = os.environ.get("XDG_CACHE_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".cache"
+        return user_home() / "Library" / "Caches" / "pip"
+    xdg = user_env("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else user_home() / ".cache"
     return base / "pip"
 
 
 def _uv_cache_dir() -> Path:
     """Return uv's cache directory (uv uses XDG-style paths on all Unixes)."""
-    override = os.environ.get("UV_CACHE_DIR")
+    override = user_env("UV_CACHE_DIR")
     if override:
         return Path(override).expanduser()
     if platform.system() == "Windows":  # pragma: no cover
-        return Path.home() / "AppData" / "Local" / "uv" / "cache"  # pragma: no cover
-    xdg = os.environ.get("XDG_CACHE_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".cache"
+        return user_home() / "AppData" / "Local" / "uv" / "cache"  # pragma: no cover
+    xdg = user_env("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else user_home() / ".cache"
     return base / "uv"
 
 
@@ -89,13 +92,15 @@ class CacheDetector(AbstractDetector):
     def _scan_local(self, root: Path) -> list[Environment]:
         """Walk *root* and collect all known local cache directories.
 
-        Virtual environments (``.venv``, any directory containing
-        ``pyvenv.cfg``) and ``site-packages`` trees are skipped.
+        Environments (``.venv``, any directory containing ``pyvenv.cfg``,
+        conda environments, pyenv versions) and ``site-packages`` trees are
+        skipped.
         """
         results: list[Environment] = []
+        pyenv_versions = str(_pyenv_versions_root())
         for current_root, directories, files in os.walk(root, topdown=True):
-            if "pyvenv.cfg" in files:
-                # Inside a virtual environment (whatever its name) — skip it.
+            if is_environment_tree(current_root, directories, files, pyenv_versions):
+                # Inside an environment (whatever its name or kind) — skip it.
                 directories[:] = []
                 continue
             pruned = set()
@@ -146,12 +151,13 @@ class CacheDetector(AbstractDetector):
 
 def _make_cache_env(cache_path: Path, tag: str) -> Environment:
     stat = cache_path.stat()
-    size = get_total_size(cache_path)
+    usage = get_disk_usage(cache_path)
     mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
     return Environment(
         path=cache_path,
         name=str(cache_path),
         type=tag,
         last_modified=mtime,
-        size_bytes=size,
+        size_bytes=usage.apparent_bytes,
+        usage=usage,
     )
@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
 
 logger = logging.getLogger(__name__)
@@ -87,7 +87,7 @@ class CondaDetector(AbstractDetector):
                 continue
             try:
                 stat = env_path.stat()
-                size = get_total_size(env_path)
+                usage = get_disk_usage(env_path)
                 mtime = datetime.fromtimestamp(
                     stat.st_mtime,
                     tz=timezone.utc,
@@ -98,7 +98,8 @@ class CondaDetector(AbstractDetector):
                         name=env_name,
                         type="conda",
                         last_modified=mtime,
-                        size_bytes=size,
+                        size_bytes=usage.apparent_bytes,
+                        usage=usage,
                         managed_by="conda",
                     )
                 )
@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import logging
-import os
 import platform
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +21,16 @@ def _hatch_envs_root() -> Path:
     Honours ``HATCH_DATA_DIR`` and ``XDG_DATA_HOME``; uses the
     platform-specific data location on macOS and Windows.
     """
-    override = os.environ.get("HATCH_DATA_DIR")
+    override = user_env("HATCH_DATA_DIR")
     if override:
         return Path(override).expanduser() / "env"
     system = platform.system()
     if system == "Windows":  # pragma: no cover
-        return Path.home() / "AppData" / "Local" / "hatch" / "env"  # pragma: no cover
+        return user_home() / "AppData" / "Local" / "hatch" / "env"  # pragma: no cover
     if system == "Darwin":
-        return Path.home() / "Library" / "Application Support" / "hatch" / "env"
-    xdg = os.environ.get("XDG_DATA_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".local" / "share"
+        return user_home() / "Library" / "Application Support" / "hatch" / "env"
+    xdg = user_env("XDG_DATA_HOME")
+    base = Path(xdg) if xdg else user_home() / ".local" / "share"
     return base / "hatch" / "env"
 
 
@@ -63,7 +63,7 @@ class HatchDetector(AbstractDetector):
                         continue
                     try:
                         stat = env_dir.stat()
-                        size = get_total_size(env_dir)
+                        usage = get_disk_usage(env_dir)
                         mtime = datetime.fromtimestamp(
                             stat.st_mtime,
                             tz=timezone.utc,
@@ -74,7 +74,8 @@ class HatchDetector(AbstractDetector):
                                 name=f"{project_dir.name}/{env_dir.name}",
                                 type="hatch",
                                 last_modified=mtime,
-                                size_bytes=size,
+                                size_bytes=usage.apparent_bytes,
+                                usage=usage,
                             )
                         )
                     except (FileNotFoundError, OSError) as exc:
@@ -3,26 +3,26 @@
 from __future__ import annotations
 
 import logging
-import os
 import platform
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
 
 def _pipenv_venvs_root() -> Path:
     """Return the pipenv virtualenvs directory, honouring ``WORKON_HOME``."""
-    override = os.environ.get("WORKON_HOME")
+    override = user_env("WORKON_HOME")
     if override:
         return Path(override).expanduser()
     if platform.system() == "Windows":  # pragma: no cover
-        return Path.home() / ".virtualenvs"  # pragma: no cover
-    return Path.home() / ".local" / "share" / "virtualenvs"
+        return user_home() / ".virtualenvs"  # pragma: no cover
+    return user_home() / ".local" / "share" / "virtualenvs"
 
 
 class PipenvDetector(AbstractDetector):
@@ -52,7 +52,7 @@ class PipenvDetector(AbstractDetector):
                     continue
                 try:
                     stat = venv_path.stat()
-                    size = get_total_size(venv_path)
+                    usage = get_disk_usage(venv_path)
                     mtime = datetime.fromtimestamp(
                         stat.st_mtime,
                         tz=timezone.utc,
@@ -63,7 +63,8 @@ class PipenvDetector(AbstractDetector):
                             name=venv_path.name,
                             type="pipenv",
                             last_modified=mtime,
-                            size_bytes=size,
+                            size_bytes=usage.apparent_bytes,
+                            usage=usage,
                         )
                     )
                 except (FileNotFoundError, OSError) as exc:
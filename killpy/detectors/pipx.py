@@ -4,15 +4,15 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 import platform
 import subprocess
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
@@ -24,26 +24,26 @@ def _pipx_venvs_root() -> Path:
     using it when it already exists) and ``XDG_DATA_HOME``; on macOS the
     platformdirs-based location is checked as well.
     """
-    override = os.environ.get("PIPX_HOME")
+    override = user_env("PIPX_HOME")
     if override:
         return Path(override).expanduser() / "venvs"
-    legacy = Path.home() / ".local" / "pipx" / "venvs"
+    legacy = user_home() / ".local" / "pipx" / "venvs"
     if legacy.exists():
         return legacy
     system = platform.system()
     if system == "Windows":  # pragma: no cover
         local_app = (
-            Path.home() / "AppData" / "Local" / "pipx" / "venvs"
+            user_home() / "AppData" / "Local" / "pipx" / "venvs"
         )  # pragma: no cover
         if local_app.exists():  # pragma: no cover
             return local_app  # pragma: no cover
-        return Path.home() / "pipx" / "venvs"  # pragma: no cover
+        return user_home() / "pipx" / "venvs"  # pragma: no cover
     if system == "Darwin":
-        mac_root = Path.home() / "Library" / "Application Support" / "pipx" / "venvs"
+        mac_root = user_home() / "Library" / "Application Support" / "pipx" / "venvs"
         if mac_root.exists():
             return mac_root
-    xdg = os.environ.get("XDG_DATA_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".local" / "share"
+    xdg = user_env("XDG_DATA_HOME")
+    base = Path(xdg) if xdg else user_home() / ".local" / "share"
     return base / "pipx" / "venvs"
 
 
@@ -116,7 +116,7 @@ class PipxDetector(AbstractDetector):
 
             try:
                 stat = candidate.stat()
-                size = get_total_size(candidate)
+                usage = get_disk_usage(candidate)
                 mtime = datetime.fromtimestamp(
                     stat.st_mtime,
                     tz=timezone.utc,
@@ -127,7 +127,8 @@ class PipxDetector(AbstractDetector):
                         name=package_name,
                         type="pipx",
                         last_modified=mtime,
-                        size_bytes=size,
+                        size_bytes=usage.apparent_bytes,
+                        usage=usage,
                         managed_by="pipx",
                     )
                 )
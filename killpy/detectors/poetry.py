@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import logging
-import os
 import platform
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +21,18 @@ def _poetry_venvs_dir() -> Path:
     Honours ``POETRY_CACHE_DIR`` and ``XDG_CACHE_HOME``; uses the
     platform-specific cache location on macOS and Windows.
     """
-    override = os.environ.get("POETRY_CACHE_DIR")
+    override = user_env("POETRY_CACHE_DIR")
     if override:
         return Path(override).expanduser() / "virtualenvs"
     system = platform.system()
     if system == "Windows":  # pragma: no cover
         return (
-            Path.home() / "AppData" / "Local" / "pypoetry" / "Cache" / "virtualenvs"
+            user_home() / "AppData" / "Local" / "pypoetry" / "Cache" / "virtualenvs"
         )  # pragma: no cover
     if system == "Darwin":
-        return Path.home() / "Library" / "Caches" / "pypoetry" / "virtualenvs"
-    xdg = os.environ.get("XDG_CACHE_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".cache"
+        return user_home() / "Library" / "Caches" / "pypoetry" / "virtualenvs"
+    xdg = user_env("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else user_home() / ".cache"
     return base / "pypoetry" / "virtualenvs"
 
 
@@ -62,7 +62,7 @@ class PoetryDetector(AbstractDetector):
                     continue
                 try:
                     stat = venv_path.stat()
-                    size = get_total_size(venv_path)
+                    usage = get_disk_usage(venv_path)
                     mtime = datetime.fromtimestamp(
                         stat.st_mtime,
                         tz=timezone.utc,
@@ -73,7 +73,8 @@ class PoetryDetector(AbstractDetector):
                             name=venv_path.name,
                             type="poetry",
                             last_modified=mtime,
-                            size_bytes=size,
+                            size_bytes=usage.apparent_bytes,
+                            usage=usage,
                         )
                     )
                 except (FileNotFoundError, OSError) as exc:
@@ -3,24 +3,24 @@
 from __future__ import annotations
 
 import logging
-import os
 import platform
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
 
 def _pyenv_root() -> Path:
     """Return the pyenv root directory, honouring ``PYENV_ROOT``."""
-    override = os.environ.get("PYENV_ROOT")
+    override = user_env("PYENV_ROOT")
     if override:
         return Path(override).expanduser()
-    return Path.home() / ".pyenv"
+    return user_home() / ".pyenv"
 
 
 def _pyenv_versions_root() -> Path:
@@ -58,7 +58,7 @@ class PyenvDetector(AbstractDetector):
                     continue
                 try:
                     stat = version_dir.stat()
-                    size = get_total_size(version_dir)
+                    usage = get_disk_usage(version_dir)
                     mtime = datetime.fromtimestamp(
                         stat.st_mtime,
                         tz=timezone.utc,
@@ -69,7 +69,8 @@ class PyenvDetector(AbstractDetector):
                             name=version_dir.name,
                             type="pyenv",
                             last_modified=mtime,
-                            size_bytes=size,
+                            size_bytes=usage.apparent_bytes,
+                            usage=usage,
                         )
                     )
                 except (FileNotFoundError, OSError) as exc:
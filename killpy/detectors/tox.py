@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import VCS_PRUNE_DIRS, AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,7 @@ class ToxDetector(AbstractDetector):
                     tox_path = Path(current_root) / d
                     try:
                         stat = tox_path.stat()
-                        size = get_total_size(tox_path)
+                        usage = get_disk_usage(tox_path)
                         mtime = datetime.fromtimestamp(
                             stat.st_mtime,
                             tz=timezone.utc,
@@ -44,7 +44,8 @@ class ToxDetector(AbstractDetector):
                                 name=str(tox_path),
                                 type="tox",
                                 last_modified=mtime,
-                                size_bytes=size,
+                                size_bytes=usage.apparent_bytes,
+                                usage=usage,
                             )
                         )
                     except (FileNotFoundError, OSError) as exc:
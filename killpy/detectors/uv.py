@@ -3,30 +3,30 @@
 from __future__ import annotations
 
 import logging
-import os
 from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
+from killpy.users import user_env, user_home
 
 logger = logging.getLogger(__name__)
 
 
 def _uv_data_dir() -> Path:
-    xdg = os.environ.get("XDG_DATA_HOME")
-    base = Path(xdg) if xdg else Path.home() / ".local" / "share"
+    xdg = user_env("XDG_DATA_HOME")
+    base = Path(xdg) if xdg else user_home() / ".local" / "share"
     return base / "uv"
 
 
 def _uv_tools_dir() -> Path:
-    override = os.environ.get("UV_TOOL_DIR")
+    override = user_env("UV_TOOL_DIR")
     return Path(override) if override else _uv_data_dir() / "tools"
 
 
 def _uv_python_dir() -> Path:
-    override = os.environ.get("UV_PYTHON_INSTALL_DIR")
+    override = user_env("UV_PYTHON_INSTALL_DIR")
     return Path(override) if override else _uv_data_dir() / "python"
 
 
@@ -74,7 +74,7 @@ class UvDetector(AbstractDetector):
                     continue
                 try:
                     stat = env_dir.stat()
-                    size = get_total_size(env_dir)
+                    usage = get_disk_usage(env_dir)
                     mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
                     envs.append(
                         Environment(
@@ -82,7 +82,8 @@ class UvDetector(AbstractDetector):
                             name=env_dir.name,
                             type="uv",
                             last_modified=mtime,
-                            size_bytes=size,
+                            size_bytes=usage.apparent_bytes,
+                            usage=usage,
                             managed_by=managed_by,
                         )
                     )
@@ -8,7 +8,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from killpy.detectors.base import VCS_PRUNE_DIRS, AbstractDetector
-from killpy.files import get_total_size
+from killpy.files import get_disk_usage
 from killpy.models import Environment
 
 logger = logging.getLogger(__name__)
@@ -100,12 +100,13 @@ class VenvDetector(AbstractDetector):
 
 def _make_env(dir_path: Path, tag: str) -> Environment:
     stat = dir_path.stat()
-    size = get_total_size(dir_path)
+    usage = get_disk_usage(dir_path)
     mtime = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
     return Environment(
         path=dir_path,
         name=str(dir_path),
         type=tag,
         last_modified=mtime,
-        size_bytes=size,
+        size_bytes=usage.apparent_bytes,
+        usage=usage,
     )
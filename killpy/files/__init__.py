@@ -1,26 +1,192 @@
-"""File-size helpers: recursive byte totals and human-readable formatting."""
+"""File-size helpers: recursive byte totals and human-readable formatting.
+
+:func:`get_disk_usage` is the one sizing walk: a single ``lstat`` per file
+yields both the apparent size and the *reclaimable* size, i.e. what deleting
+the tree actually frees once hard links are taken into account (uv and conda
+hardlink installed files out of their package caches, so a venv's apparent
+size can be several times what its deletion returns).
+
+The same ``lstat`` also gives the allocated size (``st_blocks``), which is what
+``du`` reports and what filesystem-full alerts measure.  Callers pick one of
+the two with a :data:`SizeMode`.  The walk also counts the files and
+directories it sees, i.e. the inodes deleting the tree gives back, for hosts
+that run out of inodes before they run out of bytes.
+"""
 
 from __future__ import annotations
 
 import os
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Literal
 
+from killpy import throttle
+from killpy.files.hardlinks import HardlinkTally
+from killpy.mounts import MountGuard
 
-def get_total_size(path: Path) -> int:
-    """Return the recursive size of *path* in bytes.
+#: ``"apparent"`` sizes files by ``st_size``; ``"disk"`` by allocated blocks.
+SizeMode = Literal["apparent", "disk"]
+SIZE_MODES: tuple[SizeMode, ...] = ("apparent", "disk")
 
-    Symlinks are never followed: a link inside an environment must not
-    pull in the size of targets outside it (nor create walk loops).  The
-    link's own size is what gets counted.
+# Unit prefixes accepted by :func:`parse_size`; binary, like :func:`format_size`.
+_SIZE_PREFIXES = {"": 0, "K": 10, "M": 20, "G": 30, "T": 40}
+_SIZE_RE = re.compile(r"\s*(\d+(?:\.\d*)?|\.\d+)\s*(?:([KMGT])I?)?B?\s*", re.IGNORECASE)
+
+# ``st_blocks`` is always in 512-byte units, whatever the filesystem block size.
+_BLOCK_UNIT = 512
+
+if hasattr(os.stat_result, "st_blocks"):
+
+    def _allocated_bytes(stat: os.stat_result) -> int:
+        return stat.st_blocks * _BLOCK_UNIT
+
+else:  # Windows reports no block allocation
+
+    def _allocated_bytes(stat: os.stat_result) -> int:
+        return stat.st_size
+
+
+@dataclass(slots=True)
+class DiskUsage:
+    """Totals from one sizing walk of a directory tree.
+
+    Attributes
+    ----------
+    apparent_bytes:
+        Sum of ``st_size`` over every file; a hardlinked file counts once per
+        link.  This is what :func:`get_total_size` returns.
+    reclaimable_bytes:
+        Bytes that deleting the tree frees: files with a single link, plus
+        hardlinked files whose every link lies inside the tree (counted once).
+    disk_bytes:
+        Allocated size (``st_blocks * 512``) with each inode counted once, as
+        ``du`` does.  Sparse files count only their allocated blocks, and a
+        tiny ``.pyc`` a whole filesystem block.  The directories' own blocks
+        are not included, which keeps the walk at one ``lstat`` per file.
+    reclaimable_disk_bytes:
+        :attr:`reclaimable_bytes`, measured in allocated blocks.
+    file_count:
+        Non-directory inodes (files and symlinks), each counted once.
+    reclaimable_file_count:
+        The files whose inode deleting the tree frees, by the same hard-link
+        rule as :attr:`reclaimable_bytes`.
+    dir_count:
+        Directories walked, the tree's root included.
+    """
+
+    apparent_bytes: int = 0
+    reclaimable_bytes: int = 0
+    disk_bytes: int = 0
+    reclaimable_disk_bytes: int = 0
+    file_count: int = 0
+    reclaimable_file_count: int = 0
+    dir_count: int = 0
+
+    @property
+    def inode_count(self) -> int:
+        """Inodes in the tree: :attr:`file_count` plus :attr:`dir_count`."""
+        return self.file_count + self.dir_count
+
+    @property
+    def reclaimable_inode_count(self) -> int:
+        """Inodes deleting the tree frees; every directory is always freed."""
+        return self.reclaimable_file_count + self.dir_count
+
+    def size(self, mode: SizeMode = "apparent") -> int:
+        """Return :attr:`apparent_bytes` or :attr:`disk_bytes` per *mode*."""
+        return self.disk_bytes if mode == "disk" else self.apparent_bytes
+
+    def reclaimable(self, mode: SizeMode = "apparent") -> int:
+        """Return the reclaimable bytes measured per *mode*."""
+        return self.reclaimable_disk_bytes if mode == "disk" else self.reclaimable_bytes
+
+
+def _iter_dir_stats(path: Path) -> Iterator[list[os.stat_result]]:
+    """Yield, per directory under *path*, the ``lstat`` of each of its files.
+
+    Symlinks are never followed, nor mount points the installed
+    :class:`~killpy.mounts.MountPolicy` rules out.  Files that vanish or
+    cannot be stat'ed mid-walk are skipped.
     """
-    total_size = 0
-    for current_root, _dirs, files in os.walk(path):
+    guard = MountGuard(path)
+    for current_root, dirs, files in throttle.walk(path):
+        dirs[:] = guard.filter(current_root, dirs)
+        stats = []
         for name in files:
             try:
-                total_size += os.lstat(os.path.join(current_root, name)).st_size
+                stats.append(throttle.lstat(os.path.join(current_root, name)))
             except OSError:
                 continue
-    return total_size
+        yield stats
+
+
+def get_disk_usage(path: Path) -> DiskUsage:
+    """Return the :class:`DiskUsage` of *path* in a single walk.
+
+    Symlinks are never followed: a link inside an environment must not
+    pull in the size of targets outside it (nor create walk loops).  The
+    link's own size is what gets counted.
+    """
+    usage = DiskUsage()
+    # Multiply-linked inodes are tallied compactly: one whose links all turn
+    # up lives entirely inside *path*.
+    tally = HardlinkTally()
+    for stats in _iter_dir_stats(path):
+        usage.dir_count += 1
+        for stat in stats:
+            _add_file(usage, stat, tally)
+    linked = tally.totals()
+    usage.disk_bytes += linked.allocated
+    usage.file_count += linked.inodes
+    usage.reclaimable_bytes += linked.complete_bytes
+    usage.reclaimable_disk_bytes += linked.complete_allocated
+    usage.reclaimable_file_count += linked.complete_inodes
+    return usage
+
+
+def _add_file(usage: DiskUsage, stat: os.stat_result, tally: HardlinkTally) -> None:
+    allocated = _allocated_bytes(stat)
+    usage.apparent_bytes += stat.st_size
+    if stat.st_nlink > 1:
+        tally.add(stat.st_dev, stat.st_ino, stat.st_nlink, stat.st_size, allocated)
+        return
+    usage.disk_bytes += allocated
+    usage.file_count += 1
+    usage.reclaimable_bytes += stat.st_size
+    usage.reclaimable_disk_bytes += allocated
+    usage.reclaimable_file_count += 1
+
+
+def get_total_size(path: Path) -> int:
+    """Return the recursive (apparent) size of *path* in bytes.
+
+    See :func:`get_disk_usage`, which this wraps.
+    """
+    return get_disk_usage(path).apparent_bytes
+
+
+def get_reclaimable_size(paths: Iterable[Path], mode: SizeMode = "apparent") -> int:
+    """Return the bytes freed by deleting every tree in *paths* together.
+
+    Unlike summing each tree's :attr:`DiskUsage.reclaimable_bytes`, a file
+    hardlinked between two of the trees counts as freed.  The hardlinked
+    inodes are tallied in compact arrays (see :class:`HardlinkTally`), so
+    selections with tens of millions of linked files stay affordable.
+    Files are sized per *mode*.
+    """
+    total = 0
+    tally = HardlinkTally()
+    for path in paths:
+        for stats in _iter_dir_stats(path):
+            for stat in stats:
+                size = _allocated_bytes(stat) if mode == "disk" else stat.st_size
+                if stat.st_nlink <= 1:
+                    total += size
+                else:
+                    tally.add(stat.st_dev, stat.st_ino, stat.st_nlink, size)
+    return total + tally.complete_bytes()
 
 
 def format_size(size_bytes: int) -> str:
@@ -33,3 +199,20 @@ def format_size(size_bytes: int) -> str:
         return f"{size_bytes / (1 << 10):.2f} KB"
     else:
         return f"{size_bytes} bytes"
+
+
+def parse_size(text: str) -> int:
+    """Parse a size such as ``"20GB"``, ``"1.5g"``, ``"500 MiB"`` or ``"4096"``.
+
+    Units are binary (``1 KB == 1024 bytes``), matching :func:`format_size`.
+
+    Raises
+    ------
+    ValueError
+        If *text* is not a size.
+    """
+    match = _SIZE_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"Not a size: {text!r}")
+    number, prefix = match.groups()
+    return int(float(number) * (1 << _SIZE_PREFIXES[(prefix or "").upper()]))
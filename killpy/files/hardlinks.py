@@ -0,0 +1,98 @@
+"""Compact tally of hardlinked inodes across many directory trees.
+
+Deciding whether deleting a selection frees a hardlinked file means counting
+how many of its links the selection contains.  Holding one Python object per
+link would cost well over 100 bytes each; :class:`HardlinkTally` instead
+buffers a bounded number of entries, sorts them, and spills each sorted run
+into typed arrays (36 bytes per link).  The runs are merged lazily at the end.
+
+Both a single tree's :class:`~killpy.files.DiskUsage` and the reclaimable size
+of a whole selection are tallied this way.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from dataclasses import dataclass
+from itertools import groupby
+from operator import itemgetter
+
+# Entries sorted and spilled at a time: bounds the transient list of tuples
+# to a few tens of megabytes.
+_RUN_LENGTH = 1 << 18
+
+# (st_dev, st_ino, st_nlink, size, allocated bytes)
+_Entry = tuple[int, int, int, int, int]
+_Run = tuple[array, array, array, array, array]
+
+
+@dataclass
+class InodeTotals:
+    """Totals over the distinct inodes of a :class:`HardlinkTally`.
+
+    Attributes
+    ----------
+    inodes, allocated:
+        Every inode recorded, and their allocated bytes, each counted once.
+    complete_inodes, complete_bytes, complete_allocated:
+        The same for the inodes whose every link was recorded, plus their
+        size.
+    """
+
+    inodes: int = 0
+    allocated: int = 0
+    complete_inodes: int = 0
+    complete_bytes: int = 0
+    complete_allocated: int = 0
+
+
+class HardlinkTally:
+    """Count the links seen of each multiply-linked inode."""
+
+    def __init__(self) -> None:
+        self._buffer: list[_Entry] = []
+        self._runs: list[_Run] = []
+
+    def add(
+        self, dev: int, ino: int, nlink: int, size: int, allocated: int = 0
+    ) -> None:
+        """Record one link to inode (*dev*, *ino*) of *size* and *allocated* bytes."""
+        self._buffer.append((dev, ino, nlink, size, allocated))
+        if len(self._buffer) >= _RUN_LENGTH:
+            self._spill()
+
+    def complete_bytes(self) -> int:
+        """Return the size of every inode whose links were all recorded."""
+        return self.totals().complete_bytes
+
+    def totals(self) -> InodeTotals:
+        """Return the :class:`InodeTotals` of the links recorded so far."""
+        self._spill()
+        totals = InodeTotals()
+        merged = heapq.merge(*(zip(*run) for run in self._runs))
+        for _inode, links in groupby(merged, key=itemgetter(0, 1)):
+            _dev, _ino, nlink, size, allocated = next(links)
+            totals.inodes += 1
+            totals.allocated += allocated
+            if 1 + sum(1 for _ in links) >= nlink:
+                totals.complete_inodes += 1
+                totals.complete_bytes += size
+                totals.complete_allocated += allocated
+        return totals
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort()
+        devs, inos, nlinks, sizes, allocated = zip(*self._buffer)
+        self._runs.append(
+            (
+                array("Q", devs),
+                array("Q", inos),
+                array("I", nlinks),
+                array("Q", sizes),
+                array("Q", allocated),
+            )
+        )
+        self._buffer = []
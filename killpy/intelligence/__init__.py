@@ -3,7 +3,14 @@
 from __future__ import annotations
 
 from killpy.intelligence.git_analyzer import GitAnalyzer
-from killpy.intelligence.scoring import ScoringService, ScoringWeights, score_all
+from killpy.intelligence.planner import DeletionPlan, PlannedDeletion, plan_to_free
+from killpy.intelligence.scoring import (
+    ScoringService,
+    ScoringWeights,
+    rescore_all,
+    score_all,
+    score_batch,
+)
 from killpy.intelligence.suggestions import SuggestionEngine
 from killpy.intelligence.tracker import UsageTracker
 from killpy.models import (
@@ -15,8 +22,10 @@ from killpy.models import (
 )
 
 __all__ = [
+    "DeletionPlan",
     "GitAnalyzer",
     "GitInfo",
+    "PlannedDeletion",
     "ScoringService",
     "ScoringWeights",
     "ScoredEnvironment",
@@ -25,6 +34,9 @@ __all__ = [
     "UsageTracker",
     "ScanRecord",
     "score_all",
+    "score_batch",
+    "rescore_all",
+    "plan_to_free",
     "analyze_environments",
 ]
 
@@ -0,0 +1,228 @@
+"""Optional SQLite store for scan history and per-environment observations.
+
+Enabled by pointing the ``KILLPY_HISTORY_DB`` environment variable at a
+database file (see :class:`~killpy.intelligence.tracker.UsageTracker`).  Each
+scan is stored together with one row per environment it saw, so
+``killpy stats --history`` can answer windowed and per-type questions with
+indexed queries instead of replaying the JSON history.
+
+The database runs in WAL mode with a busy timeout, so a cron ``stats``, a
+pre-commit hook and an interactive TUI can all write to it concurrently.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from killpy.models import Environment, ScanRecord
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_VERSION = 1
+
+# Seconds a writer waits for a concurrent writer's lock before giving up.
+_BUSY_TIMEOUT_SECONDS = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    scan_path TEXT NOT NULL,
+    total_space_found INTEGER NOT NULL,
+    environments_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS observations (
+    scan_id INTEGER NOT NULL REFERENCES scans(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    type TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS deletions (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER REFERENCES scans(id) ON DELETE SET NULL,
+    ts REAL NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scans_ts ON scans(ts);
+CREATE INDEX IF NOT EXISTS idx_scans_path_ts ON scans(scan_path, ts);
+CREATE INDEX IF NOT EXISTS idx_observations_scan_type
+    ON observations(scan_id, type);
+CREATE INDEX IF NOT EXISTS idx_observations_path ON observations(path);
+CREATE INDEX IF NOT EXISTS idx_deletions_ts ON deletions(ts);
+"""
+
+# Per (month, type): totals from the latest scan of each root in that month,
+# summed across roots — one consistent reading per root per period.
+_TRENDS_QUERY = """
+WITH latest AS (
+    SELECT strftime('%Y-%m', ts, 'unixepoch') AS period,
+           scan_path,
+           MAX(id) AS scan_id
+    FROM scans
+    WHERE ts >= ?
+    GROUP BY period, scan_path
+)
+SELECT latest.period, o.type, COUNT(*), SUM(o.size_bytes)
+FROM latest
+JOIN observations AS o ON o.scan_id = latest.scan_id
+GROUP BY latest.period, o.type
+ORDER BY o.type, latest.period
+"""
+
+
+def _epoch(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class HistoryStore:
+    """Scan, observation and deletion history in a SQLite database.
+
+    Every method opens a short-lived connection, so an instance is cheap to
+    keep around and safe to use from several processes.  Errors propagate as
+    :class:`sqlite3.Error`; :class:`~killpy.intelligence.tracker.UsageTracker`
+    decides how best-effort to be about them.
+    """
+
+    #: The exception the methods raise, for callers that do not import sqlite3.
+    Error = sqlite3.Error
+
+    def __init__(self, db_path: Path) -> None:
+        self._path = db_path
+
+    # ------------------------------------------------------------------ #
+    #  Write operations                                                    #
+    # ------------------------------------------------------------------ #
+
+    def record_scan(
+        self, record: ScanRecord, environments: Iterable[Environment] = ()
+    ) -> int:
+        """Store *record* and one observation per environment; return the scan id."""
+        rows = []
+        for env in environments:
+            try:
+                mtime: float | None = _epoch(env.last_modified)
+            except (OverflowError, OSError, ValueError):
+                mtime = None
+            rows.append((str(env.path), env.type, env.size_bytes, mtime))
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO scans (ts, scan_path, total_space_found,"
+                " environments_count) VALUES (?, ?, ?, ?)",
+                (
+                    _epoch(record.timestamp),
+                    record.scan_path,
+                    record.total_space_found,
+                    record.environments_count,
+                ),
+            )
+            scan_id = int(cursor.lastrowid or 0)
+            if record.total_space_deleted:
+                conn.execute(
+                    "INSERT INTO deletions (scan_id, ts, size_bytes) VALUES (?, ?, ?)",
+                    (scan_id, _epoch(record.timestamp), record.total_space_deleted),
+                )
+            conn.executemany(
+                "INSERT INTO observations (scan_id, path, type, size_bytes, mtime)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(scan_id, *row) for row in rows],
+            )
+        return scan_id
+
+    def record_deletion(self, size_bytes: int) -> None:
+        """Record *size_bytes* freed, attributed to the most recent scan."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO deletions (scan_id, ts, size_bytes)"
+                " VALUES ((SELECT MAX(id) FROM scans), ?, ?)",
+                (datetime.now(tz=timezone.utc).timestamp(), size_bytes),
+            )
+
+    # ------------------------------------------------------------------ #
+    #  Read operations                                                     #
+    # ------------------------------------------------------------------ #
+
+    def summary(self, since: datetime | None = None) -> dict:
+        """Return the ``get_summary`` aggregates for scans at or after *since*."""
+        start = _epoch(since) if since is not None else 0.0
+        with self._connect() as conn:
+            count, found, last_ts = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_space_found), 0), MAX(ts)"
+                " FROM scans WHERE ts >= ?",
+                (start,),
+            ).fetchone()
+            (deleted,) = conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM deletions WHERE ts >= ?",
+                (start,),
+            ).fetchone()
+        return {
+            "total_scans": count,
+            "total_space_found": found,
+            "total_space_deleted": deleted,
+            "last_scan_time": (
+                datetime.fromtimestamp(last_ts, tz=timezone.utc).isoformat()
+                if last_ts is not None
+                else None
+            ),
+        }
+
+    def type_trends(self, since: datetime | None = None) -> list[dict]:
+        """Return monthly per-type totals with month-over-month growth.
+
+        Each entry has ``period`` (``YYYY-MM``), ``type``, ``count``,
+        ``size_bytes``, ``growth_bytes`` (change since the previous period of
+        the same type, ``None`` for the first) and ``growth_rate`` (that change
+        as a fraction of the previous size, ``None`` when undefined).
+        """
+        start = _epoch(since) if since is not None else 0.0
+        with self._connect() as conn:
+            rows = conn.execute(_TRENDS_QUERY, (start,)).fetchall()
+        trends: list[dict] = []
+        previous: dict[str, int] = {}
+        for period, env_type, count, size_bytes in rows:
+            before = previous.get(env_type)
+            growth = size_bytes - before if before is not None else None
+            trends.append(
+                {
+                    "period": period,
+                    "type": env_type,
+                    "count": count,
+                    "size_bytes": size_bytes,
+                    "growth_bytes": growth,
+                    "growth_rate": (
+                        round(growth / before, 4)
+                        if growth is not None and before
+                        else None
+                    ),
+                }
+            )
+            previous[env_type] = size_bytes
+        return trends
+
+    # ------------------------------------------------------------------ #
+    #  Internal                                                            #
+    # ------------------------------------------------------------------ #
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection inside one transaction, then close it."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=_BUSY_TIMEOUT_SECONDS)
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version < _SCHEMA_VERSION:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,137 @@
+"""Deletion planner: pick what to delete to free a target amount of space.
+
+Choosing the cheapest set of environments whose sizes reach a target is a
+covering knapsack.  Each environment's *collateral* (what deleting it costs)
+is its keep value, ``1 - score``, plus a fixed per-deletion cost, so fewer,
+larger deletions win over many small ones at the same score.
+
+:func:`plan_to_free` solves it greedily:
+
+1. Take environments in order of collateral per byte freed until the target
+   is reached.
+2. Drop any pick the target no longer needs, most expensive per byte first,
+   to trim the overshoot.
+3. If a single environment covers the target on its own for less total
+   collateral, use it instead.  This guards the greedy pass against
+   filling up on many cheap-per-byte but small environments.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from killpy.files import SizeMode, format_size
+from killpy.intelligence.scoring import ScoringService
+from killpy.models import Environment, ScoredEnvironment
+
+# Collateral charged for every deletion on top of the keep value, so that of
+# two equally scored options the one deleting fewer environments wins.
+_DELETION_COST = 0.05
+
+
+@dataclass
+class PlannedDeletion:
+    """One environment chosen by :func:`plan_to_free`, and why."""
+
+    scored: ScoredEnvironment
+    freed_bytes: int
+    reason: str
+
+    @property
+    def env(self) -> Environment:
+        """The environment to delete."""
+        return self.scored.env
+
+
+@dataclass
+class DeletionPlan:
+    """The environments to delete to free :attr:`target_bytes`, in order."""
+
+    target_bytes: int
+    items: list[PlannedDeletion] = field(default_factory=list)
+
+    @property
+    def freed_bytes(self) -> int:
+        """Bytes the plan frees, summed over its environments."""
+        return sum(item.freed_bytes for item in self.items)
+
+    @property
+    def reached(self) -> bool:
+        """``True`` when the plan frees at least :attr:`target_bytes`."""
+        return self.freed_bytes >= self.target_bytes
+
+    @property
+    def envs(self) -> list[Environment]:
+        """The planned environments, in deletion order."""
+        return [item.env for item in self.items]
+
+
+def collateral(scored: ScoredEnvironment) -> float:
+    """Return what deleting *scored* costs: its keep value plus a fixed cost."""
+    return _DELETION_COST + (1.0 - scored.score)
+
+
+def plan_to_free(
+    scored_envs: list[ScoredEnvironment],
+    target_bytes: int,
+    *,
+    size_mode: SizeMode = "apparent",
+) -> DeletionPlan:
+    """Choose the least valuable environments that together free *target_bytes*.
+
+    Each environment frees its reclaimable size in *size_mode*.  In-use
+    (system-critical) environments and ones that would free nothing are
+    never planned.  When every candidate together falls short of the target,
+    the plan holds all of them and :attr:`DeletionPlan.reached` is ``False``.
+    """
+    candidates = [
+        (se, se.env.reclaimable_for(size_mode))
+        for se in scored_envs
+        if not se.env.is_system_critical and se.env.reclaimable_for(size_mode) > 0
+    ]
+    candidates.sort(key=lambda c: collateral(c[0]) / c[1])
+
+    chosen: list[tuple[ScoredEnvironment, int]] = []
+    freed = 0
+    for candidate in candidates:
+        if freed >= target_bytes:
+            break
+        chosen.append(candidate)
+        freed += candidate[1]
+
+    if freed >= target_bytes:
+        for candidate in reversed(chosen[:]):
+            if freed - candidate[1] >= target_bytes:
+                chosen.remove(candidate)
+                freed -= candidate[1]
+        single = min(
+            (c for c in candidates if c[1] >= target_bytes),
+            key=lambda c: collateral(c[0]),
+            default=None,
+        )
+        if single is not None and collateral(single[0]) < sum(
+            collateral(se) for se, _ in chosen
+        ):
+            return DeletionPlan(
+                target_bytes,
+                [_planned(single, "covers the whole target on its own")],
+            )
+
+    return DeletionPlan(
+        target_bytes,
+        [
+            _planned(candidate, f"#{rank} by space freed per unit of keep value")
+            for rank, candidate in enumerate(chosen, start=1)
+        ],
+    )
+
+
+def _planned(candidate: tuple[ScoredEnvironment, int], why: str) -> PlannedDeletion:
+    scored, freed_bytes = candidate
+    # Skip the explanation's leading "Size: …"; the plan reports freed bytes.
+    details = ScoringService.explain(scored)[1:]
+    reason = "; ".join(
+        [f"frees {format_size(freed_bytes)}, {why}", f"score {scored.score:.2f}"]
+        + details
+    )
+    return PlannedDeletion(scored, freed_bytes, reason)
@@ -3,9 +3,14 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import cache
+from importlib import import_module
 from pathlib import Path
+from types import ModuleType
+from typing import Any
 
 from killpy.intelligence.git_analyzer import GitAnalyzer
 from killpy.models import Environment, GitInfo, ScoredEnvironment
@@ -30,6 +35,24 @@ _SIZE_REFERENCE_BYTES = 500 * 1024 * 1024  # 500 MB
 # Age in days beyond which an environment scores 1.0 on the age axis.
 _MAX_AGE_DAYS = 365
 
+_SECONDS_PER_DAY = 86_400
+
+# Below this many rows the NumPy round-trip costs more than the plain loop.
+_NUMPY_MIN_BATCH = 512
+
+
+@cache
+def _numpy() -> ModuleType | None:
+    """Import NumPy on first use; ``None`` when it is not installed.
+
+    Optional, and only worth its import time for large batches, so it is
+    never imported at module load.
+    """
+    try:
+        return import_module("numpy")
+    except ImportError:  # pragma: no cover - exercised only without numpy
+        return None
+
 
 @dataclass
 class ScoringWeights:
@@ -64,33 +87,10 @@ class ScoringService:
         git_info: GitInfo | None = None,
     ) -> ScoredEnvironment:
         """Return a :class:`~killpy.models.ScoredEnvironment` for *env*."""
-        explanation: list[str] = []
-
         size_score = self._normalize_size(env.size_bytes)
-        explanation.append(f"Size: {env.size_human}")
-
-        age_score, age_days = self._normalize_age(env.last_modified)
-        explanation.append(f"Last modified {age_days} days ago")
-
+        age_score, _age_days = self._normalize_age(env.last_modified)
         is_orphan, orphan_score = self._orphan_score(env.path)
-        has_project_files = not is_orphan
-        explanation.append(
-            "No project files found (orphan environment)"
-            if is_orphan
-            else "Project files found nearby"
-        )
-
         git_score = self._git_inactivity_score(git_info)
-        if git_info is None:
-            explanation.append("Git status: unknown")
-        elif not git_info.is_git_repo:
-            explanation.append("No associated git repository")
-        elif git_info.is_active:
-            explanation.append("Active git repository")
-        else:
-            explanation.append("Inactive git repository (no recent commits)")
-
-        num_packages = self._count_packages(env.path)
 
         total_weight = (
             self._w.size_weight
@@ -106,15 +106,49 @@ class ScoringService:
         )
         final_score = raw / total_weight if total_weight > 0 else 0.0
 
-        return ScoredEnvironment(
+        scored = ScoredEnvironment(
             env=env,
             score=round(final_score, 4),
-            explanation=explanation,
             git_info=git_info,
-            has_project_files=has_project_files,
+            has_project_files=not is_orphan,
             is_orphan=is_orphan,
-            num_packages=num_packages,
         )
+        self.explain(scored)
+        return scored
+
+    @classmethod
+    def explain(cls, scored: ScoredEnvironment) -> list[str]:
+        """Return the human-readable explanation for *scored*, building it once.
+
+        :func:`score_all` leaves :attr:`~killpy.models.ScoredEnvironment.explanation`
+        empty and :attr:`~killpy.models.ScoredEnvironment.num_packages` unset so
+        large batches never pay for string formatting or a ``site-packages``
+        listing; callers fill both here only for the environments they display.
+        """
+        if scored.explanation:
+            return scored.explanation
+        env = scored.env
+        if scored.num_packages is None:
+            scored.num_packages = cls._count_packages(env.path)
+        git_info = scored.git_info
+        _age_score, age_days = cls._normalize_age(env.last_modified)
+        explanation = [
+            f"Size: {env.size_human}",
+            f"Last modified {age_days} days ago",
+            "No project files found (orphan environment)"
+            if scored.is_orphan
+            else "Project files found nearby",
+        ]
+        if git_info is None:
+            explanation.append("Git status: unknown")
+        elif not git_info.is_git_repo:
+            explanation.append("No associated git repository")
+        elif git_info.is_active:
+            explanation.append("Active git repository")
+        else:
+            explanation.append("Inactive git repository (no recent commits)")
+        scored.explanation = explanation
+        return explanation
 
     # ------------------------------------------------------------------ #
     #  Internal normalizers                                                #
@@ -199,6 +233,125 @@ class ScoringService:
         return 0
 
 
+def _epoch(last_modified: datetime) -> float | None:
+    """Return *last_modified* as epoch seconds (naive means UTC), or ``None``."""
+    try:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.timestamp()
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def score_batch(
+    size_bytes: Sequence[int],
+    mtimes: Sequence[float | None],
+    orphan: Sequence[bool],
+    git_inactivity: Sequence[float],
+    weights: ScoringWeights | None = None,
+    *,
+    now: float | None = None,
+) -> list[float]:
+    """Score many environments in one pass from column arrays.
+
+    Produces the same values as :meth:`ScoringService.score`, but reads the
+    clock once, hoists every constant out of the loop and, for large batches,
+    evaluates the whole formula with NumPy when it is importable.
+
+    Parameters
+    ----------
+    size_bytes:
+        Environment sizes in bytes.
+    mtimes:
+        Last-modified times as epoch seconds; ``None`` scores neutral (0.5)
+        on the age axis.
+    orphan:
+        ``True`` where no project files were found next to the environment.
+    git_inactivity:
+        Per-environment git inactivity scores, as returned by
+        :meth:`ScoringService._git_inactivity_score` (0.0, 0.5 or 1.0).
+    weights:
+        Optional custom scoring weights.
+    now:
+        Reference time in epoch seconds; defaults to the current time.
+
+    Returns
+    -------
+    list[float]
+        Scores rounded to four decimals, in input order.
+    """
+    w = weights or ScoringWeights()
+    total_weight = (
+        w.size_weight + w.age_weight + w.orphan_weight + w.git_inactivity_weight
+    )
+    if total_weight <= 0:
+        return [0.0] * len(size_bytes)
+    if now is None:
+        now = datetime.now(tz=timezone.utc).timestamp()
+    if len(size_bytes) >= _NUMPY_MIN_BATCH and _numpy() is not None:
+        return _score_batch_numpy(size_bytes, mtimes, orphan, git_inactivity, w, now)
+
+    exp = math.exp
+    k = 3.0 / _SIZE_REFERENCE_BYTES
+    x0 = _SIZE_REFERENCE_BYTES
+    ws, wa, wo, wg = (
+        w.size_weight,
+        w.age_weight,
+        w.orphan_weight,
+        w.git_inactivity_weight,
+    )
+    scores: list[float] = []
+    append = scores.append
+    for size, mtime, is_orphan, git_score in zip(
+        size_bytes, mtimes, orphan, git_inactivity, strict=True
+    ):
+        size_score = 1.0 / (1.0 + exp(-k * (size - x0))) if size > 0 else 0.0
+        if mtime is None:
+            age_score = 0.5
+        else:
+            age_days = max(0.0, (now - mtime) // _SECONDS_PER_DAY)
+            age_score = min(1.0, age_days / _MAX_AGE_DAYS)
+        raw = (
+            ws * size_score
+            + wa * age_score
+            + wo * (1.0 if is_orphan else 0.0)
+            + wg * git_score
+        )
+        append(round(raw / total_weight, 4))
+    return scores
+
+
+def _score_batch_numpy(
+    size_bytes: Sequence[int],
+    mtimes: Sequence[float | None],
+    orphan: Sequence[bool],
+    git_inactivity: Sequence[float],
+    w: ScoringWeights,
+    now: float,
+) -> list[float]:
+    """Vectorised body of :func:`score_batch` (NumPy available, large batch)."""
+    np: Any = _numpy()
+    total_weight = (
+        w.size_weight + w.age_weight + w.orphan_weight + w.git_inactivity_weight
+    )
+    k = 3.0 / _SIZE_REFERENCE_BYTES
+    sizes = np.asarray(size_bytes, dtype=np.float64)
+    size_scores = np.where(
+        sizes > 0, 1.0 / (1.0 + np.exp(-k * (sizes - _SIZE_REFERENCE_BYTES))), 0.0
+    )
+    # ``None`` becomes NaN in a float array: those rows score a neutral 0.5.
+    mt = np.array(mtimes, dtype=np.float64)
+    age_days = np.maximum(0.0, np.floor((now - mt) / _SECONDS_PER_DAY))
+    age_scores = np.where(np.isnan(mt), 0.5, np.minimum(1.0, age_days / _MAX_AGE_DAYS))
+    raw = (
+        w.size_weight * size_scores
+        + w.age_weight * age_scores
+        + w.orphan_weight * np.asarray(orphan, dtype=np.float64)
+        + w.git_inactivity_weight * np.asarray(git_inactivity, dtype=np.float64)
+    )
+    return np.round(raw / total_weight, 4).tolist()
+
+
 def score_all(
     envs: list[Environment],
     weights: ScoringWeights | None = None,
@@ -207,6 +360,11 @@ def score_all(
 ) -> list[ScoredEnvironment]:
     """Convenience: score every environment in *envs*.
 
+    The per-environment filesystem checks (project markers, optional git) run
+    once; the formula itself is evaluated by :func:`score_batch`.  Explanations
+    are left empty and packages uncounted — :meth:`ScoringService.explain`
+    fills both in for the environments you display.
+
     Parameters
     ----------
     envs:
@@ -218,10 +376,50 @@ def score_all(
         :class:`~killpy.intelligence.git_analyzer.GitAnalyzer`
         on each environment path.
     """
-    service = ScoringService(weights)
-    results: list[ScoredEnvironment] = []
-    for env in envs:
-        git_info = GitAnalyzer.analyze(env.path) if run_git else None
-        results.append(service.score(env, git_info))
+    git_infos = [GitAnalyzer.analyze(env.path) if run_git else None for env in envs]
+    orphans = [ScoringService._orphan_score(env.path)[0] for env in envs]
+    scores = score_batch(
+        [env.size_bytes for env in envs],
+        [_epoch(env.last_modified) for env in envs],
+        orphans,
+        [ScoringService._git_inactivity_score(g) for g in git_infos],
+        weights,
+    )
+    results = [
+        ScoredEnvironment(
+            env=env,
+            score=score,
+            git_info=git_info,
+            has_project_files=not is_orphan,
+            is_orphan=is_orphan,
+        )
+        for env, score, git_info, is_orphan in zip(
+            envs, scores, git_infos, orphans, strict=True
+        )
+    ]
     results.sort(key=lambda se: se.score, reverse=True)
     return results
+
+
+def rescore_all(
+    scored_envs: list[ScoredEnvironment],
+    weights: ScoringWeights | None = None,
+) -> list[ScoredEnvironment]:
+    """Re-score already-scored environments under new *weights*, in place.
+
+    Reuses the orphan and git results stored on each
+    :class:`~killpy.models.ScoredEnvironment`, so no filesystem or git work
+    is repeated — only :func:`score_batch` runs.  Returns *scored_envs*
+    re-sorted by score, highest first.
+    """
+    scores = score_batch(
+        [se.env.size_bytes for se in scored_envs],
+        [_epoch(se.env.last_modified) for se in scored_envs],
+        [se.is_orphan for se in scored_envs],
+        [ScoringService._git_inactivity_score(se.git_info) for se in scored_envs],
+        weights,
+    )
+    for se, score in zip(scored_envs, scores, strict=True):
+        se.score = score
+    scored_envs.sort(key=lambda se: se.score, reverse=True)
+    return scored_envs
@@ -1,4 +1,26 @@
-"""Lightweight persistence layer: tracks scan history and reclaimed space."""
+"""Lightweight persistence layer: tracks scan history and reclaimed space.
+
+History is stored as two files in ``~/.killpy/``:
+
+* ``history.ndjson`` — an append-only journal.  Every scan and every deletion
+  appends one small JSON line, so writing never costs more than the line
+  itself, however long the history is.
+* ``history.json`` — the compacted snapshot: a running summary over the
+  whole history plus the most recent :data:`_MAX_RECORDS` scan records.
+  Older records are rolled up into the summary only.
+
+Once the journal grows past :data:`_COMPACT_JOURNAL_BYTES` it is folded into
+the snapshot (atomically, under a ``history.lock`` file lock that concurrent
+killpy processes share) and discarded.  Reads combine the snapshot with the
+short journal tail, so :meth:`UsageTracker.get_summary` never replays the
+full history.  A pre-journal ``history.json`` (a plain JSON list) is read
+as-is and converted on the next compaction.
+
+Setting ``KILLPY_HISTORY_DB`` to a file path additionally records every scan,
+its per-environment observations and every deletion in a SQLite database
+(:class:`~killpy.intelligence.history_db.HistoryStore`), which enables
+time-windowed summaries and per-type trends in ``killpy stats --history``.
+"""
 
 from __future__ import annotations
 
@@ -9,33 +31,85 @@ import tempfile
 from collections.abc import Iterable
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from killpy.models import Environment, ScanRecord, ScoredEnvironment
+from killpy.snapshots import ScanLock
+
+if TYPE_CHECKING:
+    from killpy.intelligence.history_db import HistoryStore
 
 logger = logging.getLogger(__name__)
 
 _DEFAULT_STORAGE = Path.home() / ".killpy" / "history.json"
 
+# Opt-in SQLite history database (path to the ``.db`` file).
+_DB_ENV_VAR = "KILLPY_HISTORY_DB"
+
+_SNAPSHOT_VERSION = 2
+
+# Fold the journal into the snapshot once it grows past this many bytes
+# (a few hundred scan/deletion lines).
+_COMPACT_JOURNAL_BYTES = 64 * 1024  # 64 KB
+
+# Individual scan records kept in the snapshot; older ones survive only in
+# the rolled-up summary.
+_MAX_RECORDS = 500
+
+
+def _empty_summary() -> dict:
+    return {
+        "total_scans": 0,
+        "total_space_found": 0,
+        "total_space_deleted": 0,
+        "last_scan_time": None,
+    }
+
 
 class UsageTracker:
-    """Persist scan history to a JSON file in ``~/.killpy/``.
+    """Persist scan history as a journal plus snapshot in ``~/.killpy/``.
 
     All I/O is best-effort: failures are logged at DEBUG level and never
     propagated to the caller.
     """
 
-    def __init__(self, storage_path: Path | None = None) -> None:
+    def __init__(
+        self, storage_path: Path | None = None, db_path: Path | None = None
+    ) -> None:
         self._path = storage_path or _DEFAULT_STORAGE
+        self._journal_path = self._path.with_suffix(".ndjson")
+        if db_path is None and storage_path is None and os.environ.get(_DB_ENV_VAR):
+            db_path = Path(os.environ[_DB_ENV_VAR]).expanduser()
+        self._store: HistoryStore | None = None
+        if db_path is not None:
+            # Only now: importing sqlite3 is wasted start-up time without it.
+            from killpy.intelligence.history_db import HistoryStore  # noqa: PLC0415
+
+            self._store = HistoryStore(db_path)
+
+    @property
+    def has_store(self) -> bool:
+        """``True`` when the SQLite history database is enabled."""
+        return self._store is not None
 
     # ------------------------------------------------------------------ #
     #  Write operations                                                    #
     # ------------------------------------------------------------------ #
 
-    def record_scan(self, record: ScanRecord) -> None:
-        """Append *record* to the history file."""
-        history = self._load()
-        history.append(record.to_dict())
-        self._save(history)
+    def record_scan(
+        self, record: ScanRecord, environments: Iterable[Environment] = ()
+    ) -> None:
+        """Append *record* to the history journal.
+
+        With the SQLite store enabled, *environments* are stored alongside it
+        as per-environment observations.
+        """
+        self._append({"op": "scan", **record.to_dict()})
+        if self._store is not None:
+            try:
+                self._store.record_scan(record, environments)
+            except self._store.Error as exc:
+                logger.debug("Could not record scan in the history DB: %s", exc)
 
     def record_scan_result(
         self,
@@ -60,49 +134,109 @@ class UsageTracker:
                 total_space_deleted=deleted_bytes,
                 environments_count=len(envs),
                 scan_path=str(scan_path),
-            )
+            ),
+            envs,
         )
 
     def record_deletion(self, size_bytes: int) -> None:
-        """Increment the ``total_space_deleted`` counter of the last scan record."""
-        history = self._load()
-        if not history:
+        """Add *size_bytes* to the ``total_space_deleted`` of the last scan record.
+
+        Appends a small delta line; it is a no-op when no scan has been
+        recorded yet.
+        """
+        if not self._path.exists() and not self._journal_path.exists():
             return
-        history[-1]["total_space_deleted"] = (
-            history[-1].get("total_space_deleted", 0) + size_bytes
-        )
-        self._save(history)
+        self._append({"op": "deletion", "size_bytes": size_bytes})
+        if self._store is not None:
+            try:
+                self._store.record_deletion(size_bytes)
+            except self._store.Error as exc:
+                logger.debug("Could not record deletion in the history DB: %s", exc)
+
+    def compact(self) -> None:
+        """Fold the journal into the snapshot and discard it.
+
+        Called automatically once the journal exceeds
+        :data:`_COMPACT_JOURNAL_BYTES`.  The journal is first renamed aside so
+        that concurrent appenders start a fresh one instead of losing lines.
+        Compactions (and appends) by separate processes are serialised by a
+        lock on a sidecar ``.lock`` file, and the snapshot is only read once
+        it is held, so no process drops what another folded or wrote.
+        """
+        lock = self._lock()
+        try:
+            lock.acquire()
+            snapshot = self._load_snapshot()
+            folding: Path | None = None
+            if self._journal_path.exists():
+                fd, tmp = tempfile.mkstemp(
+                    dir=self._path.parent, prefix=".history_", suffix=".compacting"
+                )
+                os.close(fd)
+                folding = Path(tmp)
+                os.replace(self._journal_path, folding)
+                self._fold(snapshot, self._read_journal(folding))
+            if folding is None:
+                self._save(snapshot)
+            elif self._save(snapshot):
+                folding.unlink()
+            elif not self._journal_path.exists():
+                # Snapshot write failed: put the journal back untouched.
+                os.replace(folding, self._journal_path)
+        except OSError as exc:
+            logger.debug("Could not compact history at %s: %s", self._path, exc)
+        finally:
+            lock.release()
 
     # ------------------------------------------------------------------ #
     #  Read operations                                                     #
     # ------------------------------------------------------------------ #
 
     def get_history(self) -> list[ScanRecord]:
-        """Return all persisted scan records."""
+        """Return the retained scan records (the most recent :data:`_MAX_RECORDS`)."""
         records: list[ScanRecord] = []
-        for raw in self._load():
+        for raw in self._load()["records"]:
             try:
                 records.append(ScanRecord.from_dict(raw))
             except (KeyError, ValueError) as exc:
                 logger.debug("Skipping corrupt record: %s", exc)
         return records
 
-    def get_summary(self) -> dict:
-        """Return cumulative aggregates over the full scan history."""
-        records = self.get_history()
-        if not records:
-            return {
-                "total_scans": 0,
-                "total_space_found": 0,
-                "total_space_deleted": 0,
-                "last_scan_time": None,
-            }
-        return {
-            "total_scans": len(records),
-            "total_space_found": sum(r.total_space_found for r in records),
-            "total_space_deleted": sum(r.total_space_deleted for r in records),
-            "last_scan_time": max(r.timestamp for r in records).isoformat(),
-        }
+    def get_summary(self, since: datetime | None = None) -> dict:
+        """Return cumulative aggregates over the scan history.
+
+        With *since*, only scans at or after that moment count.  The SQLite
+        store answers that exactly; without it the window is computed from
+        the retained JSON records, so it cannot reach further back than the
+        most recent :data:`_MAX_RECORDS` scans.
+        """
+        if since is None:
+            return self._load()["summary"]
+        if self._store is not None:
+            try:
+                return self._store.summary(since)
+            except self._store.Error as exc:
+                logger.debug("Could not query the history DB: %s", exc)
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        records = [r for r in self.get_history() if r.timestamp >= since]
+        snapshot: dict = {"summary": _empty_summary(), "records": []}
+        self._fold(snapshot, [{"op": "scan", **r.to_dict()} for r in records])
+        return snapshot["summary"]
+
+    def get_type_trends(self, since: datetime | None = None) -> list[dict] | None:
+        """Return monthly per-type size trends, or ``None`` without the store.
+
+        See :meth:`~killpy.intelligence.history_db.HistoryStore.type_trends`
+        for the shape of each entry.
+        """
+        if self._store is None:
+            return None
+        try:
+            return self._store.type_trends(since)
+        except self._store.Error as exc:
+            logger.debug("Could not query the history DB: %s", exc)
+            return []
 
     @staticmethod
     def get_top_offenders(
@@ -115,22 +249,111 @@ class UsageTracker:
     #  Internal I/O                                                        #
     # ------------------------------------------------------------------ #
 
-    def _load(self) -> list[dict]:
+    def _load(self) -> dict:
+        """Return the snapshot with the current journal tail folded in."""
+        snapshot = self._load_snapshot()
+        self._fold(snapshot, self._read_journal(self._journal_path))
+        return snapshot
+
+    def _append(self, entry: dict) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps(entry, default=str) + "\n"
+            # One write() of one short line in append mode: concurrent
+            # writers never interleave within a line.  The lock keeps the
+            # write out of a journal a compaction is renaming aside.
+            lock = self._lock()
+            lock.acquire()
+            try:
+                with self._journal_path.open("a", encoding="utf-8") as fh:
+                    fh.write(line)
+            finally:
+                lock.release()
+            if (
+                not self._path.exists()
+                or self._journal_path.stat().st_size > _COMPACT_JOURNAL_BYTES
+            ):
+                self.compact()
+        except OSError as exc:
+            logger.debug("Could not append to %s: %s", self._journal_path, exc)
+
+    def _lock(self) -> ScanLock:
+        """Return the inter-process lock on the journal and snapshot."""
+        return ScanLock(self._path.with_suffix(".lock"))
+
+    @staticmethod
+    def _read_journal(path: Path) -> list[dict]:
+        entries: list[dict] = []
+        try:
+            with path.open(encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted append.
+                        logger.debug("Skipping corrupt journal line in %s", path)
+                        continue
+                    if isinstance(entry, dict):
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        except OSError as exc:
+            logger.debug("Could not read journal %s: %s", path, exc)
+        return entries
+
+    @staticmethod
+    def _fold(snapshot: dict, entries: list[dict]) -> None:
+        """Apply journal *entries* to *snapshot* in place."""
+        summary = snapshot["summary"]
+        records = snapshot["records"]
+        for entry in entries:
+            op = entry.get("op")
+            if op == "scan":
+                raw = {k: v for k, v in entry.items() if k != "op"}
+                try:
+                    record = ScanRecord.from_dict(raw)
+                except (KeyError, ValueError) as exc:
+                    logger.debug("Skipping corrupt journal entry: %s", exc)
+                    continue
+                records.append(record.to_dict())
+                summary["total_scans"] += 1
+                summary["total_space_found"] += record.total_space_found
+                summary["total_space_deleted"] += record.total_space_deleted
+                timestamp = record.timestamp.isoformat()
+                last = summary["last_scan_time"]
+                if last is None or record.timestamp > datetime.fromisoformat(last):
+                    summary["last_scan_time"] = timestamp
+            elif op == "deletion" and records:
+                size_bytes = int(entry.get("size_bytes", 0))
+                records[-1]["total_space_deleted"] = (
+                    records[-1].get("total_space_deleted", 0) + size_bytes
+                )
+                summary["total_space_deleted"] += size_bytes
+        del records[:-_MAX_RECORDS]
+
+    def _load_snapshot(self) -> dict:
+        empty = {"summary": _empty_summary(), "records": []}
         if not self._path.exists():
-            return []
+            return empty
         try:
             text = self._path.read_text(encoding="utf-8")
             data = json.loads(text)
-            if not isinstance(data, list):
-                raise ValueError("Expected a JSON list")
-            return data
+            if isinstance(data, list):
+                # Pre-journal format: a flat list of scan records.
+                self._fold(empty, [{"op": "scan", **raw} for raw in data])
+                return empty
+            if not isinstance(data, dict) or not isinstance(data.get("records"), list):
+                raise ValueError("Expected a history snapshot")
+            summary = _empty_summary()
+            summary.update(data.get("summary") or {})
+            return {"summary": summary, "records": data["records"]}
         except (json.JSONDecodeError, ValueError, OSError) as exc:
             logger.debug(
                 "Could not load history from %s: %s — resetting", self._path, exc
             )
-            return []
+            return empty
 
-    def _save(self, history: list[dict]) -> None:
+    def _save(self, snapshot: dict) -> bool:
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
             # Atomic write: write to a temp file then rename.
@@ -139,8 +362,14 @@ class UsageTracker:
             )
             try:
                 with os.fdopen(fd, "w", encoding="utf-8") as fh:
-                    json.dump(history, fh, indent=2, default=str)
+                    json.dump(
+                        {"version": _SNAPSHOT_VERSION, **snapshot},
+                        fh,
+                        indent=2,
+                        default=str,
+                    )
                 os.replace(tmp, self._path)
+                return True
             except Exception:
                 try:
                     os.unlink(tmp)
@@ -149,3 +378,4 @@ class UsageTracker:
                 raise
         except OSError as exc:
             logger.debug("Could not save history to %s: %s", self._path, exc)
+            return False
@@ -0,0 +1,192 @@
+"""Write-ahead journal for bulk deletions, so an interrupted run can be resumed.
+
+Before ``killpy delete`` or ``killpy --delete-all`` removes anything, it
+writes the whole selection to ``~/.killpy/deletions.ndjson``; the
+:class:`~killpy.cleaner.Cleaner` then appends one line when it starts deleting
+an environment and one when that deletion finishes or fails.  (The TUI's
+deletions, confirmed one at a time, are not journaled.)  Each item is
+therefore in one of four states:
+
+``pending``
+    Not touched yet.
+``deleting``
+    Removal started but never finished: the process died part-way, leaving
+    a partly deleted tree behind.
+``done`` / ``failed``
+    Finished; ``done`` items record the bytes they freed.
+
+A run that completes (and has reported its freed bytes to the
+:class:`~killpy.intelligence.tracker.UsageTracker`) removes the journal.  A
+journal still present at start-up therefore belongs to an interrupted run,
+which ``killpy delete --resume`` finishes from :meth:`DeletionJournal.load`.
+
+Lines are written with a single ``write()`` each and flushed at once, which
+survives the process being killed; a torn last line is skipped on load.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Literal
+
+from killpy.files import SizeMode
+from killpy.models import Environment
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PATH = Path.home() / ".killpy" / "deletions.ndjson"
+
+ItemState = Literal["pending", "deleting", "done", "failed"]
+
+
+@dataclass
+class JournalItem:
+    """One environment of a journaled run and how far its deletion got."""
+
+    env: Environment
+    state: ItemState = "pending"
+    freed_bytes: int = 0
+    error: str | None = None
+
+
+@dataclass
+class JournaledRun:
+    """An interrupted deletion run, as read back by :meth:`DeletionJournal.load`."""
+
+    scan_path: str
+    size_mode: SizeMode
+    started_at: datetime
+    items: list[JournalItem] = field(default_factory=list)
+
+    @property
+    def unfinished(self) -> list[JournalItem]:
+        """Items still ``pending`` or ``deleting``, in their original order."""
+        return [item for item in self.items if item.state in ("pending", "deleting")]
+
+    @property
+    def freed_bytes(self) -> int:
+        """Bytes the ``done`` items freed."""
+        return sum(item.freed_bytes for item in self.items if item.state == "done")
+
+
+class DeletionJournal:
+    """Append-only record of a bulk deletion, one NDJSON line per event.
+
+    Parameters
+    ----------
+    path:
+        Journal file; ``~/.killpy/deletions.ndjson`` by default.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or _DEFAULT_PATH
+        self._items: dict[Path, int] = {}
+
+    # ------------------------------------------------------------------ #
+    #  Writing                                                             #
+    # ------------------------------------------------------------------ #
+
+    def begin(
+        self, envs: list[Environment], scan_path: Path | str, size_mode: SizeMode
+    ) -> None:
+        """Start a new run that intends to delete *envs*, replacing any journal."""
+        header = {
+            "op": "begin",
+            "scan_path": str(scan_path),
+            "size_mode": size_mode,
+            "started_at": datetime.now(tz=timezone.utc).isoformat(),
+        }
+        lines = [header] + [{"op": "intent", "env": env.to_dict()} for env in envs]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(line) + "\n" for line in lines))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._items = {env.path: i for i, env in enumerate(envs)}
+
+    def started(self, env: Environment) -> None:
+        """Record that removing *env* has begun."""
+        self._append(env, {"op": "started"})
+
+    def done(self, env: Environment, freed_bytes: int) -> None:
+        """Record that *env* is gone, having freed *freed_bytes*."""
+        self._append(env, {"op": "done", "freed_bytes": freed_bytes})
+
+    def failed(self, env: Environment, error: str) -> None:
+        """Record that deleting *env* failed with *error*."""
+        self._append(env, {"op": "failed", "error": error})
+
+    def finish(self) -> None:
+        """Close a completed run: its journal is no longer needed."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self._items = {}
+
+    def _append(self, env: Environment, entry: dict) -> None:
+        index = self._items.get(env.path)
+        if index is None:
+            logger.debug("%s is not part of the journaled run", env.path)
+            return
+        line = json.dumps({**entry, "item": index}) + "\n"
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+
+    # ------------------------------------------------------------------ #
+    #  Reading                                                             #
+    # ------------------------------------------------------------------ #
+
+    def load(self) -> JournaledRun | None:
+        """Return the interrupted run in the journal, or ``None`` if there is none.
+
+        Also makes this journal the one the resumed run appends to.
+        """
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return None
+        run: JournaledRun | None = None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                run = _apply(run, entry)
+            except (ValueError, KeyError, TypeError, IndexError) as exc:
+                # A torn final line from an interrupted append.
+                logger.debug("Skipping corrupt journal line in %s: %s", self.path, exc)
+        if run is not None:
+            self._items = {item.env.path: i for i, item in enumerate(run.items)}
+        return run
+
+
+def _apply(run: JournaledRun | None, entry: dict) -> JournaledRun | None:
+    """Apply one journal line to *run*, returning the (possibly new) run."""
+    op = entry["op"]
+    if op == "begin":
+        return JournaledRun(
+            scan_path=entry["scan_path"],
+            size_mode=entry["size_mode"],
+            started_at=datetime.fromisoformat(entry["started_at"]),
+        )
+    if run is None:
+        raise ValueError("journal does not start with a begin line")
+    if op == "intent":
+        run.items.append(JournalItem(Environment.from_dict(entry["env"])))
+        return run
+    item = run.items[entry["item"]]
+    if op == "started":
+        item.state = "deleting"
+    elif op == "done":
+        item.state = "done"
+        item.freed_bytes = int(entry["freed_bytes"])
+    elif op == "failed":
+        item.state = "failed"
+        item.error = entry["error"]
+    return run
@@ -8,12 +8,40 @@ makes the contract between layers explicit and IDE-friendly.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Literal
 
-from killpy.files import format_size
+from killpy.files import DiskUsage, SizeMode, format_size
+
+
+@dataclass(frozen=True)
+class RootIdentity:
+    """Which directory an environment root was, as of the scan that found it.
+
+    Recorded by the :class:`~killpy.scanner.Scanner` so that a scan result
+    saved to a file can later be checked against the filesystem without
+    walking it again (see :func:`~killpy.scanner.revalidate`): a directory
+    replaced since has a new device/inode pair, and one whose entries were
+    added or removed a new ``mtime``.
+    """
+
+    device: int
+    inode: int
+    mtime_ns: int
+
+    @classmethod
+    def of(cls, path: Path) -> RootIdentity:
+        """Return the identity of *path* (not following symlinks).
+
+        Raises
+        ------
+        OSError
+            If *path* cannot be stat'ed.
+        """
+        stat = path.lstat()
+        return cls(stat.st_dev, stat.st_ino, stat.st_mtime_ns)
 
 
 @dataclass
@@ -39,11 +67,22 @@ class Environment:
         Last modification time (``st_mtime``) of the environment root, as
         reported by the filesystem — not an access time.
     size_bytes:
-        Total size in bytes (recursive directory sum).
+        Total size in bytes (recursive directory sum, the *apparent* size).
     managed_by:
         If not ``None``, the external tool that manages deletion.  Supported
         values: ``"conda"``, ``"pipx"`` and ``"uv"`` (uv tool environments).
         When ``None`` deletion is performed via :func:`shutil.rmtree`.
+    size_pending:
+        ``True`` while :attr:`size_bytes` is a ``0`` placeholder because the
+        scan deferred sizing (``Scanner.scan_async(defer_sizing=True)``); the
+        consumer is expected to size the environment itself.
+    usage:
+        The full :class:`~killpy.files.DiskUsage` of the sizing walk, or
+        ``None`` when the environment was not measured that way.  Backs
+        :attr:`reclaimable_bytes`, :attr:`disk_bytes` and the inode counts.
+    identity:
+        The :class:`RootIdentity` of :attr:`path` when it was scanned, or
+        ``None`` if it was not recorded.
     """
 
     path: Path
@@ -53,6 +92,9 @@ class Environment:
     size_bytes: int
     managed_by: str | None = None
     is_system_critical: bool = False
+    size_pending: bool = False
+    usage: DiskUsage | None = None
+    identity: RootIdentity | None = None
 
     # ------------------------------------------------------------------ #
     #  Computed helpers                                                    #
@@ -63,6 +105,45 @@ class Environment:
         """Human-readable size string (GB / MB / KB / bytes)."""
         return format_size(self.size_bytes)
 
+    @property
+    def reclaimable_bytes(self) -> int:
+        """Bytes deleting this environment frees, hard links accounted for.
+
+        Falls back to :attr:`size_bytes` when no :attr:`usage` was measured.
+        """
+        return self.usage.reclaimable_bytes if self.usage else self.size_bytes
+
+    @property
+    def reclaimable_human(self) -> str:
+        """Human-readable :attr:`reclaimable_bytes`."""
+        return format_size(self.reclaimable_bytes)
+
+    @property
+    def disk_bytes(self) -> int:
+        """Allocated size on disk (``st_blocks``), as ``du`` reports it.
+
+        Falls back to :attr:`size_bytes` when no :attr:`usage` was measured.
+        """
+        return self.usage.disk_bytes if self.usage else self.size_bytes
+
+    def size_for(self, mode: SizeMode) -> int:
+        """Return :attr:`size_bytes` or :attr:`disk_bytes` per *mode*."""
+        return self.disk_bytes if mode == "disk" else self.size_bytes
+
+    def reclaimable_for(self, mode: SizeMode) -> int:
+        """Return :attr:`reclaimable_bytes` measured per *mode*."""
+        return self.usage.reclaimable(mode) if self.usage else self.size_bytes
+
+    @property
+    def inode_count(self) -> int:
+        """Files and directories in the environment; ``0`` if not measured."""
+        return self.usage.inode_count if self.usage else 0
+
+    @property
+    def reclaimable_inode_count(self) -> int:
+        """Inodes deleting this environment frees; ``0`` if not measured."""
+        return self.usage.reclaimable_inode_count if self.usage else 0
+
     @property
     def last_modified_str(self) -> str:
         """Formatted date string ``DD/MM/YYYY`` for display."""
@@ -87,10 +168,57 @@ class Environment:
             "last_modified": self.last_modified.isoformat(),
             "size_bytes": self.size_bytes,
             "size_human": self.size_human,
+            "reclaimable_bytes": self.reclaimable_bytes,
+            "reclaimable_human": self.reclaimable_human,
+            "disk_bytes": self.disk_bytes,
+            "disk_human": format_size(self.disk_bytes),
+            "reclaimable_disk_bytes": self.reclaimable_for("disk"),
+            "file_count": self.usage.file_count if self.usage else 0,
+            "dir_count": self.usage.dir_count if self.usage else 0,
+            "inode_count": self.inode_count,
+            "reclaimable_inode_count": self.reclaimable_inode_count,
             "managed_by": self.managed_by,
             "is_system_critical": self.is_system_critical,
+            "identity": asdict(self.identity) if self.identity else None,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Environment:
+        """Rebuild an environment from :meth:`to_dict` output, without the disk.
+
+        The sizes and inode counts are taken as recorded.
+
+        Raises
+        ------
+        KeyError, TypeError, ValueError
+            If *data* is not :meth:`to_dict` output.
+        """
+        usage = None
+        if data.get("dir_count"):
+            usage = DiskUsage(
+                apparent_bytes=data["size_bytes"],
+                reclaimable_bytes=data["reclaimable_bytes"],
+                disk_bytes=data["disk_bytes"],
+                reclaimable_disk_bytes=data["reclaimable_disk_bytes"],
+                file_count=data["file_count"],
+                reclaimable_file_count=(
+                    data["reclaimable_inode_count"] - data["dir_count"]
+                ),
+                dir_count=data["dir_count"],
+            )
+        identity = data.get("identity")
+        return cls(
+            path=Path(data["absolute_path"]),
+            name=data["name"],
+            type=data["type"],
+            last_modified=datetime.fromisoformat(data["last_modified"]),
+            size_bytes=data["size_bytes"],
+            managed_by=data.get("managed_by"),
+            is_system_critical=data.get("is_system_critical", False),
+            usage=usage,
+            identity=RootIdentity(**identity) if identity else None,
+        )
+
 
 # ---------------------------------------------------------------------------
 # Intelligence layer models
@@ -113,6 +241,18 @@ class ScoredEnvironment:
 
     Wraps the original environment via composition so that existing code
     consuming plain :class:`Environment` objects is unaffected.
+
+    Attributes
+    ----------
+    explanation:
+        Human-readable reasons behind :attr:`score`.  Empty as returned by
+        :func:`~killpy.intelligence.scoring.score_all`, which scores in bulk;
+        :meth:`~killpy.intelligence.scoring.ScoringService.explain` builds it
+        on demand.
+    num_packages:
+        Top-level packages in the environment's ``site-packages``.  ``None``
+        until counted, which :meth:`ScoringService.explain
+        <killpy.intelligence.scoring.ScoringService.explain>` does.
     """
 
     env: Environment
@@ -121,7 +261,7 @@ class ScoredEnvironment:
     git_info: GitInfo | None = None
     has_project_files: bool = False
     is_orphan: bool = False
-    num_packages: int = 0
+    num_packages: int | None = None
 
 
 @dataclass
@@ -0,0 +1,434 @@
+"""Mount-aware traversal: which mount points a walk may cross, and how often.
+
+``os.walk`` crosses mount points freely.  Scanning ``/`` or a home directory
+can then descend into ``/proc``-like virtual filesystems, trigger NFS
+automounts, crawl a FUSE mount, or walk the same tree twice through a bind
+mount.  The walks (:func:`~killpy.detectors._shared_walk.walk_environments`
+and :func:`~killpy.files.get_disk_usage`) therefore ask a :class:`MountGuard`
+before entering each subdirectory:
+
+* A mount whose filesystem type is in the skip list of the installed
+  :class:`MountPolicy` is never entered.  By default that is the virtual
+  filesystems and ``autofs`` (entering an automount point mounts it).
+* With ``one_file_system`` (``--one-file-system``), no directory with a
+  different ``st_dev`` from the walk's root is entered, mount point or not
+  (btrfs subvolumes and overlay directories change device without one).
+* A mount point whose ``(st_dev, st_ino)`` was already visited is skipped.
+  So is a bind mount whose source directory the walk reaches anyway.
+
+Mount points come from ``/proc/self/mountinfo``, so directories that are
+not mount points cost no extra syscall.  ``one_file_system`` is the exception:
+like ``find -xdev``, it costs one ``lstat`` per directory, and it is all that
+applies where there is no mount table (macOS, Windows).
+
+Separately, a :class:`MountLimiter` caps how many trees are walked at once
+on each network or FUSE mount.  The thread pools that size or scan several
+trees use it, so that a slow NFS server cannot tie up every worker while
+trees on local disks wait.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+logger = logging.getLogger(__name__)
+
+_MOUNTINFO = "/proc/self/mountinfo"
+
+#: Filesystem types never walked into: kernel and virtual filesystems, and
+#: ``autofs``, whose mount points mount a (typically network) filesystem
+#: when entered.
+DEFAULT_SKIPPED_FSTYPES: frozenset[str] = frozenset(
+    {
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "devtmpfs",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "rpc_pipefs",
+        "securityfs",
+        "selinuxfs",
+        "sysfs",
+        "tracefs",
+    }
+)
+
+# Network filesystems; FUSE types ("fuse", "fuse.sshfs"…) are added by prefix.
+_REMOTE_FSTYPES = frozenset(
+    {"9p", "afs", "ceph", "cifs", "glusterfs", "lustre", "nfs", "nfs4", "smb3", "smbfs"}
+)
+
+#: Trees walked at once on one network or FUSE mount.
+SLOW_MOUNT_WORKERS = 2
+
+# The mount table is re-read at most this often (seconds).
+_TABLE_TTL = 5.0
+
+_ESCAPE_RE = re.compile(r"\\([0-7]{3})")
+
+_Item = TypeVar("_Item")
+
+
+@dataclass(frozen=True)
+class Mount:
+    """One line of ``/proc/self/mountinfo``."""
+
+    mount_point: str
+    fstype: str
+    device: tuple[int, int]
+    #: Directory of the mounted filesystem shown at :attr:`mount_point`;
+    #: anything but ``/`` for a bind mount of a subdirectory.
+    root: str = "/"
+
+    @property
+    def is_slow(self) -> bool:
+        """``True`` for network and FUSE filesystems."""
+        return self.fstype in _REMOTE_FSTYPES or _type_family(self.fstype) == "fuse"
+
+
+@dataclass(frozen=True)
+class MountPolicy:
+    """Which mount points walks may cross (see the module docstring)."""
+
+    one_file_system: bool = False
+    skip_types: frozenset[str] = field(default=DEFAULT_SKIPPED_FSTYPES)
+
+    def skips(self, fstype: str) -> bool:
+        """Return ``True`` when mounts of *fstype* are never walked into.
+
+        A listed family name such as ``fuse`` also covers its subtypes
+        (``fuse.sshfs``).
+        """
+        return fstype in self.skip_types or _type_family(fstype) in self.skip_types
+
+    @property
+    def options(self) -> frozenset[str]:
+        """The command-line options that reproduce this policy, as flags."""
+        flags = {f"skip-fs-type={t}" for t in self.skip_types - DEFAULT_SKIPPED_FSTYPES}
+        if self.one_file_system:
+            flags.add("one-file-system")
+        return frozenset(flags)
+
+
+def _type_family(fstype: str) -> str:
+    return fstype.split(".", 1)[0]
+
+
+# --------------------------------------------------------------------------- #
+#  Installed policy                                                            #
+# --------------------------------------------------------------------------- #
+
+_policy = MountPolicy()
+
+
+def set_policy(policy: MountPolicy) -> None:
+    """Install *policy* for every walk in this process."""
+    global _policy  # noqa: PLW0603
+    _policy = policy
+
+
+def get_policy() -> MountPolicy:
+    """Return the installed :class:`MountPolicy`."""
+    return _policy
+
+
+def configure(*, one_file_system: bool = False, skip_types: Iterable[str] = ()) -> None:
+    """Tighten the installed policy: stay on one filesystem, skip *skip_types*.
+
+    Options only ever add restrictions, so several ``--one-file-system`` or
+    ``--skip-fs-type`` options (on the top-level command and a subcommand)
+    combine.
+    """
+    set_policy(
+        MountPolicy(
+            one_file_system=_policy.one_file_system or one_file_system,
+            skip_types=_policy.skip_types | frozenset(skip_types),
+        )
+    )
+
+
+# --------------------------------------------------------------------------- #
+#  Mount table                                                                 #
+# --------------------------------------------------------------------------- #
+
+
+def parse_mountinfo(text: str) -> list[Mount]:
+    """Parse the contents of a ``mountinfo`` file, in mount order."""
+    mounts: list[Mount] = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-", 6)
+            major, minor = fields[2].split(":")
+            mounts.append(
+                Mount(
+                    mount_point=_unescape(fields[4]),
+                    fstype=fields[separator + 1],
+                    device=(int(major), int(minor)),
+                    root=_unescape(fields[3]),
+                )
+            )
+        except (ValueError, IndexError):
+            logger.debug("Ignoring unparsable mountinfo line: %r", line)
+    return mounts
+
+
+def _unescape(text: str) -> str:
+    return _ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), text)
+
+
+class MountTable:
+    """The mount points of this process, by path; empty where unknown."""
+
+    def __init__(self, mounts: Iterable[Mount] = ()) -> None:
+        self.mounts = list(mounts)
+        # Later mounts on the same point cover the earlier ones.
+        self.points: dict[str, Mount] = {m.mount_point: m for m in self.mounts}
+
+    def mount_of(self, path: str) -> Mount | None:
+        """Return the mount *path* (absolute) lies on."""
+        while True:
+            mount = self.points.get(path)
+            if mount is not None:
+                return mount
+            parent = os.path.dirname(path)
+            if parent == path:
+                return None
+            path = parent
+
+
+_table_cache: tuple[float, MountTable] | None = None
+
+
+def mount_table() -> MountTable:
+    """Return this process's mount table, re-read every few seconds."""
+    global _table_cache  # noqa: PLW0603
+    now = time.monotonic()
+    if _table_cache is not None and now - _table_cache[0] < _TABLE_TTL:
+        return _table_cache[1]
+    try:
+        with open(_MOUNTINFO, encoding="utf-8", errors="surrogateescape") as fh:
+            table = MountTable(parse_mountinfo(fh.read()))
+    except OSError:
+        table = MountTable()
+    _table_cache = (now, table)
+    return table
+
+
+# --------------------------------------------------------------------------- #
+#  Guarding a walk                                                             #
+# --------------------------------------------------------------------------- #
+
+
+def _identity(path: str) -> tuple[int, int]:
+    stat = os.lstat(path)
+    return stat.st_dev, stat.st_ino
+
+
+class MountGuard:
+    """Decide, for one walk, which subdirectories it may descend into.
+
+    Parameters
+    ----------
+    root:
+        Top of the walk; it is always walked, whatever it is mounted on.
+    policy:
+        Defaults to the installed :class:`MountPolicy`.
+    table:
+        Defaults to :func:`mount_table`.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        policy: MountPolicy | None = None,
+        table: MountTable | None = None,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self.policy = policy or _policy
+        self.table = table if table is not None else mount_table()
+        prefix = os.path.join(self.root, "")
+        self._points = {p for p in self.table.points if p.startswith(prefix)}
+        self._parents = {os.path.dirname(p) for p in self._points}
+        # A device can change below a directory that is no mount point (a
+        # btrfs subvolume), so one_file_system has to stat every directory.
+        self._stat_all = self.policy.one_file_system
+        self._root_id: tuple[int, int] | None = None
+        self._seen: set[tuple[int, int]] = set()
+
+    def filter(self, current: str, names: list[str]) -> list[str]:
+        """Return the subdirectories *names* of *current* the walk may enter."""
+        if not self._stat_all and current not in self._parents:
+            return names
+        return [name for name in names if self.allows(os.path.join(current, name))]
+
+    def allows(self, path: str) -> bool:
+        """Return ``True`` if the walk may enter directory *path*."""
+        mount = self.table.points.get(path)
+        if mount is None and not self._stat_all:
+            return True  # not a mount point: same filesystem as its parent
+        if mount is not None and self.policy.skips(mount.fstype):
+            logger.debug("Not entering %s mount %s", mount.fstype, path)
+            return False
+        try:
+            identity = _identity(path)
+            root_id = self._root_identity()
+        except OSError as exc:
+            logger.debug("Not entering %s: %s", path, exc)
+            return False
+        if self.policy.one_file_system and identity[0] != root_id[0]:
+            return False
+        return mount is None or self._first_visit(mount, identity)
+
+    def _first_visit(self, mount: Mount, identity: tuple[int, int]) -> bool:
+        """Return ``True`` unless the walk reaches *mount*'s tree another way."""
+        if identity in self._seen or self._reached_elsewhere(mount):
+            logger.debug("Not entering %s again through a mount", mount.mount_point)
+            return False
+        self._seen.add(identity)
+        return True
+
+    def _root_identity(self) -> tuple[int, int]:
+        if self._root_id is None:
+            self._root_id = _identity(self.root)
+            self._seen.add(self._root_id)
+        return self._root_id
+
+    def _reached_elsewhere(self, mount: Mount) -> bool:
+        """Return ``True`` if *mount* binds a directory the walk reaches anyway.
+
+        That is, another mount of the same filesystem shows a larger tree,
+        containing *mount*'s, at a place the walk covers.
+        """
+        if mount.root == "/":
+            return False
+        for other in self.table.mounts:
+            if other is mount or other.device != mount.device:
+                continue
+            if self.table.points.get(other.mount_point) is not other:
+                continue  # covered by a later mount
+            relative = _relative(mount.root, other.root)
+            if not relative:
+                continue  # unrelated, or the same tree: the seen set decides
+            source = os.path.normpath(os.path.join(other.mount_point, relative))
+            if _within(source, self.root) and not _within(source, mount.mount_point):
+                return True
+        return False
+
+
+def _relative(path: str, base: str) -> str | None:
+    if base == "/":
+        return path.lstrip("/")
+    if path == base:
+        return ""
+    if path.startswith(base + "/"):
+        return path[len(base) + 1 :]
+    return None
+
+
+def _within(path: str, top: str) -> bool:
+    return path == top or path.startswith(os.path.join(top, ""))
+
+
+# --------------------------------------------------------------------------- #
+#  Per-mount concurrency                                                       #
+# --------------------------------------------------------------------------- #
+
+
+class MountLimiter:
+    """Count the trees being walked per slow mount, up to a limit each.
+
+    Schedulers ask :meth:`has_room` before starting on a tree and pick
+    another one when its mount is busy, so their workers keep going on
+    the mounts that are responsive.
+    """
+
+    def __init__(
+        self, table: MountTable | None = None, limit: int = SLOW_MOUNT_WORKERS
+    ) -> None:
+        self.table = table if table is not None else mount_table()
+        self.limit = limit
+        self._running: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def has_room(self, path: str | os.PathLike[str]) -> bool:
+        """Return ``True`` if a walk of *path* may start now."""
+        key = self._key(path)
+        if key is None:
+            return True
+        with self._lock:
+            return self._running.get(key, 0) < self.limit
+
+    def acquire(self, path: str | os.PathLike[str]) -> None:
+        """Record that a walk of *path* started."""
+        key = self._key(path)
+        if key is not None:
+            with self._lock:
+                self._running[key] = self._running.get(key, 0) + 1
+
+    def release(self, path: str | os.PathLike[str]) -> None:
+        """Record that a walk of *path* finished."""
+        key = self._key(path)
+        if key is not None:
+            with self._lock:
+                self._running[key] -= 1
+
+    def _key(self, path: str | os.PathLike[str]) -> str | None:
+        mount = self.table.mount_of(os.path.abspath(path))
+        if mount is None or not mount.is_slow:
+            return None
+        return mount.mount_point
+
+
+def run_per_mount(
+    func: Callable[[_Item], None],
+    items: Iterable[_Item],
+    path_of: Callable[[_Item], str | os.PathLike[str]],
+    *,
+    workers: int,
+) -> None:
+    """Call *func* on every item on *workers* threads, respecting mount limits.
+
+    Items on a busy slow mount wait while items elsewhere go ahead.  The
+    first exception raised by *func* is re-raised once every started call
+    has finished.
+    """
+    limiter = MountLimiter()
+    pending = list(items)
+    running: dict[Future[None], _Item] = {}
+    errors: list[BaseException] = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending or running:
+            for item in list(pending):
+                if len(running) >= workers:
+                    break
+                if limiter.has_room(path_of(item)):
+                    pending.remove(item)
+                    limiter.acquire(path_of(item))
+                    running[pool.submit(func, item)] = item
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                limiter.release(path_of(running.pop(future)))
+                if future.exception() is not None:
+                    errors.append(future.exception())  # type: ignore[arg-type]
+    if errors:
+        raise errors[0]
@@ -11,23 +11,114 @@ The :meth:`Scanner.scan` variant is synchronous and suitable for CLI commands.
 :meth:`Scanner.scan_async` is an async generator that yields
 :class:`~killpy.models.Environment` objects progressively as each detector
 finishes, which is used by the TUI for live updates.
+:meth:`Scanner.scan_many` scans several roots, and optionally the home
+directories of other users, concurrently.
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import os
 import sys
-from collections.abc import AsyncIterator, Callable
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from dataclasses import dataclass
 from pathlib import Path
 
-from killpy.detectors import ALL_DETECTORS, AbstractDetector
-from killpy.detectors._shared_walk import TYPE_TO_DETECTOR, walk_environments
+from killpy.detectors import AbstractDetector, load_detectors
+from killpy.detectors._shared_walk import (
+    TYPE_TO_DETECTOR,
+    walk_environments,
+    walk_git_candidates,
+    walk_sharded,
+    walk_subtree,
+)
 from killpy.detectors.pyenv import _pyenv_root
-from killpy.models import Environment
+from killpy.models import Environment, RootIdentity
+from killpy.mounts import get_policy as get_mount_policy
+from killpy.mounts import run_per_mount
+from killpy.snapshots import SnapshotStore
+from killpy.throttle import get_throttle
+from killpy.users import LocalUser, as_user
 
 logger = logging.getLogger(__name__)
 
+# Roots scanned at the same time by :meth:`Scanner.scan_many`.
+_MAX_CONCURRENT_ROOTS = 8
+
+ProgressCallback = Callable[[AbstractDetector, list[Environment]], None]
+
+
+@dataclass(frozen=True)
+class ScanRoot:
+    """One part of a multi-root scan, as planned by :func:`plan_roots`.
+
+    Attributes
+    ----------
+    path:
+        Directory the part is about.
+    home:
+        Home directory of the user whose tool directories this part
+        resolves, or ``None`` for the invoking user.
+    walk:
+        Whether to walk the tree below :attr:`path`; ``False`` when an
+        enclosing root already covers it.
+    tools:
+        Whether to report the global tool directories (Poetry, pyenv,
+        pipx…) of :attr:`home`'s user; each user's are reported once.
+    """
+
+    path: Path
+    home: Path | None = None
+    walk: bool = True
+    tools: bool = True
+
+
+def plan_roots(paths: Iterable[Path], homes: Iterable[Path] = ()) -> list[ScanRoot]:
+    """Plan a scan of *paths* and of the users whose homes are *homes*.
+
+    A path equal to or below another is not walked again, and the global
+    tool directories of the invoking user and of each home's owner are
+    reported once each.  A home inside a walked root still gets a part of
+    its own, without a walk, for its owner's tool directories.
+
+    The invoking user's own home is planned as theirs (``home=None``), so
+    their ``PATH`` tools (conda, pipx) and environment overrides
+    (``PIP_CACHE_DIR``…) still count; if it is not among *homes* or
+    *paths*, a part without a walk reports their tool directories.
+    """
+    invoker = _resolved(Path.home())
+    resolved_homes = {_resolved(h) for h in homes}
+    candidates = sorted(
+        {(_resolved(p), None) for p in paths}
+        | {(h, None if h == invoker else h) for h in resolved_homes},
+        key=lambda c: (c[0].parts, str(c[1] or "")),
+    )
+    plan: list[ScanRoot] = []
+    walked: list[Path] = []
+    owners_done: set[Path | None] = set()
+    for path, home in candidates:
+        nested = any(path == w or w in path.parents for w in walked)
+        tools = home not in owners_done
+        if nested and not tools:
+            continue
+        plan.append(ScanRoot(path, home, walk=not nested, tools=tools))
+        owners_done.add(home)
+        if not nested:
+            walked.append(path)
+    if resolved_homes and None not in owners_done:
+        plan.append(ScanRoot(invoker, walk=False))
+    return plan
+
+
+def _resolved(path: Path) -> Path:
+    try:
+        return path.resolve()
+    except OSError:
+        return path.absolute()
+
 
 class Scanner:
     """Orchestrates all (or a subset of) detectors and deduplicates results.
@@ -40,6 +131,17 @@ class Scanner:
     types:
         Optional set of detector :attr:`~killpy.detectors.base.AbstractDetector.name`
         strings to limit scanning to.  When ``None`` all detectors are used.
+        Only the selected detectors' modules are imported.
+    git_aware:
+        When ``True`` and the scan root is inside a git work tree, the shared
+        walk only visits the directories git reports as untracked or ignored
+        (see :func:`~killpy.detectors._shared_walk.walk_git_candidates`);
+        tracked source trees are skipped.  Outside git it walks everything.
+    processes:
+        Number of worker processes the shared walk is spread over (see
+        :func:`~killpy.detectors._shared_walk.walk_sharded`); ``0`` means one
+        per CPU.  The default walks in this process.  Ignored in gentle mode
+        and for git-aware walks.
     """
 
     def __init__(
@@ -47,26 +149,48 @@ class Scanner:
         detectors: list[AbstractDetector] | None = None,
         types: set[str] | None = None,
         excluded: set[str] | None = None,
+        git_aware: bool = False,
+        processes: int = 1,
     ) -> None:
         if detectors is not None:
             self._detectors = detectors
+            if types is not None:
+                self._detectors = [d for d in self._detectors if d.name in types]
         else:
-            self._detectors = [cls() for cls in ALL_DETECTORS]
-
-        if types is not None:
-            self._detectors = [d for d in self._detectors if d.name in types]
+            self._detectors = [cls() for cls in load_detectors(types)]
 
         self._excluded: set[str] = excluded or set()
+        self._git_aware = git_aware
+        self._processes = processes or os.cpu_count() or 1
 
     # ------------------------------------------------------------------ #
     #  Public API                                                          #
     # ------------------------------------------------------------------ #
 
+    @property
+    def types(self) -> frozenset[str]:
+        """Names of the detectors this scanner runs."""
+        return frozenset(d.name for d in self._detectors)
+
+    @property
+    def excluded(self) -> frozenset[str]:
+        """Path patterns excluded from the results."""
+        return frozenset(self._excluded)
+
+    @property
+    def options(self) -> frozenset[str]:
+        """Other settings that change what a scan finds, as flags.
+
+        Snapshots and scan locks are keyed on them, so that a
+        ``--one-file-system`` scan is never mistaken for a full one.
+        """
+        flags = set(get_mount_policy().options)
+        if self._git_aware:
+            flags.add("git-aware")
+        return frozenset(flags)
+
     def scan(
-        self,
-        path: Path,
-        on_progress: Callable[[AbstractDetector, list[Environment]], None]
-        | None = None,
+        self, path: Path, on_progress: ProgressCallback | None = None
     ) -> list[Environment]:
         """Scan *path* synchronously with all applicable detectors.
 
@@ -85,35 +209,96 @@ class Scanner:
         """
         seen: set[Path] = set()
         results: list[Environment] = []
-
-        applicable = [d for d in self._detectors if d.can_handle()]
-        shared = [d for d in applicable if d.shared_walk]
-        others = [d for d in applicable if not d.shared_walk]
-
-        # One traversal shared by every filesystem-walking detector.
-        for detector, found in self._shared_walk_groups(shared, path):
+        for detector, found in self._scan_parts(ScanRoot(path)):
             processed = self._process(found, seen)
             results.extend(processed)
             if on_progress is not None:
                 on_progress(detector, processed)
 
-        # The remaining detectors scan their own global directories.
-        for detector in others:
-            try:
-                found = detector.detect(path)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Detector %s raised: %s", detector.name, exc)
-                found = []
-            processed = self._process(found, seen)
-            results.extend(processed)
-            if on_progress is not None:
-                on_progress(detector, processed)
+        results.sort(key=lambda e: e.size_bytes, reverse=True)
+        return results
+
+    def scan_many(
+        self,
+        paths: Iterable[Path],
+        *,
+        users: Iterable[LocalUser] = (),
+        on_progress: ProgressCallback | None = None,
+    ) -> list[Environment]:
+        """Scan several roots, and the home directories of *users*, concurrently.
+
+        The work is split by :func:`plan_roots`: nothing is walked twice, and
+        each user's tool directories (pip cache, Poetry, pyenv…) are resolved
+        against that user's home (see :func:`killpy.users.as_user`).  Results
+        are deduplicated across all parts.  *on_progress* is called as for
+        :meth:`scan`, one call at a time.  A single path without *users* is
+        exactly :meth:`scan`.  Parts on the same network or FUSE mount are
+        limited to a couple at a time (see :class:`killpy.mounts.MountLimiter`).
+        """
+        plan = plan_roots(paths, [user.home for user in users])
+        if not plan:
+            return []
+        if len(plan) == 1 and plan[0].home is None:
+            return self.scan(plan[0].path, on_progress)
+
+        seen: set[Path] = set()
+        results: list[Environment] = []
+        lock = threading.Lock()
+
+        def _run(root: ScanRoot) -> None:
+            owner = as_user(root.home) if root.home else contextlib.nullcontext()
+            with owner:
+                for detector, found in self._scan_parts(root):
+                    processed = self._process(found, set())
+                    with lock:
+                        processed = self._deduplicate(processed, seen)
+                        results.extend(processed)
+                        if on_progress is not None:
+                            on_progress(detector, processed)
+
+        # At most a couple of parts at a time on each network or FUSE mount.
+        run_per_mount(
+            _run,
+            plan,
+            lambda root: root.path,
+            workers=min(len(plan), _MAX_CONCURRENT_ROOTS),
+        )
 
         results.sort(key=lambda e: e.size_bytes, reverse=True)
         return results
 
+    def scan_tree(
+        self, path: Path, *, visited: list[str] | None = None
+    ) -> list[Environment]:
+        """Run only the shared tree walk below *path*, which may itself be an env.
+
+        Global tool directories and caches are left out (see
+        :meth:`scan_globals`).  *visited* collects the directories walked
+        that are not environments; see
+        :func:`~killpy.detectors._shared_walk.walk_subtree`.
+        """
+        active = {d.name for d in self._detectors if d.shared_walk and d.can_handle()}
+        if not active:
+            return []
+        return self._process(walk_subtree(path, active, visited=visited), set())
+
+    def scan_globals(self, path: Path) -> list[Environment]:
+        """Run only what :meth:`scan_tree` leaves out: global dirs and caches."""
+        found: list[Environment] = []
+        for detector in self._detectors:
+            if not detector.can_handle():
+                continue
+            try:
+                if detector.shared_walk:
+                    found.extend(detector.scan_global(path))
+                else:
+                    found.extend(detector.detect(path))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Detector %s raised: %s", detector.name, exc)
+        return self._process(found, set())
+
     async def scan_async(
-        self, path: Path
+        self, path: Path, *, defer_sizing: bool = False
     ) -> AsyncIterator[tuple[AbstractDetector, list[Environment]]]:
         """Async generator that yields *(detector, envs)* tuples progressively.
 
@@ -121,6 +306,12 @@ class Scanner:
         :func:`asyncio.to_thread` so the event loop is never blocked.  Results
         are yielded as soon as each detector finishes (first-come-first-served).
 
+        With ``defer_sizing=True`` the shared tree walk reports environments
+        without summing their sizes (they come back with
+        :attr:`~killpy.models.Environment.size_pending` set), so results
+        arrive long before a full sizing pass would finish.  Detectors that
+        scan global directories still size what they find.
+
         Usage::
 
             async for detector, envs in scanner.scan_async(path):
@@ -134,7 +325,9 @@ class Scanner:
 
         async def _run_shared() -> list[tuple[AbstractDetector, list[Environment]]]:
             try:
-                return await asyncio.to_thread(self._shared_walk_groups, shared, path)
+                return await asyncio.to_thread(
+                    self._shared_walk_groups, shared, path, not defer_sizing
+                )
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Shared walk raised: %s", exc)
                 return [(d, []) for d in shared]
@@ -161,12 +354,39 @@ class Scanner:
     #  Helpers                                                             #
     # ------------------------------------------------------------------ #
 
+    def _scan_parts(
+        self, root: ScanRoot
+    ) -> Iterator[tuple[AbstractDetector, list[Environment]]]:
+        """Yield ``(detector, envs)`` for one part of a scan, before processing."""
+        applicable = [d for d in self._detectors if d.can_handle()]
+        shared = [d for d in applicable if d.shared_walk]
+        others = [d for d in applicable if not d.shared_walk]
+
+        # One traversal shared by every filesystem-walking detector.
+        if root.walk:
+            yield from self._shared_walk_groups(shared, root.path)
+        elif root.tools:
+            for detector in shared:
+                yield detector, detector.scan_global(root.path)
+        if not root.tools:
+            return
+
+        # The remaining detectors scan their own global directories.
+        for detector in others:
+            try:
+                found = detector.detect(root.path)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Detector %s raised: %s", detector.name, exc)
+                found = []
+            yield detector, found
+
     def _shared_walk_groups(
-        self, shared: list[AbstractDetector], path: Path
+        self, shared: list[AbstractDetector], path: Path, sized: bool = True
     ) -> list[tuple[AbstractDetector, list[Environment]]]:
         """Run the one shared walk, returning ``(detector, envs)`` per detector.
 
-        The local tree is walked once for the union of *shared* detector names;
+        The local tree is walked once for the union of *shared* detector names
+        (only below git's untracked and ignored directories when git-aware);
         each detector also contributes its own global scan (pip/uv caches).
         Results are grouped back per detector via :data:`TYPE_TO_DETECTOR` so the
         per-detector progress contract is preserved.
@@ -174,7 +394,11 @@ class Scanner:
         if not shared:
             return []
         active = {d.name for d in shared}
-        found = walk_environments(path, active)
+        found = (
+            walk_git_candidates(path, active, sized=sized) if self._git_aware else None
+        )
+        if found is None:
+            found = self._walk_tree(path, active, sized)
         for detector in shared:
             found.extend(detector.scan_global(path))
         by_name: dict[str, list[Environment]] = {d.name: [] for d in shared}
@@ -184,12 +408,51 @@ class Scanner:
                 by_name[name].append(env)
         return [(d, by_name[d.name]) for d in shared]
 
+    def _walk_tree(
+        self, path: Path, active: set[str], sized: bool
+    ) -> list[Environment]:
+        """Walk the whole tree below *path*, sharded over processes if asked to.
+
+        Gentle mode stays in one process: its throttle is per process.
+        """
+        if self._processes <= 1 or get_throttle() is not None:
+            return walk_environments(path, active, sized=sized)
+        return walk_sharded(
+            path,
+            active,
+            processes=self._processes,
+            sized=sized,
+            weights=self._shard_weights(path),
+        )
+
+    def _shard_weights(self, path: Path) -> dict[str, int]:
+        """Weigh *path*'s top-level directories by the last scan's directory counts."""
+        snapshot = SnapshotStore().load(
+            path, self.types, self.excluded, options=self.options
+        )
+        if snapshot is None:
+            return {}
+        root = path.resolve()  # snapshots store resolved paths
+        weights: dict[str, int] = {}
+        for env in snapshot.envs:
+            try:
+                top = env.path.relative_to(root).parts[0]
+            except (ValueError, IndexError):
+                continue  # a global directory, or the root itself
+            dirs = env.usage.dir_count if env.usage else 0
+            weights[top] = weights.get(top, 1) + dirs
+        return weights
+
     def _process(self, found: list[Environment], seen: set[Path]) -> list[Environment]:
-        """Deduplicate, apply exclusions, and flag system-critical envs."""
+        """Deduplicate, apply exclusions, flag system-critical envs, record identity."""
         deduped = self._deduplicate(found, seen)
         deduped = self._apply_exclusions(deduped)
         for env in deduped:
             self._mark_system_critical(env)
+            try:
+                env.identity = RootIdentity.of(env.path)
+            except OSError:
+                env.identity = None
         return deduped
 
     @staticmethod
@@ -246,3 +509,60 @@ class Scanner:
                     env.is_system_critical = True
             except OSError:
                 pass
+
+
+def mark_system_critical(envs: Iterable[Environment]) -> None:
+    """Re-evaluate the system-critical flag of *envs* for this process.
+
+    Environments scanned by another process (the daemon, a concurrent scan,
+    a snapshot) carry the flags *that* process worked out from its own
+    ``sys.prefix``; they must be recomputed before anything is deleted.
+    """
+    for env in envs:
+        env.is_system_critical = False
+        Scanner._mark_system_critical(env)
+
+
+def revalidate(
+    envs: list[Environment], *, check_mtime: bool = True
+) -> tuple[list[Environment], dict[Path, str]]:
+    """Check that environments from an earlier scan are still what was scanned.
+
+    Costs one ``lstat`` per environment instead of a walk: each root must
+    still exist with the device, inode and ``mtime`` recorded in its
+    :attr:`~killpy.models.Environment.identity`.  The system-critical flag
+    is re-evaluated, since the active environment may have changed.  Sizes
+    are kept as recorded.  With ``check_mtime=False`` only the device and
+    inode are compared, for trees whose deletion already started.
+
+    Returns
+    -------
+    tuple[list[Environment], dict[Path, str]]
+        The environments that passed, and why each of the others did not.
+    """
+    valid: list[Environment] = []
+    stale: dict[Path, str] = {}
+    for env in envs:
+        reason = _stale_reason(env, check_mtime)
+        if reason is None:
+            mark_system_critical([env])
+            valid.append(env)
+        else:
+            stale[env.path] = reason
+    return valid, stale
+
+
+def _stale_reason(env: Environment, check_mtime: bool = True) -> str | None:
+    if env.identity is None:
+        return "no device/inode recorded by the scan"
+    try:
+        current = RootIdentity.of(env.path)
+    except FileNotFoundError:
+        return "no longer exists"
+    except OSError as exc:
+        return f"cannot be checked: {exc.strerror or exc}"
+    if (current.device, current.inode) != (env.identity.device, env.identity.inode):
+        return "replaced since the scan (different device/inode)"
+    if check_mtime and current.mtime_ns != env.identity.mtime_ns:
+        return "modified since the scan"
+    return None
@@ -0,0 +1,299 @@
+"""Snapshots of the last full scan of each root, for instant start-up.
+
+Every full scan by ``killpy list``, ``killpy stats`` and the TUI stores its
+result under ``~/.killpy/snapshots/``: one gzip-compressed JSON file per
+scan root, set of detector types, exclusions and scan options (such as
+``--one-file-system``), written atomically.  With ``--cached``
+those commands show the snapshot straight away instead of waiting for a
+fresh walk, provided it is younger than ``--max-age``, and revalidate it
+behind the scenes: the CLI commands start a detached ``killpy list`` that
+rewrites the snapshot, the TUI rescans in a worker and reconciles its rows.
+
+Snapshots are a cache.  Reading one never fails: a missing, corrupt or
+incompatible file simply means there is no snapshot.
+
+They also let concurrent invocations share one scan.  A process scanning a
+root holds a :class:`ScanLock` on it until the snapshot is written (the TUI
+until its walk is done); another process that wants the same scan meanwhile
+waits for the lock, for a minute at most, and reads the snapshot, instead of
+walking the tree a second time (:meth:`SnapshotStore.scan_once`).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from killpy.models import Environment
+
+try:
+    import fcntl
+except ImportError:  # Windows: scans are not coalesced
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path.home() / ".killpy" / "snapshots"
+
+# Bumped whenever the stored layout changes; other versions are ignored.
+_FORMAT_VERSION = 1
+
+# How long scan_once waits for another process's scan before scanning itself,
+# and how often it checks the lock meanwhile, in seconds.
+_SCAN_WAIT_SECONDS = 60.0
+_LOCK_POLL_SECONDS = 0.2
+
+# The ``Environment.to_dict`` keys ``Environment.from_dict`` reads back; the
+# derived human-readable ones are not worth storing.
+_STORED_KEYS = (
+    "absolute_path",
+    "name",
+    "type",
+    "last_modified",
+    "size_bytes",
+    "reclaimable_bytes",
+    "disk_bytes",
+    "reclaimable_disk_bytes",
+    "file_count",
+    "dir_count",
+    "reclaimable_inode_count",
+    "managed_by",
+    "is_system_critical",
+    "identity",
+)
+
+
+@dataclass
+class Snapshot:
+    """The stored result of one full scan of :attr:`root`."""
+
+    root: Path
+    taken_at: datetime
+    envs: list[Environment] = field(default_factory=list)
+
+    @property
+    def age(self) -> timedelta:
+        """Time since the scan finished."""
+        return datetime.now(tz=timezone.utc) - self.taken_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        """Return ``True`` if the snapshot is at most *max_age* seconds old."""
+        return self.age.total_seconds() <= max_age
+
+
+class ScanLock:
+    """Advisory, process-wide lock on one scan (root, types and exclusions).
+
+    Held by the process scanning, and released once its snapshot is written
+    (or when the process exits).  Where :mod:`fcntl` is unavailable the lock
+    is always granted.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh: int | None = None
+
+    def acquire(self, *, blocking: bool = True, timeout: float | None = None) -> bool:
+        """Take the lock; without *blocking*, return ``False`` if it is held.
+
+        With a *timeout*, wait at most that many seconds, polling, and return
+        ``False`` if the lock is still held by then.
+        """
+        if blocking and timeout is not None:
+            deadline = time.monotonic() + timeout
+            while not self.acquire(blocking=False):
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(_LOCK_POLL_SECONDS)
+            return True
+        if fcntl is None or self._fh is not None:
+            return True
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as exc:
+            logger.debug("Cannot create scan lock %s: %s", self.path, exc)
+            return True  # nothing to coordinate through: scan anyway
+        try:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fh = fd
+        return True
+
+    def release(self) -> None:
+        """Release the lock, if held."""
+        if self._fh is not None:
+            os.close(self._fh)  # closing the descriptor drops the flock
+            self._fh = None
+
+
+class SnapshotStore:
+    """Directory of scan snapshots, one file per root and detector types.
+
+    Parameters
+    ----------
+    directory:
+        Where snapshots live; ``~/.killpy/snapshots`` by default.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self.directory = directory or _DEFAULT_DIR
+
+    def load(
+        self,
+        root: Path,
+        types: Iterable[str] = (),
+        excluded: Iterable[str] = (),
+        *,
+        options: Iterable[str] = (),
+    ) -> Snapshot | None:
+        """Return the snapshot of *root* scanned for *types*, if there is one.
+
+        *types*, *excluded* and *options* are the detector names, exclusion
+        patterns and other settings of the scan (see
+        :attr:`killpy.scanner.Scanner.options`), which must match those it
+        was saved with.  The system-critical flags are recomputed for this
+        process, since the one that saved the snapshot may run from another
+        environment.
+        """
+        from killpy.scanner import mark_system_critical  # noqa: PLC0415 - cycle
+
+        path = self._file(root, types, excluded, options)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != _FORMAT_VERSION:
+                return None
+            snapshot = Snapshot(
+                root=Path(data["root"]),
+                taken_at=datetime.fromisoformat(data["taken_at"]),
+                envs=[Environment.from_dict(env) for env in data["envs"]],
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, KeyError, TypeError) as exc:
+            logger.debug("Ignoring unreadable snapshot %s: %s", path, exc)
+            return None
+        mark_system_critical(snapshot.envs)
+        return snapshot
+
+    def save(
+        self,
+        root: Path,
+        envs: list[Environment],
+        types: Iterable[str] = (),
+        excluded: Iterable[str] = (),
+        *,
+        options: Iterable[str] = (),
+    ) -> None:
+        """Store *envs* as the latest full scan of *root* for *types*.
+
+        Best-effort: failures are logged, never raised, so a read-only home
+        directory does not break the command that scanned.
+        """
+        path = self._file(root, types, excluded, options)
+        data = {
+            "version": _FORMAT_VERSION,
+            "root": str(root.resolve()),
+            "taken_at": datetime.now(tz=timezone.utc).isoformat(),
+            "envs": [_compact(env) for env in envs],
+        }
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"))
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug("Cannot write snapshot %s: %s", path, exc)
+            with contextlib.suppress(OSError):
+                tmp.unlink()
+
+    def lock(
+        self,
+        root: Path,
+        types: Iterable[str] = (),
+        excluded: Iterable[str] = (),
+        *,
+        options: Iterable[str] = (),
+    ) -> ScanLock:
+        """Return the :class:`ScanLock` guarding scans of *root* for *types*."""
+        return ScanLock(self._file(root, types, excluded, options).with_suffix(".lock"))
+
+    def scan_once(  # noqa: PLR0913 - keyword-only tuning knobs
+        self,
+        root: Path,
+        scan: Callable[[], list[Environment]],
+        types: Iterable[str] = (),
+        excluded: Iterable[str] = (),
+        *,
+        options: Iterable[str] = (),
+        on_wait: Callable[[], None] | None = None,
+        wait: float = _SCAN_WAIT_SECONDS,
+    ) -> list[Environment]:
+        """Run *scan* and save its result, unless another process is already at it.
+
+        If another process holds the scan's lock, call *on_wait*, wait up to
+        *wait* seconds for that scan to finish and return the snapshot it
+        saved.  If it saved none (it failed, or was killed), or is still
+        running by then, scan after all.
+        """
+        types, excluded = frozenset(types), frozenset(excluded)
+        options = frozenset(options)
+        lock = self.lock(root, types, excluded, options=options)
+        requested_at = datetime.now(tz=timezone.utc)
+        if not lock.acquire(blocking=False):
+            if on_wait is not None:
+                on_wait()
+            if lock.acquire(timeout=wait):
+                snapshot = self.load(root, types, excluded, options=options)
+                if snapshot is not None and snapshot.taken_at >= requested_at:
+                    lock.release()
+                    return snapshot.envs
+            else:
+                logger.debug("Scan lock %s still held; scanning anyway", lock.path)
+        try:
+            envs = scan()
+            self.save(root, envs, types, excluded, options=options)
+            return envs
+        finally:
+            lock.release()
+
+    def _file(
+        self,
+        root: Path,
+        types: Iterable[str],
+        excluded: Iterable[str],
+        options: Iterable[str],
+    ) -> Path:
+        parts = [
+            str(root.resolve()),
+            ",".join(sorted(types)),
+            ",".join(sorted(excluded)),
+        ]
+        flags = sorted(options)
+        if flags:  # default scans keep the keys they always had
+            parts.append(",".join(flags))
+        key = "\0".join(parts)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.json.gz"
+
+
+def _compact(env: Environment) -> dict:
+    data = env.to_dict()
+    return {key: data[key] for key in _STORED_KEYS}
@@ -0,0 +1,305 @@
+"""Low-impact ("gentle") I/O for scans and deletions on busy hosts.
+
+A scan is almost entirely filesystem metadata I/O: one directory read per
+directory and one ``lstat`` per file; a deletion is one ``unlink`` per file.
+On a busy server that burst of metadata I/O competes with the jobs running
+there.  Gentle mode (``--gentle``) limits it in two ways:
+
+* :func:`lower_priority` puts the process in the idle I/O scheduling class
+  and raises its nice value.  Threads started afterwards (scan workers,
+  ``asyncio.to_thread``) and subprocesses (``conda``, ``pipx``) inherit both.
+* An :class:`IoThrottle`, installed with :func:`set_throttle`, rate-limits
+  the syscalls themselves with token buckets: operations per second, plus
+  bytes per second for deletions.  It also times every call, and halves its
+  rates while the observed latency is well above the best seen so far (a
+  sign the disk is contended), recovering gradually once latency drops.
+
+The I/O helpers here (:func:`walk`, :func:`scandir`, :func:`lstat`,
+:func:`unlink`, :func:`rmdir`, :func:`rmtree`) go through the installed
+throttle, and fall straight through to :mod:`os` and :mod:`shutil` when none
+is installed.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import logging
+import os
+import platform
+import shutil
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Limits used by --gentle: a small fraction of what a local SSD sustains.
+GENTLE_OPS_PER_SECOND = 2_000.0
+GENTLE_BYTES_PER_SECOND = float(32 << 20)
+
+# Adaptive backoff: every _ADAPT_EVERY operations, compare the smoothed
+# latency with the lowest smoothed latency seen.  Above _BACKOFF_RATIO times
+# it, rates halve (down to _MIN_FACTOR of the configured limits); below
+# _RECOVER_RATIO times it, they grow back by _RECOVER_STEP.
+_ADAPT_EVERY = 32
+_LATENCY_SMOOTHING = 0.1
+_BACKOFF_RATIO = 3.0
+_RECOVER_RATIO = 1.5
+_RECOVER_STEP = 1.25
+_MIN_FACTOR = 1 / 16
+
+# ioprio_set(2) has no wrapper in the os module.  Syscall numbers per
+# architecture; IOPRIO_WHO_PROCESS with id 0 targets the calling thread.
+_IOPRIO_SET_SYSCALL = {"x86_64": 251, "aarch64": 30, "i686": 289, "armv7l": 314}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+_GENTLE_NICENESS = 10
+
+
+class TokenBucket:
+    """Thread-safe token bucket: :meth:`take` blocks to hold *rate* per second.
+
+    Up to *burst* tokens accumulate while idle (a second's worth by default).
+    A caller taking more than is available sleeps until its deficit has
+    refilled; requests larger than *burst* are allowed.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self._burst = rate if burst is None else burst
+        self._tokens = self._burst
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def take(self, amount: float = 1.0) -> None:
+        """Remove *amount* tokens, sleeping while the bucket is short of them."""
+        with self._lock:
+            now = self._clock()
+            refill = (now - self._last) * self.rate
+            self._tokens = min(self._burst, self._tokens + refill) - amount
+            self._last = now
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            self._sleep(wait)
+
+
+class IoThrottle:
+    """Rate-limits filesystem calls and backs off when they slow down.
+
+    Parameters
+    ----------
+    ops_per_second:
+        Directory reads, stats and unlinks allowed per second.
+    bytes_per_second:
+        Bytes of deleted file data allowed per second.
+    clock, sleep:
+        Time source and sleep function, for tests.
+    """
+
+    def __init__(
+        self,
+        ops_per_second: float = GENTLE_OPS_PER_SECOND,
+        bytes_per_second: float = GENTLE_BYTES_PER_SECOND,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._ops_limit = ops_per_second
+        self._bytes_limit = bytes_per_second
+        self._ops = TokenBucket(ops_per_second, clock=clock, sleep=sleep)
+        self._bytes = TokenBucket(bytes_per_second, clock=clock, sleep=sleep)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latency: float | None = None
+        self._best_latency: float | None = None
+        self._count = 0
+        self.factor = 1.0
+
+    @contextmanager
+    def op(self, nbytes: int = 0) -> Iterator[None]:
+        """Wait for a slot for one filesystem call (moving *nbytes*), then time it."""
+        self._ops.take()
+        if nbytes:
+            self._bytes.take(nbytes)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self._observe(self._clock() - start)
+
+    def _observe(self, latency: float) -> None:
+        with self._lock:
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += _LATENCY_SMOOTHING * (latency - self._latency)
+            self._count += 1
+            if self._count % _ADAPT_EVERY:
+                return
+            if self._best_latency is None or self._latency < self._best_latency:
+                self._best_latency = self._latency
+            if self._latency > _BACKOFF_RATIO * self._best_latency:
+                factor = max(_MIN_FACTOR, self.factor / 2)
+            elif self._latency < _RECOVER_RATIO * self._best_latency:
+                factor = min(1.0, self.factor * _RECOVER_STEP)
+            else:
+                return
+            if factor != self.factor:
+                logger.debug(
+                    "I/O latency %.2gs: throttling to %.0f%%", latency, factor * 100
+                )
+                self.factor = factor
+                self._ops.rate = self._ops_limit * factor
+                self._bytes.rate = self._bytes_limit * factor
+
+
+# --------------------------------------------------------------------------- #
+#  Process-wide throttle                                                       #
+# --------------------------------------------------------------------------- #
+
+_throttle: IoThrottle | None = None
+
+
+def set_throttle(throttle: IoThrottle | None) -> None:
+    """Install *throttle* for every scan and deletion in this process."""
+    global _throttle  # noqa: PLW0603
+    _throttle = throttle
+
+
+def get_throttle() -> IoThrottle | None:
+    """Return the installed throttle, or ``None`` when I/O is unthrottled."""
+    return _throttle
+
+
+def enable_gentle() -> None:
+    """Switch the process to gentle mode: low priority plus an :class:`IoThrottle`.
+
+    Does nothing when a throttle is already installed, so ``killpy --gentle
+    delete --gentle`` lowers the priority only once.
+    """
+    if _throttle is not None:
+        return
+    lower_priority()
+    set_throttle(IoThrottle())
+
+
+def lower_priority() -> None:
+    """Give this thread, and the threads and processes it starts, idle priority.
+
+    Sets the idle I/O scheduling class on Linux and raises the nice value
+    where supported.  Failures are logged and ignored: gentle mode still
+    rate-limits without them.
+    """
+    if hasattr(os, "nice"):
+        try:
+            os.nice(_GENTLE_NICENESS)
+        except OSError as exc:
+            logger.debug("Cannot lower CPU priority: %s", exc)
+    syscall_nr = _IOPRIO_SET_SYSCALL.get(platform.machine())
+    if not sys.platform.startswith("linux") or syscall_nr is None:
+        return
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        ioprio = _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT
+        if libc.syscall(syscall_nr, _IOPRIO_WHO_PROCESS, 0, ioprio) != 0:
+            logger.debug("ioprio_set failed: errno %d", ctypes.get_errno())
+    except (OSError, AttributeError) as exc:
+        logger.debug("Cannot lower I/O priority: %s", exc)
+
+
+# --------------------------------------------------------------------------- #
+#  Throttled I/O                                                               #
+# --------------------------------------------------------------------------- #
+
+
+def walk(
+    top: str | os.PathLike[str], *, topdown: bool = True
+) -> Iterator[tuple[str, list[str], list[str]]]:
+    """:func:`os.walk` (never following symlinks), one throttled op per directory."""
+    walker = os.walk(top, topdown=topdown)
+    throttle = _throttle
+    if throttle is None:
+        yield from walker
+        return
+    while True:
+        with throttle.op():
+            entry = next(walker, None)
+        if entry is None:
+            return
+        yield entry
+
+
+def scandir(path: str | os.PathLike[str]) -> list[os.DirEntry[str]]:
+    """The entries of :func:`os.scandir`, read in full as one throttled op."""
+    throttle = _throttle
+    if throttle is None:
+        with os.scandir(path) as entries:
+            return list(entries)
+    with throttle.op(), os.scandir(path) as entries:
+        return list(entries)
+
+
+def lstat(path: str | os.PathLike[str]) -> os.stat_result:
+    """:func:`os.lstat` as one throttled op."""
+    throttle = _throttle
+    if throttle is None:
+        return os.lstat(path)
+    with throttle.op():
+        return os.lstat(path)
+
+
+def unlink(path: str | os.PathLike[str], nbytes: int = 0) -> None:
+    """:func:`os.unlink` as one throttled op freeing *nbytes*."""
+    throttle = _throttle
+    if throttle is None:
+        os.unlink(path)
+        return
+    with throttle.op(nbytes):
+        os.unlink(path)
+
+
+def rmdir(path: str | os.PathLike[str]) -> None:
+    """:func:`os.rmdir` as one throttled op."""
+    throttle = _throttle
+    if throttle is None:
+        os.rmdir(path)
+        return
+    with throttle.op():
+        os.rmdir(path)
+
+
+def rmtree(path: Path, *, bytes_per_file: int = 0) -> None:
+    """Remove the tree at *path*, throttled; plain :func:`shutil.rmtree` otherwise.
+
+    Each unlink is charged *bytes_per_file* against the bytes-per-second
+    limit; callers pass the tree's average file size, which they know from
+    sizing it, so the removal needs no extra ``lstat`` per file.
+    """
+    throttle = _throttle
+    if throttle is None:
+        shutil.rmtree(path)
+        return
+    for current, dirnames, filenames in walk(path, topdown=False):
+        for name in filenames:
+            unlink(os.path.join(current, name), bytes_per_file)
+        for name in dirnames:
+            subdir = os.path.join(current, name)
+            # Symlinks to directories are listed as directories.
+            if os.path.islink(subdir):
+                unlink(subdir)
+            else:
+                rmdir(subdir)
+    rmdir(path)
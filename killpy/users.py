@@ -0,0 +1,116 @@
+"""Local user accounts, and resolving tool directories on behalf of one.
+
+The global tool directories the detectors report (pip's cache, Poetry's
+virtualenvs, pyenv's versions…) live in each user's home.  Detectors resolve
+them through :func:`user_home` and :func:`user_env`, which normally mean the
+invoking user's home directory and environment.  Inside :func:`as_user` they
+mean another account's: its home directory, and no environment overrides,
+since ``PIP_CACHE_DIR`` and friends are the invoking user's settings, not
+theirs.  The override is a context variable, so concurrent scans in separate
+threads can each act for a different user.
+
+:func:`local_users` lists the accounts ``--system`` scans.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import pwd
+except ImportError:  # Windows: no account database to enumerate
+    pwd = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Lowest UID of a regular (human or CI) account; system accounts sit below.
+_FIRST_REGULAR_UID = 500 if sys.platform == "darwin" else 1000
+
+# ``nobody`` and friends: high UIDs that are not real accounts.
+_OVERFLOW_UIDS = frozenset({65534, 4294967294})
+
+_home: ContextVar[Path | None] = ContextVar("killpy_user_home", default=None)
+
+
+@dataclass(frozen=True)
+class LocalUser:
+    """One local account whose home directory can be scanned."""
+
+    name: str
+    uid: int
+    home: Path
+
+
+def local_users() -> list[LocalUser]:
+    """Return root and every regular account with an existing home directory.
+
+    Accounts sharing a home directory are listed once.  Returns an empty
+    list where there is no account database (Windows).
+    """
+    if pwd is None:
+        return []
+    users: list[LocalUser] = []
+    homes: set[Path] = set()
+    for entry in sorted(pwd.getpwall(), key=lambda e: e.pw_uid):
+        uid = entry.pw_uid
+        if uid != 0 and (uid < _FIRST_REGULAR_UID or uid in _OVERFLOW_UIDS):
+            continue
+        home = Path(entry.pw_dir)
+        if home in homes or home == Path("/") or not home.is_dir():
+            continue
+        homes.add(home)
+        users.append(LocalUser(entry.pw_name, uid, home))
+    return users
+
+
+def owner_name(uid: int) -> str:
+    """Return the login name of *uid*, or the number when it has none."""
+    if pwd is not None:
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+    return str(uid)
+
+
+# --------------------------------------------------------------------------- #
+#  Acting for another user                                                     #
+# --------------------------------------------------------------------------- #
+
+
+@contextmanager
+def as_user(home: Path) -> Iterator[None]:
+    """Resolve tool directories for the user whose home is *home*, in this context."""
+    token = _home.set(home)
+    try:
+        yield
+    finally:
+        _home.reset(token)
+
+
+def other_user() -> bool:
+    """Return ``True`` inside :func:`as_user`.
+
+    Tools on ``PATH`` (``conda``, ``pipx``) only ever report the invoking
+    user's environments, so detectors that ask them are skipped then.
+    """
+    return _home.get() is not None
+
+
+def user_home() -> Path:
+    """Return the home directory tool directories are resolved against."""
+    return _home.get() or Path.home()
+
+
+def user_env(name: str) -> str | None:
+    """Return environment variable *name*, unless acting for another user."""
+    if _home.get() is not None:
+        return None
+    return os.environ.get(name)
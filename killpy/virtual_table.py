@@ -0,0 +1,364 @@
+"""Virtualized table widget for the TUI's environment list.
+
+:class:`VirtualTable` never holds the rows itself.  The owner supplies a row
+count and a ``render_row(index)`` callback, and the table only asks for the
+rows that are currently on screen (plus a small cache).  Filtering, sorting
+and status changes therefore cost an index update and a repaint instead of
+rebuilding a widget row per environment, which keeps the TUI responsive with
+tens of thousands of ``__pycache__`` and artifact rows.
+
+The public surface mirrors the subset of :class:`textual.widgets.DataTable`
+that ``TableApp`` uses: a row cursor, ``move_cursor``, ``HeaderSelected`` and
+``RowHighlighted`` messages, zebra stripes and per-row refresh.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from typing import ClassVar
+
+from rich.style import Style
+from rich.text import Text
+from textual import events
+from textual.binding import Binding, BindingType
+from textual.cache import LRUCache
+from textual.geometry import Region, Size
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+CellType = str | int | float | Text
+RowSource = Callable[[int], Sequence[CellType]]
+
+# Rendered rows kept around for scrolling back and forth; a few screens' worth.
+_ROW_CACHE_SIZE = 512
+
+# Blank columns on each side of a cell, as in DataTable.
+_CELL_PADDING = 1
+
+_HEADER_ROW = -1
+
+
+def _no_rows(_index: int) -> Sequence[CellType]:
+    return ()
+
+
+def _cell_text(cell: CellType) -> Text:
+    if isinstance(cell, Text):
+        return cell.copy()
+    text = Text(str(cell), no_wrap=True)
+    if isinstance(cell, (int, float)):
+        text.justify = "right"
+    return text
+
+
+class VirtualTable(ScrollView, can_focus=True):
+    """A row-cursor table whose rows are rendered on demand.
+
+    Parameters
+    ----------
+    render_row:
+        Callback returning the cells of display row *index*.  Called only for
+        rows that are about to be painted; results are cached until
+        :meth:`refresh_row` or :meth:`reload` invalidates them.
+    """
+
+    BINDINGS: ClassVar[list[BindingType]] = [
+        Binding("up", "cursor_up", "Cursor up", show=False),
+        Binding("down", "cursor_down", "Cursor down", show=False),
+        Binding("pageup", "page_up", "Page up", show=False),
+        Binding("pagedown", "page_down", "Page down", show=False),
+        Binding("home", "cursor_first", "First row", show=False),
+        Binding("end", "cursor_last", "Last row", show=False),
+    ]
+
+    COMPONENT_CLASSES: ClassVar[set[str]] = {
+        "virtual-table--header",
+        "virtual-table--cursor",
+        "virtual-table--even-row",
+    }
+
+    DEFAULT_CSS = """
+    VirtualTable {
+        background: $surface;
+        color: $foreground;
+        height: auto;
+        max-height: 100%;
+
+        & > .virtual-table--header {
+            text-style: bold;
+            background: $panel;
+            color: $foreground;
+        }
+
+        & > .virtual-table--even-row {
+            background: $surface-lighten-1 50%;
+        }
+
+        & > .virtual-table--cursor {
+            background: $block-cursor-blurred-background;
+            color: $block-cursor-blurred-foreground;
+            text-style: $block-cursor-blurred-text-style;
+        }
+
+        &:focus > .virtual-table--cursor {
+            background: $block-cursor-background;
+            color: $block-cursor-foreground;
+            text-style: $block-cursor-text-style;
+        }
+    }
+    """
+
+    class HeaderSelected(Message):
+        """Posted when a column header is clicked."""
+
+        def __init__(self, virtual_table: VirtualTable, column_index: int) -> None:
+            self.virtual_table = virtual_table
+            self.column_index = column_index
+            super().__init__()
+
+        @property
+        def control(self) -> VirtualTable:
+            return self.virtual_table
+
+    class RowHighlighted(Message):
+        """Posted when the cursor moves to a different row."""
+
+        def __init__(self, virtual_table: VirtualTable, cursor_row: int) -> None:
+            self.virtual_table = virtual_table
+            self.cursor_row = cursor_row
+            super().__init__()
+
+        @property
+        def control(self) -> VirtualTable:
+            return self.virtual_table
+
+    def __init__(
+        self,
+        render_row: RowSource = _no_rows,
+        *,
+        name: str | None = None,
+        id: str | None = None,  # noqa: A002
+        classes: str | None = None,
+    ) -> None:
+        super().__init__(name=name, id=id, classes=classes)
+        self._render_row = render_row
+        self._labels: list[str] = []
+        self._column_widths: list[int] = []
+        self._row_count = 0
+        self._cursor_row = 0
+        self._row_cache: LRUCache[int, list[Text]] = LRUCache(_ROW_CACHE_SIZE)
+        self.zebra_stripes = False
+
+    # ------------------------------------------------------------------ #
+    #  Data source                                                         #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def columns(self) -> list[str]:
+        """The current column labels."""
+        return list(self._labels)
+
+    def set_columns(self, *labels: str) -> None:
+        """Set the column labels, e.g. to show a sort arrow.
+
+        Column widths only ever grow, so relabelling never makes the
+        layout jump.
+        """
+        self._labels = list(labels)
+        for index, label in enumerate(self._labels):
+            self._grow_column(index, Text(label).cell_len)
+        self._update_virtual_size()
+        self.refresh()
+
+    @property
+    def row_count(self) -> int:
+        """Number of display rows the source currently provides."""
+        return self._row_count
+
+    @row_count.setter
+    def row_count(self, count: int) -> None:
+        was_empty = self._row_count == 0
+        self._row_count = max(0, count)
+        self._row_cache.clear()
+        self._cursor_row = min(self._cursor_row, max(0, self._row_count - 1))
+        self._update_virtual_size()
+        self.refresh()
+        if was_empty and self._row_count:
+            self.post_message(self.RowHighlighted(self, self._cursor_row))
+
+    def append_rows(self, count: int = 1) -> None:
+        """Grow the table by *count* rows without invalidating cached ones."""
+        was_empty = self._row_count == 0
+        self._row_count += count
+        self._update_virtual_size()
+        self.refresh()
+        if was_empty and self._row_count:
+            self.post_message(self.RowHighlighted(self, self._cursor_row))
+
+    def refresh_row(self, index: int) -> None:
+        """Re-fetch and repaint display row *index* only."""
+        self._row_cache.discard(index)
+        line = index + 1 - round(self.scroll_y)
+        if 1 <= line < self.size.height:
+            self.refresh(Region(0, line, self.size.width, 1))
+
+    @property
+    def cached_rows(self) -> list[int]:
+        """Display indices whose cells are cached.
+
+        Only these can be stale after a change to the data; any other row is
+        fetched afresh when it is next painted.
+        """
+        return list(self._row_cache.keys())
+
+    def reload(self) -> None:
+        """Re-fetch every row, e.g. after the rows' order or contents changed."""
+        self._row_cache.clear()
+        self.refresh()
+
+    # ------------------------------------------------------------------ #
+    #  Cursor                                                              #
+    # ------------------------------------------------------------------ #
+
+    @property
+    def cursor_row(self) -> int:
+        """Display index of the row under the cursor."""
+        return self._cursor_row
+
+    def move_cursor(self, *, row: int, scroll: bool = True) -> None:
+        """Move the cursor to *row*, clamped to the table."""
+        if not self._row_count:
+            return
+        row = min(max(row, 0), self._row_count - 1)
+        if row != self._cursor_row:
+            previous = self._cursor_row
+            self._cursor_row = row
+            self.refresh_row(previous)
+            self.refresh_row(row)
+            self.post_message(self.RowHighlighted(self, row))
+        if scroll:
+            self._scroll_cursor_into_view()
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(row=self._cursor_row - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(row=self._cursor_row + 1)
+
+    def action_page_up(self) -> None:
+        self.move_cursor(row=self._cursor_row - self._page_height)
+
+    def action_page_down(self) -> None:
+        self.move_cursor(row=self._cursor_row + self._page_height)
+
+    def action_cursor_first(self) -> None:
+        self.move_cursor(row=0)
+
+    def action_cursor_last(self) -> None:
+        self.move_cursor(row=self._row_count - 1)
+
+    @property
+    def _page_height(self) -> int:
+        # One line is taken by the header.
+        return max(1, self.scrollable_content_region.height - 1)
+
+    def _scroll_cursor_into_view(self) -> None:
+        top = round(self.scroll_y)
+        if self._cursor_row < top:
+            self.scroll_to(y=self._cursor_row, animate=False, force=True)
+        elif self._cursor_row >= top + self._page_height:
+            self.scroll_to(
+                y=self._cursor_row - self._page_height + 1, animate=False, force=True
+            )
+
+    async def _on_click(self, event: events.Click) -> None:
+        meta = event.style.meta
+        if "row" not in meta:
+            return
+        if meta["row"] == _HEADER_ROW:
+            self.post_message(self.HeaderSelected(self, meta["column"]))
+        else:
+            self.move_cursor(row=meta["row"])
+        event.stop()
+
+    # ------------------------------------------------------------------ #
+    #  Rendering                                                           #
+    # ------------------------------------------------------------------ #
+
+    def render_lines(self, crop: Region) -> list[Strip]:
+        # Fetch the rows being painted up front so that column widths grown by
+        # any of them apply to the whole frame, not just the rows below.
+        top = round(self.scroll_y) - 1
+        first = max(top + crop.y, 0)
+        last = min(top + crop.bottom, self._row_count)
+        grew = False
+        for index in range(first, last):
+            grew |= self._fetch(index)
+        if grew:
+            self._update_virtual_size()
+        return super().render_lines(crop)
+
+    def render_line(self, y: int) -> Strip:
+        width = self.size.width
+        base_style = self.rich_style
+        if y == 0:
+            style = base_style + self.get_component_rich_style("virtual-table--header")
+            strip = self._render_cells(
+                [Text(label, no_wrap=True) for label in self._labels], _HEADER_ROW
+            )
+        else:
+            index = round(self.scroll_y) + y - 1
+            if index >= self._row_count:
+                return Strip.blank(width, base_style)
+            style = base_style + self._row_style(index)
+            self._fetch(index)
+            strip = self._render_cells(self._row_cache.get(index) or [], index)
+        return strip.apply_style(style).crop_extend(
+            round(self.scroll_x), round(self.scroll_x) + width, style
+        )
+
+    def notify_style_update(self) -> None:
+        super().notify_style_update()
+        self.refresh()
+
+    def _row_style(self, index: int) -> Style:
+        style = Style()
+        if self.zebra_stripes and index % 2:
+            style += self.get_component_rich_style("virtual-table--even-row")
+        if index == self._cursor_row:
+            style += self.get_component_rich_style("virtual-table--cursor")
+        return style
+
+    def _fetch(self, index: int) -> bool:
+        """Cache the cells of row *index*; return ``True`` if a column grew."""
+        if index in self._row_cache:
+            return False
+        cells = [_cell_text(cell) for cell in self._render_row(index)]
+        self._row_cache[index] = cells
+        grew = False
+        for column, text in enumerate(cells):
+            grew |= self._grow_column(column, text.cell_len)
+        return grew
+
+    def _render_cells(self, cells: Sequence[Text], row: int) -> Strip:
+        line = Text(no_wrap=True, end="")
+        for column, width in enumerate(self._column_widths):
+            cell = cells[column].copy() if column < len(cells) else Text()
+            cell.align("right" if cell.justify == "right" else "left", width)
+            cell.pad(_CELL_PADDING)
+            cell.stylize(Style.from_meta({"row": row, "column": column}))
+            line.append_text(cell)
+        return Strip(line.render(self.app.console), line.cell_len)
+
+    def _grow_column(self, column: int, width: int) -> bool:
+        while len(self._column_widths) <= column:
+            self._column_widths.append(0)
+        if width <= self._column_widths[column]:
+            return False
+        self._column_widths[column] = width
+        return True
+
+    def _update_virtual_size(self) -> None:
+        width = sum(w + 2 * _CELL_PADDING for w in self._column_widths)
+        self.virtual_size = Size(width, self._row_count + 1)
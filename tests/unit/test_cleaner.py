@@ -12,7 +12,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from killpy.cleaner import Cleaner, CleanerError
+from killpy.cleaner import Cleaner, CleanerError, DeletionRate
+from killpy.files import DiskUsage
+from killpy.journal import DeletionJournal
 from killpy.models import Environment
 
 # ---------------------------------------------------------------------------
@@ -60,6 +62,17 @@ class TestCleanerDryRun:
             total = cleaner.delete_many(envs)
         assert total == 3000
 
+    def test_disk_size_mode_reports_allocated_bytes(self, tmp_path: Path) -> None:
+        env = _env(path=tmp_path / "env", size=100)
+        env.usage = DiskUsage(
+            apparent_bytes=100,
+            reclaimable_bytes=100,
+            disk_bytes=4096,
+            reclaimable_disk_bytes=4096,
+        )
+        assert Cleaner(dry_run=True, size_mode="disk").delete(env) == 4096
+        assert Cleaner(dry_run=True).delete(env) == 100
+
 
 # ---------------------------------------------------------------------------
 # Filesystem deletion
@@ -346,3 +359,141 @@ class TestCleanerDeleteManyErrors:
             total = cleaner.delete_many(envs)
         # Second env deleted, first failed
         assert total == 200
+
+
+# ---------------------------------------------------------------------------
+# deletion journal
+# ---------------------------------------------------------------------------
+
+
+class TestCleanerJournal:
+    def test_records_done_and_failed(self, tmp_path: Path) -> None:
+        good = tmp_path / "good"
+        good.mkdir()
+        envs = [
+            _env(path=good, name="good", size=300),
+            _env(path=tmp_path / "in-use", name="in-use", critical=True),
+        ]
+        journal = DeletionJournal(tmp_path / "journal.ndjson")
+        journal.begin(envs, tmp_path, "apparent")
+
+        Cleaner(journal=journal).delete_many(envs)
+
+        run = journal.load()
+        assert run is not None
+        assert [(i.state, i.freed_bytes) for i in run.items] == [
+            ("done", 300),
+            ("failed", 0),
+        ]
+        assert not good.exists()
+
+    def test_dry_run_is_not_journaled(self, tmp_path: Path) -> None:
+        env = _env(path=tmp_path / "env")
+        journal = DeletionJournal(tmp_path / "journal.ndjson")
+        journal.begin([env], tmp_path, "apparent")
+        Cleaner(dry_run=True, journal=journal).delete(env)
+        assert journal.load().items[0].state == "pending"
+
+
+# ---------------------------------------------------------------------------
+# time-budgeted deletion
+# ---------------------------------------------------------------------------
+
+_GB = 1 << 30
+
+
+def _measured(name: str, size: int, inodes: int, **kwargs) -> Environment:
+    env = _env(path=Path(f"/fake/{name}"), name=name, size=size, **kwargs)
+    env.usage = DiskUsage(
+        apparent_bytes=size,
+        reclaimable_bytes=size,
+        file_count=inodes - 1,
+        reclaimable_file_count=inodes - 1,
+        dir_count=1,
+    )
+    return env
+
+
+class _TimedCleaner(Cleaner):
+    """Cleaner whose removals advance a fake clock by a per-inode cost."""
+
+    def __init__(self, envs: list[Environment], seconds_per_inode: float) -> None:
+        super().__init__()
+        self.now = 0.0
+        self.deleted: list[str] = []
+        self._by_path = {env.path: env for env in envs}
+        self._seconds_per_inode = seconds_per_inode
+
+    def clock(self) -> float:
+        return self.now
+
+    def _remove_filesystem(self, path: Path, bytes_per_file: int = 0) -> bool:
+        env = self._by_path[path]
+        self.now += env.inode_count * self._seconds_per_inode
+        self.deleted.append(env.name)
+        return True
+
+
+class TestCleanerTimeBudget:
+    def test_most_bytes_per_second_first(self) -> None:
+        envs = [
+            _measured("many-files", _GB, 100_000),
+            _measured("big-few", 4 * _GB, 10_000),
+            _measured("mid", 2 * _GB, 10_000),
+        ]
+        cleaner = _TimedCleaner(envs, 1 / 20_000)
+        run = cleaner.delete_within(envs, 3600, clock=cleaner.clock)
+        assert cleaner.deleted == ["big-few", "mid", "many-files"]
+        assert run.freed_bytes == 7 * _GB
+        assert run.remaining == []
+
+    def test_stops_on_observed_throughput(self) -> None:
+        envs = [
+            _measured("a", 4 * _GB, 100_000),
+            _measured("b", _GB, 50_000),
+            _measured("c", _GB, 50_000),
+        ]
+        # Twice as slow as the default rate: "a" takes 10s, not the 5s
+        # estimated.  At the default rate "b" (2.5s) would still fit in the
+        # 3s left; at the observed one (5s) it does not, so the run stops.
+        cleaner = _TimedCleaner(envs, 1 / 10_000)
+        run = cleaner.delete_within(envs, 13, clock=cleaner.clock)
+        assert cleaner.deleted == ["a"]
+        assert [e.name for e in run.remaining] == ["b", "c"]
+        assert run.elapsed == pytest.approx(10)
+        assert run.inodes_per_second == pytest.approx(10_000)
+
+    def test_passes_over_what_does_not_fit(self) -> None:
+        envs = [
+            _measured("too-slow", 10 * _GB, 100_000),
+            _measured("quick", 100 << 20, 10_000),
+        ]
+        cleaner = _TimedCleaner(envs, 1 / 20_000)
+        run = cleaner.delete_within(envs, 1, clock=cleaner.clock)
+        assert cleaner.deleted == ["quick"]
+        assert [e.name for e in run.remaining] == ["too-slow"]
+
+    def test_reports_failures_and_continues(self) -> None:
+        envs = [
+            _measured("in-use", 4 * _GB, 10, critical=True),
+            _measured("ok", _GB, 10),
+        ]
+        cleaner = _TimedCleaner(envs, 1 / 20_000)
+        progress = []
+        run = cleaner.delete_within(
+            envs,
+            60,
+            lambda env, freed, error: progress.append((env.name, freed, error)),
+            clock=cleaner.clock,
+        )
+        assert [e.name for e in run.failed] == ["in-use"]
+        assert [e.name for e in run.deleted] == ["ok"]
+        assert isinstance(progress[0][2], CleanerError)
+        assert progress[1] == ("ok", _GB, None)
+
+    def test_managed_environments_pay_a_fixed_overhead(self) -> None:
+        rate = DeletionRate()
+        plain = _measured("plain", _GB, 1000)
+        conda = _measured("conda", _GB, 1000, managed_by="conda")
+        assert rate.estimate(conda) > rate.estimate(plain)
+        assert rate.order([conda, plain], "apparent") == [plain, conda]
@@ -29,6 +29,7 @@ def test_delete_now_refuses_system_critical(tmp_path: Path) -> None:
 
             app.action_delete_now()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
             status_text = str(app.query_one("#status-label", Label).render())
             assert "currently in use" in status_text
@@ -62,6 +63,7 @@ def test_confirm_delete_skips_marked_critical_row(tmp_path: Path) -> None:
 
             app.action_confirm_delete()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert cleaner.deleted == [env_normal]
         assert app.venv_rows[0]["status"] != EnvStatus.DELETED.value
@@ -0,0 +1,169 @@
+"""Tests for the TUI's background deletion queue (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``.  A gated
+cleaner holds each deletion until the test releases it, so the queued and
+deleting states can be observed while the app keeps running.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from killpy.cli import EnvStatus
+from killpy.models import Environment
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+
+
+class GatedCleaner:
+    """Cleaner stub whose deletions block until :meth:`release` is called."""
+
+    def __init__(self) -> None:
+        self.deleted: list[Environment] = []
+        self.started = threading.Event()
+        self._gate = threading.Event()
+
+    def release(self) -> None:
+        self._gate.set()
+
+    def delete(self, env: Environment) -> int:
+        self.started.set()
+        self._gate.wait(timeout=5)
+        self.deleted.append(env)
+        return env.size_bytes
+
+
+def _statuses(app) -> list[str]:
+    return [row["status"] for row in app.venv_rows]
+
+
+def test_deletions_run_in_background_and_can_be_cancelled(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        cleaner = GatedCleaner()
+        app.cleaner = cleaner  # type: ignore[assignment]
+        envs = [_make_env(f"/data/p{i}/.venv", 10 * (i + 1)) for i in range(3)]
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for env in envs:
+                app.add_venv_environment(env)
+            app.action_toggle_multi_select()
+            app.action_multi_select_all()
+            app.action_confirm_delete()
+
+            await asyncio.to_thread(cleaner.started.wait, 5)
+            assert _statuses(app) == [
+                EnvStatus.DELETING.value,
+                EnvStatus.QUEUED.value,
+                EnvStatus.QUEUED.value,
+            ]
+
+            # The event loop is free: navigation and cancelling still work.
+            await pilot.press("j")
+            assert app.query_one("#venv-table").cursor_row == 1
+            app.action_cancel_deletions()
+
+            cleaner.release()
+            await app.workers.wait_for_complete()
+
+        assert cleaner.deleted == [envs[0]]
+        assert _statuses(app) == [EnvStatus.DELETED.value, "", ""]
+        assert app.bytes_release == 10
+        assert app.tracker.get_summary()["total_space_deleted"] == 10
+
+    asyncio.run(scenario())
+
+
+def test_mark_on_queued_row_unqueues_it(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        cleaner = GatedCleaner()
+        app.cleaner = cleaner  # type: ignore[assignment]
+        first = _make_env("/data/first/.venv", 10)
+        second = _make_env("/data/second/.venv", 20)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.add_venv_environment(first)
+            app.add_venv_environment(second)
+
+            app.action_delete_now()
+            await asyncio.to_thread(cleaner.started.wait, 5)
+            table = app.query_one("#venv-table")
+            table.move_cursor(row=1)
+            app.action_delete_now()
+            assert app.venv_rows[1]["status"] == EnvStatus.QUEUED.value
+
+            app.action_mark_for_delete()
+            assert app.venv_rows[1]["status"] == ""
+
+            cleaner.release()
+            await app.workers.wait_for_complete()
+
+        assert cleaner.deleted == [first]
+
+    asyncio.run(scenario())
+
+
+def test_status_change_repaints_only_that_row(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        cleaner = GatedCleaner()
+        app.cleaner = cleaner  # type: ignore[assignment]
+        envs = [_make_env(f"/data/p{i}/.venv", 10) for i in range(3)]
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for env in envs:
+                app.add_venv_environment(env)
+            table = app.query_one("#venv-table")
+            table.move_cursor(row=1)
+            while 1 not in table.cached_rows:  # until the row has been painted
+                await pilot.pause()
+            with (
+                patch.object(table, "reload") as reload,
+                patch.object(table, "refresh_row", wraps=table.refresh_row) as repaint,
+            ):
+                app.action_delete_now()
+                await asyncio.to_thread(cleaner.started.wait, 5)
+                cleaner.release()
+                await app.workers.wait_for_complete()
+            reload.assert_not_called()
+            assert {call.args for call in repaint.call_args_list} == {(1,)}
+            assert EnvStatus.DELETED.value in str(app._venv_cells(1))
+
+        assert cleaner.deleted == [envs[1]]
+
+    asyncio.run(scenario())
+
+
+def test_unmarking_a_queued_row_takes_out_that_row(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            # Rows for equal environments compare equal as dicts.
+            first = app.add_venv_environment(_make_env("/data/p/.venv", 10))
+            second = app.add_venv_environment(_make_env("/data/p/.venv", 10))
+            assert first == second
+            app._draining = True  # hold the deletion worker back
+            app._enqueue_deletion(first)
+            app._enqueue_deletion(second)
+
+            app.query_one("#venv-table").move_cursor(row=1)
+            app.action_mark_for_delete()
+
+            assert [row is first for row in app._delete_queue] == [True]
+            assert first["status"] == EnvStatus.QUEUED.value
+            assert second["status"] == ""
+            app._draining = False
+
+    asyncio.run(scenario())
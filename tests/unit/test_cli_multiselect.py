@@ -16,6 +16,7 @@ from killpy.cli import EnvStatus, TableApp
 from killpy.intelligence.tracker import UsageTracker
 from killpy.models import Environment
 from killpy.scanner import Scanner
+from killpy.snapshots import SnapshotStore
 
 
 class RecordingCleaner:
@@ -44,6 +45,7 @@ def _make_app(tmp_path: Path) -> tuple[TableApp, RecordingCleaner]:
     app = TableApp(root_dir=tmp_path)
     app.scanner = Scanner(detectors=[])
     app.tracker = UsageTracker(storage_path=tmp_path / "history.json")
+    app.snapshots = SnapshotStore(tmp_path / "snapshots")
     cleaner = RecordingCleaner()
     app.cleaner = cleaner  # type: ignore[assignment]
     return app, cleaner
@@ -78,6 +80,7 @@ def test_multi_select_deletes_selected_env_after_sort(tmp_path: Path) -> None:
 
             app.action_confirm_delete()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert cleaner.deleted == [env_small]
         deleted_envs = [
@@ -112,6 +115,7 @@ def test_multi_select_all_survives_sort(tmp_path: Path) -> None:
             app.sort_venv_rows(app.VENV_COL_SIZE, reverse=True)
             app.action_confirm_delete()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert sorted(str(e.path) for e in cleaner.deleted) == sorted(
             str(e.path) for e in envs
@@ -142,6 +146,7 @@ def test_exiting_multi_select_clears_selection(tmp_path: Path) -> None:
             app.action_toggle_multi_select()  # re-enter
             app.action_confirm_delete()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert cleaner.deleted == []
 
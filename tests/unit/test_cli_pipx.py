@@ -49,6 +49,7 @@ def test_uninstall_pipx_from_pipx_tab(tmp_path: Path) -> None:
 
             app.action_uninstall_pipx()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert cleaner.deleted == [env]
         assert app.pipx_rows[0]["status"] == EnvStatus.DELETED.value
@@ -76,6 +77,7 @@ def test_uninstall_pipx_skips_already_deleted_row(tmp_path: Path) -> None:
             app.action_uninstall_pipx()
             app.action_uninstall_pipx()
             await pilot.pause()
+            await app.workers.wait_for_complete()
 
         assert cleaner.deleted == [env]
         assert app.bytes_release == 1234
@@ -0,0 +1,60 @@
+"""Tests for the TUI free-space planner (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from killpy.cli import EnvStatus
+from killpy.models import ScoredEnvironment
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+
+_GB = 1 << 30
+
+
+def test_free_target_marks_planned_rows(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, cleaner = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            scores = {"/data/new/.venv": 0.1, "/data/old/.venv": 0.9}
+            for path, score in scores.items():
+                env = _make_env(path, 3 * _GB)
+                app.add_venv_environment(env)
+                app._scored_by_path[path] = ScoredEnvironment(env=env, score=score)
+
+            await pilot.press("f", *"2GB", "enter")
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+
+            status = {row["path"]: row["status"] for row in app.venv_rows}
+            assert status == {
+                "/data/new/.venv": "",
+                "/data/old/.venv": EnvStatus.MARKED_TO_DELETE.value,
+            }
+            assert "/data/old/.venv" in app._plan_reasons
+            # The plan only marks rows; nothing is deleted until confirmed.
+            assert cleaner.deleted == []
+
+    asyncio.run(scenario())
+
+
+def test_free_rejects_bad_size(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.add_venv_environment(_make_env("/data/a/.venv", _GB))
+
+            await pilot.press("f", *"lots", "enter")
+            await pilot.pause()
+            assert app.venv_rows[0]["status"] == ""
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+"""Tests for the TUI path filter (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from textual.widgets import Input
+
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+
+
+def _visible_paths(app) -> list[str]:
+    return [app.venv_rows[i]["path"] for i in app._venv_display_indices]
+
+
+def test_filter_is_debounced(tmp_path: Path, monkeypatch) -> None:
+    """Keystrokes only re-filter once typing pauses."""
+    # Long enough that a slow test run never sees the timer fire mid-typing.
+    monkeypatch.setattr("killpy.cli._SEARCH_DEBOUNCE_SECONDS", 0.5)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app.add_venv_environment(_make_env("/data/alpha/.venv", 10))
+            app.add_venv_environment(_make_env("/data/beta/.venv", 20))
+
+            app.action_start_search()
+            await pilot.press("b", "e")
+            assert len(app._venv_display_indices) == 2
+
+            await pilot.pause(1.0)
+            assert _visible_paths(app) == ["/data/beta/.venv"]
+
+    asyncio.run(scenario())
+
+
+def test_extending_and_shortening_query(tmp_path: Path) -> None:
+    """Narrowing on a longer query must not lose rows when it shrinks again."""
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for name in ("Alpha", "alpine", "beta"):
+                app.add_venv_environment(_make_env(f"/data/{name}/.venv", 10))
+
+            for query, expected in (
+                ("al", ["/data/Alpha/.venv", "/data/alpine/.venv"]),
+                ("alp", ["/data/Alpha/.venv", "/data/alpine/.venv"]),
+                ("alpi", ["/data/alpine/.venv"]),
+                ("a", ["/data/Alpha/.venv", "/data/alpine/.venv", "/data/beta/.venv"]),
+            ):
+                app._filter_query = query
+                app._apply_filter()
+                assert _visible_paths(app) == expected
+
+    asyncio.run(scenario())
+
+
+def test_rows_added_while_filtering_respect_query(tmp_path: Path) -> None:
+    """Rows streamed in during a scan only appear when they match."""
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app._filter_query = "keep"
+            app._apply_filter()
+            app.add_venv_environment(_make_env("/data/keep/.venv", 10))
+            app.add_venv_environment(_make_env("/data/drop/.venv", 10))
+            assert _visible_paths(app) == ["/data/keep/.venv"]
+
+            # Escape clears the filter immediately, without waiting.
+            app.query_one("#search-input", Input).add_class("visible")
+            await pilot.press("escape")
+            assert len(_visible_paths(app)) == 2
+
+    asyncio.run(scenario())
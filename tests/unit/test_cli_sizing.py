@@ -0,0 +1,134 @@
+"""Tests for progressive (deferred) sizing in the TUI (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``; the scan runs
+the real shared walk over a small tree under ``tmp_path``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from killpy.files import DiskUsage
+from killpy.scanner import Scanner
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+
+
+def _make_venv(root: Path, name: str, payload: int) -> Path:
+    venv = root / name / ".venv"
+    venv.mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (venv / "blob.bin").write_bytes(b"x" * payload)
+    return venv
+
+
+def test_rows_are_sized_in_the_background(tmp_path: Path) -> None:
+    small = _make_venv(tmp_path / "tree", "small", 100)
+    big = _make_venv(tmp_path / "tree", "big", 5000)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.root_dir = tmp_path / "tree"
+        app.scanner = Scanner(types={"venv"})
+        app.sort_state["venv-table"] = (app.VENV_COL_SIZE, True)
+
+        async with app.run_test() as pilot:
+            while not app._scan_complete or app._sizing:
+                await pilot.pause(0.01)
+            await app.workers.wait_for_complete()
+
+        sizes = {Path(row["path"]): row["size"] for row in app.venv_rows}
+        assert sizes[small] > 100
+        assert sizes[big] > 5000
+        assert not any(row["environment"].size_pending for row in app.venv_rows)
+        # Each venv is its root directory plus pyvenv.cfg and blob.bin.
+        assert {row["inodes"] for row in app.venv_rows} == {3}
+        # The size sort is re-applied once sizes are known.
+        assert Path(app.venv_rows[0]["path"]) == big
+        assert app.tracker.get_summary()["total_space_found"] == sum(sizes.values())
+
+    asyncio.run(scenario())
+
+
+def test_pending_row_shows_placeholder(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            env = _make_env(str(tmp_path / "missing" / ".venv"), 0)
+            env.size_pending = True
+            app._sizing = True  # hold the sizing worker back
+            app.add_venv_environment(env)
+            cells = app._venv_cells(0)
+            assert cells[app.VENV_COL_SIZE_HUMAN] == "sizing…"
+            assert list(app._unsized) == [str(env.path)]
+
+    asyncio.run(scenario())
+
+
+def test_disk_size_mode_shows_allocated_size(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.size_mode = "disk"
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            env = _make_env(str(tmp_path / "a" / ".venv"), 100)
+            env.usage = DiskUsage(apparent_bytes=100, disk_bytes=4096)
+            app.add_venv_environment(env)
+            assert app.venv_rows[0]["size"] == 4096
+            assert app.venv_rows[0]["size_human"] == "4.00 KB"
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("query", ["", "keep"])
+@pytest.mark.parametrize("reverse", [True, False])
+def test_sized_rows_move_into_place_without_a_resort(
+    tmp_path: Path, query: str, reverse: bool
+) -> None:
+    sizes = random.Random(7).sample(range(1, 1000), 40)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            app._sizing = True  # hold the sizing worker back
+            app.sort_state["venv-table"] = (app.VENV_COL_SIZE, reverse)
+            app._filter_query = query
+            app._apply_filter()
+            rows = []
+            for i in range(len(sizes)):
+                env = _make_env(f"/data/{'keep' if i % 3 else 'drop'}{i}/.venv", 0)
+                env.size_pending = True
+                rows.append(app.add_venv_environment(env))
+            table = app.query_one("#venv-table")
+
+            with (
+                patch.object(table, "reload") as reload,
+                patch.object(app, "sort_venv_rows") as resort,
+            ):
+                for row, size in zip(rows, sizes, strict=True):
+                    app._apply_size(row, DiskUsage(apparent_bytes=size, disk_bytes=0))
+                    expected = sorted(
+                        app.venv_rows,
+                        key=lambda r: (-r["size"] if reverse else r["size"], r["path"]),
+                    )
+                    assert app.venv_rows == expected
+                    assert app._venv_display_indices == [
+                        i for i, r in enumerate(app.venv_rows) if query in r["path_key"]
+                    ]
+            reload.assert_not_called()
+            resort.assert_not_called()
+            assert app._applied_query == query
+
+    asyncio.run(scenario())
@@ -0,0 +1,137 @@
+"""Tests for ``--cached`` start-up from a scan snapshot in the TUI (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``; the rescan
+runs the real shared walk over a small tree under ``tmp_path``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from killpy.files import DiskUsage, get_disk_usage
+from killpy.scanner import Scanner
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+from tests.unit.test_cli_sizing import _make_venv
+
+
+def test_snapshot_rows_are_reconciled_with_the_rescan(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    kept = _make_venv(tree, "kept", 5000)
+    new = _make_venv(tree, "new", 100)
+    gone = tree / "gone" / ".venv"
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.root_dir = tree
+        app.scanner = Scanner(types={"venv"})
+        app._cached_max_age = 3600
+        app.snapshots.save(
+            tree,
+            [_make_env(str(kept), 1), _make_env(str(gone), 1)],
+            app.scanner.types,
+        )
+
+        async with app.run_test() as pilot:
+            while not app._scan_complete or app._sizing:
+                await pilot.pause(0.01)
+            await app.workers.wait_for_complete()
+            status = str(app.query_one("#status-label").render())
+
+        sizes = {Path(row["path"]): row["size"] for row in app.venv_rows}
+        assert set(sizes) == {kept, new}
+        assert sizes[kept] >= 5000
+        assert "1 new, 1 gone since the snapshot" in status
+
+        snapshot = app.snapshots.load(tree, app.scanner.types)
+        assert snapshot is not None
+        assert {env.path for env in snapshot.envs} == {kept, new}
+
+    asyncio.run(scenario())
+
+
+def test_without_cached_the_snapshot_is_only_written(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    venv = _make_venv(tree, "only", 100)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.root_dir = tree
+        app.scanner = Scanner(types={"venv"})
+        app.snapshots.save(tree, [_make_env("/elsewhere/.venv", 1)], {"venv"})
+
+        async with app.run_test() as pilot:
+            while not app._scan_complete or app._sizing:
+                await pilot.pause(0.01)
+            await app.workers.wait_for_complete()
+
+        assert [Path(row["path"]) for row in app.venv_rows] == [venv]
+        snapshot = app.snapshots.load(tree, {"venv"})
+        assert snapshot is not None
+        assert [env.path for env in snapshot.envs] == [venv]
+
+    asyncio.run(scenario())
+
+
+def test_waits_for_a_concurrent_scan_and_reuses_it(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    shared = _make_env("/elsewhere/.venv", 10)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.root_dir = tree
+        app.scanner = Scanner(types={"venv"})
+        other = app.snapshots.lock(tree, app.scanner.types)
+        assert other.acquire(blocking=False)
+
+        async with app.run_test() as pilot:
+            while "waiting" not in str(app.query_one("#status-label").render()):
+                await pilot.pause(0.01)
+            app.snapshots.save(tree, [shared], app.scanner.types)
+            other.release()
+            while not app._scan_complete:
+                await pilot.pause(0.01)
+            await app.workers.wait_for_complete()
+            status = str(app.query_one("#status-label").render())
+
+        assert [row["path"] for row in app.venv_rows] == [str(shared.path)]
+        assert "from a concurrent scan" in status
+
+    asyncio.run(scenario())
+
+
+def test_scan_lock_is_released_before_sizing_finishes(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    _make_venv(tree, "only", 100)
+    sizing = threading.Event()
+    release = threading.Event()
+
+    def slow_usage(path: Path) -> DiskUsage:
+        sizing.set()
+        release.wait(5)
+        return get_disk_usage(path)
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+        app.root_dir = tree
+        app.scanner = Scanner(types={"venv"})
+        other = app.snapshots.lock(tree, app.scanner.types)
+
+        with patch("killpy.cli.get_disk_usage", slow_usage):
+            async with app.run_test() as pilot:
+                while not app._scan_complete or not sizing.is_set():
+                    await pilot.pause(0.01)
+                assert app._sizing
+                assert other.acquire(blocking=False)
+                other.release()
+                release.set()
+                while app._sizing:
+                    await pilot.pause(0.01)
+                await app.workers.wait_for_complete()
+
+        assert app.snapshots.load(tree, app.scanner.types) is not None
+
+    asyncio.run(scenario())
@@ -0,0 +1,104 @@
+"""Tests for TUI column sorting (``killpy/cli.py``).
+
+Reuses the headless-app helpers from ``test_cli_multiselect``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+
+from killpy.cli import EnvStatus
+from tests.unit.test_cli_multiselect import _make_app, _make_env
+
+
+def _sorted_paths(tmp_path: Path, envs, column: str, reverse: bool) -> list[str]:
+    result: list[str] = []
+
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for env in envs:
+                app.add_venv_environment(env)
+            app.sort_venv_rows(getattr(app, column), reverse)
+            result.extend(app.venv_rows[i]["path"] for i in app._venv_display_indices)
+
+    asyncio.run(scenario())
+    return result
+
+
+def test_human_size_column_sorts_by_bytes(tmp_path: Path) -> None:
+    envs = [
+        _make_env("/data/nine-mb/.venv", 9 * (1 << 20)),
+        _make_env("/data/ten-gb/.venv", 10 * (1 << 30)),
+    ]
+    assert _sorted_paths(tmp_path, envs, "VENV_COL_SIZE_HUMAN", reverse=True) == [
+        "/data/ten-gb/.venv",
+        "/data/nine-mb/.venv",
+    ]
+
+
+def test_date_column_sorts_chronologically(tmp_path: Path) -> None:
+    old = _make_env("/data/old/.venv", 1)
+    old.last_modified = datetime(2023, 12, 31, tzinfo=timezone.utc)
+    new = _make_env("/data/new/.venv", 1)
+    new.last_modified = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    # "31/12/2023" > "02/01/2024" as strings; the typed key must win.
+    assert _sorted_paths(tmp_path, [old, new], "VENV_COL_LAST_MODIFIED", False) == [
+        "/data/old/.venv",
+        "/data/new/.venv",
+    ]
+
+
+def test_ties_are_broken_by_path_in_both_directions(tmp_path: Path) -> None:
+    envs = [_make_env(f"/data/{name}/.venv", 10) for name in ("b", "c", "a")]
+    expected = ["/data/a/.venv", "/data/b/.venv", "/data/c/.venv"]
+    assert _sorted_paths(tmp_path, envs, "VENV_COL_SIZE", reverse=False) == expected
+    assert _sorted_paths(tmp_path, envs, "VENV_COL_SIZE", reverse=True) == expected
+
+
+def test_status_column_sorts_by_the_status_shown(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for name in ("a", "b", "c"):
+                app.add_venv_environment(_make_env(f"/data/{name}/.venv", 10))
+            app.action_toggle_multi_select()
+            app.action_multi_select_toggle_row()  # selects /data/a
+            app.venv_rows[2]["status"] = EnvStatus.MARKED_TO_DELETE.value
+
+            app.sort_venv_rows(app.VENV_COL_STATUS, reverse=True)
+
+            shown = [app._venv_cells(i)[app.VENV_COL_STATUS] for i in range(3)]
+            assert shown == sorted(shown, reverse=True)
+            assert app.venv_rows[-1]["path"] == "/data/b/.venv"  # no status
+
+    asyncio.run(scenario())
+
+
+def test_sorting_keeps_the_filter_and_its_narrowing(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        app, _ = _make_app(tmp_path)
+
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            for name, size in (("keep-s", 1), ("drop", 5), ("keep-l", 9)):
+                app.add_venv_environment(_make_env(f"/data/{name}/.venv", size))
+            app._filter_query = "keep"
+            app._apply_filter()
+
+            app.sort_venv_rows(app.VENV_COL_SIZE, reverse=True)
+
+            assert app._applied_query == "keep"
+            visible = [app.venv_rows[i]["path"] for i in app._venv_display_indices]
+            assert visible == ["/data/keep-l/.venv", "/data/keep-s/.venv"]
+
+    asyncio.run(scenario())
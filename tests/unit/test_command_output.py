@@ -20,6 +20,7 @@ from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from killpy.__main__ import cli
@@ -27,6 +28,14 @@ from killpy.intelligence import analyze_environments
 from killpy.intelligence.tracker import UsageTracker
 from killpy.models import Environment, GitInfo, ScoredEnvironment
 
+
+@pytest.fixture(autouse=True)
+def _snapshots_in_tmp(tmp_path: Path):
+    """Keep the scan snapshots of ``list`` and ``stats`` out of the home directory."""
+    with patch("killpy.snapshots._DEFAULT_DIR", tmp_path / "snapshots"):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -196,6 +205,24 @@ class TestStatsHistory:
         data = json.loads(result.output)
         assert data["total_scans"] == 1
 
+    def test_history_since_window(self, tmp_path: Path) -> None:
+        tracker = self._tracker(tmp_path, records=1)
+        result = self._run(tracker, ["--history", "--since", "7", "--json"])
+        assert result.exit_code == 0
+        assert json.loads(result.output)["total_scans"] == 1
+
+    def test_by_type_requires_store(self, tmp_path: Path) -> None:
+        result = self._run(self._tracker(tmp_path), ["--history", "--by-type"])
+        assert result.exit_code != 0
+        assert "KILLPY_HISTORY_DB" in result.output
+
+    def test_by_type_with_store(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json", db_path=tmp_path / "h.db")
+        tracker.record_scan_result([_env("e0", size=1_000)], "/tmp")
+        result = self._run(tracker, ["--history", "--by-type"])
+        assert result.exit_code == 0
+        assert "Growth by type" in result.output
+
 
 # ---------------------------------------------------------------------------
 # killpy list — json-stream + progress callback
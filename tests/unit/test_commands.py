@@ -7,16 +7,36 @@ stubs ``Scanner`` / ``Cleaner`` to avoid real filesystem scans.
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime, timezone
+from importlib import import_module
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pytest
 from click.testing import CliRunner, Result
 
-from killpy.__main__ import cli
-from killpy.cleaner import CleanerError
+from killpy.__main__ import _SUBCOMMANDS, cli
+from killpy.cleaner import BudgetedRun, CleanerError
+from killpy.commands._utils import parse_duration, refresh_snapshot
+from killpy.files import DiskUsage
 from killpy.intelligence.tracker import UsageTracker
-from killpy.models import Environment, ScoredEnvironment
+from killpy.journal import DeletionJournal
+from killpy.models import Environment, RootIdentity, ScoredEnvironment
+from killpy.users import LocalUser, owner_name
+
+
+@pytest.fixture(autouse=True)
+def _state_in_tmp(tmp_path: Path):
+    """Keep the journal, snapshots and daemon socket out of the real home directory."""
+    with (
+        patch("killpy.journal._DEFAULT_PATH", tmp_path / "deletions.ndjson"),
+        patch("killpy.snapshots._DEFAULT_DIR", tmp_path / "snapshots"),
+        patch("killpy.daemon._DEFAULT_SOCKET", tmp_path / "daemon.sock"),
+        patch.dict("os.environ", {"KILLPY_SOCKET": ""}),
+    ):
+        yield
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -92,12 +112,27 @@ class TestListCommand:
 
     def test_type_filter(self) -> None:
         envs = [
-            _env(name="a", env_type="venv"),
-            _env(name="b", env_type="conda"),
+            _env(name="keep-me", env_type="venv"),
+            _env(name="skip-me", env_type="conda"),
         ]
         result = self._run(["--type", "venv"], envs=envs)
-        assert "a" in result.output
-        assert "b" not in result.output
+        assert "keep-me" in result.output
+        assert "skip-me" not in result.output
+
+    def test_disk_size_mode_shows_allocated_size(self) -> None:
+        env = _env(size=100)
+        env.usage = DiskUsage(apparent_bytes=100, disk_bytes=8192)
+        result = self._run(["--size-mode", "disk"], envs=[env])
+        assert "8.00 KB total on disk" in result.output
+
+    def test_sort_by_inodes_puts_most_files_first(self) -> None:
+        few, many = _env(name="few-files"), _env(name="many-files")
+        few.usage = DiskUsage(file_count=3, dir_count=1)
+        many.usage = DiskUsage(file_count=300, dir_count=20)
+        result = self._run(["--json", "--sort", "inodes"], envs=[few, many])
+        data = json.loads(result.output)
+        assert [d["name"] for d in data] == ["many-files", "few-files"]
+        assert data[0]["inode_count"] == 320
 
     def test_type_filter_case_insensitive(self) -> None:
         envs = [_env(name="a", env_type="Venv")]
@@ -153,6 +188,170 @@ class TestStatsCommand:
         data = json.loads(result.output)
         assert data["total_size_bytes"] == 2000
 
+    def test_json_reports_reclaimable_bytes(self) -> None:
+        linked = _env(env_type="uv", size=1000)
+        linked.usage = DiskUsage(apparent_bytes=1000, reclaimable_bytes=250)
+        result = self._run(["--json"], envs=[linked, _env(size=500)])
+        data = json.loads(result.output)
+        assert data["total_reclaimable_bytes"] == 750
+        assert data["by_type"]["uv"]["reclaimable_bytes"] == 250
+
+    def test_json_reports_disk_bytes(self) -> None:
+        env = _env(size=100)
+        env.usage = DiskUsage(apparent_bytes=100, disk_bytes=4096)
+        data = json.loads(self._run(["--json"], envs=[env]).output)
+        assert data["total_disk_bytes"] == 4096
+        assert data["by_type"]["venv"]["disk_bytes"] == 4096
+        assert data["total_size_bytes"] == 100
+
+    def test_json_reports_inode_counts(self) -> None:
+        env = _env(size=100)
+        env.usage = DiskUsage(file_count=40, dir_count=2)
+        data = json.loads(self._run(["--json"], envs=[env]).output)
+        assert data["total_inode_count"] == 42
+        assert data["by_type"]["venv"]["inode_count"] == 42
+
+    def test_json_by_owner(self, tmp_path: Path) -> None:
+        envs = [_env(tmp_path, size=100), _env(tmp_path / "gone", size=50)]
+        data = json.loads(self._run(["--json", "--by-owner"], envs=envs).output)
+        mine = data["by_owner"][owner_name(os.getuid())]
+        assert (mine["uid"], mine["count"], mine["size_bytes"]) == (
+            os.getuid(),
+            1,
+            100,
+        )
+        assert data["by_owner"]["unknown"]["size_bytes"] == 50
+
+    def test_by_owner_table(self, tmp_path: Path) -> None:
+        result = self._run(["--by-owner"], envs=[_env(tmp_path)])
+        assert "By owner" in result.output
+        assert owner_name(os.getuid()) in result.output
+
+    def test_several_paths_and_system_scan_together(self, tmp_path: Path) -> None:
+        users = [LocalUser("alice", 1000, tmp_path)]
+        with (
+            patch("killpy.commands.stats.Scanner") as mock_cls,
+            patch("killpy.commands._utils.local_users", return_value=users),
+        ):
+            mock_cls.return_value.scan_many.return_value = [_env(tmp_path)]
+            result = CliRunner().invoke(
+                cli,
+                ["stats", "--path", "/tmp", "--path", str(tmp_path), "--system"],
+            )
+        assert result.exit_code == 0, result.output
+        call = mock_cls.return_value.scan_many.call_args
+        assert call.args[0] == [Path("/tmp"), tmp_path]
+        assert call.kwargs["users"] == users
+        assert "By owner" in result.output
+
+
+# ---------------------------------------------------------------------------
+# --cached (scan snapshots)
+# ---------------------------------------------------------------------------
+
+
+class TestCachedScans:
+    def _run(
+        self,
+        command: str,
+        args: list[str],
+        envs: list[Environment],
+        options: frozenset[str] = frozenset(),
+    ):
+        with (
+            patch(f"killpy.commands.{command}.Scanner") as mock_cls,
+            patch("killpy.commands._utils.refresh_snapshot") as mock_refresh,
+        ):
+            mock_cls.return_value.scan.return_value = envs
+            mock_cls.return_value.types = frozenset({"venv"})
+            mock_cls.return_value.excluded = frozenset()
+            mock_cls.return_value.options = options
+            result = CliRunner().invoke(cli, [command, "--path", "/tmp", *args])
+        return result, mock_cls.return_value.scan, mock_refresh
+
+    def test_every_scan_leaves_a_snapshot(self) -> None:
+        self._run("list", [], [_env(name="first")])
+
+        result, scan, refresh = self._run("list", ["--cached"], [])
+
+        assert result.exit_code == 0, result.output
+        assert "first" in result.output
+        assert "refreshing it in the background" in result.output
+        scan.assert_not_called()
+        # Too young to be worth a background rescan yet.
+        refresh.assert_not_called()
+
+    def test_snapshot_is_refreshed_in_the_background(self) -> None:
+        self._run("list", [], [_env(name="first")])
+
+        with patch("killpy.commands._utils._MIN_REFRESH_AGE", 0):
+            result, _, refresh = self._run("stats", ["--cached"], [])
+
+        assert result.exit_code == 0, result.output
+        refresh.assert_called_once_with(Path("/tmp"), frozenset({"venv"}))
+
+    def test_old_snapshot_means_a_new_scan(self) -> None:
+        self._run("list", [], [_env(name="first")])
+
+        result, scan, _ = self._run(
+            "list", ["--cached", "--max-age", "0"], [_env(name="second")]
+        )
+
+        scan.assert_called_once()
+        assert "second" in result.output
+        assert "first" not in result.output
+
+    def test_without_cached_always_scans(self) -> None:
+        self._run("list", [], [_env(name="first")])
+        result, scan, _ = self._run("list", [], [_env(name="second")])
+        scan.assert_called_once()
+        assert "second" in result.output
+
+    def test_running_daemon_answers_instead_of_a_scan(self) -> None:
+        daemon_envs = [_env(name="indexed", env_type="conda")]
+        with patch(
+            "killpy.commands._utils.query_daemon", return_value=daemon_envs
+        ) as mock_query:
+            result, scan, _ = self._run("list", ["--type", "conda"], [])
+
+        mock_query.assert_called_once_with(Path("/tmp"))
+        scan.assert_not_called()
+        assert "indexed" in result.output
+        assert "Answered by the killpy daemon" in result.output
+
+    def test_daemon_does_not_answer_scans_with_options(self) -> None:
+        with patch("killpy.commands._utils.query_daemon") as mock_query:
+            _, scan, _ = self._run(
+                "list", [], [_env()], options=frozenset({"one-file-system"})
+            )
+        mock_query.assert_not_called()
+        scan.assert_called_once()
+
+    def test_cached_needs_a_single_root(self) -> None:
+        result, scan, _ = self._run("list", ["--cached", "--path", "/"], [])
+        assert result.exit_code == 2
+        assert "--cached needs a single --path" in result.output
+        scan.assert_not_called()
+
+    def test_refresh_runs_a_detached_list(self) -> None:
+        with patch("subprocess.Popen") as mock_popen:
+            refresh_snapshot(Path("/srv"), frozenset({"venv", "conda"}))
+        command = mock_popen.call_args.args[0]
+        assert command[1:] == [
+            "-m",
+            "killpy",
+            "list",
+            "--path",
+            "/srv",
+            "--json",
+            "--quiet",
+            "--type",
+            "conda",
+            "--type",
+            "venv",
+        ]
+        assert mock_popen.call_args.kwargs["start_new_session"] is True
+
 
 # ---------------------------------------------------------------------------
 # killpy delete
@@ -246,6 +445,174 @@ class TestDeleteCommand:
         # Should not prompt, should succeed
         assert result.exit_code == 0
 
+    def test_git_flag_makes_scanner_git_aware(self) -> None:
+        with patch("killpy.commands.delete.Scanner") as mock_scanner:
+            mock_scanner.return_value.scan.return_value = []
+            result = CliRunner().invoke(
+                cli, ["delete", "--path", "/tmp", "--type", "cache", "--git"]
+            )
+        assert result.exit_code == 0
+        assert mock_scanner.call_args.kwargs["git_aware"] is True
+
+    def test_reports_reclaimable_across_the_selection(self, tmp_path: Path) -> None:
+        """A file hardlinked between two selected envs is freed by the pair."""
+        one, two = tmp_path / "one", tmp_path / "two"
+        one.mkdir()
+        two.mkdir()
+        (one / "lib.so").write_bytes(b"x" * 2048)
+        (tmp_path / "cache.so").write_bytes(b"y" * 4096)
+        (two / "lib.so").hardlink_to(one / "lib.so")
+        (two / "cached.so").hardlink_to(tmp_path / "cache.so")
+        envs = []
+        for path in (one, two):
+            env = _env(path=path, size=2048 if path == one else 6144)
+            env.usage = DiskUsage(apparent_bytes=env.size_bytes, reclaimable_bytes=0)
+            envs.append(env)
+        result = self._run(["--dry-run"], envs=envs)
+        assert "8.00 KB total, 2.00 KB reclaimable" in result.output
+
+    def test_free_inodes_selects_fewest_envs(self) -> None:
+        envs = []
+        for name, files in (("small", 10), ("large", 900), ("medium", 200)):
+            env = _env(name=name, path=Path(f"/fake/{name}"))
+            env.usage = DiskUsage(file_count=files, reclaimable_file_count=files)
+            envs.append(env)
+        result = self._run(["--free-inodes", "1000", "--dry-run"], envs=envs)
+        assert "large" in result.output
+        assert "medium" in result.output
+        assert "small" not in result.output
+        assert "Frees 1,100 inodes (target 1,000)" in result.output
+
+    def test_free_plans_and_explains_deletions(self) -> None:
+        envs = [
+            _env(name="keep-me", path=Path("/fake/keep-me"), size=3 << 30),
+            _env(name="drop-me", path=Path("/fake/drop-me"), size=3 << 30),
+        ]
+        scores = {"keep-me": 0.1, "drop-me": 0.9}
+        with patch(
+            "killpy.commands.delete.score_all",
+            side_effect=lambda envs: [
+                ScoredEnvironment(env=e, score=scores[e.name]) for e in envs
+            ],
+        ):
+            result = self._run(["--free", "2GB", "--dry-run"], envs=envs)
+        assert result.exit_code == 0
+        assert "drop-me" in result.output
+        assert "keep-me" not in result.output
+        assert "Frees 3.00 GB (target 2.00 GB)" in result.output
+        assert "why: frees 3.00 GB" in result.output
+
+    def test_free_rejects_bad_size(self) -> None:
+        result = self._run(["--free", "lots"], envs=[_env()])
+        assert result.exit_code == 2
+        assert "not a size" in result.output
+
+    def test_free_and_free_inodes_are_exclusive(self) -> None:
+        result = self._run(["--free", "1GB", "--free-inodes", "5"], envs=[_env()])
+        assert result.exit_code == 2
+
+    def test_free_inodes_reports_shortfall(self) -> None:
+        env = _env()
+        env.usage = DiskUsage(file_count=5, reclaimable_file_count=5)
+        result = self._run(["--free-inodes", "100", "--dry-run"], envs=[env])
+        assert "Only 5 inodes can be freed" in result.output
+
+    def test_time_budget_lists_what_is_left(self) -> None:
+        done, left = _env(name="done-env"), _env(name="left-env")
+        run = BudgetedRun(
+            freed_bytes=done.size_bytes,
+            deleted=[done],
+            remaining=[left],
+            elapsed=590,
+            inodes_per_second=12_345,
+        )
+        with (
+            patch("killpy.commands.delete.Scanner") as mock_scanner,
+            patch("killpy.commands.delete.Cleaner") as mock_cleaner,
+        ):
+            mock_scanner.return_value.scan.return_value = [done, left]
+            mock_cleaner.return_value.size_mode = "apparent"
+            mock_cleaner.return_value.delete_within.return_value = run
+            result = CliRunner().invoke(
+                cli, ["delete", "--path", "/tmp", "--time-budget", "10m", "--yes"]
+            )
+        assert result.exit_code == 0
+        args = mock_cleaner.return_value.delete_within.call_args.args
+        assert args[1] == 600
+        assert "Time budget 10m:" in result.output
+        assert "used up after 9m50s (12,345 inodes/s)" in result.output
+        assert "1 environment(s)" in result.output
+        assert "left-env" in result.output.split("next run")[1]
+
+    def test_time_budget_rejects_bad_duration(self) -> None:
+        result = self._run(["--time-budget", "soon"], envs=[_env()])
+        assert result.exit_code == 2
+        assert "not a duration" in result.output
+
+    def _plan_envs(self, tmp_path: Path) -> tuple[Environment, Environment]:
+        kept_path = tmp_path / "kept" / ".venv"
+        kept_path.mkdir(parents=True)
+        kept = _env(path=kept_path, name="kept-env", size=3000)
+        kept.usage = DiskUsage(
+            apparent_bytes=3000,
+            reclaimable_bytes=1000,
+            disk_bytes=8192,
+            reclaimable_disk_bytes=4096,
+            file_count=3,
+            reclaimable_file_count=1,
+            dir_count=2,
+        )
+        kept.identity = RootIdentity.of(kept_path)
+        gone = _env(path=tmp_path / "gone", name="gone-env")
+        gone.identity = RootIdentity(device=1, inode=2, mtime_ns=3)
+        return kept, gone
+
+    def _run_plan(self, args: list[str], input: str | None = None):
+        with (
+            patch("killpy.commands.delete.Scanner") as mock_scanner,
+            patch("killpy.commands.delete.Cleaner") as mock_cleaner,
+        ):
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.reclaimable_bytes
+            result = CliRunner().invoke(cli, ["delete", "--yes", *args], input=input)
+        mock_scanner.assert_not_called()
+        deleted = [c.args[0] for c in mock_cleaner.return_value.delete.call_args_list]
+        return result, deleted
+
+    def test_from_plan_deletes_revalidated_entries(self, tmp_path: Path) -> None:
+        kept, gone = self._plan_envs(tmp_path)
+        plan = tmp_path / "plan.json"
+        plan.write_text(json.dumps([kept.to_dict(), gone.to_dict()]))
+
+        with patch("killpy.commands._utils.get_reclaimable_size") as mock_walk:
+            result, deleted = self._run_plan(["--from", str(plan)])
+
+        assert result.exit_code == 0, result.output
+        assert [e.name for e in deleted] == ["kept-env"]
+        mock_walk.assert_not_called()
+        assert "1000 bytes reclaimable" in result.output
+        # Sizes and identity come from the plan, not from a new walk.
+        assert deleted[0].usage == kept.usage
+        assert deleted[0].identity == kept.identity
+        assert "Skipping 1 plan entry changed since the scan" in result.output
+        assert "no longer exists" in result.output
+        assert "Freed 1000 bytes" in result.output
+
+    def test_from_plan_reads_ndjson_on_stdin(self, tmp_path: Path) -> None:
+        kept, _ = self._plan_envs(tmp_path)
+        result, deleted = self._run_plan(
+            ["--from", "-"], input=json.dumps(kept.to_dict()) + "\n"
+        )
+        assert result.exit_code == 0, result.output
+        assert [e.name for e in deleted] == ["kept-env"]
+
+    def test_from_plan_rejects_other_json(self, tmp_path: Path) -> None:
+        plan = tmp_path / "plan.json"
+        plan.write_text(json.dumps([{"path": "/x"}]))
+        result, deleted = self._run_plan(["--from", str(plan)])
+        assert result.exit_code == 2
+        assert "killpy list --json" in result.output
+        assert deleted == []
+
     def test_abort_on_no_confirmation(self) -> None:
         envs = [_env(name="proj")]
         with (
@@ -258,6 +625,132 @@ class TestDeleteCommand:
         mock_cleaner.return_value.delete.assert_not_called()
 
 
+class TestParseDuration:
+    def test_units(self) -> None:
+        assert parse_duration("45") == 45
+        assert parse_duration("90s") == 90
+        assert parse_duration("10m") == 600
+        assert parse_duration("1h30m") == 5400
+        assert parse_duration("1.5H") == 5400
+
+    def test_rejects_garbage(self) -> None:
+        for text in ("", "soon", "10x", "m", "1h-"):
+            with pytest.raises(ValueError):
+                parse_duration(text)
+
+
+class TestDeleteResume:
+    def _interrupted(self, tmp_path: Path) -> DeletionJournal:
+        """Journal a run killed while deleting "partial" and "vanished"."""
+        envs = []
+        for name in ("done", "vanished", "partial", "pending"):
+            env_path = tmp_path / name
+            env_path.mkdir()
+            env = _env(path=env_path, name=name, size=1000)
+            env.identity = RootIdentity.of(env_path)
+            envs.append(env)
+        journal = DeletionJournal()
+        journal.begin(envs, tmp_path, "apparent")
+        journal.started(envs[0])
+        envs[0].path.rmdir()
+        journal.done(envs[0], 1000)
+        journal.started(envs[1])
+        envs[1].path.rmdir()
+        journal.started(envs[2])
+        return journal
+
+    def test_resume_finishes_and_reconciles(self, tmp_path: Path) -> None:
+        journal = self._interrupted(tmp_path)
+        tracker = UsageTracker(tmp_path / "history.json")
+        tracker.record_scan_result([], tmp_path)
+        with (
+            patch("killpy.commands.delete.Cleaner") as mock_cleaner,
+            patch("killpy.commands.delete.UsageTracker", return_value=tracker),
+        ):
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.size_bytes
+            result = CliRunner().invoke(cli, ["delete", "--resume", "--yes"])
+
+        assert result.exit_code == 0, result.output
+        deleted = [
+            c.args[0].name for c in mock_cleaner.return_value.delete.call_args_list
+        ]
+        assert deleted == ["partial", "pending"]
+        assert "2 partly deleted" in result.output
+        # done + vanished (freed by the interrupted run) + partial + pending
+        assert tracker.get_history()[-1].total_space_deleted == 4000
+        assert journal.load() is None
+
+    def test_resume_skips_pending_entries_that_changed(self, tmp_path: Path) -> None:
+        self._interrupted(tmp_path)
+        (tmp_path / "pending").rmdir()
+        with patch("killpy.commands.delete.Cleaner") as mock_cleaner:
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.size_bytes
+            result = CliRunner().invoke(cli, ["delete", "--resume", "--yes"])
+        assert result.exit_code == 0, result.output
+        assert "Skipping pending: no longer exists" in result.output
+        deleted = [
+            c.args[0].name for c in mock_cleaner.return_value.delete.call_args_list
+        ]
+        assert deleted == ["partial"]
+
+    def test_resume_leaves_a_recreated_partial_tree_alone(self, tmp_path: Path) -> None:
+        self._interrupted(tmp_path)
+        # Moved aside rather than removed, so its inode cannot be reused.
+        (tmp_path / "partial").rename(tmp_path / "old-partial")
+        (tmp_path / "partial").mkdir()
+        with patch("killpy.commands.delete.Cleaner") as mock_cleaner:
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.size_bytes
+            result = CliRunner().invoke(cli, ["delete", "--resume", "--yes"])
+        assert result.exit_code == 0, result.output
+        assert "Skipping partial: replaced since the scan" in result.output
+        deleted = [
+            c.args[0].name for c in mock_cleaner.return_value.delete.call_args_list
+        ]
+        assert deleted == ["pending"]
+
+    def test_resume_skips_a_partial_tree_now_in_use(self, tmp_path: Path) -> None:
+        self._interrupted(tmp_path)
+
+        def mark(env: Environment) -> None:
+            env.is_system_critical = env.name == "partial"
+
+        with (
+            patch("killpy.commands.delete.Cleaner") as mock_cleaner,
+            patch("killpy.scanner.Scanner._mark_system_critical", side_effect=mark),
+        ):
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.size_bytes
+            result = CliRunner().invoke(cli, ["delete", "--resume", "--yes"])
+        assert result.exit_code == 0, result.output
+        assert "currently in use" in result.output
+        deleted = [
+            c.args[0].name for c in mock_cleaner.return_value.delete.call_args_list
+        ]
+        assert deleted == ["pending"]
+
+    def test_nothing_to_resume(self) -> None:
+        result = CliRunner().invoke(cli, ["delete", "--resume"])
+        assert result.exit_code == 0
+        assert "Nothing to resume" in result.output
+
+    def test_new_run_refuses_while_one_is_interrupted(self, tmp_path: Path) -> None:
+        self._interrupted(tmp_path)
+        with patch("killpy.commands.delete.Scanner") as mock_scanner:
+            result = CliRunner().invoke(cli, ["delete", "--path", "/tmp", "--yes"])
+        assert result.exit_code == 1
+        assert "killpy delete --resume" in result.output
+        mock_scanner.assert_not_called()
+
+    def test_completed_run_leaves_no_journal(self) -> None:
+        with (
+            patch("killpy.commands.delete.Scanner") as mock_scanner,
+            patch("killpy.commands.delete.Cleaner") as mock_cleaner,
+        ):
+            mock_scanner.return_value.scan.return_value = [_env()]
+            mock_cleaner.return_value.delete.side_effect = lambda e: e.size_bytes
+            CliRunner().invoke(cli, ["delete", "--path", "/tmp", "--yes"])
+        assert DeletionJournal().load() is None
+
+
 # ---------------------------------------------------------------------------
 # killpy --help
 # ---------------------------------------------------------------------------
@@ -362,6 +855,12 @@ class TestHelpOutput:
         assert "clean" in result.output
         assert "doctor" in result.output
 
+    def test_stored_short_helps_match_the_commands(self) -> None:
+        for target, short_help in _SUBCOMMANDS.values():
+            module, attribute = target.split(":")
+            command = getattr(import_module(module), attribute)
+            assert command.get_short_help_str(1000) == short_help
+
     def test_list_help(self) -> None:
         runner = CliRunner()
         result = runner.invoke(cli, ["list", "--help"])
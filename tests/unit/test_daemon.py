@@ -0,0 +1,241 @@
+"""Unit tests for ``killpy.daemon`` (``killpy serve``)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from killpy.daemon import (
+    DaemonError,
+    EnvironmentIndex,
+    InotifyWatcher,
+    PollingWatcher,
+    daemon_status,
+    query_daemon,
+    serve,
+)
+from killpy.scanner import Scanner
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _ManualWatcher(PollingWatcher):
+    """Polling watcher that does not sleep, so tests drive the cycles."""
+
+    def changes(self, timeout: float) -> set[str]:  # noqa: ARG002
+        return super().changes(0)
+
+
+def _make_venv(root: Path, name: str, payload: int = 100) -> Path:
+    venv = root / name / ".venv"
+    venv.mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+    (venv / "blob.bin").write_bytes(b"x" * payload)
+    return venv
+
+
+def _index(root: Path) -> EnvironmentIndex:
+    index = EnvironmentIndex(
+        root, scanner=Scanner(types={"venv", "cache"}), watcher=_ManualWatcher()
+    )
+    index.build()
+    return index
+
+
+def _paths(index: EnvironmentIndex, path: Path | None = None) -> set[Path]:
+    envs = index.query(path or index.root)
+    assert envs is not None
+    return {env.path for env in envs}
+
+
+def _touch_later(path: Path) -> None:
+    """Move *path*'s mtime forward so a coarse-grained clock still sees a change."""
+    stat = path.stat()
+    later = stat.st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(later, later))
+
+
+# ---------------------------------------------------------------------------
+# EnvironmentIndex
+# ---------------------------------------------------------------------------
+
+
+class TestEnvironmentIndex:
+    def test_build_matches_a_scan(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        _make_venv(root, "a")
+        _make_venv(root / "deep" / "er", "b")
+        (root / "src" / "__pycache__").mkdir(parents=True)
+
+        index = _index(root)
+
+        scanned = {env.path for env in Scanner(types={"venv", "cache"}).scan(root)}
+        assert _paths(index) == scanned
+
+    def test_new_and_removed_environments(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        gone = _make_venv(root, "gone")
+        (root / "proj").mkdir()
+        index = _index(root)
+
+        new = _make_venv(root / "proj", "new")
+        shutil.rmtree(gone.parent)
+        _touch_later(root / "proj")
+        _touch_later(root)
+        index.refresh(0)
+
+        assert _paths(index) == {new}
+
+    def test_directory_becomes_an_environment(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        env_dir = root / "plain"
+        env_dir.mkdir()
+        index = _index(root)
+        assert _paths(index) == set()
+
+        (env_dir / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        _touch_later(env_dir)
+        index.refresh(0)
+
+        assert _paths(index) == {env_dir}
+
+    def test_changed_environment_is_resized(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        venv = _make_venv(root, "a", payload=100)
+        index = _index(root)
+
+        (venv / "more.bin").write_bytes(b"y" * 5000)
+        _touch_later(venv)
+        index.refresh(0)
+
+        [env] = index.query(root) or []
+        assert env.size_bytes >= 5100
+
+    def test_removed_tree_is_forgotten_down_to_its_leaves(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        kept = _make_venv(root, "kept")
+        _make_venv(root / "deep" / "er", "b")
+        (root / "deep" / "src").mkdir()
+        index = _index(root)
+
+        shutil.rmtree(root / "deep")
+        _touch_later(root)
+        index.refresh(0)
+
+        assert _paths(index) == {kept}
+        assert (
+            index.status()["watched_directories"]
+            == (_index(root).status()["watched_directories"])
+        )
+        assert list(index._resize_queue) == [str(kept)]
+
+    def test_out_of_watches_closes_the_watcher_and_polls(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        _make_venv(root, "a")
+
+        class _Exhausted(_ManualWatcher):
+            name = "exhausted"
+            closed = False
+
+            def add(self, path: str) -> None:
+                raise OSError(28, "No space left on device", path)
+
+            def close(self) -> None:
+                self.closed = True
+
+        watcher = _Exhausted()
+        index = EnvironmentIndex(root, Scanner(types={"venv"}), watcher)
+        index.build()
+
+        assert watcher.closed
+        assert isinstance(index.watcher, PollingWatcher)
+        assert _paths(index) == {root / "a" / ".venv"}
+
+    def test_query_is_limited_to_the_path(self, tmp_path: Path) -> None:
+        root = tmp_path.resolve()
+        a = _make_venv(root / "team", "a")
+        _make_venv(root / "teammate", "b")
+        index = _index(root)
+
+        assert _paths(index, root / "team") == {a}
+        assert index.query(root.parent) is None
+
+
+@pytest.mark.skipif(
+    not Path("/proc/sys/fs/inotify").exists(), reason="inotify not available"
+)
+def test_inotify_reports_the_changed_directory(tmp_path: Path) -> None:
+    watcher = InotifyWatcher()
+    try:
+        watcher.add(str(tmp_path))
+        (tmp_path / "new").mkdir()
+        assert watcher.changes(5) == {str(tmp_path)}
+        assert watcher.changes(0) == set()
+    finally:
+        watcher.close()
+
+
+# ---------------------------------------------------------------------------
+# Server and client
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def running(tmp_path: Path) -> Iterator[tuple[EnvironmentIndex, Path]]:
+    root = (tmp_path / "tree").resolve()
+    _make_venv(root, "a")
+    index = _index(root)
+    sock = tmp_path / "daemon.sock"
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=serve, args=(index, sock), kwargs={"interval": 0.01, "stop": stop}
+    )
+    thread.start()
+    deadline = time.monotonic() + 5
+    while daemon_status(sock) is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    yield index, sock
+    stop.set()
+    thread.join(5)
+
+
+class TestServer:
+    def test_answers_queries_for_its_tree(self, running) -> None:
+        index, sock = running
+        envs = query_daemon(index.root, sock)
+        assert envs is not None
+        assert [env.path for env in envs] == [index.root / "a" / ".venv"]
+        assert query_daemon(index.root.parent, sock) is None
+
+    def test_critical_flags_are_the_clients(self, running) -> None:
+        index, sock = running
+        for env in index.query(index.root) or []:
+            env.is_system_critical = True  # as the daemon's own sys.prefix had it
+        [answered] = query_daemon(index.root, sock) or []
+        assert not answered.is_system_critical
+
+    def test_status(self, running) -> None:
+        index, sock = running
+        status = daemon_status(sock)
+        assert status is not None
+        assert status["root"] == str(index.root)
+        assert status["environments"] == 1
+
+    def test_refuses_a_second_daemon(self, running) -> None:
+        index, sock = running
+        with pytest.raises(DaemonError):
+            serve(index, sock, stop=threading.Event())
+
+    def test_no_daemon_means_no_answer(self, tmp_path: Path) -> None:
+        assert query_daemon(tmp_path, tmp_path / "missing.sock") is None
+        stale = tmp_path / "stale.sock"
+        stale.write_text("")
+        assert query_daemon(tmp_path, stale) is None
@@ -9,11 +9,13 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from pathlib import Path
 
+import click
 import pytest
 
 import killpy.__main__ as main_mod
 from killpy.cleaner import CleanerError
 from killpy.intelligence.tracker import UsageTracker
+from killpy.journal import DeletionJournal
 from killpy.models import Environment
 
 
@@ -57,6 +59,7 @@ def _patch_pipeline(
             deleted.append(env)
             return env.size_bytes
 
+    monkeypatch.setattr("killpy.journal._DEFAULT_PATH", tmp_path / "deletions.ndjson")
     monkeypatch.setattr(main_mod, "Scanner", FakeScanner)
     monkeypatch.setattr(main_mod, "Cleaner", FakeCleaner)
     monkeypatch.setattr(
@@ -158,3 +161,35 @@ def test_delete_all_force_includes_system_critical(
 
     assert deleted == [env_ok, env_active]
     assert "Deleted 2/2" in capsys.readouterr().out
+
+
+def test_delete_all_is_journaled(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    env = _make_env("/data/a/.venv", 10)
+    _patch_pipeline(monkeypatch, tmp_path, [env])
+    journaled: list[list[Environment]] = []
+    begin = DeletionJournal.begin
+
+    def spy(self, envs, scan_path, size_mode) -> None:
+        journaled.append(list(envs))
+        begin(self, envs, scan_path, size_mode)
+
+    monkeypatch.setattr(DeletionJournal, "begin", spy)
+
+    main_mod._run_delete_all(tmp_path, set(), yes=True)
+
+    assert journaled == [[env]]
+    assert DeletionJournal().load() is None  # finished runs leave no journal
+
+
+def test_delete_all_refuses_while_a_run_is_interrupted(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    deleted = _patch_pipeline(monkeypatch, tmp_path, [_make_env("/data/a/.venv", 10)])
+    DeletionJournal().begin([_make_env("/data/b/.venv", 20)], tmp_path, "apparent")
+
+    with pytest.raises(click.ClickException, match="delete --resume"):
+        main_mod._run_delete_all(tmp_path, set(), yes=True)
+
+    assert deleted == []
@@ -10,7 +10,7 @@ from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
-from killpy.detectors import ALL_DETECTORS
+from killpy.detectors import ALL_DETECTORS, DETECTOR_REGISTRY, load_detectors
 from killpy.detectors import venv as venv_mod
 from killpy.detectors.base import AbstractDetector
 from killpy.detectors.cache import CacheDetector
@@ -235,3 +235,10 @@ class TestDetectorContract:
                 "always_available, required_tool, override _candidate_dirs(), "
                 "or override can_handle() (documented exception)"
             )
+
+    def test_registry_names_match_detector_names(self) -> None:
+        assert [cls.name for cls in ALL_DETECTORS] == list(DETECTOR_REGISTRY)
+
+    def test_load_detectors_keeps_canonical_order(self) -> None:
+        loaded = load_detectors(["cache", "venv", "unknown"])
+        assert [cls.name for cls in loaded] == ["venv", "cache"]
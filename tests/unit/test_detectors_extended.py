@@ -883,7 +883,7 @@ class TestPyenvDetectorExtended:
         (versions / "3.11.0").mkdir(parents=True)
         with (
             patch("killpy.detectors.pyenv._pyenv_versions_root", return_value=versions),
-            patch("killpy.detectors.pyenv.get_total_size", side_effect=OSError("io")),
+            patch("killpy.detectors.pyenv.get_disk_usage", side_effect=OSError("io")),
         ):
             envs = PyenvDetector().detect(tmp_path)
         assert envs == []
@@ -899,7 +899,7 @@ class TestPoetryDetectorErrors:
         (tmp_path / "project-abc").mkdir()
         with (
             patch("killpy.detectors.poetry._poetry_venvs_dir", return_value=tmp_path),
-            patch("killpy.detectors.poetry.get_total_size", side_effect=OSError("io")),
+            patch("killpy.detectors.poetry.get_disk_usage", side_effect=OSError("io")),
         ):
             envs = PoetryDetector().detect(tmp_path)
         assert envs == []
@@ -923,7 +923,7 @@ class TestHatchDetectorErrors:
         (tmp_path / "project_a" / "default").mkdir(parents=True)
         with (
             patch("killpy.detectors.hatch._hatch_envs_root", return_value=tmp_path),
-            patch("killpy.detectors.hatch.get_total_size", side_effect=OSError("io")),
+            patch("killpy.detectors.hatch.get_disk_usage", side_effect=OSError("io")),
         ):
             envs = HatchDetector().detect(tmp_path)
         assert envs == []
@@ -947,7 +947,7 @@ class TestPipenvDetectorErrors:
         (tmp_path / "project-abc").mkdir()
         with (
             patch("killpy.detectors.pipenv._pipenv_venvs_root", return_value=tmp_path),
-            patch("killpy.detectors.pipenv.get_total_size", side_effect=OSError("io")),
+            patch("killpy.detectors.pipenv.get_disk_usage", side_effect=OSError("io")),
         ):
             envs = PipenvDetector().detect(tmp_path)
         assert envs == []
@@ -6,11 +6,21 @@ import os
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
+from killpy import throttle
 from killpy.__main__ import cli
-from killpy.cleaners import remove_pycache
-from killpy.files import format_size, get_total_size
+from killpy.cleaners import find_pycache, remove_pycache
+from killpy.files import (
+    format_size,
+    get_disk_usage,
+    get_reclaimable_size,
+    get_total_size,
+    parse_size,
+)
+from killpy.files.hardlinks import HardlinkTally
+from killpy.throttle import IoThrottle
 
 # ---------------------------------------------------------------------------
 # files/__init__.py
@@ -81,6 +91,103 @@ class TestGetTotalSize:
         assert get_total_size(tree) < 10_000
 
 
+class TestDiskUsage:
+    def test_hardlinks_inside_tree_are_reclaimed_once(self, tmp_path: Path) -> None:
+        (tmp_path / "a.bin").write_bytes(b"x" * 100)
+        os.link(tmp_path / "a.bin", tmp_path / "b.bin")
+        (tmp_path / "c.bin").write_bytes(b"y" * 10)
+        usage = get_disk_usage(tmp_path)
+        assert usage.apparent_bytes == 210
+        assert usage.reclaimable_bytes == 110
+
+    def test_hardlink_to_outside_is_not_reclaimable(self, tmp_path: Path) -> None:
+        cache, venv = tmp_path / "cache", tmp_path / "venv"
+        cache.mkdir()
+        venv.mkdir()
+        (cache / "pkg.py").write_bytes(b"x" * 100)
+        os.link(cache / "pkg.py", venv / "pkg.py")
+        (venv / "own.py").write_bytes(b"y" * 7)
+        usage = get_disk_usage(venv)
+        assert usage.apparent_bytes == 107
+        assert usage.reclaimable_bytes == 7
+
+    def test_selection_reclaims_links_shared_between_trees(
+        self, tmp_path: Path
+    ) -> None:
+        one, two = tmp_path / "one", tmp_path / "two"
+        one.mkdir()
+        two.mkdir()
+        (one / "shared.so").write_bytes(b"x" * 100)
+        os.link(one / "shared.so", two / "shared.so")
+        (two / "own.py").write_bytes(b"y" * 5)
+        assert get_disk_usage(one).reclaimable_bytes == 0
+        assert get_reclaimable_size([one, two]) == 105
+        assert get_reclaimable_size([one]) == 0
+
+    def test_counts_files_and_directories(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg" / "__pycache__").mkdir(parents=True)
+        (tmp_path / "pkg" / "a.py").write_text("")
+        (tmp_path / "pkg" / "__pycache__" / "a.pyc").write_text("")
+        os.link(tmp_path / "pkg" / "a.py", tmp_path / "b.py")
+        usage = get_disk_usage(tmp_path)
+        assert (usage.file_count, usage.dir_count) == (2, 3)
+        assert usage.inode_count == 5
+        assert usage.reclaimable_inode_count == 5
+
+    @pytest.mark.skipif(
+        not hasattr(os.stat_result, "st_blocks"), reason="needs st_blocks"
+    )
+    def test_disk_bytes_match_allocated_blocks(self, tmp_path: Path) -> None:
+        (tmp_path / "tiny.pyc").write_bytes(b"x")
+        with (tmp_path / "sparse.img").open("wb") as fh:
+            fh.truncate(50 * (1 << 20))
+        os.link(tmp_path / "tiny.pyc", tmp_path / "alias.pyc")
+        allocated = sum(
+            os.lstat(tmp_path / name).st_blocks * 512
+            for name in ("tiny.pyc", "sparse.img")
+        )
+        usage = get_disk_usage(tmp_path)
+        # Each inode's blocks count once, as du does; sparse holes not at all.
+        assert usage.disk_bytes == allocated
+        assert usage.disk_bytes < usage.apparent_bytes
+        assert usage.reclaimable_disk_bytes == allocated
+        assert get_reclaimable_size([tmp_path], "disk") == allocated
+
+
+class TestHardlinkTally:
+    def test_merges_sorted_runs(self, tmp_path: Path) -> None:
+        tally = HardlinkTally()
+        with patch("killpy.files.hardlinks._RUN_LENGTH", 2):
+            for ino in (3, 1, 2, 1, 3, 3):
+                tally.add(dev=1, ino=ino, nlink=3 if ino == 3 else 2, size=ino * 10)
+            # The same inode number on another device is a different file.
+            tally.add(dev=2, ino=1, nlink=2, size=1000)
+            assert tally.complete_bytes() == 10 + 30
+
+    def test_totals_count_each_inode_once(self) -> None:
+        tally = HardlinkTally()
+        with patch("killpy.files.hardlinks._RUN_LENGTH", 2):
+            for ino in (1, 2, 1):
+                tally.add(dev=1, ino=ino, nlink=2, size=ino * 10, allocated=4096)
+            totals = tally.totals()
+        assert (totals.inodes, totals.allocated) == (2, 8192)
+        assert (totals.complete_inodes, totals.complete_bytes) == (1, 10)
+        assert totals.complete_allocated == 4096
+
+
+class TestParseSize:
+    def test_units_are_binary(self) -> None:
+        assert parse_size("4096") == 4096
+        assert parse_size("2k") == 2048
+        assert parse_size("500 MiB") == 500 << 20
+        assert parse_size("1.5GB") == 3 << 29
+
+    def test_rejects_garbage(self) -> None:
+        for text in ("", "lots", "5 PB", "1.2.3"):
+            with pytest.raises(ValueError):
+                parse_size(text)
+
+
 class TestFormatSize:
     def test_bytes(self) -> None:
         assert format_size(0) == "0 bytes"
@@ -131,7 +238,7 @@ class TestRemovePycache:
         cache = tmp_path / "__pycache__"
         cache.mkdir()
         (cache / "x.pyc").write_bytes(b"y")
-        with patch("shutil.rmtree", side_effect=PermissionError("denied")):
+        with patch("os.unlink", side_effect=PermissionError("denied")):
             # Should not raise, and a failed removal frees nothing
             freed = remove_pycache(tmp_path)
         assert freed == 0
@@ -167,6 +274,108 @@ class TestRemovePycache:
         assert freed == 0
         assert (target / "data.txt").exists()
 
+    def test_leaves_environment_and_vcs_caches_alone(self, tmp_path: Path) -> None:
+        kept = [
+            tmp_path / ".venv" / "lib" / "__pycache__",
+            tmp_path / "env" / "lib" / "site-packages" / "pkg" / "__pycache__",
+            tmp_path / "node_modules" / "x" / "__pycache__",
+            tmp_path / ".git" / "__pycache__",
+        ]
+        for pycache in kept:
+            pycache.mkdir(parents=True)
+        removed = tmp_path / "src" / "__pycache__"
+        removed.mkdir(parents=True)
+        remove_pycache(tmp_path)
+        assert all(p.exists() for p in kept)
+        assert not removed.exists()
+
+    def test_leaves_conda_and_pyenv_caches_alone(self, tmp_path: Path) -> None:
+        versions = tmp_path / ".pyenv" / "versions"
+        kept = [
+            tmp_path
+            / "miniconda"
+            / "envs"
+            / "ds"
+            / "lib"
+            / "python3.12"
+            / "__pycache__",
+            versions / "3.12.1" / "lib" / "python3.12" / "json" / "__pycache__",
+        ]
+        for pycache in kept:
+            pycache.mkdir(parents=True)
+        (tmp_path / "miniconda" / "envs" / "ds" / "conda-meta").mkdir()
+        removed = tmp_path / "src" / "__pycache__"
+        removed.mkdir(parents=True)
+        with patch(
+            "killpy.detectors._shared_walk._pyenv_versions_root", return_value=versions
+        ):
+            assert find_pycache(tmp_path) == [removed]
+
+    def test_removes_caches_under_build_artifacts(self, tmp_path: Path) -> None:
+        removed = [
+            tmp_path / "build" / "lib" / "pkg" / "__pycache__",
+            tmp_path / "pkg.egg-info" / "__pycache__",
+        ]
+        for pycache in removed:
+            pycache.mkdir(parents=True)
+            (pycache / "m.pyc").write_bytes(b"x" * 10)
+
+        assert remove_pycache(tmp_path) == 20
+        assert not any(p.exists() for p in removed)
+        assert (tmp_path / "build" / "lib" / "pkg").is_dir()
+
+    def test_removes_directories_through_the_throttle(self, tmp_path: Path) -> None:
+        cache = tmp_path / "__pycache__"
+        (cache / "nested").mkdir(parents=True)
+        (cache / "a.pyc").write_bytes(b"x" * 30)
+        limiter = IoThrottle(ops_per_second=1e9, bytes_per_second=1e12)
+        throttle.set_throttle(limiter)
+        try:
+            with (
+                patch("killpy.cleaners.find_pycache", return_value=[cache]),
+                patch.object(limiter, "op", wraps=limiter.op) as op,
+            ):
+                assert remove_pycache(tmp_path) == 30
+        finally:
+            throttle.set_throttle(None)
+        assert not cache.exists()
+        # Per directory an lstat, a listing and an rmdir; an lstat and an
+        # unlink for the file.
+        assert op.call_count == 8
+
+    def test_sizes_nested_files_while_removing(self, tmp_path: Path) -> None:
+        cache = tmp_path / "__pycache__"
+        (cache / "nested").mkdir(parents=True)
+        (cache / "a.pyc").write_bytes(b"x" * 30)
+        (cache / "nested" / "b.pyc").write_bytes(b"x" * 12)
+        assert find_pycache(tmp_path) == [cache]
+        assert remove_pycache(tmp_path) == 42
+        assert not cache.exists()
+
+    def test_git_aware_only_visits_untracked_and_ignored(self, tmp_path: Path) -> None:
+        ignored = tmp_path / "src" / "__pycache__"
+        tracked = tmp_path / "tracked" / "__pycache__"
+        for pycache in (ignored, tracked):
+            pycache.mkdir(parents=True)
+            (pycache / "m.pyc").write_bytes(b"x" * 10)
+        with patch(
+            "killpy.detectors._shared_walk.git_candidate_dirs", return_value=[ignored]
+        ) as candidates:
+            freed = remove_pycache(tmp_path, git_aware=True)
+        candidates.assert_called_once_with(tmp_path)
+        assert freed == 10
+        assert not ignored.exists()
+        assert tracked.exists()
+
+    def test_git_aware_falls_back_to_full_walk(self, tmp_path: Path) -> None:
+        pycache = tmp_path / "pkg" / "__pycache__"
+        pycache.mkdir(parents=True)
+        with patch(
+            "killpy.detectors._shared_walk.git_candidate_dirs", return_value=None
+        ):
+            remove_pycache(tmp_path, git_aware=True)
+        assert not pycache.exists()
+
 
 # ---------------------------------------------------------------------------
 # commands/clean.py
@@ -183,6 +392,18 @@ class TestCleanCommand:
         assert result.exit_code == 0
         assert not cache.exists()
 
+    def test_clean_dry_run_counts_without_deleting(self, tmp_path: Path) -> None:
+        for pkg in ("a", "b"):
+            cache = tmp_path / pkg / "__pycache__"
+            cache.mkdir(parents=True)
+            (cache / "x.pyc").write_bytes(b"x" * 100)
+        result = CliRunner().invoke(
+            cli, ["clean", "--path", str(tmp_path), "--dry-run"]
+        )
+        assert result.exit_code == 0
+        assert "2 __pycache__ directories, 200 bytes would be freed" in result.output
+        assert (tmp_path / "a" / "__pycache__").exists()
+
     def test_clean_default_path(self) -> None:
         """Clean without --path should not crash (uses cwd)."""
         runner = CliRunner()
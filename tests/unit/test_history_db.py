@@ -0,0 +1,142 @@
+"""Unit tests for ``killpy.intelligence.history_db`` and its tracker wiring."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from killpy.intelligence.history_db import HistoryStore
+from killpy.intelligence.tracker import UsageTracker
+from killpy.models import Environment, ScanRecord
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _env(path: str, env_type: str = ".venv", size: int = 100) -> Environment:
+    return Environment(
+        path=Path(path),
+        name=path,
+        type=env_type,
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        size_bytes=size,
+    )
+
+
+def _record(
+    timestamp: datetime, envs: list[Environment], scan_path: str = "/srv"
+) -> ScanRecord:
+    return ScanRecord(
+        timestamp=timestamp,
+        total_space_found=sum(e.size_bytes for e in envs),
+        total_space_deleted=0,
+        environments_count=len(envs),
+        scan_path=scan_path,
+    )
+
+
+# ---------------------------------------------------------------------------
+# HistoryStore
+# ---------------------------------------------------------------------------
+
+
+class TestHistoryStore:
+    def test_schema_uses_wal(self, tmp_path: Path) -> None:
+        store = HistoryStore(tmp_path / "history.db")
+        store.summary()
+        conn = sqlite3.connect(tmp_path / "history.db")
+        try:
+            (mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+        finally:
+            conn.close()
+        assert mode == "wal"
+
+    def test_record_scan_stores_observations(self, tmp_path: Path) -> None:
+        store = HistoryStore(tmp_path / "history.db")
+        envs = [_env("/srv/a/.venv"), _env("/srv/b/__pycache__", "__pycache__", 5)]
+        scan_id = store.record_scan(_record(datetime.now(tz=timezone.utc), envs), envs)
+        conn = sqlite3.connect(tmp_path / "history.db")
+        try:
+            rows = conn.execute(
+                "SELECT path, type, size_bytes FROM observations WHERE scan_id = ?",
+                (scan_id,),
+            ).fetchall()
+        finally:
+            conn.close()
+        assert sorted(rows) == [
+            ("/srv/a/.venv", ".venv", 100),
+            ("/srv/b/__pycache__", "__pycache__", 5),
+        ]
+
+    def test_summary_window(self, tmp_path: Path) -> None:
+        store = HistoryStore(tmp_path / "history.db")
+        now = datetime.now(tz=timezone.utc)
+        store.record_scan(_record(now - timedelta(days=90), [_env("/a", size=10)]))
+        store.record_scan(_record(now - timedelta(days=1), [_env("/a", size=20)]))
+        store.record_deletion(7)
+
+        assert store.summary()["total_scans"] == 2
+        recent = store.summary(now - timedelta(days=30))
+        assert recent["total_scans"] == 1
+        assert recent["total_space_found"] == 20
+        assert recent["total_space_deleted"] == 7
+
+    def test_type_trends_growth(self, tmp_path: Path) -> None:
+        store = HistoryStore(tmp_path / "history.db")
+        jan = datetime(2026, 1, 15, tzinfo=timezone.utc)
+        feb = datetime(2026, 2, 15, tzinfo=timezone.utc)
+        jan_envs = [_env("/srv/a/.venv", size=100)]
+        feb_early = [_env("/srv/a/.venv", size=999)]
+        feb_envs = [_env("/srv/a/.venv", size=150), _env("/srv/b/.venv", size=50)]
+        store.record_scan(_record(jan, jan_envs), jan_envs)
+        store.record_scan(_record(feb - timedelta(days=5), feb_early), feb_early)
+        # The latest scan of the month wins for each root.
+        store.record_scan(_record(feb, feb_envs), feb_envs)
+
+        trends = store.type_trends()
+        assert [(t["period"], t["size_bytes"]) for t in trends] == [
+            ("2026-01", 100),
+            ("2026-02", 200),
+        ]
+        assert trends[0]["growth_bytes"] is None
+        assert trends[1]["growth_bytes"] == 100
+        assert trends[1]["growth_rate"] == 1.0
+
+
+# ---------------------------------------------------------------------------
+# UsageTracker integration
+# ---------------------------------------------------------------------------
+
+
+class TestTrackerWithStore:
+    def test_store_disabled_by_default(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        assert not tracker.has_store
+        assert tracker.get_type_trends() is None
+
+    def test_env_var_enables_store(self, tmp_path: Path, monkeypatch) -> None:
+        monkeypatch.setenv("KILLPY_HISTORY_DB", str(tmp_path / "h.db"))
+        monkeypatch.setattr(
+            "killpy.intelligence.tracker._DEFAULT_STORAGE", tmp_path / "history.json"
+        )
+        assert UsageTracker().has_store
+
+    def test_scans_and_deletions_reach_store(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json", db_path=tmp_path / "h.db")
+        tracker.record_scan_result([_env("/a", size=40)], "/srv")
+        tracker.record_deletion(40)
+        summary = HistoryStore(tmp_path / "h.db").summary()
+        assert summary["total_space_found"] == 40
+        assert summary["total_space_deleted"] == 40
+        assert tracker.get_type_trends()[0]["type"] == ".venv"
+
+    def test_window_without_store_uses_json_records(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        now = datetime.now(tz=timezone.utc)
+        tracker.record_scan(_record(now - timedelta(days=60), [_env("/a", size=1)]))
+        tracker.record_scan(_record(now, [_env("/a", size=2)]))
+        summary = tracker.get_summary(now - timedelta(days=7))
+        assert summary["total_scans"] == 1
+        assert summary["total_space_found"] == 2
@@ -0,0 +1,96 @@
+"""Start-up cost of the ``killpy`` entry point.
+
+Each test imports the CLI in a fresh interpreter with ``-X importtime`` and
+checks that the heavy, TUI- or scoring-only dependencies stay out of the
+non-interactive start-up path.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules only the TUI, the numpy scoring path or ``find`` need.
+_DEFERRED = ("textual", "numpy", "packaging", "killpy.cli", "killpy.detectors.venv")
+
+# Generous ceiling on what ``killpy --help`` adds to interpreter start-up, in
+# microseconds: about 60% of it is used today, and importing the TUI
+# (``killpy.cli``) eagerly would exceed it.
+_HELP_BUDGET_US = 500_000
+
+
+def _import_times(*args: str) -> tuple[dict[str, int], int]:
+    """Run ``python -X importtime`` on *args*.
+
+    Returns ``{module: cumulative_us}`` and the total of the top-level
+    imports, i.e. the whole import time of the run.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, int] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+            if not name.startswith("  "):  # nested imports are indented
+                total += int(cumulative)
+    return modules, total
+
+
+def _imported_modules(*args: str) -> dict[str, int]:
+    """Return ``{module: cumulative_us}`` for a ``python -X importtime`` run."""
+    return _import_times(*args)[0]
+
+
+def _is_loaded(module: str, modules: dict[str, int]) -> bool:
+    return any(name == module or name.startswith(f"{module}.") for name in modules)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("-c", "import killpy.__main__"),
+        ("-m", "killpy", "--help"),
+        ("-m", "killpy", "clean", "--help"),
+        ("-m", "killpy", "list", "--help"),
+    ],
+)
+def test_cli_start_up_skips_heavy_imports(args: tuple[str, ...]) -> None:
+    modules = _imported_modules(*args)
+    assert "killpy.scanner" in modules
+    assert [m for m in _DEFERRED if _is_loaded(m, modules)] == []
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("-c", "import killpy.__main__"),
+        ("-m", "killpy", "--help"),
+        ("-m", "killpy", "list", "--json", "--path", "{tmp}"),
+    ],
+)
+def test_rich_and_sqlite3_stay_out_of_the_plain_paths(
+    args: tuple[str, ...], tmp_path: Path
+) -> None:
+    """The history store is opt-in and JSON output prints nothing rich."""
+    modules = _imported_modules(*(arg.format(tmp=tmp_path) for arg in args))
+    assert not _is_loaded("rich", modules)
+    assert not _is_loaded("sqlite3", modules)
+
+
+def test_help_imports_stay_within_budget() -> None:
+    """Catch slow eager imports, including of modules not in ``_DEFERRED``."""
+    # Best of three, against a bare interpreter, to keep machine noise out.
+    baseline = min(_import_times("-c", "pass")[1] for _ in range(3))
+    help_total = min(_import_times("-m", "killpy", "--help")[1] for _ in range(3))
+    assert help_total - baseline < _HELP_BUDGET_US
@@ -0,0 +1,82 @@
+"""Unit tests for ``killpy.journal``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from killpy.journal import DeletionJournal
+from killpy.models import Environment
+
+
+def _env(path: Path, size: int = 1000) -> Environment:
+    return Environment(
+        path=path,
+        name=path.name,
+        type="venv",
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        size_bytes=size,
+    )
+
+
+def test_load_without_journal_returns_none(tmp_path: Path) -> None:
+    assert DeletionJournal(tmp_path / "j.ndjson").load() is None
+
+
+def test_records_per_item_state(tmp_path: Path) -> None:
+    envs = [_env(tmp_path / name) for name in ("a", "b", "c", "d")]
+    journal = DeletionJournal(tmp_path / "j.ndjson")
+    journal.begin(envs, tmp_path, "disk")
+    journal.started(envs[0])
+    journal.done(envs[0], 1000)
+    journal.started(envs[1])
+    journal.failed(envs[1], "boom")
+    journal.started(envs[2])
+
+    run = DeletionJournal(tmp_path / "j.ndjson").load()
+
+    assert run is not None
+    assert run.scan_path == str(tmp_path)
+    assert run.size_mode == "disk"
+    assert [item.state for item in run.items] == [
+        "done",
+        "failed",
+        "deleting",
+        "pending",
+    ]
+    assert run.items[1].error == "boom"
+    assert run.freed_bytes == 1000
+    assert [item.env.name for item in run.unfinished] == ["c", "d"]
+
+
+def test_loaded_journal_keeps_recording(tmp_path: Path) -> None:
+    env = _env(tmp_path / "a")
+    DeletionJournal(tmp_path / "j.ndjson").begin([env], tmp_path, "apparent")
+
+    resumed = DeletionJournal(tmp_path / "j.ndjson")
+    run = resumed.load()
+    assert run is not None
+    resumed.done(run.items[0].env, 1000)
+
+    assert DeletionJournal(tmp_path / "j.ndjson").load().unfinished == []
+
+
+def test_torn_last_line_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "j.ndjson"
+    env = _env(tmp_path / "a")
+    journal = DeletionJournal(path)
+    journal.begin([env], tmp_path, "apparent")
+    journal.started(env)
+    with path.open("a") as fh:
+        fh.write('{"op": "done", "item"')
+
+    run = DeletionJournal(path).load()
+    assert run is not None
+    assert run.items[0].state == "deleting"
+
+
+def test_finish_removes_the_journal(tmp_path: Path) -> None:
+    journal = DeletionJournal(tmp_path / "j.ndjson")
+    journal.begin([_env(tmp_path / "a")], tmp_path, "apparent")
+    journal.finish()
+    assert journal.load() is None
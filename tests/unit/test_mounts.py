@@ -0,0 +1,257 @@
+"""Unit tests for ``killpy.mounts`` (mount-aware traversal)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from killpy.__main__ import cli
+from killpy.detectors._shared_walk import walk_environments
+from killpy.files import get_disk_usage
+from killpy.mounts import (
+    Mount,
+    MountGuard,
+    MountLimiter,
+    MountPolicy,
+    MountTable,
+    get_policy,
+    parse_mountinfo,
+    run_per_mount,
+    set_policy,
+)
+
+_MOUNTINFO = """\
+22 1 8:1 / / rw,relatime shared:1 - ext4 /dev/sda1 rw
+23 22 0:21 / /proc rw,nosuid shared:12 - proc proc rw
+24 22 0:45 / /mnt/my\\040share rw shared:40 master:2 - nfs4 srv:/export rw
+25 22 0:46 / /home/u/remote rw - fuse.sshfs u@host: rw
+26 22 8:1 /home/u/src /srv/src rw - ext4 /dev/sda1 rw
+bogus line
+"""
+
+
+@pytest.fixture(autouse=True)
+def _default_policy():
+    yield
+    set_policy(MountPolicy())
+
+
+def _venv(path: Path) -> None:
+    path.mkdir(parents=True)
+    (path / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+
+def _root_mount(tmp_path: Path) -> Mount:
+    return Mount(str(tmp_path), "ext4", (8, 1))
+
+
+# ---------------------------------------------------------------------------
+# Mount table
+# ---------------------------------------------------------------------------
+
+
+def test_parse_mountinfo() -> None:
+    mounts = parse_mountinfo(_MOUNTINFO)
+    assert [(m.mount_point, m.fstype) for m in mounts] == [
+        ("/", "ext4"),
+        ("/proc", "proc"),
+        ("/mnt/my share", "nfs4"),
+        ("/home/u/remote", "fuse.sshfs"),
+        ("/srv/src", "ext4"),
+    ]
+    assert mounts[4].root == "/home/u/src"
+    assert mounts[4].device == (8, 1)
+    assert [m.is_slow for m in mounts] == [False, False, True, True, False]
+
+
+def test_mount_of_is_the_deepest_mount_point() -> None:
+    table = MountTable(parse_mountinfo(_MOUNTINFO))
+    assert table.mount_of("/mnt/my share/a/b").fstype == "nfs4"
+    assert table.mount_of("/mnt/other").mount_point == "/"
+
+
+def test_policy_skips_type_families() -> None:
+    policy = MountPolicy(skip_types=frozenset({"fuse"}))
+    assert policy.skips("fuse.sshfs")
+    assert not policy.skips("ext4")
+    assert MountPolicy().skips("proc")
+
+
+# ---------------------------------------------------------------------------
+# Guarded walks
+# ---------------------------------------------------------------------------
+
+
+def test_walk_skips_virtual_filesystems(tmp_path: Path) -> None:
+    _venv(tmp_path / "proj" / ".venv")
+    _venv(tmp_path / "proc" / "1" / ".venv")
+    table = MountTable(
+        [_root_mount(tmp_path), Mount(str(tmp_path / "proc"), "proc", (0, 21))]
+    )
+    with patch("killpy.mounts.mount_table", return_value=table):
+        envs = walk_environments(tmp_path, {"venv"})
+    assert [e.path for e in envs] == [tmp_path / "proj" / ".venv"]
+
+
+def test_one_file_system_stays_on_the_roots_device(tmp_path: Path) -> None:
+    (tmp_path / "local").mkdir()
+    (tmp_path / "local" / "f").write_bytes(b"x" * 10)
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "f").write_bytes(b"x" * 1000)
+    table = MountTable(
+        [_root_mount(tmp_path), Mount(str(tmp_path / "other"), "xfs", (8, 2))]
+    )
+
+    def identity(path: str) -> tuple[int, int]:
+        return (2 if path.endswith("other") else 1), hash(path)
+
+    with (
+        patch("killpy.mounts.mount_table", return_value=table),
+        patch("killpy.mounts._identity", side_effect=identity),
+    ):
+        assert get_disk_usage(tmp_path).apparent_bytes == 1010
+        set_policy(MountPolicy(one_file_system=True))
+        assert get_disk_usage(tmp_path).apparent_bytes == 10
+
+
+def test_one_file_system_without_a_mount_table(tmp_path: Path) -> None:
+    _venv(tmp_path / "a" / ".venv")
+    _venv(tmp_path / "b" / ".venv")
+    guard = MountGuard(tmp_path, MountPolicy(one_file_system=True), table=MountTable())
+    with patch(
+        "killpy.mounts._identity",
+        side_effect=lambda p: (2 if p.endswith("b") else 1, hash(p)),
+    ):
+        assert guard.filter(str(tmp_path), ["a", "b"]) == ["a"]
+
+
+def test_one_file_system_stops_where_the_device_changes(tmp_path: Path) -> None:
+    # A btrfs subvolume has its own st_dev but no line in mountinfo.
+    (tmp_path / "src").mkdir()
+    (tmp_path / "subvol").mkdir()
+    guard = MountGuard(
+        tmp_path,
+        MountPolicy(one_file_system=True),
+        table=MountTable([_root_mount(tmp_path)]),
+    )
+    with patch(
+        "killpy.mounts._identity",
+        side_effect=lambda p: (2 if p.endswith("subvol") else 1, hash(p)),
+    ):
+        assert guard.filter(str(tmp_path), ["src", "subvol"]) == ["src"]
+
+
+def test_same_tree_mounted_twice_is_walked_once(tmp_path: Path) -> None:
+    for name in ("first", "second"):
+        (tmp_path / name).mkdir()
+    table = MountTable(
+        [
+            _root_mount(tmp_path),
+            Mount(str(tmp_path / "first"), "ext4", (8, 3), root="/vol"),
+            Mount(str(tmp_path / "second"), "ext4", (8, 3), root="/vol"),
+        ]
+    )
+    guard = MountGuard(tmp_path, table=table)
+    with patch(
+        "killpy.mounts._identity",
+        side_effect=lambda p: (1, 1) if p == str(tmp_path) else (3, 2),
+    ):
+        assert guard.filter(str(tmp_path), ["first", "second"]) == ["first"]
+
+
+def test_bind_mount_of_a_walked_directory_is_skipped(tmp_path: Path) -> None:
+    _venv(tmp_path / "src" / ".venv")
+    _venv(tmp_path / "bind" / ".venv")  # what the bind mount shows
+    table = MountTable(
+        [
+            Mount("/", "ext4", (8, 1)),
+            Mount(str(tmp_path / "bind"), "ext4", (8, 1), root=str(tmp_path / "src")),
+        ]
+    )
+    with patch("killpy.mounts.mount_table", return_value=table):
+        envs = walk_environments(tmp_path, {"venv"})
+        # Walked from inside, the bind mount's source is out of reach.
+        inside = walk_environments(tmp_path / "bind", {"venv"})
+    assert [e.path for e in envs] == [tmp_path / "src" / ".venv"]
+    assert [e.path for e in inside] == [tmp_path / "bind" / ".venv"]
+
+
+# ---------------------------------------------------------------------------
+# Per-mount concurrency
+# ---------------------------------------------------------------------------
+
+
+def test_limiter_caps_slow_mounts_only() -> None:
+    limiter = MountLimiter(MountTable(parse_mountinfo(_MOUNTINFO)), limit=2)
+    for _ in range(2):
+        assert limiter.has_room("/mnt/my share/a")
+        limiter.acquire("/mnt/my share/a")
+    assert not limiter.has_room("/mnt/my share/b")
+    assert limiter.has_room("/home/u/remote/x")
+    limiter.acquire("/srv/src")
+    assert limiter.has_room("/srv/src")
+    limiter.release("/mnt/my share/a")
+    assert limiter.has_room("/mnt/my share/b")
+
+
+def test_run_per_mount_lets_local_work_past_a_busy_mount() -> None:
+    table = MountTable(parse_mountinfo(_MOUNTINFO))
+    items = ["/mnt/my share/1", "/mnt/my share/2", "/mnt/my share/3", "/srv/a"]
+    lock = threading.Lock()
+    busy: list[int] = [0]
+    peak: list[int] = [0]
+    finished: list[str] = []
+
+    def work(item: str) -> None:
+        slow = item.startswith("/mnt")
+        with lock:
+            busy[0] += slow
+            peak[0] = max(peak[0], busy[0])
+        time.sleep(0.05 if slow else 0)
+        with lock:
+            busy[0] -= slow
+            finished.append(item)
+
+    with patch("killpy.mounts.mount_table", return_value=table):
+        run_per_mount(work, items, lambda item: item, workers=4)
+    assert sorted(finished) == sorted(items)
+    assert peak[0] == 2
+    assert finished[0] == "/srv/a"
+
+
+def test_run_per_mount_reraises() -> None:
+    def work(item: str) -> None:
+        raise ValueError(item)
+
+    with pytest.raises(ValueError, match="/a"):
+        run_per_mount(work, ["/a"], lambda item: item, workers=2)
+
+
+# ---------------------------------------------------------------------------
+# Options
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--one-file-system", "list", "--skip-fs-type", "nfs4"],
+        ["list", "--one-file-system", "--skip-fs-type", "nfs4"],
+    ],
+)
+def test_options_install_the_policy(tmp_path: Path, args) -> None:
+    with (
+        patch("killpy.commands.list.Scanner"),
+        patch("killpy.snapshots._DEFAULT_DIR", tmp_path / "snapshots"),
+    ):
+        result = CliRunner().invoke(cli, [*args, "--path", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    policy = get_policy()
+    assert policy.one_file_system
+    assert policy.skips("nfs4")
+    assert policy.skips("proc")
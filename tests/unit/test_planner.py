@@ -0,0 +1,95 @@
+"""Unit tests for ``killpy.intelligence.planner``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from killpy.intelligence.planner import collateral, plan_to_free
+from killpy.models import Environment, ScoredEnvironment
+
+_GB = 1 << 30
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def _scored(
+    name: str, size: int, score: float, *, critical: bool = False
+) -> ScoredEnvironment:
+    env = Environment(
+        path=Path(f"/fake/{name}"),
+        name=name,
+        type="venv",
+        last_modified=datetime(2023, 1, 1, tzinfo=timezone.utc),
+        size_bytes=size,
+        is_system_critical=critical,
+    )
+    return ScoredEnvironment(env=env, score=score, is_orphan=True)
+
+
+def _names(plan) -> list[str]:
+    return [item.env.name for item in plan.items]
+
+
+# ---------------------------------------------------------------------------
+# plan_to_free
+# ---------------------------------------------------------------------------
+
+
+class TestPlanToFree:
+    def test_prefers_low_value_environments(self) -> None:
+        envs = [
+            _scored("fresh", 5 * _GB, 0.1),
+            _scored("stale-a", 5 * _GB, 0.9),
+            _scored("stale-b", 5 * _GB, 0.8),
+        ]
+        plan = plan_to_free(envs, 8 * _GB)
+        assert _names(plan) == ["stale-a", "stale-b"]
+        assert plan.reached
+        assert plan.freed_bytes == 10 * _GB
+
+    def test_trims_picks_the_target_does_not_need(self) -> None:
+        envs = [
+            _scored("small", 1 * _GB, 1.0),
+            _scored("big", 10 * _GB, 0.5),
+        ]
+        # "small" is cheaper per byte and taken first, but "big" alone
+        # reaches the target, so "small" is dropped again.
+        plan = plan_to_free(envs, 9 * _GB)
+        assert _names(plan) == ["big"]
+
+    def test_single_environment_beats_many_small_ones(self) -> None:
+        # Per byte the caches are cheaper, but reaching the target takes five
+        # of them (collateral 0.25) against one venv (collateral 0.22).
+        target = 21 * _GB // 10
+        envs = [_scored(f"cache-{i}", _GB // 2, 1.0) for i in range(10)]
+        envs.append(_scored("old-venv", target, 0.83))
+        plan = plan_to_free(envs, target)
+        assert _names(plan) == ["old-venv"]
+        assert "on its own" in plan.items[0].reason
+
+    def test_unreachable_target_plans_everything(self) -> None:
+        envs = [_scored("a", _GB, 0.5), _scored("b", _GB, 0.5)]
+        plan = plan_to_free(envs, 5 * _GB)
+        assert not plan.reached
+        assert sorted(_names(plan)) == ["a", "b"]
+
+    def test_never_plans_in_use_or_empty_environments(self) -> None:
+        envs = [
+            _scored("in-use", 10 * _GB, 1.0, critical=True),
+            _scored("empty", 0, 1.0),
+            _scored("old", 2 * _GB, 0.6),
+        ]
+        assert _names(plan_to_free(envs, _GB)) == ["old"]
+
+    def test_reason_explains_the_choice(self) -> None:
+        plan = plan_to_free([_scored("old", 2 * _GB, 0.6)], _GB)
+        reason = plan.items[0].reason
+        assert reason.startswith("frees 2.00 GB")
+        assert "score 0.60" in reason
+        assert "orphan" in reason
+
+    def test_collateral_rises_with_keep_value(self) -> None:
+        assert collateral(_scored("a", _GB, 0.9)) < collateral(_scored("b", _GB, 0.2))
@@ -7,13 +7,18 @@ filesystem access is required.
 from __future__ import annotations
 
 import asyncio
+import os
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from killpy.detectors.base import AbstractDetector
+from killpy.files import DiskUsage
 from killpy.models import Environment
-from killpy.scanner import Scanner
+from killpy.scanner import Scanner, ScanRoot, plan_roots, revalidate
+from killpy.snapshots import SnapshotStore
+from killpy.users import LocalUser, other_user, user_home
 
 # ---------------------------------------------------------------------------
 # Fixtures / stubs
@@ -173,6 +178,24 @@ class TestScanner:
         assert "__pycache__" in types
         assert "venv" in progressed and "cache" in progressed
 
+    def test_git_aware_walks_only_git_candidates(self, tmp_path: Path) -> None:
+        (tmp_path / "tracked" / "__pycache__").mkdir(parents=True)
+        ignored = tmp_path / "ignored" / "__pycache__"
+        ignored.mkdir(parents=True)
+        with patch(
+            "killpy.detectors._shared_walk.git_candidate_dirs", return_value=[ignored]
+        ):
+            results = Scanner(types={"cache"}, git_aware=True).scan(tmp_path)
+        assert [e.path for e in results] == [ignored]
+
+    def test_git_aware_falls_back_to_full_walk(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg" / "__pycache__").mkdir(parents=True)
+        with patch(
+            "killpy.detectors._shared_walk.git_candidate_dirs", return_value=None
+        ):
+            results = Scanner(types={"cache"}, git_aware=True).scan(tmp_path)
+        assert [e.path for e in results] == [tmp_path / "pkg" / "__pycache__"]
+
     def test_default_instantiates_all_detectors(self) -> None:
         """Scanner() with no args instantiates all default detectors."""
         scanner = Scanner()
@@ -252,6 +275,22 @@ class TestScannerAsync:
         assert ".venv" in types
         assert "__pycache__" in types
 
+    def test_scan_async_defer_sizing(self, tmp_path: Path) -> None:
+        """Deferred sizing reports shared-walk envs unsized and flagged pending."""
+        venv = tmp_path / "proj" / ".venv"
+        venv.mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        scanner = Scanner(types={"venv"})
+
+        async def _collect():
+            results = []
+            async for _det, envs in scanner.scan_async(tmp_path, defer_sizing=True):
+                results.extend(envs)
+            return results
+
+        results = asyncio.run(_collect())
+        assert [(e.size_bytes, e.size_pending) for e in results] == [(0, True)]
+
     def test_scan_async_shared_walk_error_is_isolated(self, tmp_path: Path) -> None:
         """A crash in the shared walk yields empties instead of propagating."""
         scanner = Scanner(types={"venv"})
@@ -290,6 +329,117 @@ class TestScannerAsync:
         assert len(results) == 1
 
 
+class TestProcesses:
+    def test_shards_are_weighted_by_the_last_scan(self, tmp_path: Path) -> None:
+        root = tmp_path / "home"
+        big = _make_env(root / "alice" / "proj" / ".venv")
+        big.usage = DiskUsage(dir_count=40)
+        small = _make_env(root / "bob" / ".venv")
+        small.usage = DiskUsage(dir_count=2)
+        outside = _make_env(tmp_path / "pip-cache")
+        scanner = Scanner(types={"venv"}, processes=4)
+        store = SnapshotStore(tmp_path / "snapshots")
+        store.save(root, [big, small, outside], scanner.types, scanner.excluded)
+
+        with (
+            patch("killpy.snapshots._DEFAULT_DIR", tmp_path / "snapshots"),
+            patch("killpy.scanner.walk_sharded", return_value=[]) as sharded,
+        ):
+            scanner.scan(root)
+
+        assert sharded.call_args.kwargs["processes"] == 4
+        assert sharded.call_args.kwargs["weights"] == {"alice": 41, "bob": 3}
+
+    def test_gentle_mode_walks_in_one_process(self, tmp_path: Path) -> None:
+        scanner = Scanner(types={"venv"}, processes=4)
+        with (
+            patch("killpy.scanner.get_throttle", return_value=MagicMock()),
+            patch("killpy.scanner.walk_sharded") as sharded,
+        ):
+            scanner.scan(tmp_path)
+        sharded.assert_not_called()
+
+    def test_zero_means_one_process_per_cpu(self) -> None:
+        with patch("killpy.scanner.os.cpu_count", return_value=64):
+            assert Scanner(types={"venv"}, processes=0)._processes == 64
+
+
+class TestMultiRoot:
+    def test_plan_collapses_nested_roots(self, tmp_path: Path) -> None:
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "c").mkdir()
+        plan = plan_roots([tmp_path / "c", tmp_path / "a" / "b", tmp_path / "a"])
+        assert plan == [
+            ScanRoot(tmp_path / "a"),
+            ScanRoot(tmp_path / "c", tools=False),
+        ]
+
+    def test_plan_keeps_tool_dirs_of_nested_homes(self, tmp_path: Path) -> None:
+        alice = tmp_path / "home" / "alice"
+        bob = tmp_path / "srv" / "bob"
+        alice.mkdir(parents=True)
+        bob.mkdir(parents=True)
+        plan = plan_roots([tmp_path / "home"], [alice, bob])
+        assert plan == [
+            ScanRoot(tmp_path / "home"),
+            ScanRoot(alice, alice, walk=False),
+            ScanRoot(bob, bob),
+        ]
+
+    def test_plan_scans_the_invoking_users_home_as_theirs(self, tmp_path: Path) -> None:
+        me, other = tmp_path / "me", tmp_path / "other"
+        me.mkdir()
+        other.mkdir()
+        with patch.object(Path, "home", return_value=me):
+            assert plan_roots([], [me, other]) == [ScanRoot(me), ScanRoot(other, other)]
+            assert plan_roots([], [other]) == [
+                ScanRoot(other, other),
+                ScanRoot(me, walk=False),
+            ]
+
+    def test_system_scan_keeps_the_invoking_users_tools(self, tmp_path: Path) -> None:
+        """Regression: --system scanned the invoker's home as another user's."""
+        me = tmp_path / "me"
+        me.mkdir()
+        detector = _stub_detector("conda", [])
+        detector.detect.side_effect = lambda _path: (
+            [] if other_user() else [_make_env(tmp_path / "envs" / "mine")]
+        )
+        scanner = Scanner(detectors=[detector])
+        with patch.object(Path, "home", return_value=me):
+            envs = scanner.scan_many([], users=[LocalUser("me", 1000, me)])
+        assert [e.name for e in envs] == ["mine"]
+
+    def test_scan_many_deduplicates_across_roots(self, tmp_path: Path) -> None:
+        for name in ("a", "b"):
+            venv = tmp_path / name / ".venv"
+            venv.mkdir(parents=True)
+            (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        scanner = Scanner(types={"venv"})
+        envs = scanner.scan_many([tmp_path / "a", tmp_path / "b", tmp_path])
+        assert sorted(e.path.parent.name for e in envs) == ["a", "b"]
+
+    def test_scan_many_resolves_tools_per_user(self, tmp_path: Path) -> None:
+        homes = []
+        for name in ("alice", "bob"):
+            home = tmp_path / name
+            (home / "tool-envs" / f"{name}-env").mkdir(parents=True)
+            homes.append(LocalUser(name, 1000 + len(homes), home))
+
+        def _tool_envs(path: Path) -> list[Environment]:
+            return [_make_env(p) for p in (user_home() / "tool-envs").iterdir()]
+
+        detector = _stub_detector("poetry", [])
+        detector.detect.side_effect = _tool_envs
+        scanner = Scanner(detectors=[detector])
+
+        with patch.object(Path, "home", return_value=tmp_path / "nobody"):
+            (tmp_path / "nobody" / "tool-envs").mkdir(parents=True)
+            envs = scanner.scan_many([], users=homes)
+
+        assert sorted(e.name for e in envs) == ["alice-env", "bob-env"]
+
+
 class TestMarkSystemCriticalPyenv:
     def _scan_pyenv_env(self, tmp_path: Path, version_dir_name: str) -> Environment:
         """Run a scan with PYENV_ROOT pointing at a fake root."""
@@ -314,3 +464,50 @@ class TestMarkSystemCriticalPyenv:
         """Regression: endswith() also matched e.g. "my-3.12.1"."""
         result = self._scan_pyenv_env(tmp_path, "my-3.12.1")
         assert result.is_system_critical is False
+
+
+# ---------------------------------------------------------------------------
+# revalidate
+# ---------------------------------------------------------------------------
+
+
+class TestRevalidate:
+    def _scanned(self, tmp_path: Path, name: str = "env") -> Environment:
+        env_path = tmp_path / name
+        env_path.mkdir()
+        scanner = Scanner(detectors=[_stub_detector("venv", [_make_env(env_path)])])
+        (result,) = scanner.scan(tmp_path)
+        assert result.identity is not None
+        return result
+
+    def test_unchanged_environment_passes(self, tmp_path: Path) -> None:
+        env = self._scanned(tmp_path)
+        assert revalidate([env]) == ([env], {})
+
+    def test_deleted_environment_is_stale(self, tmp_path: Path) -> None:
+        env = self._scanned(tmp_path)
+        env.path.rmdir()
+        assert revalidate([env])[1] == {env.path: "no longer exists"}
+
+    def test_replaced_environment_is_stale(self, tmp_path: Path) -> None:
+        env = self._scanned(tmp_path)
+        other = tmp_path / "other"
+        other.mkdir()
+        os.replace(other, env.path)
+        assert "different device/inode" in revalidate([env])[1][env.path]
+
+    def test_modified_environment_is_stale(self, tmp_path: Path) -> None:
+        env = self._scanned(tmp_path)
+        (env.path / "new-file").touch()
+        os.utime(env.path, ns=(0, env.identity.mtime_ns + 1_000_000_000))
+        assert revalidate([env])[1] == {env.path: "modified since the scan"}
+
+    def test_unrecorded_identity_is_stale(self, tmp_path: Path) -> None:
+        env = _make_env(tmp_path)
+        assert env.path in revalidate([env])[1]
+
+    def test_system_critical_flag_is_reevaluated(self, tmp_path: Path) -> None:
+        env = self._scanned(tmp_path)
+        with patch.object(sys, "prefix", str(env.path)):
+            valid, _ = revalidate([env])
+        assert valid[0].is_system_critical is True
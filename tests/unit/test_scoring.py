@@ -4,8 +4,17 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from unittest.mock import patch
 
-from killpy.intelligence.scoring import ScoringService, ScoringWeights, score_all
+import pytest
+
+from killpy.intelligence.scoring import (
+    ScoringService,
+    ScoringWeights,
+    rescore_all,
+    score_all,
+    score_batch,
+)
 from killpy.models import Environment, GitInfo
 
 # ---------------------------------------------------------------------------
@@ -199,3 +208,99 @@ class TestScoreAll:
             (tmp_path / str(i)).mkdir()
         results = score_all(envs, run_git=False)
         assert len(results) == 3
+
+
+# ---------------------------------------------------------------------------
+# score_batch / rescore_all
+# ---------------------------------------------------------------------------
+
+
+def _batch_inputs(envs: list[Environment]) -> tuple[list, list, list, list]:
+    return (
+        [e.size_bytes for e in envs],
+        [e.last_modified.timestamp() for e in envs],
+        [True] * len(envs),
+        [0.5] * len(envs),
+    )
+
+
+class TestScoreBatch:
+    def _envs(self, tmp_path: Path) -> list[Environment]:
+        now = datetime.now(tz=timezone.utc)
+        return [
+            _env(path=tmp_path, size=size, last_modified=now - timedelta(days=days))
+            for size in (0, 1024, 500 * 1024 * 1024, 20 * 1024 * 1024 * 1024)
+            for days in (0, 30, 400)
+        ]
+
+    def test_matches_score_service(self, tmp_path: Path) -> None:
+        envs = self._envs(tmp_path)
+        service = ScoringService()
+        expected = [service.score(e).score for e in envs]
+        assert score_batch(*_batch_inputs(envs)) == expected
+
+    def test_numpy_path_matches_python_path(self, tmp_path: Path) -> None:
+        pytest.importorskip("numpy")
+        envs = self._envs(tmp_path)
+        inputs = _batch_inputs(envs)
+        now = datetime.now(tz=timezone.utc).timestamp()
+        with patch("killpy.intelligence.scoring._numpy", return_value=None):
+            pure = score_batch(*inputs, now=now)
+        with patch("killpy.intelligence.scoring._NUMPY_MIN_BATCH", 1):
+            vectorised = score_batch(*inputs, now=now)
+        assert vectorised == pytest.approx(pure, abs=1e-4)
+
+    def test_unknown_mtime_is_neutral_on_age_axis(self) -> None:
+        weights = ScoringWeights(
+            size_weight=0.0,
+            age_weight=1.0,
+            orphan_weight=0.0,
+            git_inactivity_weight=0.0,
+        )
+        assert score_batch([1], [None], [False], [0.0], weights) == [0.5]
+
+    def test_zero_weights_give_zero(self) -> None:
+        weights = ScoringWeights(0.0, 0.0, 0.0, 0.0)
+        assert score_batch([1, 2], [None, None], [True, True], [1.0, 1.0], weights) == [
+            0.0,
+            0.0,
+        ]
+
+
+class TestLazyExplanation:
+    def test_score_all_defers_explanation(self, tmp_path: Path) -> None:
+        results = score_all([_env(path=tmp_path)], run_git=False)
+        assert results[0].explanation == []
+        explanation = ScoringService.explain(results[0])
+        assert explanation[0].startswith("Size:")
+        assert results[0].explanation is explanation
+
+    def test_score_all_counts_packages_only_when_explaining(
+        self, tmp_path: Path
+    ) -> None:
+        site_packages = tmp_path / "lib" / "python3.12" / "site-packages"
+        (site_packages / "requests").mkdir(parents=True)
+        with patch.object(
+            ScoringService, "_count_packages", wraps=ScoringService._count_packages
+        ) as count:
+            results = score_all([_env(path=tmp_path)], run_git=False)
+            assert results[0].num_packages is None
+            count.assert_not_called()
+            ScoringService.explain(results[0])
+        assert results[0].num_packages == 1
+
+
+class TestRescoreAll:
+    def test_weight_change_reorders_without_io(self, tmp_path: Path) -> None:
+        now = datetime.now(tz=timezone.utc)
+        big_new = _env(path=tmp_path / "big", size=20 * 1024**3, last_modified=now)
+        small_old = _env(
+            path=tmp_path / "old", size=1024, last_modified=now - timedelta(days=900)
+        )
+        scored = score_all([big_new, small_old], run_git=False)
+        size_only = ScoringWeights(1.0, 0.0, 0.0, 0.0)
+        age_only = ScoringWeights(0.0, 1.0, 0.0, 0.0)
+        with patch.object(ScoringService, "_orphan_score") as orphan:
+            assert rescore_all(scored, size_only)[0].env is big_new
+            assert rescore_all(scored, age_only)[0].env is small_old
+        orphan.assert_not_called()
@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import subprocess
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
-from killpy.detectors._shared_walk import walk_environments
+from killpy.detectors._shared_walk import (
+    balance_shards,
+    git_candidate_dirs,
+    walk_environments,
+    walk_git_candidates,
+    walk_sharded,
+)
 
 
 def _make_tree(root: Path) -> None:
@@ -35,12 +42,22 @@ def test_make_env_oserror_skips_container(tmp_path: Path) -> None:
     """If sizing a container raises OSError, it is skipped, not crashed on."""
     _make_tree(tmp_path)
     with patch(
-        "killpy.detectors._shared_walk.get_total_size", side_effect=OSError("boom")
+        "killpy.detectors._shared_walk.get_disk_usage", side_effect=OSError("boom")
     ):
         envs = walk_environments(tmp_path, {"cache"})
     assert envs == []
 
 
+def test_unsized_walk_skips_sizing(tmp_path: Path) -> None:
+    """``sized=False`` never sums a container and flags it as pending."""
+    _make_tree(tmp_path)
+    with patch("killpy.detectors._shared_walk.get_disk_usage") as sizer:
+        envs = walk_environments(tmp_path, {"venv", "cache"}, sized=False)
+    sizer.assert_not_called()
+    assert {e.type for e in envs} == {".venv", "__pycache__"}
+    assert all(e.size_pending and e.size_bytes == 0 for e in envs)
+
+
 def test_bare_site_packages_is_pruned(tmp_path: Path) -> None:
     """A conda-style ``site-packages`` (no pyvenv.cfg) is never scanned inside."""
     site = tmp_path / "envs" / "ml" / "lib" / "site-packages"
@@ -55,3 +72,110 @@ def test_pyvenv_named_env_reported_as_pyvenv_cfg(tmp_path: Path) -> None:
     (env / "pyvenv.cfg").write_text("home = /usr/bin\n")
     envs = walk_environments(tmp_path, {"venv"})
     assert [e.type for e in envs] == ["pyvenv.cfg"]
+
+
+# ---------------------------------------------------------------------------
+# Git-aware walk
+# ---------------------------------------------------------------------------
+
+
+def _git_ls(untracked: list[str], ignored: list[str]) -> MagicMock:
+    """Stub ``subprocess.run`` for the two ``git ls-files --others`` calls."""
+
+    def run(cmd, **kwargs):
+        entries = ignored if "--ignored" in cmd else untracked
+        return MagicMock(stdout="".join(f"{e}\0" for e in entries), returncode=0)
+
+    return MagicMock(side_effect=run)
+
+
+def test_git_candidates_collapse_nested_and_skip_pruned(tmp_path: Path) -> None:
+    run = _git_ls(
+        untracked=["new/", "node_modules/", "notes.txt"],
+        ignored=["new/sub/__pycache__/", "src/__pycache__/", ".venv/"],
+    )
+    with patch("subprocess.run", run):
+        candidates = git_candidate_dirs(tmp_path)
+    assert candidates == [
+        tmp_path / ".venv/",
+        tmp_path / "new/",
+        tmp_path / "src/__pycache__/",
+    ]
+
+
+def test_git_candidates_none_outside_git(tmp_path: Path) -> None:
+    error = subprocess.CalledProcessError(128, ["git"], stderr="not a git repository")
+    with patch("subprocess.run", side_effect=error):
+        assert git_candidate_dirs(tmp_path) is None
+    with patch("subprocess.run", side_effect=FileNotFoundError):
+        assert git_candidate_dirs(tmp_path) is None
+
+
+def test_git_candidates_none_when_root_is_untracked(tmp_path: Path) -> None:
+    with patch("subprocess.run", _git_ls(untracked=["./"], ignored=[])):
+        assert git_candidate_dirs(tmp_path) is None
+
+
+def test_git_walk_only_visits_candidates(tmp_path: Path) -> None:
+    """Tracked containers are not reported; candidates are classified themselves."""
+    _make_tree(tmp_path)
+    run = _git_ls(untracked=[], ignored=["proj/.venv/", "proj/__pycache__/"])
+    with patch("subprocess.run", run):
+        envs = walk_git_candidates(tmp_path, {"venv", "cache", "artifacts", "tox"})
+    assert envs is not None
+    assert sorted(e.type for e in envs) == [".venv", "__pycache__"]
+
+
+def test_git_walk_descends_into_untracked_dirs(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    with patch("subprocess.run", _git_ls(untracked=["proj/"], ignored=[])):
+        envs = walk_git_candidates(tmp_path, {"venv", "cache", "artifacts", "tox"})
+    assert envs is not None
+    assert {e.type for e in envs} == {".venv", "__pycache__", "artifacts", "tox"}
+
+
+# ---------------------------------------------------------------------------
+# Sharded walk
+# ---------------------------------------------------------------------------
+
+
+def _summary(envs: list) -> list[tuple]:
+    return sorted(
+        (str(e.path), e.type, e.size_bytes, e.last_modified, e.usage) for e in envs
+    )
+
+
+def test_sharded_walk_matches_single_process_walk(tmp_path: Path) -> None:
+    for user in ("alice", "bob", "carol"):
+        _make_tree(tmp_path / user)
+        (tmp_path / user / "proj" / "__pycache__" / "m.pyc").write_bytes(b"x" * 10)
+    (tmp_path / "dist").mkdir()  # a container at the top level
+    (tmp_path / ".git" / "build").mkdir(parents=True)  # never walked
+    active = {"venv", "cache", "artifacts", "tox"}
+
+    sharded = walk_sharded(tmp_path, active, processes=2)
+
+    assert _summary(sharded) == _summary(walk_environments(tmp_path, active))
+    assert str(tmp_path / "dist") in {str(e.path) for e in sharded}
+
+
+def test_sharded_walk_falls_back_when_pool_fails(tmp_path: Path) -> None:
+    for user in ("alice", "bob"):
+        _make_tree(tmp_path / user)
+    with patch(
+        "killpy.detectors._shared_walk.ProcessPoolExecutor",
+        side_effect=OSError("no semaphores"),
+    ):
+        envs = walk_sharded(tmp_path, {"tox"}, processes=4)
+    assert sorted(e.path.parent.parent.name for e in envs) == ["alice", "bob"]
+
+
+def test_balance_shards_spreads_weight() -> None:
+    shards = balance_shards({"a": 10, "b": 6, "c": 5, "d": 1, "e": 1}, 2)
+    loads = sorted(sum({"a": 10, "b": 6, "c": 5}.get(n, 1) for n in s) for s in shards)
+    assert loads == [11, 12]
+    assert sorted(n for s in shards for n in s) == ["a", "b", "c", "d", "e"]
+
+
+def test_balance_shards_never_returns_empty_shards() -> None:
+    assert balance_shards({"a": 1}, 8) == [["a"]]
@@ -0,0 +1,167 @@
+"""Unit tests for ``killpy.snapshots``."""
+
+from __future__ import annotations
+
+import gzip
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from killpy.files import DiskUsage
+from killpy.models import Environment
+from killpy.snapshots import Snapshot, SnapshotStore
+
+
+def _env(path: Path, size: int = 1000) -> Environment:
+    return Environment(
+        path=path,
+        name=path.name,
+        type=".venv",
+        last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        size_bytes=size,
+        usage=DiskUsage(
+            apparent_bytes=size,
+            reclaimable_bytes=size,
+            disk_bytes=4096,
+            reclaimable_disk_bytes=4096,
+            file_count=3,
+            reclaimable_file_count=3,
+            dir_count=2,
+        ),
+    )
+
+
+def test_round_trip(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    env = _env(tmp_path / "a" / ".venv")
+    store.save(tmp_path, [env], {"venv"})
+
+    snapshot = store.load(tmp_path, {"venv"})
+
+    assert snapshot is not None
+    assert snapshot.root == tmp_path.resolve()
+    assert snapshot.is_fresh(60)
+    [loaded] = snapshot.envs
+    assert loaded.path == env.path
+    assert loaded.size_bytes == 1000
+    assert loaded.disk_bytes == 4096
+    assert loaded.inode_count == env.inode_count
+
+
+def test_keyed_by_root_types_and_exclusions(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    store.save(tmp_path, [_env(tmp_path / "a")], {"venv", "conda"})
+
+    assert store.load(tmp_path, ["conda", "venv"]) is not None
+    assert store.load(tmp_path, {"venv"}) is None
+    assert store.load(tmp_path, {"venv", "conda"}, excluded={"legacy"}) is None
+    assert store.load(tmp_path / "a", {"venv", "conda"}) is None
+
+
+def test_keyed_by_scan_options(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    store.save(tmp_path, [_env(tmp_path / "a")], {"venv"}, options={"one-file-system"})
+
+    assert store.load(tmp_path, {"venv"}) is None
+    assert store.load(tmp_path, {"venv"}, options={"one-file-system"}) is not None
+    assert store.lock(tmp_path, {"venv"}).path != (
+        store.lock(tmp_path, {"venv"}, options={"one-file-system"}).path
+    )
+
+
+def test_critical_flags_are_this_processs(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    other = _env(tmp_path / "a" / ".venv")
+    other.is_system_critical = True  # the saving process ran from it
+    ours = _env(Path(sys.prefix))
+    store.save(tmp_path, [other, ours], {"venv"})
+
+    snapshot = store.load(tmp_path, {"venv"})
+
+    assert snapshot is not None
+    assert [e.is_system_critical for e in snapshot.envs] == [False, True]
+
+
+def test_unreadable_snapshot_is_ignored(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "snapshots")
+    store.save(tmp_path, [_env(tmp_path / "a")])
+    [path] = (tmp_path / "snapshots").iterdir()
+
+    path.write_bytes(b"not gzip")
+    assert store.load(tmp_path) is None
+
+    with gzip.open(path, "wt") as fh:
+        fh.write('{"version": 0}')
+    assert store.load(tmp_path) is None
+
+
+def test_unwritable_directory_is_not_an_error(tmp_path: Path) -> None:
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    SnapshotStore(blocker / "snapshots").save(tmp_path, [_env(tmp_path / "a")])
+
+
+def test_freshness() -> None:
+    taken_at = datetime.now(tz=timezone.utc) - timedelta(minutes=10)
+    snapshot = Snapshot(root=Path("/"), taken_at=taken_at)
+    assert snapshot.is_fresh(3600)
+    assert not snapshot.is_fresh(60)
+
+
+class TestScanOnce:
+    def test_scans_and_saves_when_alone(self, tmp_path: Path) -> None:
+        store = SnapshotStore(tmp_path / "snapshots")
+        env = _env(tmp_path / "a")
+
+        assert store.scan_once(tmp_path, lambda: [env], {"venv"}) == [env]
+        snapshot = store.load(tmp_path, {"venv"})
+        assert snapshot is not None
+        assert [e.path for e in snapshot.envs] == [env.path]
+
+    def _contend(self, store: SnapshotStore, root: Path, leader_saves: bool):
+        """Start scan_once while another scan holds the lock; return its outcome."""
+        leader = store.lock(root)
+        assert leader.acquire(blocking=False)
+        waiting = threading.Event()
+        outcome: dict = {}
+
+        def follower() -> None:
+            outcome["envs"] = store.scan_once(
+                root,
+                lambda: outcome.setdefault("scanned", [_env(root / "own")]),
+                on_wait=waiting.set,
+            )
+
+        thread = threading.Thread(target=follower)
+        thread.start()
+        assert waiting.wait(5)
+        if leader_saves:
+            shared = _env(root / "shared")
+            shared.is_system_critical = True  # the leader ran from it
+            store.save(root, [shared])
+        leader.release()
+        thread.join(5)
+        return outcome
+
+    def test_waits_for_and_reuses_a_scan_in_flight(self, tmp_path: Path) -> None:
+        outcome = self._contend(SnapshotStore(tmp_path / "s"), tmp_path, True)
+        assert "scanned" not in outcome
+        assert [e.path for e in outcome["envs"]] == [tmp_path / "shared"]
+        assert not outcome["envs"][0].is_system_critical
+
+    def test_scans_itself_when_the_other_scan_saved_nothing(
+        self, tmp_path: Path
+    ) -> None:
+        outcome = self._contend(SnapshotStore(tmp_path / "s"), tmp_path, False)
+        assert [e.path for e in outcome["envs"]] == [tmp_path / "own"]
+
+    def test_stops_waiting_for_a_scan_that_takes_too_long(self, tmp_path: Path) -> None:
+        store = SnapshotStore(tmp_path / "s")
+        leader = store.lock(tmp_path)
+        assert leader.acquire(blocking=False)
+        try:
+            envs = store.scan_once(tmp_path, lambda: [_env(tmp_path / "own")], wait=0.3)
+        finally:
+            leader.release()
+        assert [e.path for e in envs] == [tmp_path / "own"]
@@ -0,0 +1,156 @@
+"""Unit tests for ``killpy.throttle`` (gentle mode)."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from killpy import throttle
+from killpy.__main__ import cli
+from killpy.files import get_disk_usage
+from killpy.throttle import IoThrottle, TokenBucket
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _FakeTime:
+    """Clock whose sleeps advance it, so rate limits can be read off it."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def installed() -> Iterator[IoThrottle]:
+    """Install a generous throttle for the test, and remove it afterwards."""
+    limiter = IoThrottle(ops_per_second=1e9, bytes_per_second=1e12)
+    throttle.set_throttle(limiter)
+    yield limiter
+    throttle.set_throttle(None)
+
+
+def _tree(root: Path) -> Path:
+    (root / "pkg" / "sub").mkdir(parents=True)
+    (root / "pkg" / "a.py").write_bytes(b"x" * 100)
+    (root / "pkg" / "sub" / "b.py").write_bytes(b"y" * 50)
+    return root / "pkg"
+
+
+# ---------------------------------------------------------------------------
+# TokenBucket / IoThrottle
+# ---------------------------------------------------------------------------
+
+
+class TestTokenBucket:
+    def test_holds_the_rate_after_the_burst(self) -> None:
+        fake = _FakeTime()
+        bucket = TokenBucket(100, clock=fake.clock, sleep=fake.sleep)
+        for _ in range(300):
+            bucket.take()
+        # The first 100 come from the initial burst; 200 more take 2 seconds.
+        assert fake.now == pytest.approx(2.0)
+
+    def test_large_requests_wait_for_their_deficit(self) -> None:
+        fake = _FakeTime()
+        bucket = TokenBucket(10, clock=fake.clock, sleep=fake.sleep)
+        bucket.take(30)
+        assert fake.slept == pytest.approx(2.0)
+
+
+class TestIoThrottle:
+    def _run(self, limiter: IoThrottle, fake: _FakeTime, latency: float, n: int):
+        for _ in range(n):
+            with limiter.op():
+                fake.now += latency
+
+    def test_backs_off_when_latency_rises_and_recovers(self) -> None:
+        fake = _FakeTime()
+        limiter = IoThrottle(1e6, 1e9, clock=fake.clock, sleep=fake.sleep)
+        self._run(limiter, fake, 0.001, 64)
+        assert limiter.factor == 1.0
+        self._run(limiter, fake, 0.02, 128)
+        slowed = limiter.factor
+        assert slowed < 1.0
+        self._run(limiter, fake, 0.001, 512)
+        assert limiter.factor > slowed
+
+    def test_bytes_are_rate_limited(self) -> None:
+        fake = _FakeTime()
+        limiter = IoThrottle(1e9, 1000, clock=fake.clock, sleep=fake.sleep)
+        for _ in range(5):
+            with limiter.op(1000):
+                pass
+        assert fake.now == pytest.approx(4.0)
+
+
+# ---------------------------------------------------------------------------
+# Throttled I/O
+# ---------------------------------------------------------------------------
+
+
+class TestThrottledIo:
+    def test_disk_usage_is_unchanged(self, tmp_path: Path, installed) -> None:
+        pkg = _tree(tmp_path)
+        throttle.set_throttle(None)
+        plain = get_disk_usage(pkg)
+        throttle.set_throttle(installed)
+        assert get_disk_usage(pkg) == plain
+
+    def test_rmtree_removes_without_following_symlinks(
+        self, tmp_path: Path, installed
+    ) -> None:
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "keep.txt").write_text("keep")
+        pkg = _tree(tmp_path)
+        os.symlink(outside, pkg / "sub" / "link")
+
+        throttle.rmtree(pkg, bytes_per_file=10)
+
+        assert not pkg.exists()
+        assert (outside / "keep.txt").exists()
+
+    def test_unthrottled_rmtree_uses_shutil(self, tmp_path: Path) -> None:
+        with patch("shutil.rmtree") as mock_rm:
+            throttle.rmtree(tmp_path)
+        mock_rm.assert_called_once_with(tmp_path)
+
+
+# ---------------------------------------------------------------------------
+# --gentle
+# ---------------------------------------------------------------------------
+
+
+class TestGentleOption:
+    @pytest.mark.parametrize(
+        "args",
+        [["--gentle", "list"], ["list", "--gentle"], ["--gentle", "list", "--gentle"]],
+    )
+    def test_installs_the_throttle_once(self, tmp_path: Path, args) -> None:
+        try:
+            with (
+                patch("killpy.throttle.lower_priority") as mock_lower,
+                patch("killpy.commands.list.Scanner"),
+                patch("killpy.snapshots._DEFAULT_DIR", tmp_path / "snapshots"),
+            ):
+                result = CliRunner().invoke(cli, [*args, "--path", str(tmp_path)])
+            assert result.exit_code == 0, result.output
+            assert throttle.get_throttle() is not None
+            mock_lower.assert_called_once()
+        finally:
+            throttle.set_throttle(None)
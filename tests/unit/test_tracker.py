@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import json
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 from killpy.intelligence.tracker import UsageTracker
 from killpy.models import ScanRecord
@@ -143,6 +145,96 @@ class TestAtomicWrite:
         tracker = UsageTracker(path)
         tracker.record_scan(_record(count=1))
         tracker.record_scan(_record(count=2))
+        tracker.compact()
         assert len(tracker.get_history()) == 2
-        # The atomic mkstemp + os.replace must not leave a temp file behind.
-        assert [p.name for p in tmp_path.iterdir()] == ["history.json"]
+        # The atomic mkstemp + os.replace must not leave a temp file behind,
+        # and compaction consumes the journal; only the lock file stays.
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "history.json",
+            "history.lock",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Append-only journal and compaction
+# ---------------------------------------------------------------------------
+
+
+class TestJournal:
+    def test_deletion_appends_without_rewriting_snapshot(self, tmp_path: Path) -> None:
+        path = tmp_path / "history.json"
+        tracker = UsageTracker(path)
+        tracker.record_scan(_record(space_deleted=0))
+        snapshot_before = path.read_text(encoding="utf-8")
+        tracker.record_deletion(10)
+        tracker.record_deletion(5)
+        assert path.read_text(encoding="utf-8") == snapshot_before
+        lines = (tmp_path / "history.ndjson").read_text().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["deletion", "deletion"]
+        assert tracker.get_history()[-1].total_space_deleted == 15
+        assert tracker.get_summary()["total_space_deleted"] == 15
+
+    def test_compaction_preserves_totals(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        tracker.record_scan(_record(space_found=100, space_deleted=0))
+        tracker.record_scan(_record(space_found=200, space_deleted=0))
+        tracker.record_deletion(50)
+        before = tracker.get_summary()
+        tracker.compact()
+        assert not (tmp_path / "history.ndjson").exists()
+        assert tracker.get_summary() == before
+        assert before["total_space_found"] == 300
+        assert before["total_space_deleted"] == 50
+
+    def test_journal_compacts_past_threshold(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        tracker.record_scan(_record())
+        with patch("killpy.intelligence.tracker._COMPACT_JOURNAL_BYTES", 1):
+            tracker.record_deletion(1)
+        assert not (tmp_path / "history.ndjson").exists()
+
+    def test_concurrent_compactions_lose_nothing(self, tmp_path: Path) -> None:
+        def writer() -> None:
+            tracker = UsageTracker(tmp_path / "history.json")
+            for _ in range(15):
+                tracker.record_scan(_record(space_found=1))
+
+        with patch("killpy.intelligence.tracker._COMPACT_JOURNAL_BYTES", 0):
+            threads = [threading.Thread(target=writer) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            UsageTracker(tmp_path / "history.json").compact()
+        summary = UsageTracker(tmp_path / "history.json").get_summary()
+        assert summary["total_scans"] == 90
+        assert summary["total_space_found"] == 90
+
+    def test_old_records_roll_into_summary(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        with patch("killpy.intelligence.tracker._MAX_RECORDS", 2):
+            for i in range(5):
+                tracker.record_scan(_record(space_found=10, count=i))
+            tracker.compact()
+            history = tracker.get_history()
+        assert [r.environments_count for r in history] == [3, 4]
+        summary = tracker.get_summary()
+        assert summary["total_scans"] == 5
+        assert summary["total_space_found"] == 50
+
+    def test_torn_journal_line_is_skipped(self, tmp_path: Path) -> None:
+        tracker = UsageTracker(tmp_path / "history.json")
+        tracker.record_scan(_record(space_deleted=0))
+        with (tmp_path / "history.ndjson").open("a") as fh:
+            fh.write('{"op": "deletion", "size_')
+        assert tracker.get_summary()["total_scans"] == 1
+
+    def test_legacy_list_history_is_read(self, tmp_path: Path) -> None:
+        path = tmp_path / "history.json"
+        path.write_text(json.dumps([_record(space_found=7).to_dict()]))
+        tracker = UsageTracker(path)
+        assert tracker.get_summary()["total_space_found"] == 7
+        tracker.record_deletion(3)
+        tracker.compact()
+        assert json.loads(path.read_text())["version"] == 2
+        assert tracker.get_history()[0].total_space_deleted == 500_003
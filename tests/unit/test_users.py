@@ -0,0 +1,72 @@
+"""Unit tests for ``killpy.users``."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from killpy.detectors.conda import CondaDetector
+from killpy.detectors.poetry import _poetry_venvs_dir
+from killpy.users import as_user, local_users, other_user, user_env, user_home
+
+
+def _pw(name: str, uid: int, home: Path) -> SimpleNamespace:
+    return SimpleNamespace(pw_name=name, pw_uid=uid, pw_dir=str(home))
+
+
+def test_local_users_keeps_root_and_regular_accounts(tmp_path: Path) -> None:
+    for name in ("root", "alice", "bob", "daemon", "nobody"):
+        (tmp_path / name).mkdir()
+    entries = [
+        _pw("bob", 1001, tmp_path / "bob"),
+        _pw("root", 0, tmp_path / "root"),
+        _pw("daemon", 1, tmp_path / "daemon"),
+        _pw("nobody", 65534, tmp_path / "nobody"),
+        _pw("alice", 1000, tmp_path / "alice"),
+        _pw("alice2", 1002, tmp_path / "alice"),  # shares alice's home
+        _pw("ghost", 1003, tmp_path / "gone"),  # home does not exist
+    ]
+    with (
+        patch("killpy.users.pwd.getpwall", return_value=entries),
+        patch("killpy.users._FIRST_REGULAR_UID", 1000),
+    ):
+        users = local_users()
+    assert [(u.name, u.uid) for u in users] == [
+        ("root", 0),
+        ("alice", 1000),
+        ("bob", 1001),
+    ]
+
+
+def test_as_user_swaps_home_and_hides_environment(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("POETRY_CACHE_DIR", "/invoker/poetry")
+    assert _poetry_venvs_dir() == Path("/invoker/poetry/virtualenvs")
+    with as_user(tmp_path):
+        assert other_user()
+        assert user_home() == tmp_path
+        assert user_env("POETRY_CACHE_DIR") is None
+        assert _poetry_venvs_dir().is_relative_to(tmp_path)
+    assert not other_user()
+    assert user_home() == Path.home()
+
+
+def test_as_user_is_per_thread(tmp_path: Path) -> None:
+    seen: list[Path] = []
+    with as_user(tmp_path):
+        thread = threading.Thread(target=lambda: seen.append(user_home()))
+        thread.start()
+        thread.join()
+    assert seen == [Path.home()]
+
+
+def test_tools_on_path_do_not_speak_for_other_users(tmp_path: Path) -> None:
+    with patch("killpy.detectors.base.shutil.which", return_value="/usr/bin/conda"):
+        assert CondaDetector().can_handle()
+        with as_user(tmp_path):
+            assert not CondaDetector().can_handle()
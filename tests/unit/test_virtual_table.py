@@ -0,0 +1,146 @@
+"""Tests for the virtualized TUI table (``killpy/virtual_table.py``).
+
+The widget is mounted headless via Textual's ``App.run_test``; its row source
+records which rows were requested, so the tests can check that only the
+on-screen rows are ever materialized.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from rich.text import Text
+from textual.app import App, ComposeResult
+
+from killpy.virtual_table import VirtualTable
+
+
+class _Source:
+    """Row source that records every row index it is asked for."""
+
+    def __init__(self) -> None:
+        self.requested: list[int] = []
+        self.status: dict[int, str] = {}
+
+    def __call__(self, index: int) -> list:
+        self.requested.append(index)
+        return [f"row-{index}", index * 10, Text(self.status.get(index, ""))]
+
+
+class _TableApp(App):
+    def __init__(self, source: _Source, row_count: int) -> None:
+        super().__init__()
+        self.source = source
+        self.initial_rows = row_count
+        self.highlighted: list[int] = []
+        self.headers: list[int] = []
+
+    def compose(self) -> ComposeResult:
+        yield VirtualTable(self.source, id="table")
+
+    def on_mount(self) -> None:
+        table = self.query_one(VirtualTable)
+        table.set_columns("Name", "Size", "Status")
+        table.row_count = self.initial_rows
+        table.focus()
+
+    def on_virtual_table_row_highlighted(
+        self, event: VirtualTable.RowHighlighted
+    ) -> None:
+        self.highlighted.append(event.cursor_row)
+
+    def on_virtual_table_header_selected(
+        self, event: VirtualTable.HeaderSelected
+    ) -> None:
+        self.headers.append(event.column_index)
+
+
+def _run(row_count: int, scenario) -> _Source:
+    source = _Source()
+
+    async def main() -> None:
+        app = _TableApp(source, row_count)
+        async with app.run_test(size=(60, 20)) as pilot:
+            await pilot.pause()
+            await scenario(app, app.query_one(VirtualTable), pilot)
+
+    asyncio.run(main())
+    return source
+
+
+class TestVirtualRendering:
+    def test_only_visible_rows_are_materialized(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            assert table.row_count == 50_000
+
+        source = _run(50_000, scenario)
+        assert source.requested
+        assert max(source.requested) < 20
+
+    def test_scrolling_fetches_rows_near_the_cursor(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            source = app.source
+            source.requested.clear()
+            table.move_cursor(row=30_000)
+            await pilot.pause()
+            assert source.requested
+            assert all(29_900 < i <= 30_000 for i in source.requested)
+            assert table.scroll_y > 29_900
+
+        _run(50_000, scenario)
+
+    def test_refresh_row_refetches_only_that_row(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            source = app.source
+            source.requested.clear()
+            source.status[2] = "DELETED"
+            table.refresh_row(2)
+            await pilot.pause()
+            assert source.requested == [2]
+
+        _run(100, scenario)
+
+    def test_row_count_shrink_clamps_cursor(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            table.move_cursor(row=50)
+            table.row_count = 10
+            assert table.cursor_row == 9
+
+        _run(100, scenario)
+
+
+class TestVirtualCursor:
+    def test_key_navigation_posts_highlight(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            await pilot.press("down", "down", "end")
+            await pilot.pause()
+            assert table.cursor_row == 99
+            assert app.highlighted[-3:] == [1, 2, 99]
+
+        _run(100, scenario)
+
+    def test_cursor_stays_within_bounds(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            table.action_cursor_up()
+            assert table.cursor_row == 0
+            table.move_cursor(row=500)
+            assert table.cursor_row == 4
+
+        _run(5, scenario)
+
+    def test_header_click_posts_header_selected(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            # Column 1 ("Size") starts after the padded "row-NN" column.
+            await pilot.click(VirtualTable, offset=(12, 0))
+            await pilot.pause()
+            assert app.headers == [1]
+
+        _run(20, scenario)
+
+    def test_row_click_moves_cursor(self) -> None:
+        async def scenario(app, table, pilot) -> None:
+            await pilot.click(VirtualTable, offset=(2, 4))
+            await pilot.pause()
+            assert table.cursor_row == 3
+
+        _run(20, scenario)